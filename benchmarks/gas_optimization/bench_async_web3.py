@@ -0,0 +1,107 @@
+"""
+Benchmark: AsyncWeb3 versus thread-offloaded Web3 in GasMonitor
+
+Runs many GasMonitor instances on one event loop against a local mock node
+and compares reading throughput and event-loop responsiveness between the
+native AsyncWeb3 path and the legacy ``asyncio.to_thread`` path.
+
+Usage:
+    python benchmarks/gas_optimization/bench_async_web3.py --monitors 200 --rounds 5
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import sys
+import os
+import time
+from typing import Dict, List
+
+# Add repository root to path to enable imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from web3 import AsyncWeb3, Web3
+
+from src.gas_optimization.gas_monitor import GasMonitor
+from benchmarks.gas_optimization.mock_node import MockNode
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    """Return the nearest-rank percentile of a list of samples."""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+async def measure_loop_lag(stop: asyncio.Event, interval: float, lags: List[float]) -> None:
+    """Record how late a periodic heartbeat wakes up while the benchmark runs."""
+    loop = asyncio.get_running_loop()
+    while not stop.is_set():
+        scheduled = loop.time()
+        await asyncio.sleep(interval)
+        lags.append(loop.time() - scheduled - interval)
+
+
+async def run_mode(mode: str, url: str, monitors: int, rounds: int) -> Dict[str, float]:
+    """Run one benchmark mode and return its summary metrics."""
+    if mode == "async":
+        gas_monitors = [
+            GasMonitor(AsyncWeb3(AsyncWeb3.AsyncHTTPProvider(url))) for _ in range(monitors)
+        ]
+    else:
+        gas_monitors = [GasMonitor(Web3(Web3.HTTPProvider(url))) for _ in range(monitors)]
+
+    # Warm up connections outside the measured window
+    await asyncio.gather(*(monitor.get_current_gas_price() for monitor in gas_monitors))
+
+    stop = asyncio.Event()
+    lags: List[float] = []
+    heartbeat = asyncio.create_task(measure_loop_lag(stop, 0.001, lags))
+
+    started = time.perf_counter()
+    for _ in range(rounds):
+        await asyncio.gather(*(monitor.get_current_gas_price() for monitor in gas_monitors))
+    elapsed = time.perf_counter() - started
+
+    stop.set()
+    await heartbeat
+
+    if mode == "async":
+        for monitor in gas_monitors:
+            await monitor.web3.provider.disconnect()
+
+    readings = monitors * rounds
+    return {
+        "mode": mode,
+        "monitors": monitors,
+        "readings": readings,
+        "elapsed_s": elapsed,
+        "readings_per_s": readings / elapsed,
+        "loop_lag_p50_ms": percentile(lags, 50) * 1000,
+        "loop_lag_p99_ms": percentile(lags, 99) * 1000,
+        "loop_lag_max_ms": max(lags, default=0.0) * 1000,
+    }
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--monitors", type=int, default=200, help="GasMonitor instances")
+    parser.add_argument("--rounds", type=int, default=5, help="Readings per monitor")
+    parser.add_argument("--latency", type=float, default=0.005, help="Mock RPC latency (s)")
+    args = parser.parse_args()
+
+    logging.getLogger("src.gas_optimization").setLevel(logging.WARNING)
+
+    results = []
+    with MockNode(latency=args.latency) as node:
+        for mode in ("sync", "async"):
+            results.append(await run_mode(mode, node.url, args.monitors, args.rounds))
+
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,276 @@
+"""
+Benchmark suite: GasMonitor throughput, latency, memory and query cost
+
+Runs GasMonitor instances against a local mock JSON-RPC node and Etherscan
+gas oracle under several latency, jitter and error profiles, and measures:
+
+- ticks: updates per second and p50/p99 per-reading latency per profile
+- memory: bytes of traced allocations per stored reading
+- queries: cost of the statistics, forecast, candle and cost queries
+
+Results are printed as JSON and optionally written to a file; ``--compare``
+prints the relative change of every metric against an earlier result file.
+
+Usage:
+    python benchmarks/gas_optimization/bench_gas_monitor.py --output results.json
+    python benchmarks/gas_optimization/bench_gas_monitor.py --profiles local,flaky --compare results.json
+"""
+
+import argparse
+import asyncio
+import gc
+import json
+import logging
+import platform
+import subprocess
+import sys
+import os
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List
+from unittest.mock import Mock
+
+# Add repository root to path to enable imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+import numpy as np
+from web3 import AsyncWeb3
+
+from src.gas_optimization.gas_monitor import GasMonitor
+from benchmarks.gas_optimization.mock_node import PROFILES, MockNode
+
+
+GWEI = 10**9
+BASE_NS = 1_700_000_000 * 10**9
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    """Return the nearest-rank percentile of a list of samples."""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+async def bench_ticks(profile_name: str, monitors: int, rounds: int, fetch_mode: str) -> Dict[str, Any]:
+    """
+    Measure update throughput and per-reading latency under one profile.
+
+    Every monitor runs ``rounds`` back-to-back updates; all monitors run
+    concurrently on one event loop. Etherscan is served by the same mock
+    with the same profile, so failed RPC calls exercise the fallback path.
+    """
+    profile = PROFILES[profile_name]
+    with MockNode(profile=profile, price_volatility=0.01) as node:
+        gas_monitors = []
+        for _ in range(monitors):
+            monitor = GasMonitor(AsyncWeb3(AsyncWeb3.AsyncHTTPProvider(node.url)), fetch_mode=fetch_mode)
+            monitor.ETHERSCAN_GAS_ORACLE_URL = node.etherscan_url
+            gas_monitors.append(monitor)
+
+        # Warm up connections outside the measured window
+        await asyncio.gather(*(monitor.get_current_gas_price() for monitor in gas_monitors))
+
+        latencies: List[float] = []
+
+        async def run(monitor: GasMonitor) -> None:
+            for _ in range(rounds):
+                started = time.perf_counter()
+                await monitor.update_gas_price()
+                latencies.append(time.perf_counter() - started)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(run(monitor) for monitor in gas_monitors))
+        elapsed = time.perf_counter() - started
+
+        fallbacks = sum(monitor.default_fallbacks for monitor in gas_monitors)
+        wins: Dict[str, int] = {}
+        for monitor in gas_monitors:
+            for name, stats in monitor.source_stats.items():
+                wins[name] = wins.get(name, 0) + stats.wins
+            await monitor.aclose()
+            await monitor.web3.provider.disconnect()
+
+        return {
+            "profile": profile_name,
+            "fetch_mode": fetch_mode,
+            "monitors": monitors,
+            "ticks": len(latencies),
+            "elapsed_s": elapsed,
+            "ticks_per_s": len(latencies) / elapsed,
+            "latency_p50_ms": percentile(latencies, 50) * 1000,
+            "latency_p99_ms": percentile(latencies, 99) * 1000,
+            "latency_max_ms": max(latencies, default=0.0) * 1000,
+            "default_fallbacks": fallbacks,
+            "source_wins": wins,
+            "node_errors": node.error_count,
+        }
+
+
+def bench_memory(history_size: int) -> Dict[str, Any]:
+    """
+    Measure traced allocations per stored reading.
+
+    The monitor is created and filled under ``tracemalloc``, so the result
+    covers the history columns, rolling statistics, forecaster and candles.
+    Buffers preallocated at creation are reported separately, since they
+    do not grow with the number of readings.
+    """
+    timestamps = BASE_NS + np.arange(history_size, dtype=np.int64) * 12 * 10**9
+    prices = (30 + np.random.default_rng(0).standard_normal(history_size)).clip(1) * GWEI
+
+    results = {"history_size": history_size}
+    for label, kwargs in (("default", {}), ("without_candles", {"candle_resolutions": None})):
+        gc.collect()
+        tracemalloc.start()
+        baseline = tracemalloc.get_traced_memory()[0]
+        monitor = GasMonitor(Mock(), history_size=history_size, **kwargs)
+        created = tracemalloc.get_traced_memory()[0] - baseline
+        for timestamp, price in zip(timestamps.tolist(), prices.astype(np.int64).tolist()):
+            monitor._record_gas_price(price, timestamp)
+        used = tracemalloc.get_traced_memory()[0] - baseline
+        tracemalloc.stop()
+        results[f"{label}_bytes_at_creation"] = created
+        results[f"{label}_bytes_per_sample"] = used / history_size
+        results[f"{label}_growth_bytes_per_sample"] = (used - created) / history_size
+        del monitor
+    return results
+
+
+def time_call(function: Callable[[], Any], min_time: float = 0.2) -> float:
+    """Return the mean seconds per call, repeating until ``min_time`` has passed."""
+    function()
+    calls = 0
+    started = time.perf_counter()
+    elapsed = 0.0
+    while elapsed < min_time:
+        for _ in range(100):
+            function()
+        calls += 100
+        elapsed = time.perf_counter() - started
+    return elapsed / calls
+
+
+def bench_queries(history_size: int) -> Dict[str, float]:
+    """Measure the cost of each statistics query, in microseconds per call."""
+    monitor = GasMonitor(Mock(), history_size=history_size)
+    rng = np.random.default_rng(1)
+    prices = (30 * np.exp(np.cumsum(rng.normal(0, 0.02, history_size)))).clip(1)
+    for i, price in enumerate(prices.tolist()):
+        monitor._record_gas_price(int(price * GWEI), BASE_NS + i * 12 * 10**9)
+    start = datetime.fromtimestamp(BASE_NS / 1e9, tz=timezone.utc)
+    gas_units = rng.integers(21_000, 1_000_000, size=1000)
+
+    queries = {
+        "record_reading": lambda: monitor._record_gas_price(30 * GWEI),
+        "average_10": lambda: monitor.get_average_gas_price(10),
+        "average_all": lambda: monitor.get_average_gas_price(history_size),
+        "median": monitor.get_median_gas_price,
+        "percentile_90": lambda: monitor.get_gas_price_percentile(90),
+        "ema_20": lambda: monitor.get_ema_gas_price(20),
+        "volatility_10": lambda: monitor.get_gas_price_volatility(10),
+        "min_all": monitor.get_min_gas_price,
+        "max_all": monitor.get_max_gas_price,
+        "forecast_5": lambda: monitor.forecast_gas_price(5),
+        "candles_points_100": lambda: monitor.get_candles(start, points=100),
+        "estimate_costs_1000": lambda: monitor.estimate_costs(gas_units),
+    }
+    return {f"{name}_us": time_call(query) * 1e6 for name, query in queries.items()}
+
+
+def flatten(results: Any, prefix: str = "") -> Dict[str, float]:
+    """Flatten nested results to ``path -> number`` for comparison."""
+    flat: Dict[str, float] = {}
+    if isinstance(results, dict):
+        items = results.items()
+    elif isinstance(results, list):
+        items = (
+            (f"{entry.get('profile', index)}", entry) if isinstance(entry, dict) else (str(index), entry)
+            for index, entry in enumerate(results)
+        )
+    else:
+        return {prefix: results} if isinstance(results, (int, float)) and not isinstance(results, bool) else {}
+    for key, value in items:
+        flat.update(flatten(value, f"{prefix}.{key}" if prefix else str(key)))
+    return flat
+
+
+def compare(baseline: Dict[str, Any], current: Dict[str, Any]) -> Dict[str, Dict[str, float]]:
+    """Relative change of every metric present in both result sets."""
+    before = flatten(baseline["results"])
+    after = flatten(current["results"])
+    return {
+        key: {"before": before[key], "after": after[key], "change": (after[key] / before[key] - 1) if before[key] else None}
+        for key in sorted(before.keys() & after.keys())
+    }
+
+
+def environment() -> Dict[str, Any]:
+    """Describe the machine and revision the results were measured on."""
+    try:
+        revision = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        revision = None
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "revision": revision,
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+        "processor": platform.machine(),
+    }
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--profiles", default="local,remote,degraded,flaky",
+        help=f"Comma-separated mock node profiles, from: {', '.join(PROFILES)}",
+    )
+    parser.add_argument("--monitors", type=int, default=50, help="GasMonitor instances per profile")
+    parser.add_argument("--rounds", type=int, default=20, help="Updates per monitor")
+    parser.add_argument("--fetch-mode", default="sequential", choices=GasMonitor.FETCH_MODES)
+    parser.add_argument("--history-size", type=int, default=10_000, help="Readings for memory and query benchmarks")
+    parser.add_argument("--skip", default="", help="Comma-separated benchmarks to skip: ticks, memory, queries")
+    parser.add_argument("--output", help="Write the results as JSON to this file")
+    parser.add_argument("--compare", help="Earlier result file to compare against")
+    args = parser.parse_args()
+
+    logging.getLogger("src.gas_optimization").setLevel(logging.CRITICAL)
+    logging.getLogger("web3").setLevel(logging.CRITICAL)
+    skip = set(filter(None, args.skip.split(",")))
+
+    results: Dict[str, Any] = {}
+    if "ticks" not in skip:
+        results["ticks"] = [
+            await bench_ticks(name, args.monitors, args.rounds, args.fetch_mode)
+            for name in filter(None, args.profiles.split(","))
+        ]
+    if "memory" not in skip:
+        results["memory"] = bench_memory(args.history_size)
+    if "queries" not in skip:
+        results["queries"] = bench_queries(args.history_size)
+
+    report = {
+        "benchmark": "gas_monitor",
+        "environment": environment(),
+        "arguments": vars(args),
+        "results": results,
+    }
+    if args.compare:
+        with open(args.compare) as f:
+            report["comparison"] = compare(json.load(f), report)
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+    print(text)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
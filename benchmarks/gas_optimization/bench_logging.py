@@ -0,0 +1,104 @@
+"""
+Micro-benchmark: logging overhead on GasMonitor hot paths
+
+Times GasMonitor's query methods with debug logging disabled (the
+production case, where deferred formatting and ``isEnabledFor`` guards skip
+all message work) and enabled with a discarding handler, and times a flood
+of identical source-failure warnings through the rate-limited channel
+against plain ``logger.warning`` calls.
+
+Usage:
+    python benchmarks/gas_optimization/bench_logging.py --repeat 7
+"""
+
+import argparse
+import json
+import logging
+import sys
+import os
+import timeit
+from typing import Callable, Dict
+from unittest.mock import Mock
+
+# Add repository root to path to enable imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from src.gas_optimization.clock import VirtualClock
+from src.gas_optimization.gas_monitor import GasMonitor
+from src.gas_optimization.rate_limited_log import RateLimitedLogger
+
+
+GWEI = 10**9
+BASE_NS = 1_700_000_000 * 10**9
+
+
+def ns_per_call(function: Callable[[], object], number: int, repeat: int) -> float:
+    """Return the best-of-``repeat`` nanoseconds per call."""
+    return min(timeit.repeat(function, number=number, repeat=repeat)) / number * 1e9
+
+
+def bench_queries(level: int, number: int, repeat: int) -> Dict[str, float]:
+    """Time each query method with the module logger at ``level``."""
+    module_logger = logging.getLogger("src.gas_optimization.gas_monitor")
+    module_logger.setLevel(level)
+
+    monitor = GasMonitor(Mock())
+    for i in range(100):
+        monitor._record_gas_price((30 + i % 5) * GWEI, BASE_NS + i * 12 * 10**9)
+
+    queries = {
+        "get_average_gas_price": lambda: monitor.get_average_gas_price(10),
+        "is_gas_price_favorable": lambda: monitor.is_gas_price_favorable(40),
+        "is_waiting_favorable": monitor.is_waiting_favorable,
+        "get_median_gas_price": monitor.get_median_gas_price,
+        "get_ema_gas_price": monitor.get_ema_gas_price,
+    }
+    return {name: ns_per_call(query, number, repeat) for name, query in queries.items()}
+
+
+def bench_failure_flood(number: int, repeat: int) -> Dict[str, float]:
+    """Time repeated identical warnings, plain versus rate-limited."""
+    flood_logger = logging.getLogger("bench.flood")
+    flood_logger.propagate = False
+    flood_logger.addHandler(logging.NullHandler())
+    limiter = RateLimitedLogger(flood_logger, interval=60.0, clock=VirtualClock())
+    error = ConnectionError("connection refused")
+
+    return {
+        "plain_warning": ns_per_call(
+            lambda: flood_logger.warning("Failed to get gas price from %s: %s", "web3", error), number, repeat
+        ),
+        "rate_limited_warning": ns_per_call(
+            lambda: limiter.warning("web3", "Failed to get gas price from %s: %s", "web3", error), number, repeat
+        ),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--number", type=int, default=20_000, help="Calls per timing run")
+    parser.add_argument("--repeat", type=int, default=7, help="Timing runs per measurement (best is kept)")
+    args = parser.parse_args()
+
+    # Discard records so that enabled logging measures formatting, not I/O
+    logging.getLogger().handlers[:] = [logging.NullHandler()]
+    logging.getLogger().setLevel(logging.DEBUG)
+
+    disabled = bench_queries(logging.WARNING, args.number, args.repeat)
+    enabled = bench_queries(logging.DEBUG, args.number, args.repeat)
+    results = {
+        "queries_ns": {
+            name: {
+                "debug_disabled": disabled[name],
+                "debug_enabled": enabled[name],
+                "saved_ratio": 1 - disabled[name] / enabled[name],
+            }
+            for name in disabled
+        },
+        "failure_flood_ns": bench_failure_flood(args.number, args.repeat),
+    }
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,231 @@
+"""
+Mock JSON-RPC Node for Benchmarks
+
+Serves Ethereum JSON-RPC requests, and an Etherscan-style gas oracle, from a
+background thread with its own event loop, so the benchmarked event loop only
+carries client-side work. Latency, jitter and error rates are configurable
+per endpoint through profiles.
+"""
+
+import asyncio
+import math
+import random
+import threading
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+from aiohttp import web
+
+
+@dataclass(frozen=True)
+class NodeProfile:
+    """
+    Response behaviour of a mock endpoint.
+
+    Attributes:
+        latency: Base seconds to wait before answering each request
+        jitter: Mean of an exponentially distributed extra delay in seconds,
+            giving the long tail of a real provider
+        error_rate: Fraction of requests answered with an error
+        http_error_share: Fraction of errors sent as HTTP 503 rather than
+            as an in-band JSON-RPC or Etherscan error
+    """
+
+    latency: float = 0.0
+    jitter: float = 0.0
+    error_rate: float = 0.0
+    http_error_share: float = 0.5
+
+
+# Named profiles shared by the benchmark scripts
+PROFILES = {
+    "instant": NodeProfile(),
+    "local": NodeProfile(latency=0.001, jitter=0.0005),
+    "remote": NodeProfile(latency=0.02, jitter=0.01, error_rate=0.01),
+    "degraded": NodeProfile(latency=0.05, jitter=0.05, error_rate=0.1),
+    "flaky": NodeProfile(latency=0.01, jitter=0.02, error_rate=0.4),
+}
+
+
+class MockNode:
+    """
+    Minimal in-process Ethereum JSON-RPC node and Etherscan gas oracle.
+
+    JSON-RPC requests are served at ``url`` and gas oracle requests at
+    ``etherscan_url``; point a monitor's ``ETHERSCAN_GAS_ORACLE_URL`` at the
+    latter to benchmark the fallback path.
+
+    Usage:
+        with MockNode(profile=PROFILES["remote"]) as node:
+            web3 = Web3(Web3.HTTPProvider(node.url))
+
+    Attributes:
+        profile: Behaviour of the JSON-RPC endpoint
+        etherscan_profile: Behaviour of the gas oracle endpoint
+        gas_price_wei: Current gas price returned by both endpoints
+        price_volatility: Standard deviation of the per-request log change
+            of the gas price; 0 keeps it constant
+        url: HTTP endpoint once the node is started
+        etherscan_url: Gas oracle endpoint once the node is started
+        request_count: Number of HTTP requests served
+        etherscan_request_count: Number of gas oracle requests served
+        error_count: Number of error responses sent by either endpoint
+    """
+
+    def __init__(
+        self,
+        latency: float = 0.0,
+        gas_price_wei: int = 30 * 10**9,
+        profile: Optional[NodeProfile] = None,
+        etherscan_profile: Optional[NodeProfile] = None,
+        price_volatility: float = 0.0,
+        seed: int = 0
+    ):
+        """
+        Initialize the mock node.
+
+        Args:
+            latency: Seconds to wait before answering each request, used
+                when no profile is given (default: 0)
+            gas_price_wei: Initial gas price (default: 30 Gwei)
+            profile: Behaviour of the JSON-RPC endpoint (default: fixed
+                ``latency``, no jitter or errors)
+            etherscan_profile: Behaviour of the gas oracle endpoint
+                (default: same as ``profile``)
+            price_volatility: Per-request log change of the gas price
+                (default: 0)
+            seed: Seed of the jitter, error and price draws (default: 0)
+        """
+        self.profile = profile or NodeProfile(latency=latency)
+        self.etherscan_profile = etherscan_profile or self.profile
+        self.gas_price_wei = gas_price_wei
+        self.price_volatility = price_volatility
+        self.url: Optional[str] = None
+        self.etherscan_url: Optional[str] = None
+        self.request_count = 0
+        self.etherscan_request_count = 0
+        self.error_count = 0
+        self._random = random.Random(seed)
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._runner: Optional[web.AppRunner] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def latency(self) -> float:
+        """Base latency of the JSON-RPC endpoint."""
+        return self.profile.latency
+
+    def __enter__(self) -> "MockNode":
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.stop()
+
+    def start(self) -> None:
+        """Start serving on a random local port in a background thread."""
+        ready = threading.Event()
+        self._loop = asyncio.new_event_loop()
+
+        def run() -> None:
+            asyncio.set_event_loop(self._loop)
+            self._loop.run_until_complete(self._start_server())
+            ready.set()
+            self._loop.run_forever()
+
+        self._thread = threading.Thread(target=run, name="mock-node", daemon=True)
+        self._thread.start()
+        ready.wait()
+
+    def stop(self) -> None:
+        """Stop the server and its background thread."""
+        if self._loop is None:
+            return
+        asyncio.run_coroutine_threadsafe(self._runner.cleanup(), self._loop).result()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
+        self._loop = None
+
+    async def _start_server(self) -> None:
+        app = web.Application()
+        app.router.add_post("/", self._handle_rpc)
+        app.router.add_get("/api", self._handle_gas_oracle)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, "127.0.0.1", 0)
+        await site.start()
+        port = self._runner.addresses[0][1]
+        self.url = f"http://127.0.0.1:{port}"
+        self.etherscan_url = f"{self.url}/api?module=gastracker&action=gasoracle"
+
+    async def _delay(self, profile: NodeProfile) -> None:
+        """Wait for the profile's latency plus a jitter draw."""
+        delay = profile.latency
+        if profile.jitter:
+            delay += self._random.expovariate(1 / profile.jitter)
+        if delay:
+            await asyncio.sleep(delay)
+
+    def _draw_error(self, profile: NodeProfile) -> Optional[str]:
+        """Decide whether to fail a request: None, "http" or "inband"."""
+        if not profile.error_rate or self._random.random() >= profile.error_rate:
+            return None
+        self.error_count += 1
+        return "http" if self._random.random() < profile.http_error_share else "inband"
+
+    def _next_gas_price(self) -> int:
+        """Get the gas price for one answer, moving it if volatility is set."""
+        if self.price_volatility:
+            self.gas_price_wei = max(1, int(self.gas_price_wei * math.exp(
+                self._random.gauss(0.0, self.price_volatility)
+            )))
+        return self.gas_price_wei
+
+    async def _handle_rpc(self, request: web.Request) -> web.Response:
+        self.request_count += 1
+        await self._delay(self.profile)
+        error = self._draw_error(self.profile)
+        if error == "http":
+            return web.Response(status=503, text="Service Unavailable")
+
+        payload = await request.json()
+        if isinstance(payload, list):
+            return web.json_response([self._answer(call, error) for call in payload])
+        return web.json_response(self._answer(payload, error))
+
+    def _answer(self, call: Dict[str, Any], error: Optional[str] = None) -> Dict[str, Any]:
+        method = call.get("method")
+        if error is not None:
+            return {
+                "jsonrpc": "2.0",
+                "id": call.get("id"),
+                "error": {"code": -32005, "message": "Request rate exceeded"},
+            }
+        if method == "eth_gasPrice":
+            return {"jsonrpc": "2.0", "id": call.get("id"), "result": hex(self._next_gas_price())}
+        return {
+            "jsonrpc": "2.0",
+            "id": call.get("id"),
+            "error": {"code": -32601, "message": f"Method {method} not supported"},
+        }
+
+    async def _handle_gas_oracle(self, request: web.Request) -> web.Response:
+        self.etherscan_request_count += 1
+        await self._delay(self.etherscan_profile)
+        error = self._draw_error(self.etherscan_profile)
+        if error == "http":
+            return web.Response(status=503, text="Service Unavailable")
+        if error is not None:
+            return web.json_response({"status": "0", "message": "NOTOK", "result": "Max rate limit reached"})
+
+        gwei = self._next_gas_price() / 1e9
+        return web.json_response({
+            "status": "1",
+            "message": "OK",
+            "result": {
+                "SafeGasPrice": f"{gwei * 0.9:.2f}",
+                "ProposeGasPrice": f"{gwei:.2f}",
+                "FastGasPrice": f"{gwei * 1.1:.2f}",
+            },
+        })
@@ -0,0 +1,8 @@
+"""Entry point of the gas monitoring daemon: ``python -m src.gas_optimization``."""
+
+import sys
+
+from .daemon import main
+
+
+sys.exit(main())
@@ -0,0 +1,402 @@
+"""
+Gas Candles Module
+
+This module downsamples gas price readings into OHLC candles at several
+resolutions (by default 1 minute, 5 minutes, 1 hour and 1 day), updated
+incrementally as readings arrive. Each resolution keeps a bounded number of
+candles, so weeks or years of history fit in a few hundred kilobytes while
+the raw history only covers the last ``history_size`` readings.
+"""
+
+from dataclasses import dataclass
+from typing import Dict, Iterable, Optional, Tuple
+
+import numpy as np
+
+
+# (resolution in seconds, candles kept): a day of minutes, a week of
+# 5-minute candles, 90 days of hours and 10 years of days
+DEFAULT_RESOLUTIONS: Tuple[Tuple[int, int], ...] = (
+    (60, 1440),
+    (300, 2016),
+    (3600, 2160),
+    (86400, 3650),
+)
+
+
+@dataclass(frozen=True)
+class Candles:
+    """
+    OHLC candles of one resolution, oldest first.
+
+    Buckets without readings are omitted, so consecutive candles may be more
+    than one resolution apart. The last candle may still be open.
+
+    Attributes:
+        resolution: Candle length in seconds
+        start_ns: Bucket start times in epoch nanoseconds (int64)
+        open: First gas price of each bucket in Gwei
+        high: Highest gas price of each bucket in Gwei
+        low: Lowest gas price of each bucket in Gwei
+        close: Last gas price of each bucket in Gwei
+        mean: Mean gas price of each bucket in Gwei
+        volume: Number of readings in each bucket (int64)
+    """
+
+    resolution: int
+    start_ns: np.ndarray
+    open: np.ndarray
+    high: np.ndarray
+    low: np.ndarray
+    close: np.ndarray
+    mean: np.ndarray
+    volume: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.start_ns)
+
+
+class CandleSeries:
+    """
+    Bounded series of candles at a single resolution.
+
+    Closed candles live in columnar ring buffers mirrored like ``GasHistory``,
+    so the retained candles are always one contiguous slice. The open candle
+    is kept in scalars and updated in O(1) per reading. Readings older than
+    the open candle are dropped and counted in ``late``.
+
+    Attributes:
+        resolution: Candle length in seconds
+        capacity: Maximum number of closed candles kept
+        late: Number of readings dropped for arriving after their bucket closed
+    """
+
+    _FLOAT_COLUMNS = ("open", "high", "low", "close", "sum")
+
+    def __init__(self, resolution: int, capacity: int):
+        """
+        Initialize an empty series.
+
+        Args:
+            resolution: Candle length in seconds
+            capacity: Maximum number of closed candles kept
+
+        Raises:
+            ValueError: If resolution or capacity is not positive
+        """
+        if resolution <= 0 or capacity <= 0:
+            raise ValueError("resolution and capacity must be positive")
+
+        self.resolution = resolution
+        self.capacity = capacity
+        self.late = 0
+        self._resolution_ns = resolution * 1_000_000_000
+        self._start_ns = np.zeros(2 * capacity, dtype=np.int64)
+        self._volume = np.zeros(2 * capacity, dtype=np.int64)
+        self._columns = {name: np.zeros(2 * capacity, dtype=np.float64) for name in self._FLOAT_COLUMNS}
+        self._total = 0
+
+        # Open candle
+        self._bucket: Optional[int] = None
+        self._open = self._high = self._low = self._close = self._sum = 0.0
+        self._count = 0
+
+    def __len__(self) -> int:
+        """Number of candles, including the open one."""
+        return min(self._total, self.capacity) + (self._bucket is not None)
+
+    @property
+    def oldest_ns(self) -> Optional[int]:
+        """Start of the oldest retained candle, or None if empty."""
+        if self._total:
+            return int(self._start_ns[self._window().start])
+        if self._bucket is not None:
+            return self._bucket * self._resolution_ns
+        return None
+
+    def covers(self, start_ns: int) -> bool:
+        """
+        Check whether the series holds every candle from ``start_ns`` on.
+
+        Args:
+            start_ns: Epoch nanoseconds
+
+        Returns:
+            bool: True if no candle at or after ``start_ns`` has been evicted
+        """
+        if self._total <= self.capacity:
+            return True
+        return self.oldest_ns <= start_ns
+
+    def update(self, timestamp_ns: int, price_gwei: float) -> None:
+        """
+        Add a reading to its candle.
+
+        Args:
+            timestamp_ns: Reading time in epoch nanoseconds
+            price_gwei: Gas price in Gwei
+        """
+        bucket = timestamp_ns // self._resolution_ns
+        if bucket == self._bucket:
+            if price_gwei > self._high:
+                self._high = price_gwei
+            if price_gwei < self._low:
+                self._low = price_gwei
+            self._close = price_gwei
+            self._sum += price_gwei
+            self._count += 1
+            return
+
+        if self._bucket is not None:
+            if bucket < self._bucket:
+                self.late += 1
+                return
+            self._close_open_candle()
+
+        self._bucket = bucket
+        self._open = self._high = self._low = self._close = self._sum = price_gwei
+        self._count = 1
+
+    def extend(self, timestamps_ns: np.ndarray, prices_gwei: np.ndarray) -> None:
+        """
+        Add many readings, aggregating whole buckets with vectorized reductions.
+
+        Args:
+            timestamps_ns: Reading times in epoch nanoseconds, non-decreasing
+            prices_gwei: Gas prices in Gwei, same length as ``timestamps_ns``
+        """
+        timestamps_ns = np.asarray(timestamps_ns, dtype=np.int64)
+        prices_gwei = np.asarray(prices_gwei, dtype=np.float64)
+        buckets = timestamps_ns // self._resolution_ns
+        if self._bucket is not None:
+            keep = buckets >= self._bucket
+            self.late += int(len(buckets) - np.count_nonzero(keep))
+            buckets, prices_gwei = buckets[keep], prices_gwei[keep]
+        if not len(buckets):
+            return
+
+        starts = np.flatnonzero(np.diff(buckets)) + 1
+        starts = np.concatenate(([0], starts))
+        ends = np.concatenate((starts[1:], [len(buckets)]))
+        group_buckets = buckets[starts]
+        groups = {
+            "open": prices_gwei[starts],
+            "high": np.maximum.reduceat(prices_gwei, starts),
+            "low": np.minimum.reduceat(prices_gwei, starts),
+            "close": prices_gwei[ends - 1],
+            "sum": np.add.reduceat(prices_gwei, starts),
+        }
+        volumes = ends - starts
+
+        # The first group may continue the open candle
+        if group_buckets[0] == self._bucket:
+            groups["open"][0] = self._open
+            groups["high"][0] = max(groups["high"][0], self._high)
+            groups["low"][0] = min(groups["low"][0], self._low)
+            groups["sum"][0] += self._sum
+            volumes[0] += self._count
+        elif self._bucket is not None:
+            self._close_open_candle()
+
+        # Every group but the last is closed
+        self._push(
+            group_buckets[:-1] * self._resolution_ns,
+            volumes[:-1],
+            **{name: values[:-1] for name, values in groups.items()},
+        )
+        self._bucket = int(group_buckets[-1])
+        self._open, self._high, self._low, self._close, self._sum = (
+            float(groups[name][-1]) for name in self._FLOAT_COLUMNS
+        )
+        self._count = int(volumes[-1])
+
+    def _close_open_candle(self) -> None:
+        """Move the open candle into the ring buffers."""
+        slot = self._total % self.capacity
+        columns = self._columns
+        for index in (slot, slot + self.capacity):
+            self._start_ns[index] = self._bucket * self._resolution_ns
+            self._volume[index] = self._count
+            columns["open"][index] = self._open
+            columns["high"][index] = self._high
+            columns["low"][index] = self._low
+            columns["close"][index] = self._close
+            columns["sum"][index] = self._sum
+        self._total += 1
+
+    def _push(self, start_ns: np.ndarray, volume: np.ndarray, **columns: np.ndarray) -> None:
+        """Append closed candles to the ring buffers."""
+        start_ns, volume = start_ns[-self.capacity:], volume[-self.capacity:]
+        count = len(start_ns)
+        if not count:
+            return
+
+        slots = (self._total + np.arange(count)) % self.capacity
+        for offset in (0, self.capacity):
+            self._start_ns[slots + offset] = start_ns
+            self._volume[slots + offset] = volume
+            for name, values in columns.items():
+                self._columns[name][slots + offset] = values[-self.capacity:]
+        self._total += count
+
+    def _window(self) -> slice:
+        """Slice of the mirrored buffers holding the closed candles."""
+        count = min(self._total, self.capacity)
+        end = self._total % self.capacity + self.capacity
+        return slice(end - count, end)
+
+    def candles(self, start_ns: Optional[int] = None, end_ns: Optional[int] = None) -> Candles:
+        """
+        Get the candles overlapping a time range.
+
+        Args:
+            start_ns: Optional inclusive start in epoch nanoseconds
+            end_ns: Optional exclusive end in epoch nanoseconds
+
+        Returns:
+            Candles: Copied candles, including the open one if it overlaps
+        """
+        window = self._window()
+        starts = self._start_ns[window]
+        lo = 0 if start_ns is None else int(
+            np.searchsorted(starts, start_ns - self._resolution_ns, side="right")
+        )
+        hi = len(starts) if end_ns is None else int(np.searchsorted(starts, end_ns, side="left"))
+        hi = max(lo, hi)
+        closed = slice(window.start + lo, window.start + hi)
+
+        columns = {name: self._columns[name][closed] for name in self._FLOAT_COLUMNS}
+        start_column, volume = self._start_ns[closed], self._volume[closed]
+
+        if self._bucket is not None:
+            open_start = self._bucket * self._resolution_ns
+            if (start_ns is None or open_start + self._resolution_ns > start_ns) and (
+                end_ns is None or open_start < end_ns
+            ):
+                current = {
+                    "open": self._open, "high": self._high, "low": self._low,
+                    "close": self._close, "sum": self._sum,
+                }
+                columns = {name: np.append(values, current[name]) for name, values in columns.items()}
+                start_column = np.append(start_column, open_start)
+                volume = np.append(volume, self._count)
+
+        return Candles(
+            resolution=self.resolution,
+            start_ns=np.array(start_column, dtype=np.int64),
+            open=np.array(columns["open"]),
+            high=np.array(columns["high"]),
+            low=np.array(columns["low"]),
+            close=np.array(columns["close"]),
+            mean=columns["sum"] / np.maximum(volume, 1),
+            volume=np.array(volume, dtype=np.int64),
+        )
+
+
+class CandleRollup:
+    """
+    Candle series at several resolutions, fed from the same readings.
+
+    Every reading updates the open candle of each resolution in O(1), so
+    the cost per reading is a handful of comparisons per resolution.
+
+    Attributes:
+        series: Candle series keyed by resolution in seconds, finest first
+    """
+
+    def __init__(self, resolutions: Iterable[Tuple[int, int]] = DEFAULT_RESOLUTIONS):
+        """
+        Initialize empty series.
+
+        Args:
+            resolutions: (resolution in seconds, candles kept) pairs
+                (default: ``DEFAULT_RESOLUTIONS``)
+
+        Raises:
+            ValueError: If no resolution is given or one is invalid
+        """
+        self.series: Dict[int, CandleSeries] = {
+            resolution: CandleSeries(resolution, capacity)
+            for resolution, capacity in sorted(resolutions)
+        }
+        if not self.series:
+            raise ValueError("At least one resolution is required")
+
+    def update(self, timestamp_ns: int, price_wei: int) -> None:
+        """
+        Add a reading to every resolution.
+
+        Args:
+            timestamp_ns: Reading time in epoch nanoseconds
+            price_wei: Gas price in Wei
+        """
+        price_gwei = price_wei / 1e9
+        for series in self.series.values():
+            series.update(timestamp_ns, price_gwei)
+
+    def extend_ns(self, timestamps_ns: np.ndarray, prices_wei: np.ndarray) -> None:
+        """
+        Add many readings, for example a whole persisted time series.
+
+        Args:
+            timestamps_ns: Reading times in epoch nanoseconds, non-decreasing
+            prices_wei: Gas prices in Wei, same length as ``timestamps_ns``
+        """
+        prices_gwei = np.asarray(prices_wei, dtype=np.float64) / 1e9
+        for series in self.series.values():
+            series.extend(timestamps_ns, prices_gwei)
+
+    def select_resolution(
+        self,
+        start_ns: int,
+        end_ns: int,
+        points: Optional[int] = None
+    ) -> int:
+        """
+        Pick the coarsest resolution that covers a range with enough points.
+
+        Resolutions that have evicted candles after ``start_ns`` do not cover
+        the range. Among those that do, the coarsest one that still yields at
+        least ``points`` buckets over the range is chosen; if none is fine
+        enough, the finest covering one is. If no resolution covers the
+        range, the coarsest one, which reaches back furthest, is used.
+
+        Args:
+            start_ns: Inclusive start in epoch nanoseconds
+            end_ns: Exclusive end in epoch nanoseconds
+            points: Minimum number of buckets wanted; None picks the finest
+                covering resolution
+
+        Returns:
+            int: Resolution in seconds
+        """
+        covering = [resolution for resolution, series in self.series.items() if series.covers(start_ns)]
+        if not covering:
+            return max(self.series)
+        if points is None or points <= 0:
+            return covering[0]
+
+        step_seconds = (end_ns - start_ns) / 1e9 / points
+        fine_enough = [resolution for resolution in covering if resolution <= step_seconds]
+        return fine_enough[-1] if fine_enough else covering[0]
+
+    def query(
+        self,
+        start_ns: int,
+        end_ns: int,
+        points: Optional[int] = None
+    ) -> Candles:
+        """
+        Get candles over a range at the resolution picked by ``select_resolution``.
+
+        Args:
+            start_ns: Inclusive start in epoch nanoseconds
+            end_ns: Exclusive end in epoch nanoseconds
+            points: Minimum number of buckets wanted, or None for the finest
+                covering resolution
+
+        Returns:
+            Candles: Candles overlapping the range
+        """
+        resolution = self.select_resolution(start_ns, end_ns, points)
+        return self.series[resolution].candles(start_ns, end_ns)
@@ -0,0 +1,160 @@
+"""
+Clock Module
+
+This module abstracts the time source used by GasMonitor, so the same
+monitoring logic can run on wall-clock time or on a virtual clock during
+replays and backtests.
+"""
+
+import asyncio
+import heapq
+import itertools
+import time
+from typing import List, Optional, Tuple
+
+
+class SystemClock:
+    """Wall-clock time and real asyncio sleeps."""
+
+    def time_ns(self) -> int:
+        """
+        Get the current time.
+
+        Returns:
+            int: Epoch time in nanoseconds
+        """
+        return time.time_ns()
+
+    def monotonic_ns(self) -> int:
+        """
+        Get a time that never jumps, for scheduling deadlines.
+
+        Returns:
+            int: Monotonic time in nanoseconds
+        """
+        return time.monotonic_ns()
+
+    async def sleep(self, seconds: float) -> None:
+        """
+        Sleep on the event loop.
+
+        Args:
+            seconds: Duration in seconds
+        """
+        await asyncio.sleep(seconds)
+
+
+class VirtualClock:
+    """
+    Manually driven clock for deterministic replays.
+
+    Time moves when it is set or advanced, or when every task is waiting on
+    ``sleep``. Each sleeper is parked on a heap under its deadline; once the
+    event loop has no other work, the clock jumps to the earliest deadline,
+    never past it, and wakes the sleepers due by then. Overlapping sleeps
+    therefore share the timeline instead of adding up, and a sleep wakes at
+    its deadline even if the clock was advanced while it waited. A loop
+    that sleeps between updates runs as fast as the CPU allows.
+
+    A task that never waits, such as one polling with ``asyncio.sleep(0)``,
+    keeps the loop busy; the clock then moves on after ``MAX_IDLE_YIELDS``
+    loop iterations.
+
+    Attributes:
+        now_ns: Current virtual time in epoch nanoseconds
+    """
+
+    # Loop iterations to wait for the loop to go idle before moving on
+    MAX_IDLE_YIELDS = 100
+
+    def __init__(self, start_ns: int = 0):
+        """
+        Initialize the clock.
+
+        Args:
+            start_ns: Initial virtual time in epoch nanoseconds (default: 0)
+        """
+        self.now_ns = start_ns
+        self._sleepers: List[Tuple[int, int, asyncio.Future]] = []
+        self._sequence = itertools.count()
+        self._driver: Optional[asyncio.Task] = None
+
+    def time_ns(self) -> int:
+        """
+        Get the current virtual time.
+
+        Returns:
+            int: Virtual epoch time in nanoseconds
+        """
+        return self.now_ns
+
+    def monotonic_ns(self) -> int:
+        """
+        Get the current virtual time for scheduling deadlines.
+
+        Returns:
+            int: Virtual time in nanoseconds
+        """
+        return self.now_ns
+
+    def set_time_ns(self, timestamp_ns: int) -> None:
+        """
+        Move the clock to a time, never backwards.
+
+        Args:
+            timestamp_ns: Target virtual time in epoch nanoseconds
+        """
+        if timestamp_ns > self.now_ns:
+            self.now_ns = timestamp_ns
+            self._wake_due()
+
+    def advance(self, seconds: float) -> None:
+        """
+        Move the clock forward.
+
+        Args:
+            seconds: Duration in seconds
+        """
+        self.now_ns += int(seconds * 1e9)
+        self._wake_due()
+
+    async def sleep(self, seconds: float) -> None:
+        """
+        Wait until the virtual time reaches now plus a duration.
+
+        Args:
+            seconds: Duration in seconds
+        """
+        loop = asyncio.get_running_loop()
+        deadline = self.now_ns + max(int(seconds * 1e9), 0)
+        future = loop.create_future()
+        heapq.heappush(self._sleepers, (deadline, next(self._sequence), future))
+        if self._driver is None or self._driver.done():
+            self._driver = loop.create_task(self._run_timers())
+        await future
+
+    def _wake_due(self) -> None:
+        """Wake the sleepers whose deadline has been reached."""
+        sleepers = self._sleepers
+        while sleepers and (sleepers[0][0] <= self.now_ns or sleepers[0][2].done()):
+            future = heapq.heappop(sleepers)[2]
+            if not future.done():
+                future.set_result(None)
+
+    async def _run_timers(self) -> None:
+        """Jump to the earliest deadline whenever the loop goes idle."""
+        loop = asyncio.get_running_loop()
+        sleepers = self._sleepers
+        while True:
+            for _ in range(self.MAX_IDLE_YIELDS):
+                await asyncio.sleep(0)
+                # Only this task is scheduled: everything else is waiting
+                if not getattr(loop, "_ready", None):
+                    break
+
+            while sleepers and sleepers[0][2].done():
+                heapq.heappop(sleepers)
+            if not sleepers:
+                return
+            self.now_ns = max(self.now_ns, sleepers[0][0])
+            self._wake_due()
@@ -0,0 +1,163 @@
+"""
+Gas Price Consensus Module
+
+This module combines the gas prices reported by several sources into one
+robust reading: a weighted median, after rejecting answers that lie too
+many median absolute deviations (MADs) away from the others, so that one
+misbehaving RPC provider cannot move the recorded price.
+"""
+
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, Mapping, Optional, Tuple
+
+import numpy as np
+
+
+# Scale factor making the MAD a consistent estimator of a normal standard deviation
+MAD_SCALE = 1.4826
+
+
+def weighted_median(values: np.ndarray, weights: np.ndarray) -> float:
+    """
+    Get the weighted median of values.
+
+    When the cumulative weight reaches exactly half at a value, the median is
+    the midpoint between it and the next value, matching the unweighted
+    median for equal weights.
+
+    Args:
+        values: Values, shape (n,), n >= 1
+        weights: Positive weights, shape (n,)
+
+    Returns:
+        float: Weighted median
+    """
+    order = np.argsort(values, kind="stable")
+    values = np.asarray(values, dtype=np.float64)[order]
+    cumulative = np.cumsum(np.asarray(weights, dtype=np.float64)[order])
+    half = cumulative[-1] / 2
+    index = int(np.searchsorted(cumulative, half))
+    if np.isclose(cumulative[index], half) and index + 1 < len(values):
+        return float((values[index] + values[index + 1]) / 2)
+    return float(values[index])
+
+
+@dataclass(frozen=True)
+class ConsensusResult:
+    """
+    Outcome of one consensus round.
+
+    Attributes:
+        gas_price: Weighted median of the inlier answers in Wei
+        answers: Valid answer of each responding source in Wei
+        inliers: Sources whose answers were used
+        outliers: Sources whose answers were rejected
+        missing: Sources that failed or had not answered by the deadline
+        contributions: Share of the total inlier weight per inlier source
+        median: Weighted median of all answers before rejection, in Wei
+        mad: Weighted median absolute deviation of all answers, in Wei
+        quorum_met: True if at least the required number of sources answered
+        staleness: Seconds since each source's last valid answer (0 for
+            this round's answers), or None if it never answered
+    """
+
+    gas_price: int
+    answers: Dict[str, int]
+    inliers: Tuple[str, ...]
+    outliers: Tuple[str, ...]
+    missing: Tuple[str, ...]
+    contributions: Dict[str, float]
+    median: float
+    mad: float
+    quorum_met: bool
+    staleness: Dict[str, Optional[float]] = field(default_factory=dict)
+
+
+class GasPriceConsensus:
+    """
+    Weighted-median consensus with MAD-based outlier rejection.
+
+    An answer is rejected if it lies more than ``mad_threshold`` scaled MADs
+    from the weighted median of all answers. When most answers agree exactly
+    the MAD is zero, so the tolerance never drops below ``min_spread`` times
+    the median. With fewer than three answers nothing can be rejected.
+
+    Attributes:
+        mad_threshold: Scaled MADs an answer may deviate before rejection
+        min_spread: Smallest tolerance, as a fraction of the median
+        quorum: Number of answers a round needs to count as a full consensus
+    """
+
+    def __init__(self, mad_threshold: float = 3.0, min_spread: float = 0.02, quorum: int = 2):
+        """
+        Initialize the consensus rule.
+
+        Args:
+            mad_threshold: Scaled MADs an answer may deviate (default: 3.0)
+            min_spread: Smallest rejection tolerance relative to the median
+                (default: 0.02)
+            quorum: Answers needed for a full consensus (default: 2)
+
+        Raises:
+            ValueError: If a parameter is not positive
+        """
+        if mad_threshold <= 0 or min_spread <= 0 or quorum <= 0:
+            raise ValueError("mad_threshold, min_spread and quorum must be positive")
+
+        self.mad_threshold = mad_threshold
+        self.min_spread = min_spread
+        self.quorum = quorum
+
+    def combine(
+        self,
+        answers: Mapping[str, int],
+        weights: Optional[Mapping[str, float]] = None,
+        missing: Iterable[str] = (),
+        staleness: Optional[Mapping[str, Optional[float]]] = None
+    ) -> Optional[ConsensusResult]:
+        """
+        Combine the answers of one round.
+
+        Nothing is logged here: rejected sources are listed in the result's
+        ``outliers``, and callers report them at their own rate.
+
+        Args:
+            answers: Valid gas price in Wei per responding source
+            weights: Optional weight per source (default: 1.0 each)
+            missing: Sources that did not answer
+            staleness: Optional seconds since each source's last valid answer
+
+        Returns:
+            Optional[ConsensusResult]: Consensus, or None if there are no answers
+        """
+        if not answers:
+            return None
+
+        names = list(answers)
+        values = np.array([answers[name] for name in names], dtype=np.float64)
+        weight_of = weights or {}
+        weights_array = np.array([max(float(weight_of.get(name, 1.0)), 1e-9) for name in names])
+
+        median = weighted_median(values, weights_array)
+        deviations = np.abs(values - median)
+        mad = weighted_median(deviations, weights_array)
+        tolerance = max(self.mad_threshold * MAD_SCALE * mad, self.min_spread * median)
+
+        keep = deviations <= tolerance if len(values) >= 3 else np.ones(len(values), dtype=bool)
+        inliers = tuple(name for name, kept in zip(names, keep) if kept)
+        outliers = tuple(name for name, kept in zip(names, keep) if not kept)
+        inlier_weights = weights_array[keep]
+        gas_price = weighted_median(values[keep], inlier_weights)
+
+        return ConsensusResult(
+            gas_price=int(round(gas_price)),
+            answers=dict(answers),
+            inliers=inliers,
+            outliers=outliers,
+            missing=tuple(missing),
+            contributions=dict(zip(inliers, (inlier_weights / inlier_weights.sum()).tolist())),
+            median=median,
+            mad=mad,
+            quorum_met=len(answers) >= self.quorum,
+            staleness=dict(staleness or {}),
+        )
@@ -0,0 +1,204 @@
+"""
+Cost Estimate Module
+
+This module prices whole batches of candidate transactions at once: given
+an array of gas limits and per-gas prices for now and for the forecast
+horizon, it returns NumPy arrays of costs in Wei and in native units (ETH),
+so a planner can screen thousands of opportunities in one vectorized call.
+"""
+
+from dataclasses import dataclass
+from typing import Optional, Union
+
+import numpy as np
+
+
+WEI_PER_NATIVE = 1e18
+
+# Price quantile used for each named urgency level
+URGENCY_LEVELS = {
+    "low": 0.25,
+    "standard": 0.5,
+    "high": 0.75,
+    "urgent": 0.95,
+}
+
+
+def urgency_quantile(urgency: Union[str, float]) -> float:
+    """
+    Resolve an urgency level to a price quantile.
+
+    Args:
+        urgency: One of ``URGENCY_LEVELS`` or a quantile strictly between
+            0 and 1
+
+    Returns:
+        float: Price quantile
+
+    Raises:
+        ValueError: If the level is unknown or the quantile is out of range
+    """
+    if isinstance(urgency, str):
+        try:
+            return URGENCY_LEVELS[urgency]
+        except KeyError:
+            raise ValueError(
+                f"Unknown urgency {urgency!r}; expected one of {tuple(URGENCY_LEVELS)} "
+                f"or a quantile between 0 and 1"
+            ) from None
+    if not 0 < urgency < 1:
+        raise ValueError("urgency quantile must be between 0 and 1")
+    return float(urgency)
+
+
+@dataclass(frozen=True)
+class CostEstimate:
+    """
+    Costs of a batch of transactions now and over the forecast horizon.
+
+    All prices are expected effective per-gas prices (base fee plus
+    priority fee), not fee caps, so current and forecast costs compare
+    like with like.
+
+    Costs are float64 because ``gas * price`` can exceed the int64 range.
+    Their relative precision of about 1e-16 is far below the uncertainty of
+    any gas price.
+
+    Attributes:
+        gas_units: Gas limit of each transaction, shape (n,)
+        urgency: Price quantile the estimate was made at
+        gas_price_wei: Per-gas price used for the current costs, in Wei
+        cost_wei: Cost of each transaction at the current price, shape (n,)
+        forecast_gas_price_wei: Per-gas price at each forecast step in Wei,
+            shape (steps,), or None without a forecast
+        forecast_cost_wei: Cost of each transaction at each forecast step,
+            shape (n, steps), or None without a forecast
+        reference_gas_price_wei: Per-gas price from the same series as the
+            forecast that forecast prices are compared against, in Wei, or
+            None to compare against ``gas_price_wei``
+    """
+
+    gas_units: np.ndarray
+    urgency: float
+    gas_price_wei: int
+    cost_wei: np.ndarray
+    forecast_gas_price_wei: Optional[np.ndarray] = None
+    forecast_cost_wei: Optional[np.ndarray] = None
+    reference_gas_price_wei: Optional[int] = None
+
+    @classmethod
+    def from_prices(
+        cls,
+        gas_units: np.ndarray,
+        urgency: float,
+        gas_price_wei: int,
+        forecast_gas_price_wei: Optional[np.ndarray] = None,
+        reference_gas_price_wei: Optional[int] = None
+    ) -> "CostEstimate":
+        """
+        Price a batch of gas limits with one broadcast per horizon.
+
+        Args:
+            gas_units: Gas limits, any array-like of shape (n,)
+            urgency: Price quantile the prices correspond to
+            gas_price_wei: Current per-gas price in Wei
+            forecast_gas_price_wei: Optional per-gas price per forecast step
+            reference_gas_price_wei: Optional current price from the same
+                series as the forecast, used to decide whether waiting pays
+
+        Returns:
+            CostEstimate: Costs for every transaction
+
+        Raises:
+            ValueError: If any gas limit is negative
+        """
+        gas_units = np.asarray(gas_units, dtype=np.float64).ravel()
+        if len(gas_units) and gas_units.min() < 0:
+            raise ValueError("gas_units must not be negative")
+
+        forecast_cost = None
+        if forecast_gas_price_wei is not None:
+            forecast_gas_price_wei = np.asarray(forecast_gas_price_wei, dtype=np.float64)
+            forecast_cost = np.multiply.outer(gas_units, forecast_gas_price_wei)
+
+        return cls(
+            gas_units=gas_units,
+            urgency=urgency,
+            gas_price_wei=gas_price_wei,
+            cost_wei=gas_units * float(gas_price_wei),
+            forecast_gas_price_wei=forecast_gas_price_wei,
+            forecast_cost_wei=forecast_cost,
+            reference_gas_price_wei=reference_gas_price_wei,
+        )
+
+    def __len__(self) -> int:
+        return len(self.gas_units)
+
+    @property
+    def cost_native(self) -> np.ndarray:
+        """Cost of each transaction at the current price, in ETH."""
+        return self.cost_wei / WEI_PER_NATIVE
+
+    @property
+    def forecast_cost_native(self) -> Optional[np.ndarray]:
+        """Cost of each transaction at each forecast step in ETH, or None."""
+        if self.forecast_cost_wei is None:
+            return None
+        return self.forecast_cost_wei / WEI_PER_NATIVE
+
+    @property
+    def _reference_price(self) -> int:
+        """Current price that forecast prices are compared against, in Wei."""
+        if self.reference_gas_price_wei is None:
+            return self.gas_price_wei
+        return self.reference_gas_price_wei
+
+    @property
+    def best_step(self) -> Optional[int]:
+        """
+        Forecast step with the lowest price (1-based), or 0 if sending now is
+        cheapest; None without a forecast.
+
+        The forecast is compared against ``reference_gas_price_wei`` when
+        set, so that both sides come from the same price series.
+        """
+        if self.forecast_gas_price_wei is None or not len(self.forecast_gas_price_wei):
+            return None
+        step = int(np.argmin(self.forecast_gas_price_wei))
+        return step + 1 if self.forecast_gas_price_wei[step] < self._reference_price else 0
+
+    @property
+    def savings_wei(self) -> np.ndarray:
+        """
+        Cost saved per transaction by waiting for the cheapest forecast step,
+        in Wei; zeros without a forecast.
+        """
+        step = self.best_step
+        if not step:
+            return np.zeros_like(self.cost_wei)
+        return self.gas_units * (float(self._reference_price) - self.forecast_gas_price_wei[step - 1])
+
+    def within_budget(self, budget_wei: Union[float, np.ndarray]) -> np.ndarray:
+        """
+        Check which transactions cost at most a budget at the current price.
+
+        Args:
+            budget_wei: Budget in Wei, a scalar or one per transaction
+
+        Returns:
+            np.ndarray: Boolean mask, shape (n,)
+        """
+        return self.cost_wei <= budget_wei
+
+    def net_value_wei(self, value_wei: Union[float, np.ndarray]) -> np.ndarray:
+        """
+        Subtract the current cost from each transaction's expected value.
+
+        Args:
+            value_wei: Expected value of each transaction in Wei, a scalar or
+                one per transaction
+
+        Returns:
+            np.ndarray: Value minus cost in Wei, shape (n,)
+        """
+        return np.asarray(value_wei, dtype=np.float64) - self.cost_wei
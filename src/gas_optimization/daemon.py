@@ -0,0 +1,575 @@
+"""
+Gas Monitoring Daemon Module
+
+This module runs configured gas monitors as a long-lived process and serves
+their current, rolling and forecast gas prices as JSON over local HTTP or a
+Unix-domain socket, so services in any language can share one poller.
+Responses are built from in-memory state only and cached until the next
+reading, so a query never waits on an RPC call.
+
+Run it with ``python -m src.gas_optimization``.
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import signal
+import stat
+from dataclasses import dataclass, field
+from typing import Any, Dict, Hashable, List, Optional, Sequence, Tuple
+
+from aiohttp import web
+from web3 import AsyncHTTPProvider
+
+from .gas_monitor import GasMonitor
+from .pool import GasMonitorPool
+
+
+# Configure module logger
+logger = logging.getLogger(__name__)
+
+JSON_CONTENT_TYPE = "application/json"
+
+# Default port of the local query API
+DEFAULT_PORT = 8547
+
+# Longest forecast a query may request
+MAX_FORECAST_STEPS = 100
+
+
+def gas_summary(monitor: GasMonitor) -> Dict[str, Any]:
+    """
+    Summarize a monitor's current and rolling gas prices.
+
+    Args:
+        monitor: Monitor to summarize
+
+    Returns:
+        Dict[str, Any]: JSON-serializable summary; prices are in Wei and
+            are None until the first reading
+    """
+    history = monitor.gas_history
+    stats = history.stats
+    has_data = bool(history)
+    return {
+        "gas_price_wei": history.last_price_wei() if has_data else None,
+        "gas_price_gwei": monitor.get_current_price_gwei(),
+        "timestamp_ns": int(history.timestamps_ns(1)[0]) if has_data else None,
+        "readings": len(history),
+        "rolling": {
+            "mean_wei": monitor.get_average_gas_price(),
+            "median_wei": monitor.get_median_gas_price(),
+            "p25_wei": monitor.get_gas_price_percentile(25),
+            "p75_wei": monitor.get_gas_price_percentile(75),
+            "min_wei": monitor.get_min_gas_price(),
+            "max_wei": monitor.get_max_gas_price(),
+            "volatility_wei": monitor.get_gas_price_volatility(),
+            "ema_wei": {
+                str(half_life): monitor.get_ema_gas_price(half_life) for half_life in stats.ema_half_lives
+            },
+        },
+    }
+
+
+def forecast_summary(monitor: GasMonitor, steps: int) -> Optional[Dict[str, Any]]:
+    """
+    Summarize a monitor's gas price forecast.
+
+    Args:
+        monitor: Monitor to forecast with
+        steps: Number of readings ahead
+
+    Returns:
+        Optional[Dict[str, Any]]: JSON-serializable median and 10th/90th
+            percentile prices in Gwei per step, or None if there is not
+            enough history
+    """
+    forecast = monitor.forecast_gas_price(steps)
+    if forecast is None:
+        return None
+    return {
+        "steps": forecast.steps.tolist(),
+        "timestamps_ns": forecast.timestamps_ns.tolist(),
+        "median_gwei": forecast.median_gwei().tolist(),
+        "p10_gwei": forecast.quantile_gwei(0.1).tolist(),
+        "p90_gwei": forecast.quantile_gwei(0.9).tolist(),
+    }
+
+
+class GasQueryServer:
+    """
+    Local JSON API over the monitors of a pool.
+
+    Routes:
+        ``GET /health``: status and chain names
+        ``GET /gas``: summary of every chain
+        ``GET /gas/{chain}``: summary of one chain
+        ``GET /gas/{chain}/forecast?steps=N``: forecast of one chain
+
+    The same application is served on a TCP port, a Unix-domain socket or
+    both. Encoded responses are cached per chain and reused until the
+    chain's next reading.
+
+    Attributes:
+        pool: Pool whose monitors are served
+        host: Interface of the TCP listener (default: loopback only)
+        port: TCP port, None to skip TCP; 0 picks a free port, readable
+            after ``start``
+        socket_path: Optional path of the Unix-domain socket
+    """
+
+    def __init__(
+        self,
+        pool: GasMonitorPool,
+        host: str = "127.0.0.1",
+        port: Optional[int] = DEFAULT_PORT,
+        socket_path: Optional[str] = None
+    ):
+        """
+        Initialize the server.
+
+        Args:
+            pool: Pool whose monitors are served
+            host: Interface of the TCP listener (default: "127.0.0.1")
+            port: TCP port, or None for no TCP listener (default: 8547)
+            socket_path: Optional path of a Unix-domain socket to serve on
+
+        Raises:
+            ValueError: If neither a port nor a socket path is given
+        """
+        if port is None and socket_path is None:
+            raise ValueError("A port or a socket path is required")
+
+        self.pool = pool
+        self.host = host
+        self.port = port
+        self.socket_path = socket_path
+        self._runner: Optional[web.AppRunner] = None
+        self._cache: Dict[Tuple[Hashable, ...], Tuple[int, bytes]] = {}
+
+    @property
+    def url(self) -> Optional[str]:
+        """Base URL of the TCP listener, or None without one."""
+        return None if self.port is None else f"http://{self.host}:{self.port}"
+
+    async def start(self) -> None:
+        """
+        Start serving on the running event loop.
+
+        A stale socket file left at ``socket_path`` is replaced.
+
+        Raises:
+            RuntimeError: If the server is already running
+            OSError: If an address cannot be bound
+        """
+        if self._runner is not None:
+            raise RuntimeError("Query server is already running")
+
+        app = web.Application()
+        app.router.add_get("/health", self._handle_health)
+        app.router.add_get("/gas", self._handle_all)
+        app.router.add_get("/gas/{chain}", self._handle_chain)
+        app.router.add_get("/gas/{chain}/forecast", self._handle_forecast)
+        runner = web.AppRunner(app, access_log=None)
+        await runner.setup()
+        try:
+            if self.port is not None:
+                await web.TCPSite(runner, self.host, self.port).start()
+                self.port = runner.addresses[0][1]
+                logger.info(f"Serving gas queries at {self.url}")
+            if self.socket_path is not None:
+                self._remove_stale_socket()
+                await web.UnixSite(runner, self.socket_path).start()
+                logger.info(f"Serving gas queries on unix socket {self.socket_path}")
+        except BaseException:
+            await runner.cleanup()
+            raise
+        self._runner = runner
+
+    async def stop(self) -> None:
+        """Stop serving and remove the socket file; does nothing if not running."""
+        if self._runner is None:
+            return
+        runner, self._runner = self._runner, None
+        await runner.cleanup()
+        if self.socket_path is not None:
+            self._remove_stale_socket()
+
+    def _remove_stale_socket(self) -> None:
+        """Remove a socket file at ``socket_path``, leaving other files alone."""
+        try:
+            if stat.S_ISSOCK(os.stat(self.socket_path).st_mode):
+                os.unlink(self.socket_path)
+        except FileNotFoundError:
+            pass
+
+    def _find_chain(self, name: str) -> Optional[Hashable]:
+        """Resolve a chain name from a URL to its pool key."""
+        for chain_id in self.pool.chain_ids():
+            if str(chain_id) == name:
+                return chain_id
+        return None
+
+    def _cached_body(self, key: Tuple[Hashable, ...], monitor: GasMonitor, build) -> bytes:
+        """
+        Get an encoded response, rebuilding it only after a new reading.
+
+        Args:
+            key: Cache key of the response
+            monitor: Monitor the response is built from
+            build: Function returning the JSON-serializable response
+
+        Returns:
+            bytes: Encoded JSON body
+        """
+        version = monitor.gas_history.stats.total_pushed
+        cached = self._cache.get(key)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+        body = json.dumps(build()).encode()
+        self._cache[key] = (version, body)
+        return body
+
+    def _chain_body(self, chain_id: Hashable) -> bytes:
+        """Get the encoded summary of one chain."""
+        monitor = self.pool[chain_id]
+
+        def build() -> Dict[str, Any]:
+            summary = gas_summary(monitor)
+            summary["chain"] = str(chain_id)
+            summary["last_update_ns"] = self.pool.get_stats()[chain_id]["last_update_ns"]
+            return summary
+
+        return self._cached_body((chain_id, "summary"), monitor, build)
+
+    @staticmethod
+    def _json(body: bytes, status: int = 200) -> web.Response:
+        return web.Response(body=body, status=status, content_type=JSON_CONTENT_TYPE)
+
+    def _error(self, status: int, message: str) -> web.Response:
+        return self._json(json.dumps({"error": message}).encode(), status)
+
+    async def _handle_health(self, request: web.Request) -> web.Response:
+        """Report that the daemon is up and which chains it serves."""
+        chains = [str(chain_id) for chain_id in self.pool.chain_ids()]
+        return self._json(json.dumps({"status": "ok", "chains": chains}).encode())
+
+    async def _handle_all(self, request: web.Request) -> web.Response:
+        """Serve the summary of every chain."""
+        parts = [
+            json.dumps(str(chain_id)).encode() + b":" + self._chain_body(chain_id)
+            for chain_id in self.pool.chain_ids()
+        ]
+        return self._json(b"{" + b",".join(parts) + b"}")
+
+    async def _handle_chain(self, request: web.Request) -> web.Response:
+        """Serve the summary of one chain."""
+        chain_id = self._find_chain(request.match_info["chain"])
+        if chain_id is None:
+            return self._error(404, f"Unknown chain {request.match_info['chain']!r}")
+        return self._json(self._chain_body(chain_id))
+
+    async def _handle_forecast(self, request: web.Request) -> web.Response:
+        """Serve the forecast of one chain."""
+        chain_id = self._find_chain(request.match_info["chain"])
+        if chain_id is None:
+            return self._error(404, f"Unknown chain {request.match_info['chain']!r}")
+        try:
+            steps = int(request.query.get("steps", 5))
+        except ValueError:
+            return self._error(400, "steps must be an integer")
+        if not 1 <= steps <= MAX_FORECAST_STEPS:
+            return self._error(400, f"steps must be between 1 and {MAX_FORECAST_STEPS}")
+
+        monitor = self.pool[chain_id]
+        body = self._cached_body(
+            (chain_id, "forecast", steps), monitor, lambda: forecast_summary(monitor, steps)
+        )
+        if body == b"null":
+            return self._error(404, "Not enough history for a forecast")
+        return self._json(body)
+
+
+@dataclass
+class DaemonConfig:
+    """
+    Settings of the gas monitoring daemon.
+
+    Attributes:
+        monitors: GasMonitor settings by chain name. Each entry needs an
+            ``rpc_url``; ``consensus_providers`` may map names to URLs, and
+            all other keys are passed to ``GasMonitor``
+        host: Interface of the TCP listener
+        port: TCP port, or None for no TCP listener
+        socket_path: Optional path of a Unix-domain socket to serve on
+        use_uvloop: Run on uvloop; None uses it when it is installed
+    """
+
+    monitors: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    host: str = "127.0.0.1"
+    port: Optional[int] = DEFAULT_PORT
+    socket_path: Optional[str] = None
+    use_uvloop: Optional[bool] = None
+
+    @classmethod
+    def from_file(cls, path: str) -> "DaemonConfig":
+        """
+        Load settings from a JSON file.
+
+        The file holds an object with a ``monitors`` object and optionally
+        ``host``, ``port``, ``socket_path`` and ``use_uvloop``.
+
+        Args:
+            path: Path of the JSON file
+
+        Returns:
+            DaemonConfig: The loaded settings
+
+        Raises:
+            ValueError: If the file has unknown keys or no monitors
+        """
+        with open(path) as f:
+            data = json.load(f)
+
+        unknown = set(data) - {"monitors", "host", "port", "socket_path", "use_uvloop"}
+        if unknown:
+            raise ValueError(f"{path}: unknown settings {sorted(unknown)}")
+        if not data.get("monitors"):
+            raise ValueError(f"{path}: at least one monitor is required")
+        return cls(**data)
+
+
+def monitor_arguments(settings: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Turn one monitor's settings into ``GasMonitorPool.add_monitor`` arguments.
+
+    Args:
+        settings: Monitor settings with an ``rpc_url``
+
+    Returns:
+        Dict[str, Any]: Keyword arguments with async providers for every URL
+
+    Raises:
+        ValueError: If ``rpc_url`` is missing
+    """
+    arguments = dict(settings)
+    rpc_url = arguments.pop("rpc_url", None)
+    if not rpc_url:
+        raise ValueError("Every monitor needs an rpc_url")
+    arguments["web3"] = AsyncHTTPProvider(rpc_url)
+    if arguments.get("consensus_providers"):
+        arguments["consensus_providers"] = {
+            name: AsyncHTTPProvider(url) if isinstance(url, str) else url
+            for name, url in arguments["consensus_providers"].items()
+        }
+    return arguments
+
+
+class GasDaemon:
+    """
+    Long-running process refreshing configured monitors and serving queries.
+
+    Attributes:
+        config: Daemon settings
+        pool: Pool refreshing one monitor per configured chain
+        server: Query API over the pool
+    """
+
+    def __init__(self, config: DaemonConfig):
+        """
+        Initialize the daemon and create its monitors.
+
+        Args:
+            config: Daemon settings
+
+        Raises:
+            ValueError: If a monitor's settings are invalid
+        """
+        self.config = config
+        self.pool = GasMonitorPool()
+        for name, settings in config.monitors.items():
+            self.pool.add_monitor(name, **monitor_arguments(settings))
+        self.server = GasQueryServer(self.pool, config.host, config.port, config.socket_path)
+        self._stopped: Optional[asyncio.Event] = None
+
+    async def start(self) -> None:
+        """Start serving queries, then start refreshing the monitors."""
+        await self.server.start()
+        await self.pool.start()
+
+    async def aclose(self) -> None:
+        """Stop serving and close every monitor."""
+        await self.server.stop()
+        await self.pool.aclose()
+
+    def request_stop(self) -> None:
+        """Ask ``run`` to shut down; safe to call from a signal handler."""
+        if self._stopped is not None:
+            self._stopped.set()
+
+    async def run(self) -> None:
+        """
+        Run until SIGINT or SIGTERM, or until ``request_stop`` is called.
+        """
+        self._stopped = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        handled: List[int] = []
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            try:
+                loop.add_signal_handler(signum, self.request_stop)
+                handled.append(signum)
+            except (NotImplementedError, RuntimeError):
+                # Not available on this platform or outside the main thread
+                pass
+
+        try:
+            await self.start()
+            logger.info(f"Gas daemon running {len(self.pool)} monitor(s)")
+            await self._stopped.wait()
+        finally:
+            for signum in handled:
+                loop.remove_signal_handler(signum)
+            await self.aclose()
+            logger.info("Gas daemon stopped")
+
+
+def run_event_loop(main, use_uvloop: Optional[bool] = None):
+    """
+    Run a coroutine on a new event loop, uvloop if requested or available.
+
+    Args:
+        main: Coroutine to run
+        use_uvloop: True requires uvloop, False never uses it, None uses it
+            when it is installed
+
+    Returns:
+        The coroutine's result
+
+    Raises:
+        ImportError: If uvloop is required but not installed
+    """
+    loop_factory = None
+    if use_uvloop is not False:
+        try:
+            import uvloop
+        except ImportError as e:
+            if use_uvloop:
+                main.close()
+                raise ImportError("Running on uvloop requires uvloop (pip install uvloop)") from e
+        else:
+            loop_factory = uvloop.new_event_loop
+    logger.info(f"Using {'uvloop' if loop_factory else 'asyncio'} event loop")
+
+    with asyncio.Runner(loop_factory=loop_factory) as runner:
+        return runner.run(main)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Build the command line parser of the daemon."""
+    parser = argparse.ArgumentParser(
+        prog="python -m src.gas_optimization",
+        description="Run gas monitors and serve their prices over a local JSON API.",
+    )
+    parser.add_argument("--config", help="JSON settings file with one or more monitors")
+    parser.add_argument(
+        "--rpc-url", default=os.environ.get("WEB3_PROVIDER_URI"),
+        help="RPC endpoint of a single monitor when no --config is given (default: $WEB3_PROVIDER_URI)",
+    )
+    parser.add_argument("--chain", default="mainnet", help="Name of that monitor (default: mainnet)")
+    parser.add_argument(
+        "--update-interval", type=float, default=15,
+        help="Seconds between gas price updates of that monitor (default: 15)",
+    )
+    parser.add_argument(
+        "--fetch-mode", choices=GasMonitor.FETCH_MODES, default="sequential",
+        help="How that monitor consults its gas sources (default: sequential)",
+    )
+    parser.add_argument("--host", help="Interface of the HTTP listener (default: 127.0.0.1)")
+    parser.add_argument("--port", type=int, help=f"HTTP port; 0 picks a free one (default: {DEFAULT_PORT})")
+    parser.add_argument("--socket", dest="socket_path", help="Also serve on this Unix-domain socket")
+    parser.add_argument("--no-http", action="store_true", help="Serve on the Unix-domain socket only")
+    loop_group = parser.add_mutually_exclusive_group()
+    loop_group.add_argument(
+        "--uvloop", dest="use_uvloop", action="store_true", default=None,
+        help="Require uvloop (default: use it when installed)",
+    )
+    loop_group.add_argument("--no-uvloop", dest="use_uvloop", action="store_false", help="Never use uvloop")
+    parser.add_argument("--log-level", default="INFO", help="Logging level (default: INFO)")
+    return parser
+
+
+def config_from_args(args: argparse.Namespace) -> DaemonConfig:
+    """
+    Build daemon settings from parsed command line arguments.
+
+    Command line options override the settings file.
+
+    Args:
+        args: Arguments parsed by ``build_parser``
+
+    Returns:
+        DaemonConfig: The settings
+
+    Raises:
+        ValueError: If no monitor is configured or no listener remains
+    """
+    if args.config:
+        config = DaemonConfig.from_file(args.config)
+    elif args.rpc_url:
+        config = DaemonConfig(monitors={args.chain: {
+            "rpc_url": args.rpc_url,
+            "update_interval": args.update_interval,
+            "fetch_mode": args.fetch_mode,
+            "etherscan_api_key": os.environ.get("ETHERSCAN_API_KEY"),
+        }})
+    else:
+        raise ValueError("Give --config or --rpc-url (or set WEB3_PROVIDER_URI)")
+
+    if args.host is not None:
+        config.host = args.host
+    if args.port is not None:
+        config.port = args.port
+    if args.socket_path is not None:
+        config.socket_path = args.socket_path
+    if args.no_http:
+        config.port = None
+    if args.use_uvloop is not None:
+        config.use_uvloop = args.use_uvloop
+    if config.port is None and config.socket_path is None:
+        raise ValueError("--no-http requires --socket")
+    return config
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """
+    Run the daemon from the command line.
+
+    Args:
+        argv: Command line arguments (default: ``sys.argv[1:]``)
+
+    Returns:
+        int: Process exit status
+    """
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    logging.basicConfig(
+        level=args.log_level.upper(),
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
+
+    try:
+        config = config_from_args(args)
+        daemon = GasDaemon(config)
+    except (OSError, ValueError) as e:
+        parser.error(str(e))
+
+    try:
+        run_event_loop(daemon.run(), config.use_uvloop)
+    except ImportError as e:
+        logger.error(str(e))
+        return 1
+    except KeyboardInterrupt:
+        pass
+    return 0
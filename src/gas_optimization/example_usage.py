@@ -113,6 +113,9 @@ async def main():
     except asyncio.CancelledError:
         pass
     
+    # Release the pooled HTTP session used for the Etherscan fallback
+    await monitor.aclose()
+    
     logger.info("\n=== Example Complete ===")
 
 
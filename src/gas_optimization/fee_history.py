@@ -0,0 +1,247 @@
+"""
+EIP-1559 Fee History Module
+
+This module tracks ``eth_feeHistory`` data block by block and recommends
+``maxFeePerGas`` / ``maxPriorityFeePerGas`` for inclusion within a number of
+blocks at a given confidence.
+"""
+
+import bisect
+import logging
+import math
+from dataclasses import dataclass
+from typing import Any, Mapping, Optional, Sequence
+
+import numpy as np
+
+from .rolling_stats import RollingGasStatistics
+
+
+# Configure module logger
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class FeeRecommendation:
+    """
+    Suggested EIP-1559 fee parameters.
+
+    Attributes:
+        max_fee_per_gas: Suggested ``maxFeePerGas`` in Wei
+        max_priority_fee_per_gas: Suggested ``maxPriorityFeePerGas`` in Wei
+        base_fee_estimate: Base fee the max fee is sized to cover, in Wei
+        blocks: Inclusion horizon in blocks
+        confidence: Requested probability of inclusion within ``blocks``
+    """
+
+    max_fee_per_gas: int
+    max_priority_fee_per_gas: int
+    base_fee_estimate: int
+    blocks: int
+    confidence: float
+
+
+class FeeHistoryEngine:
+    """
+    Incremental store of recent base fees and priority-fee percentiles.
+
+    Each ``ingest`` appends only blocks newer than the last one seen. After
+    every ingest the engine refreshes small lookup tables, so
+    ``recommend(blocks, confidence)`` runs in constant time:
+
+    * Priority fee: to be included within ``N`` blocks with probability
+      ``p``, each block must accept the tip with probability
+      ``q = 1 - (1 - p) ** (1 / N)``. The tip is the ``q`` quantile of the
+      recent reward percentiles, each tracked as a rolling median across
+      blocks.
+    * Max fee: the next block's base fee scaled by the ``p`` quantile of the
+      base-fee growth observed over ``N`` blocks within the window, plus the tip.
+
+    Attributes:
+        window: Number of recent blocks kept
+        reward_percentiles: Percentiles requested from ``eth_feeHistory``
+        max_blocks_ahead: Largest supported inclusion horizon
+        last_block: Number of the newest ingested block, or None
+        next_base_fee: Base fee of the block after ``last_block``, or None
+    """
+
+    # Largest base fee change per block allowed by EIP-1559
+    MAX_BASE_FEE_CHANGE = 1.125
+
+    def __init__(
+        self,
+        window: int = 64,
+        reward_percentiles: Sequence[float] = (5, 10, 25, 50, 75, 90, 95, 99),
+        max_blocks_ahead: int = 10
+    ):
+        """
+        Initialize the engine.
+
+        Args:
+            window: Number of recent blocks kept (default: 64)
+            reward_percentiles: Increasing percentiles requested from
+                ``eth_feeHistory`` (default: 5 to 99)
+            max_blocks_ahead: Largest inclusion horizon, in blocks (default: 10)
+
+        Raises:
+            ValueError: If the arguments are empty, unsorted or non-positive
+        """
+        if window <= 1 or max_blocks_ahead <= 0:
+            raise ValueError("window must exceed 1 and max_blocks_ahead must be positive")
+        if not reward_percentiles or list(reward_percentiles) != sorted(reward_percentiles):
+            raise ValueError("reward_percentiles must be a non-empty increasing sequence")
+
+        self.window = window
+        self.reward_percentiles = tuple(float(p) for p in reward_percentiles)
+        self.max_blocks_ahead = max_blocks_ahead
+
+        self.block_numbers = np.zeros(window, dtype=np.int64)
+        self.base_fees = np.zeros(window, dtype=np.float64)
+        self.gas_used_ratios = np.zeros(window, dtype=np.float64)
+        self.rewards = np.zeros((window, len(self.reward_percentiles)), dtype=np.float64)
+        self.count = 0
+        self.last_block: Optional[int] = None
+        self.next_base_fee: Optional[int] = None
+
+        self._reward_stats = [RollingGasStatistics(window, ema_half_lives=()) for _ in self.reward_percentiles]
+        self._tip_curve = [0.0] * len(self.reward_percentiles)
+        self._growth_quantiles = [np.ones(1)] * (max_blocks_ahead + 1)
+
+    def blocks_to_fetch(self, newest_block: int) -> int:
+        """
+        Get how many blocks to request so only unseen blocks are fetched.
+
+        Args:
+            newest_block: Number of the chain's newest block
+
+        Returns:
+            int: Block count for ``eth_feeHistory`` (0 if up to date)
+        """
+        if self.last_block is None:
+            return min(self.window, newest_block + 1)
+        return max(0, min(self.window, newest_block - self.last_block))
+
+    def ingest(self, fee_history: Mapping[str, Any]) -> int:
+        """
+        Append blocks from an ``eth_feeHistory`` result.
+
+        Blocks at or below ``last_block`` are skipped. A gap larger than the
+        window simply replaces the stored blocks.
+
+        Args:
+            fee_history: Result with ``oldestBlock``, ``baseFeePerGas``,
+                ``gasUsedRatio`` and ``reward`` fields
+
+        Returns:
+            int: Number of new blocks ingested
+        """
+        oldest = int(fee_history["oldestBlock"])
+        base_fees = list(fee_history["baseFeePerGas"])
+        ratios = list(fee_history["gasUsedRatio"])
+        rewards = list(fee_history.get("reward") or [])
+
+        ingested = 0
+        for offset, ratio in enumerate(ratios):
+            block_number = oldest + offset
+            if self.last_block is not None and block_number <= self.last_block:
+                continue
+
+            row = rewards[offset] if offset < len(rewards) else [0] * len(self.reward_percentiles)
+            self._append_block(block_number, base_fees[offset], ratio, row)
+            ingested += 1
+
+        newest = oldest + len(ratios) - 1
+        if ratios and (self.last_block is None or newest >= self.last_block) and len(base_fees) > len(ratios):
+            self.next_base_fee = int(base_fees[len(ratios)])
+
+        if ingested:
+            self.last_block = max(self.last_block or newest, newest)
+            self._refresh_tables()
+            logger.debug(f"Ingested {ingested} fee history blocks up to {self.last_block}")
+        return ingested
+
+    def _append_block(self, block_number: int, base_fee: int, ratio: float, rewards: Sequence[int]) -> None:
+        """Shift the window arrays by one and append a block."""
+        if self.count == self.window:
+            for column in (self.block_numbers, self.base_fees, self.gas_used_ratios, self.rewards):
+                column[:-1] = column[1:]
+            index = self.window - 1
+        else:
+            index = self.count
+            self.count += 1
+
+        self.block_numbers[index] = block_number
+        self.base_fees[index] = base_fee
+        self.gas_used_ratios[index] = ratio
+        self.rewards[index] = rewards
+        for stats, reward in zip(self._reward_stats, rewards):
+            stats.push(int(reward))
+
+    def _refresh_tables(self) -> None:
+        """Recompute the constant-time lookup tables after new blocks."""
+        self._tip_curve = [stats.median() or 0.0 for stats in self._reward_stats]
+        # Reward percentiles of a single block are non-decreasing; keep the curve monotonic
+        for i in range(1, len(self._tip_curve)):
+            self._tip_curve[i] = max(self._tip_curve[i], self._tip_curve[i - 1])
+
+        base_fees = self.base_fees[:self.count]
+        for blocks in range(1, self.max_blocks_ahead + 1):
+            steps = blocks - 1
+            if steps == 0 or self.count <= steps:
+                self._growth_quantiles[blocks] = np.ones(1)
+                continue
+            with np.errstate(divide="ignore", invalid="ignore"):
+                growth = base_fees[steps:] / base_fees[:-steps]
+            growth = growth[np.isfinite(growth)]
+            cap = self.MAX_BASE_FEE_CHANGE ** steps
+            self._growth_quantiles[blocks] = np.sort(np.clip(growth, 1.0, cap)) if len(growth) else np.ones(1)
+
+    def _tip_at(self, percentile: float) -> float:
+        """Interpolate the tip curve at a percentile."""
+        grid = self.reward_percentiles
+        if percentile <= grid[0]:
+            return self._tip_curve[0]
+        if percentile >= grid[-1]:
+            return self._tip_curve[-1]
+        upper = bisect.bisect_left(grid, percentile)
+        lower = upper - 1
+        fraction = (percentile - grid[lower]) / (grid[upper] - grid[lower])
+        return self._tip_curve[lower] + (self._tip_curve[upper] - self._tip_curve[lower]) * fraction
+
+    def recommend(self, blocks: int = 3, confidence: float = 0.9) -> Optional[FeeRecommendation]:
+        """
+        Recommend fees for inclusion within ``blocks`` blocks at ``confidence``.
+
+        Args:
+            blocks: Inclusion horizon, 1 to ``max_blocks_ahead`` (default: 3)
+            confidence: Probability of inclusion, strictly between 0 and 1
+                (default: 0.9)
+
+        Returns:
+            Optional[FeeRecommendation]: Suggested fees, or None before any
+                fee history has been ingested
+
+        Raises:
+            ValueError: If blocks or confidence is out of range
+        """
+        if not 1 <= blocks <= self.max_blocks_ahead:
+            raise ValueError(f"blocks must be between 1 and {self.max_blocks_ahead}")
+        if not 0 < confidence < 1:
+            raise ValueError("confidence must be between 0 and 1")
+        if not self.count or self.next_base_fee is None:
+            return None
+
+        per_block = 1 - (1 - confidence) ** (1 / blocks)
+        tip = int(math.ceil(self._tip_at(per_block * 100)))
+
+        growth = self._growth_quantiles[blocks]
+        growth_factor = float(growth[min(len(growth) - 1, int(confidence * (len(growth) - 1) + 0.5))])
+        base_fee_estimate = int(math.ceil(self.next_base_fee * growth_factor))
+
+        return FeeRecommendation(
+            max_fee_per_gas=base_fee_estimate + tip,
+            max_priority_fee_per_gas=tip,
+            base_fee_estimate=base_fee_estimate,
+            blocks=blocks,
+            confidence=confidence,
+        )
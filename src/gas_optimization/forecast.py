@@ -0,0 +1,270 @@
+"""
+Gas Price Forecasting Module
+
+This module fits lightweight short-horizon models to the gas price history
+and returns predictive distributions for the next few readings, so callers
+can judge whether waiting is likely to pay off.
+"""
+
+import logging
+import math
+from dataclasses import dataclass
+from statistics import NormalDist
+from typing import Optional
+
+import numpy as np
+
+
+# Configure module logger
+logger = logging.getLogger(__name__)
+
+HOUR_NS = 3_600_000_000_000
+
+_erf = np.vectorize(math.erf, otypes=[np.float64])
+
+
+@dataclass(frozen=True)
+class GasForecast:
+    """
+    Predictive distribution of the next readings.
+
+    Prices are modelled as log-normal: ``log(price_gwei)`` at step ``h`` is
+    normal with mean ``log_mean[h - 1]`` and standard deviation
+    ``log_std[h - 1]``.
+
+    Attributes:
+        steps: Steps ahead, 1 to N
+        timestamps_ns: Expected time of each step in epoch nanoseconds
+        log_mean: Mean of the log Gwei price per step
+        log_std: Standard deviation of the log Gwei price per step
+    """
+
+    steps: np.ndarray
+    timestamps_ns: np.ndarray
+    log_mean: np.ndarray
+    log_std: np.ndarray
+
+    def median_gwei(self) -> np.ndarray:
+        """Median price per step, in Gwei."""
+        return np.exp(self.log_mean)
+
+    def mean_gwei(self) -> np.ndarray:
+        """Expected price per step, in Gwei."""
+        return np.exp(self.log_mean + self.log_std ** 2 / 2)
+
+    def quantile_gwei(self, q: float) -> np.ndarray:
+        """
+        Get a quantile of the price per step.
+
+        Args:
+            q: Quantile between 0 and 1 (exclusive)
+
+        Returns:
+            np.ndarray: Price quantile per step, in Gwei
+        """
+        return np.exp(self.log_mean + NormalDist().inv_cdf(q) * self.log_std)
+
+    def probability_below(self, threshold_gwei: float) -> np.ndarray:
+        """
+        Get the probability that the price is at or below a threshold.
+
+        Args:
+            threshold_gwei: Price threshold in Gwei
+
+        Returns:
+            np.ndarray: Probability per step
+        """
+        if threshold_gwei <= 0:
+            return np.zeros(len(self.steps))
+        std = np.maximum(self.log_std, 1e-12)
+        z = (math.log(threshold_gwei) - self.log_mean) / (std * math.sqrt(2))
+        return 0.5 * (1 + _erf(z))
+
+
+class GasPriceForecaster:
+    """
+    Incremental short-horizon forecaster of log gas prices.
+
+    Three components are refit on every reading in O(1):
+
+    * Time-of-day seasonality: an exponentially weighted mean offset of the
+      log price for each UTC hour.
+    * Holt's linear trend (level and trend smoothing) on the deseasonalized
+      log price.
+    * AR(1) on Holt's one-step errors, estimated from exponentially
+      discounted sufficient statistics, which captures short bursts and
+      the decay that follows them.
+
+    ``forecast`` evaluates all horizons at once with NumPy.
+
+    Attributes:
+        alpha: Level smoothing factor
+        beta: Trend smoothing factor
+        seasonal_rate: Learning rate of the hourly offsets
+        count: Number of readings seen
+        phi: Current AR(1) coefficient of the one-step errors
+    """
+
+    # Bound on the AR(1) coefficient, keeping forecasts stationary
+    MAX_PHI = 0.98
+
+    def __init__(
+        self,
+        alpha: float = 0.3,
+        beta: float = 0.05,
+        seasonal_rate: float = 0.02,
+        ar_half_life: float = 200,
+        step_rate: float = 0.1
+    ):
+        """
+        Initialize the forecaster.
+
+        Args:
+            alpha: Level smoothing factor in (0, 1] (default: 0.3)
+            beta: Trend smoothing factor in [0, 1] (default: 0.05)
+            seasonal_rate: Learning rate of the hourly offsets (default: 0.02)
+            ar_half_life: Half-life, in readings, of the AR(1) and error
+                variance statistics (default: 200)
+            step_rate: Smoothing factor of the reading interval estimate
+                (default: 0.1)
+
+        Raises:
+            ValueError: If a smoothing factor is out of range
+        """
+        if not 0 < alpha <= 1 or not 0 <= beta <= 1 or not 0 <= seasonal_rate < 1:
+            raise ValueError("alpha must be in (0, 1], beta in [0, 1] and seasonal_rate in [0, 1)")
+        if ar_half_life <= 0:
+            raise ValueError("ar_half_life must be positive")
+
+        self.alpha = alpha
+        self.beta = beta
+        self.seasonal_rate = seasonal_rate
+        self.step_rate = step_rate
+        self._discount = 0.5 ** (1 / ar_half_life)
+        self.reset()
+
+    def reset(self) -> None:
+        """Forget all readings."""
+        self.count = 0
+        self.level = 0.0
+        self.trend = 0.0
+        self.phi = 0.0
+        self.season = [0.0] * 24
+        self.last_timestamp_ns: Optional[int] = None
+        self.step_ns: Optional[float] = None
+        self._last_error = 0.0
+        self._sxx = 0.0
+        self._sxy = 0.0
+        self._var_sum = 0.0
+        self._var_weight = 0.0
+
+    @property
+    def sigma(self) -> Optional[float]:
+        """Standard deviation of the AR(1) innovations, in log Gwei."""
+        if self._var_weight == 0:
+            return None
+        return math.sqrt(self._var_sum / self._var_weight)
+
+    def update(self, timestamp_ns: int, price_wei: int) -> None:
+        """
+        Refit the model with one reading.
+
+        Args:
+            timestamp_ns: Reading time in epoch nanoseconds
+            price_wei: Gas price in Wei; non-positive prices are ignored
+        """
+        if price_wei <= 0:
+            return
+
+        y = math.log(price_wei / 1e9)
+        hour = (timestamp_ns // HOUR_NS) % 24
+        z = y - self.season[hour]
+
+        if self.count == 0:
+            self.level = z
+            self.count = 1
+            self.last_timestamp_ns = timestamp_ns
+            return
+
+        elapsed = timestamp_ns - self.last_timestamp_ns
+        if elapsed > 0:
+            self.step_ns = elapsed if self.step_ns is None else (
+                self.step_ns + self.step_rate * (elapsed - self.step_ns)
+            )
+        self.last_timestamp_ns = max(self.last_timestamp_ns, timestamp_ns)
+
+        # One-step error of Holt's forecast
+        error = z - (self.level + self.trend)
+
+        # AR(1) on consecutive errors from discounted sufficient statistics
+        if self.count > 1:
+            d = self._discount
+            self._sxx = d * self._sxx + self._last_error * self._last_error
+            self._sxy = d * self._sxy + self._last_error * error
+            if self._sxx > 0:
+                self.phi = max(-self.MAX_PHI, min(self.MAX_PHI, self._sxy / self._sxx))
+            innovation = error - self.phi * self._last_error
+            self._var_sum = d * self._var_sum + innovation * innovation
+            self._var_weight = d * self._var_weight + 1
+        self._last_error = error
+
+        # Holt's linear trend in error-correction form
+        self.level += self.trend + self.alpha * error
+        self.trend += self.alpha * self.beta * error
+
+        # Hourly offset relative to the updated level
+        self.season[hour] += self.seasonal_rate * (y - self.level - self.season[hour])
+        self.count += 1
+
+    def fit(self, timestamps_ns: np.ndarray, prices_wei: np.ndarray) -> None:
+        """
+        Refit the model from scratch over a history of readings.
+
+        Args:
+            timestamps_ns: Reading times in epoch nanoseconds, oldest first
+            prices_wei: Gas prices in Wei
+        """
+        self.reset()
+        for timestamp_ns, price_wei in zip(np.asarray(timestamps_ns).tolist(), np.asarray(prices_wei).tolist()):
+            self.update(timestamp_ns, price_wei)
+        logger.debug(f"Fitted gas price forecaster on {self.count} readings")
+
+    def forecast(self, steps: int = 5) -> Optional[GasForecast]:
+        """
+        Predict the distribution of the next readings.
+
+        Args:
+            steps: Number of readings ahead (default: 5)
+
+        Returns:
+            Optional[GasForecast]: Predictive distribution per step, or None
+                until enough readings have been seen to estimate the spread
+
+        Raises:
+            ValueError: If steps is not positive
+        """
+        if steps <= 0:
+            raise ValueError("steps must be positive")
+        sigma = self.sigma
+        if sigma is None:
+            return None
+
+        h = np.arange(1, steps + 1)
+        phi_pow = self.phi ** h
+
+        # Expected future errors decay as phi**k; Holt absorbs alpha of each
+        # error before the horizon is reached
+        absorbed = self.alpha * np.concatenate(([0.0], np.cumsum(phi_pow[:-1])))
+        ar_shift = (phi_pow + absorbed) * self._last_error
+
+        timestamps_ns = self.last_timestamp_ns + (h * (self.step_ns or 0)).astype(np.int64)
+        seasonal = np.asarray(self.season)[(timestamps_ns // HOUR_NS) % 24]
+        log_mean = self.level + h * self.trend + ar_shift + seasonal
+
+        # Weight of each future innovation on the horizon: its AR(1) echo
+        # plus the level and trend shift it causes
+        k = h - 1
+        psi = self.phi ** k + np.where(k > 0, self.alpha * (1 + k * self.beta), 0.0)
+        log_std = sigma * np.sqrt(np.cumsum(psi ** 2))
+
+        return GasForecast(steps=h, timestamps_ns=timestamps_ns, log_mean=log_mean, log_std=log_std)
@@ -8,12 +8,39 @@ to help make informed trading decisions.
 
 import asyncio
 import logging
-from typing import Optional, List, Tuple
+import time
+from typing import Awaitable, Callable, Dict, Mapping, Optional, List, Sequence, Tuple, Union
 from datetime import datetime
-from collections import deque
 
 import aiohttp
-from web3 import Web3
+import numpy as np
+from web3 import AsyncWeb3, Web3
+from web3.providers import AsyncBaseProvider
+
+from .candles import DEFAULT_RESOLUTIONS, CandleRollup, Candles
+from .clock import SystemClock, VirtualClock
+from .consensus import ConsensusResult, GasPriceConsensus
+from .cost_estimate import CostEstimate, urgency_quantile
+from .fee_history import FeeHistoryEngine, FeeRecommendation
+from .forecast import GasForecast, GasPriceForecaster
+from .history import GasHistory, datetime_to_ns
+from .http_pool import HttpConnectionStats, create_http_session
+from .mempool import MempoolMonitor
+from .metrics import MetricsRegistry, MetricsServer
+from .price_cache import SingleFlightCache
+from .rate_limited_log import RateLimitedLogger
+from .scheduler import AdaptiveInterval, FixedRateScheduler
+from .shared_feed import SharedGasFeedPublisher
+from .snapshot import GasSnapshot
+from .source_stats import CircuitBreaker, SourceStats
+from .subscription import (
+    DEFAULT_MAX_RETRY_DELAY,
+    DEFAULT_RETRY_DELAY,
+    EthSubscription,
+    resubscribe_with_backoff,
+)
+from .thresholds import ThresholdWaiters
+from .timeseries_store import GasTimeSeriesFile
 
 
 # Configure module logger
@@ -28,56 +55,568 @@ class GasMonitor:
     moving averages, and threshold checking to help determine optimal transaction timing.
     
     Attributes:
-        web3: Web3 instance for blockchain interactions
+        web3: Web3 or AsyncWeb3 instance for blockchain interactions
+        is_async: True when RPC calls are awaited natively on the event loop
         update_interval: Seconds between gas price updates
         history_size: Maximum number of historical readings to store
-        gas_history: Deque of (timestamp, price_wei) tuples
+        gas_history: Columnar GasHistory of (timestamp, price_wei) readings
+            with rolling statistics attached as ``gas_history.stats``
+        ws_url: Optional WebSocket endpoint for new block subscriptions
+        latest_block_number: Number of the most recent block header seen
+        http_stats: Connection reuse counters for the owned HTTP session
+        fetch_mode: How gas sources are consulted ("sequential", "hedged",
+            "concurrent" or "consensus")
+        consensus_providers: Additional named RPC providers consulted as gas
+            sources after the primary ``web3``
+        source_weights: Weight of each source in consensus rounds
+        consensus: Outlier rejection and weighted median rule of consensus
+            rounds
+        consensus_timeout: Latency budget of a consensus round in seconds
+        last_consensus: Outcome of the most recent consensus round, or None
+        source_stats: Per-source latency, outcome, win-rate and health
+            counters, each with a circuit breaker unless disabled
+        timeseries: Optional on-disk store every reading is appended to
+        fee_history: EIP-1559 fee history used for fee recommendations
+        forecaster: Short-horizon gas price model refit on every reading
+        thresholds: Heap-indexed waiters for price threshold events
+        track_fee_history: Whether each gas price update also ingests new
+            fee history blocks
+        clock: Time source for reading timestamps and polling sleeps
+        scheduler: Fixed-rate scheduler driving the polling loop
+        adaptive_interval: Optional policy retuning the polling interval
+            after every reading
+        price_cache: Single-flight cache shared by concurrent
+            ``get_current_gas_price`` callers
+        cache_per_block: Whether cached prices stay valid until a new block
+            header is seen
+        latest_snapshot: Most recent result of ``get_gas_snapshot``, or None
+        shared_feed: Optional shared memory publisher every reading is
+            written to for reader processes
+        mempool: Optional consumer of pending transactions keeping fee
+            percentiles of the mempool
+        candles: Optional OHLC rollups of every reading at several
+            resolutions, for ranges longer than the raw history
+        default_fallbacks: Number of times every source failed and the
+            default price was returned
+        skipped_updates: Number of updates that recorded nothing because
+            every source failed
+        metrics: Registry of OpenMetrics families read at scrape time
+        metrics_server: Optional local HTTP server exposing ``/metrics``
+        log_limiter: Rate limiter for warnings that repeat on every update,
+            such as failures of a source that is down
         is_monitoring: Flag indicating if monitoring loop is active
+    
+    GasMonitor owns a pooled HTTP session for the gas oracle fallback. Release
+    it with ``await monitor.aclose()`` or by using the monitor as an async
+    context manager.
     """
     
     # Etherscan API endpoint for gas oracle
     ETHERSCAN_GAS_ORACLE_URL = "https://api.etherscan.io/api?module=gastracker&action=gasoracle"
     
+    # Supported strategies for consulting gas sources
+    FETCH_MODES = ("sequential", "hedged", "concurrent", "consensus")
+    
+    # Hedge delay used until a source has enough latency samples for a percentile
+    DEFAULT_HEDGE_DELAY = 1.0
+    MIN_HEDGE_SAMPLES = 5
+    
+    # Upper bound of the backed-off circuit breaker timeout
+    MAX_CIRCUIT_BREAKER_TIMEOUT = 300.0
+    
+    # Number of recent readings whose volatility drives adaptive polling
+    ADAPTIVE_VOLATILITY_WINDOW = 10
+    
+    # Backoff between attempts to restore a lost newHeads subscription
+    SUBSCRIPTION_RETRY_DELAY = DEFAULT_RETRY_DELAY
+    SUBSCRIPTION_RETRY_MAX_DELAY = DEFAULT_MAX_RETRY_DELAY
+    
     def __init__(
         self, 
-        web3: Web3, 
+        web3: Union[Web3, AsyncWeb3, AsyncBaseProvider], 
         update_interval: int = 15,
         history_size: int = 100,
-        etherscan_api_key: Optional[str] = None
+        etherscan_api_key: Optional[str] = None,
+        ws_url: Optional[str] = None,
+        http_session: Optional[aiohttp.ClientSession] = None,
+        max_http_connections: int = 10,
+        fetch_mode: str = "sequential",
+        hedge_delay: Optional[float] = None,
+        hedge_percentile: float = 95,
+        ema_half_lives: Tuple[float, ...] = (5, 20, 100),
+        persist_path: Optional[str] = None,
+        track_fee_history: bool = False,
+        fee_history_window: int = 64,
+        clock: Optional[Union[SystemClock, VirtualClock]] = None,
+        max_in_flight_fetches: int = 1,
+        missed_tick_policy: str = "coalesce",
+        circuit_breaker_threshold: Optional[int] = 3,
+        circuit_breaker_timeout: float = 30.0,
+        min_update_interval: Optional[float] = None,
+        max_update_interval: Optional[float] = None,
+        price_cache_ttl: float = 0.0,
+        cache_per_block: bool = False,
+        shared_feed_name: Optional[str] = None,
+        mempool_url: Optional[str] = None,
+        mempool_window: float = 60.0,
+        candle_resolutions: Optional[Tuple[Tuple[int, int], ...]] = DEFAULT_RESOLUTIONS,
+        consensus_providers: Optional[Mapping[str, Union[Web3, AsyncWeb3, AsyncBaseProvider]]] = None,
+        source_weights: Optional[Mapping[str, float]] = None,
+        consensus_timeout: float = 2.0,
+        consensus_quorum: int = 2,
+        consensus_mad_threshold: float = 3.0,
+        log_interval: float = 60.0,
+        etherscan_fallback: bool = True
     ):
         """
         Initialize the GasMonitor.
         
         Args:
-            web3: Web3 instance connected to an Ethereum node
+            web3: Web3 or AsyncWeb3 instance connected to an Ethereum node, or an
+                async provider (e.g. ``AsyncHTTPProvider``) to wrap in AsyncWeb3.
+                Synchronous Web3 calls run in a worker thread; AsyncWeb3 calls
+                are awaited directly on the event loop.
             update_interval: Seconds between gas price updates (default: 15)
             history_size: Maximum number of historical readings to store (default: 100)
             etherscan_api_key: Optional Etherscan API key for gas oracle access
+            ws_url: Optional WebSocket endpoint; when set, monitoring refreshes
+                once per new block header via ``eth_subscribe newHeads``
+            http_session: Optional shared aiohttp session; the monitor will not
+                close a session it did not create
+            max_http_connections: Connection limit of the session the monitor
+                creates for itself (default: 10)
+            fetch_mode: "sequential" tries each source after the previous one
+                fails; "hedged" starts the next source if no valid answer has
+                arrived after the hedge delay; "concurrent" starts all sources
+                at once; "consensus" starts all sources at once and combines
+                their answers (default: "sequential")
+            hedge_delay: Fixed hedge delay in seconds; None derives it from the
+                ``hedge_percentile`` latency of the source being hedged
+            hedge_percentile: Latency percentile used for the adaptive hedge
+                delay (default: 95)
+            ema_half_lives: Half-lives, in readings, of the exponential moving
+                averages maintained over the history (default: (5, 20, 100))
+            persist_path: Optional path of a memory-mapped time-series file.
+                The history is warm-started from its most recent readings and
+                every new reading is appended to it.
+            track_fee_history: Refresh the EIP-1559 fee history on every gas
+                price update (default: False)
+            fee_history_window: Number of recent blocks the fee history
+                keeps (default: 64)
+            clock: Time source; a ``VirtualClock`` replays recorded data
+                deterministically (default: wall-clock ``SystemClock``)
+            max_in_flight_fetches: Maximum number of polling fetches running
+                at once; a tick that finds this many still running is
+                dropped (default: 1)
+            missed_tick_policy: What polling does after falling a whole
+                interval behind: "coalesce" fetches once immediately, "skip"
+                waits for the next scheduled tick (default: "coalesce")
+            circuit_breaker_threshold: Consecutive failures after which a
+                source is skipped until a probe succeeds; None disables the
+                breakers (default: 3)
+            circuit_breaker_timeout: Seconds a tripped source is skipped
+                before it is probed again; doubled after each failed probe
+                (default: 30.0)
+            min_update_interval: Shortest polling interval when adaptive
+                polling is enabled (default: ``update_interval``)
+            max_update_interval: Longest polling interval when adaptive
+                polling is enabled (default: ``update_interval``). Setting
+                either bound enables adaptive polling: the interval shrinks
+                as volatility rises or the price nears a watched threshold.
+            price_cache_ttl: Seconds a fetched price is returned to
+                ``get_current_gas_price`` callers without I/O; concurrent
+                callers always share one in-flight fetch (default: 0.0)
+            cache_per_block: Also reuse a fetched price until a newer block
+                header is seen (default: False)
+            shared_feed_name: Optional name of a shared memory segment to
+                create; every reading and the rolling statistics are
+                published to it for ``SharedGasFeedReader`` processes
+            mempool_url: Optional endpoint of a local node whose pending
+                transactions are sketched while monitoring runs; ws:// or
+                wss:// streams ``newPendingTransactions``, http:// or
+                https:// polls ``txpool_content``
+            mempool_window: Seconds of pending transactions covered by the
+                mempool percentiles (default: 60.0)
+            candle_resolutions: (resolution in seconds, candles kept) pairs
+                of the OHLC rollups; None disables them (default: 1 minute,
+                5 minutes, 1 hour and 1 day)
+            consensus_providers: Optional additional RPC providers by name,
+                each a Web3, AsyncWeb3 or async provider; they are consulted
+                after ``web3`` and before Etherscan in every fetch mode
+            source_weights: Optional weight of each source ("web3",
+                "etherscan" or a provider name) in consensus rounds
+                (default: 1.0 each)
+            consensus_timeout: Seconds a consensus round waits for every
+                source before combining the answers received so far
+                (default: 2.0)
+            consensus_quorum: Answers a consensus round needs to count as a
+                full consensus; a round short of it still uses the answers
+                it has (default: 2)
+            consensus_mad_threshold: Scaled median absolute deviations an
+                answer may lie from the median before it is rejected
+                (default: 3.0)
+            log_interval: Seconds between repeats of the same warning, such
+                as failures of one source; repeats in between are counted
+                and reported with the next one logged (default: 60.0)
+            etherscan_fallback: Whether the Etherscan gas oracle is consulted
+                after the RPC sources; disable it to keep every price from
+                the configured nodes, as replays do (default: True)
+        
+        Raises:
+            ValueError: If ``fetch_mode`` or ``missed_tick_policy`` is not
+                supported, or the circuit breaker, interval, cache or
+                consensus settings are invalid
+            FileExistsError: If the shared feed segment already exists
         """
+        if fetch_mode not in self.FETCH_MODES:
+            raise ValueError(
+                f"Unsupported fetch_mode {fetch_mode!r}; expected one of {self.FETCH_MODES}"
+            )
+        
+        if isinstance(web3, AsyncBaseProvider):
+            web3 = AsyncWeb3(web3)
         self.web3 = web3
+        self.is_async = isinstance(web3, AsyncWeb3)
         self.update_interval = update_interval
         self.history_size = history_size
         self.etherscan_api_key = etherscan_api_key
+        self.ws_url = ws_url
+        self.max_http_connections = max_http_connections
+        self.clock = clock or SystemClock()
+        self.log_limiter = RateLimitedLogger(logger, log_interval, clock=self.clock)
+        
+        # Pooled HTTP session, created lazily on the running event loop
+        self._http_session: Optional[aiohttp.ClientSession] = http_session
+        self._owns_http_session = http_session is None
+        self.http_stats = HttpConnectionStats()
+        
+        # Source selection
+        self.fetch_mode = fetch_mode
+        self.hedge_delay = hedge_delay
+        self.hedge_percentile = hedge_percentile
+        self.consensus_providers: Dict[str, Union[Web3, AsyncWeb3]] = {}
+        for name, provider in (consensus_providers or {}).items():
+            if name in ("web3", "etherscan"):
+                raise ValueError(f"Provider name {name!r} is reserved")
+            if isinstance(provider, AsyncBaseProvider):
+                provider = AsyncWeb3(provider)
+            self.consensus_providers[name] = provider
+        self.etherscan_fallback = etherscan_fallback
+        source_names = ("web3", *self.consensus_providers, *(("etherscan",) if etherscan_fallback else ()))
+        self.source_weights = dict(source_weights or {})
+        for name, weight in self.source_weights.items():
+            if name not in source_names:
+                raise ValueError(f"Weight given for unknown source {name!r}")
+            if weight <= 0:
+                raise ValueError("Source weights must be positive")
+        self.consensus = GasPriceConsensus(mad_threshold=consensus_mad_threshold, quorum=consensus_quorum)
+        self.consensus_timeout = consensus_timeout
+        self.last_consensus: Optional[ConsensusResult] = None
+        self.source_stats: Dict[str, SourceStats] = {}
+        for name in source_names:
+            breaker = None
+            if circuit_breaker_threshold is not None:
+                breaker = CircuitBreaker(
+                    name,
+                    failure_threshold=circuit_breaker_threshold,
+                    reset_timeout=circuit_breaker_timeout,
+                    max_reset_timeout=max(circuit_breaker_timeout, self.MAX_CIRCUIT_BREAKER_TIMEOUT),
+                    clock=self.clock,
+                )
+            self.source_stats[name] = SourceStats(name, breaker=breaker)
+        
+        # Concurrent callers share one fetch; fresh prices are served from cache
+        self.price_cache = SingleFlightCache(ttl=price_cache_ttl, clock=self.clock)
+        self.cache_per_block = cache_per_block
         
         # Historical data storage: (timestamp, price_in_wei)
-        self.gas_history: deque = deque(maxlen=history_size)
+        self.gas_history = GasHistory(maxlen=history_size, ema_half_lives=ema_half_lives)
+        
+        # Short-horizon forecaster, refit incrementally on every reading
+        self.forecaster = GasPriceForecaster()
+        
+        # Callers awaiting price threshold events
+        self.thresholds = ThresholdWaiters()
+        
+        # Downsampled candles for long-horizon queries
+        self.candles: Optional[CandleRollup] = None
+        if candle_resolutions is not None:
+            self.candles = CandleRollup(candle_resolutions)
+        
+        # Optional persistence: warm-start from the most recent stored readings
+        self.timeseries: Optional[GasTimeSeriesFile] = None
+        if persist_path is not None:
+            self.timeseries = GasTimeSeriesFile(persist_path)
+            self.gas_history.extend_ns(*self.timeseries.tail(history_size))
+            if self.candles is not None:
+                # Candles outlive the raw history, so rebuild them from the whole file
+                self.candles.extend_ns(*self.timeseries.tail(len(self.timeseries)))
+            self.forecaster.fit(self.gas_history.timestamps_ns(), self.gas_history.prices_wei())
+            self.thresholds.last_price = self.gas_history.last_price_wei() if self.gas_history else None
+            logger.info(
+                f"Warm-started gas history with {len(self.gas_history)} readings "
+                f"from {persist_path}"
+            )
+        
+        # Optional cross-process feed for workers that do not poll themselves
+        self.shared_feed: Optional[SharedGasFeedPublisher] = None
+        if shared_feed_name is not None:
+            self.shared_feed = SharedGasFeedPublisher(shared_feed_name)
+            logger.info(f"Publishing gas readings to shared memory {shared_feed_name!r}")
+        
+        # Optional pending transaction fee sketches
+        self.mempool: Optional[MempoolMonitor] = None
+        self._mempool_task: Optional[asyncio.Task] = None
+        if mempool_url is not None:
+            if mempool_url.startswith(("ws://", "wss://")):
+                self.mempool = MempoolMonitor(ws_url=mempool_url, window=mempool_window, clock=self.clock)
+            else:
+                self.mempool = MempoolMonitor(http_url=mempool_url, window=mempool_window, clock=self.clock)
+        
+        # EIP-1559 fee history, refreshed incrementally block by block
+        self.fee_history = FeeHistoryEngine(window=fee_history_window)
+        self.track_fee_history = track_fee_history
         
         # Monitoring state
+        self.scheduler = FixedRateScheduler(
+            update_interval,
+            self._poll_once,
+            clock=self.clock,
+            max_in_flight=max_in_flight_fetches,
+            missed_tick_policy=missed_tick_policy,
+        )
+        self.adaptive_interval: Optional[AdaptiveInterval] = None
+        if min_update_interval is not None or max_update_interval is not None:
+            self.adaptive_interval = AdaptiveInterval(
+                min_update_interval if min_update_interval is not None else update_interval,
+                max_update_interval if max_update_interval is not None else update_interval,
+            )
         self.is_monitoring = False
         self._monitor_task: Optional[asyncio.Task] = None
+        self.latest_block_number: Optional[int] = None
+        self.latest_snapshot: Optional[GasSnapshot] = None
+        self._batch_supported = True
+        
+        # Instrumentation, read from the counters above only when scraped
+        self.default_fallbacks = 0
+        self.skipped_updates = 0
+        self.metrics = MetricsRegistry()
+        self.metrics_server: Optional[MetricsServer] = None
+        self._register_metrics()
         
         logger.info(
             f"GasMonitor initialized with update_interval={update_interval}s, "
-            f"history_size={history_size}"
+            f"history_size={history_size}, async_web3={self.is_async}"
         )
     
+    async def __aenter__(self) -> "GasMonitor":
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.aclose()
+    
+    async def aclose(self) -> None:
+        """
+        Stop monitoring, release the pooled HTTP session and close the
+        time-series file.
+        
+        A session passed in by the caller is left open.
+        """
+        if self.is_monitoring:
+            await self.stop_monitoring()
+        
+        self.thresholds.cancel_all()
+        await self.price_cache.cancel()
+        
+        if self._owns_http_session and self._http_session is not None:
+            session, self._http_session = self._http_session, None
+            await session.close()
+            logger.debug("Closed pooled HTTP session")
+        
+        if self.timeseries is not None:
+            self.timeseries.close()
+            self.timeseries = None
+        
+        if self.shared_feed is not None:
+            self.shared_feed.close()
+            self.shared_feed.unlink()
+            self.shared_feed = None
+        
+        if self.mempool is not None:
+            await self.mempool.aclose()
+        
+        if self.metrics_server is not None:
+            await self.metrics_server.stop()
+            self.metrics_server = None
+    
+    async def set_http_session(self, session: Optional[aiohttp.ClientSession], owned: bool = False) -> None:
+        """
+        Send HTTP calls through a different session from now on.
+        
+        A session the monitor created itself is closed once replaced; one
+        passed in by the caller is left open.
+        
+        Args:
+            session: Session to use, or None to drop the current one; the
+                monitor then creates its own session on next use
+            owned: Whether ``aclose`` should close ``session`` (default: False)
+        """
+        previous, owned_previous = self._http_session, self._owns_http_session
+        self._http_session = session
+        self._owns_http_session = owned and session is not None
+        if owned_previous and previous is not None and previous is not session:
+            await previous.close()
+            logger.debug("Closed pooled HTTP session")
+    
+    def _get_http_session(self) -> aiohttp.ClientSession:
+        """
+        Get the pooled HTTP session, creating it on first use.
+        
+        Returns:
+            aiohttp.ClientSession: Long-lived session with keep-alive
+        """
+        if self._http_session is None or (self._owns_http_session and self._http_session.closed):
+            self._http_session = create_http_session(
+                max_connections=self.max_http_connections,
+                stats=self.http_stats,
+            )
+            self._owns_http_session = True
+        return self._http_session
+    
+    def _register_metrics(self) -> None:
+        """Register the monitor's metric families, read from existing counters."""
+        metrics = self.metrics
+        sources = self.source_stats
+        
+        def per_source(value):
+            return lambda: [({"source": name}, value(stats)) for name, stats in sources.items()]
+        
+        def fetch_outcomes():
+            for name, stats in sources.items():
+                yield {"source": name, "outcome": "success"}, stats.successes
+                yield {"source": name, "outcome": "failure"}, stats.failures
+                yield {"source": name, "outcome": "cancelled"}, stats.cancellations
+                yield {"source": name, "outcome": "skipped"}, stats.breaker.rejections if stats.breaker else 0
+        
+        def cache_results():
+            cache = self.price_cache
+            return [({"result": "hit"}, cache.hits), ({"result": "miss"}, cache.misses),
+                    ({"result": "coalesced"}, cache.coalesced)]
+        
+        scheduler = self.scheduler
+        metrics.histogram(
+            "gas_source_fetch_duration_seconds", "Latency of completed gas price fetches per source.",
+            per_source(lambda stats: stats.latency_histogram),
+        )
+        metrics.counter("gas_source_fetches", "Gas price fetches per source and outcome.", fetch_outcomes)
+        metrics.counter("gas_source_wins", "Readings supplied per source.", per_source(lambda stats: stats.wins))
+        metrics.counter(
+            "gas_source_consensus_answers", "Consensus round answers per source by whether they were used.",
+            lambda: [item for name, stats in sources.items()
+                     for item in (({"source": name, "result": "inlier"}, stats.inliers),
+                                  ({"source": name, "result": "outlier"}, stats.outliers))],
+        )
+        metrics.gauge(
+            "gas_source_error_rate", "Exponentially weighted fetch failure rate per source.",
+            per_source(lambda stats: stats.error_rate),
+        )
+        metrics.gauge(
+            "gas_source_circuit_open", "1 while a source's circuit breaker is open or half-open.",
+            per_source(lambda stats: None if stats.breaker is None else int(stats.breaker.state != stats.breaker.CLOSED)),
+        )
+        metrics.counter(
+            "gas_default_fallbacks", "Times every source failed and the default price was used.",
+            lambda: self.default_fallbacks,
+        )
+        metrics.counter(
+            "gas_skipped_updates", "Updates that recorded nothing because every source failed.",
+            lambda: self.skipped_updates,
+        )
+        metrics.counter("gas_price_cache_requests", "Gas price requests by cache result.", cache_results)
+        metrics.gauge("gas_history_size", "Readings held in the gas history.", lambda: len(self.gas_history))
+        metrics.gauge(
+            "gas_price_wei", "Most recent gas price reading in Wei.",
+            lambda: self.gas_history.last_price_wei() if self.gas_history else None,
+        )
+        metrics.gauge("gas_monitoring", "1 while the monitoring loop is running.", lambda: int(self.is_monitoring))
+        metrics.gauge("gas_poll_interval_seconds", "Current polling interval.", lambda: scheduler.interval)
+        metrics.counter("gas_scheduler_ticks", "Polling ticks started.", lambda: scheduler.ticks)
+        metrics.counter("gas_scheduler_missed_ticks", "Polling ticks missed by a late wakeup.", lambda: scheduler.missed_ticks)
+        metrics.counter(
+            "gas_scheduler_dropped_ticks", "Polling ticks dropped because fetches were still in flight.",
+            lambda: scheduler.busy_ticks,
+        )
+        metrics.histogram(
+            "gas_scheduler_lag_seconds", "Delay between a polling deadline and the tick starting.",
+            lambda: scheduler.tick_lag,
+        )
+        metrics.histogram(
+            "gas_scheduler_fetch_duration_seconds", "Duration of each polling tick's update.",
+            lambda: scheduler.duration,
+        )
+        metrics.counter(
+            "gas_http_connections", "Pooled HTTP connections by how they were acquired.",
+            lambda: [({"kind": "created"}, self.http_stats.connections_created),
+                     ({"kind": "reused"}, self.http_stats.connections_reused)],
+        )
+    
+    def get_metrics_snapshot(self) -> Dict[str, object]:
+        """
+        Get every metric as plain Python data.
+        
+        Returns:
+            Dict[str, object]: Value per metric family; labeled families map
+                to lists of ``{"labels": ..., "value": ...}`` entries and
+                histograms to their summaries
+        """
+        return self.metrics.snapshot()
+    
+    async def start_metrics_server(self, host: str = "127.0.0.1", port: int = 9464) -> str:
+        """
+        Serve the metrics in OpenMetrics text format at ``/metrics``.
+        
+        The server runs on the current event loop until ``aclose``.
+        
+        Args:
+            host: Interface to bind (default: loopback only)
+            port: Port to bind; 0 picks a free port (default: 9464)
+        
+        Returns:
+            str: URL of the metrics endpoint
+        
+        Raises:
+            RuntimeError: If the server is already running
+            OSError: If the address cannot be bound
+        """
+        if self.metrics_server is not None:
+            raise RuntimeError("Metrics server is already running")
+        server = MetricsServer(self.metrics, host, port)
+        await server.start()
+        self.metrics_server = server
+        return server.url
+    
+    def get_http_stats(self) -> dict:
+        """
+        Get connection reuse statistics for the pooled HTTP session.
+        
+        Returns:
+            dict: Request, connection-created and connection-reused counters
+        """
+        return self.http_stats.as_dict()
+    
     async def start_monitoring(self) -> None:
         """
         Start the async gas price monitoring loop.
         
-        This method starts a background task that continuously fetches and stores
-        gas prices at the configured update interval. The monitoring runs until
-        stopped or an unrecoverable error occurs.
+        When ``ws_url`` is configured, gas state is refreshed once per new block
+        header received over an ``eth_subscribe newHeads`` subscription. While
+        the subscription cannot be established or is lost, monitoring polls at
+        the configured update interval and retries the subscription with
+        capped exponential backoff, switching back once it connects. The
+        monitoring runs until stopped or an unrecoverable error occurs.
+        
+        When ``mempool_url`` is configured, pending transactions are consumed
+        in a background task for as long as monitoring runs.
         
         Raises:
             RuntimeError: If monitoring is already active
@@ -88,35 +627,239 @@ class GasMonitor:
         self.is_monitoring = True
         self._monitor_task = asyncio.current_task()
         logger.info("Starting gas price monitoring")
+        if self.mempool is not None:
+            self._mempool_task = asyncio.create_task(self.mempool.run())
         
         try:
-            while self.is_monitoring:
-                try:
-                    # Fetch current gas price
-                    gas_price = await self.get_current_gas_price()
-                    
-                    # Store with timestamp
-                    timestamp = datetime.now()
-                    self.gas_history.append((timestamp, gas_price))
-                    
-                    gas_gwei = self.wei_to_gwei(gas_price)
-                    logger.debug(
-                        f"Gas price updated: {gas_gwei:.2f} Gwei "
-                        f"(history size: {len(self.gas_history)})"
-                    )
-                    
-                except Exception as e:
-                    logger.error(f"Error in monitoring loop: {e}", exc_info=True)
-                
-                # Wait before next update
-                await asyncio.sleep(self.update_interval)
-                
+            if self.ws_url:
+                await self._run_subscription_with_fallback()
+            else:
+                await self._run_polling_loop()
+        
         except asyncio.CancelledError:
             logger.info("Gas monitoring cancelled")
             raise
         finally:
             self.is_monitoring = False
             self._monitor_task = None
+            if self._mempool_task is not None:
+                self._mempool_task.cancel()
+                await asyncio.gather(self._mempool_task, return_exceptions=True)
+                self._mempool_task = None
+    
+    async def _run_subscription_with_fallback(self) -> None:
+        """
+        Follow new block headers, polling while the subscription is down.
+        
+        Each time the subscription fails, polling starts (if not already
+        running) and the subscription is retried after a delay that doubles
+        up to ``SUBSCRIPTION_RETRY_MAX_DELAY``. Once a subscription is
+        established, polling stops and the delay is reset.
+        """
+        await resubscribe_with_backoff(
+            self._run_subscription_loop,
+            lambda: self.is_monitoring,
+            self.clock.sleep,
+            fallback=self._run_polling_loop,
+            fallback_description=f"polling every {self.update_interval:g}s",
+            retry_delay=self.SUBSCRIPTION_RETRY_DELAY,
+            max_retry_delay=self.SUBSCRIPTION_RETRY_MAX_DELAY,
+            log=logger,
+        )
+    
+    async def _run_polling_loop(self) -> None:
+        """
+        Refresh the gas price at a fixed rate of one per ``update_interval``.
+        
+        Ticks are aimed at absolute deadlines, so fetch latency does not
+        stretch the period.
+        """
+        await self.scheduler.run()
+    
+    async def _poll_once(self) -> None:
+        """Refresh the gas price for one scheduler tick."""
+        if not self.is_monitoring:
+            self.scheduler.stop()
+            return
+        
+        try:
+            await self.update_gas_price()
+        except Exception as e:
+            self.log_limiter.error("monitoring", "Error in monitoring loop: %s", e, exc_info=True)
+            return
+        
+        if self.adaptive_interval is not None:
+            self.scheduler.set_interval(self.get_adaptive_interval())
+    
+    def get_adaptive_interval(self) -> float:
+        """
+        Get the polling interval the adaptive policy picks for the current market.
+        
+        Volatility is the coefficient of variation of the last
+        ``ADAPTIVE_VOLATILITY_WINDOW`` readings; proximity is the relative
+        distance from the latest price to the nearest threshold someone is
+        waiting on.
+        
+        Returns:
+            float: Interval in seconds, or ``update_interval`` when adaptive
+                polling is disabled or there is no data yet
+        """
+        policy = self.adaptive_interval
+        price = self.gas_history.last_price_wei() if self.gas_history else None
+        if policy is None or not price:
+            return self.update_interval
+        
+        stats = self.gas_history.stats
+        window = self.ADAPTIVE_VOLATILITY_WINDOW
+        mean = stats.window_mean(window)
+        std = stats.window_std(window)
+        volatility = std / mean if mean and std is not None else None
+        
+        threshold = self.thresholds.nearest_threshold(price)
+        distance = None if threshold is None else abs(threshold - price) / price
+        return policy.interval(volatility, distance)
+    
+    def get_scheduler_stats(self) -> Dict[str, object]:
+        """
+        Get cadence statistics of the polling loop.
+        
+        Returns:
+            Dict[str, object]: Tick, missed-tick, dropped-tick and overrun
+                counters with tick-lag, fetch-duration and overrun histograms
+        """
+        return self.scheduler.get_stats()
+    
+    async def _run_subscription_loop(
+        self,
+        on_subscribed: Optional[Callable[[], Awaitable[None]]] = None
+    ) -> None:
+        """
+        Refresh the gas price once per new block header.
+        
+        Args:
+            on_subscribed: Optional coroutine function awaited once the
+                subscription is established
+        
+        Raises:
+            SubscriptionUnavailableError: If the subscription cannot be
+                established or the connection is lost
+        """
+        async with EthSubscription(self.ws_url, ["newHeads"]) as subscription:
+            logger.info("Monitoring gas price on new block headers")
+            if on_subscribed is not None:
+                await on_subscribed()
+            async for header in subscription:
+                if not self.is_monitoring:
+                    return
+                
+                try:
+                    self.latest_block_number = int(header["number"], 16)
+                    if self.mempool is not None and header.get("baseFeePerGas") is not None:
+                        self.mempool.base_fee = int(header["baseFeePerGas"], 16)
+                except (KeyError, TypeError, ValueError):
+                    logger.debug("Ignoring malformed block header: %s", header)
+                    continue
+                
+                try:
+                    await self.update_gas_price()
+                except Exception as e:
+                    self.log_limiter.error("monitoring", "Error in monitoring loop: %s", e, exc_info=True)
+    
+    async def update_gas_price(self) -> Optional[int]:
+        """
+        Fetch the current gas price and append it to the history.
+        
+        The cached price is invalidated first, so every update records a
+        new reading; concurrent ``get_current_gas_price`` callers join the
+        fetch and see its result. When every source fails nothing is
+        recorded: the 50 Gwei default was never observed, so it must not
+        wake threshold waiters or reach the forecaster, candles or stores.
+        
+        Returns:
+            Optional[int]: The gas price that was recorded in Wei, or None
+                if every source failed
+        """
+        # Fetch current gas price
+        self.price_cache.invalidate()
+        block = self.latest_block_number if self.cache_per_block else None
+        gas_price = await self.price_cache.get(self._fetch_current_gas_price, block)
+        if gas_price is None:
+            self.skipped_updates += 1
+            self.log_limiter.warning("no_price", "No gas price from any source; skipping reading")
+            return None
+        self.log_limiter.reset("no_price")
+        
+        # Store with timestamp
+        self._record_gas_price(gas_price)
+        
+        if self.track_fee_history:
+            try:
+                await self.update_fee_history()
+            except Exception as e:
+                self.log_limiter.warning("fee_history", "Failed to update fee history: %s", e)
+        
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "Gas price updated: %.2f Gwei (history size: %d)",
+                self.wei_to_gwei(gas_price), len(self.gas_history)
+            )
+        
+        return gas_price
+    
+    def _record_gas_price(self, gas_price: int, timestamp_ns: Optional[int] = None) -> None:
+        """
+        Append a reading to the history and any attached stores.
+        
+        Args:
+            gas_price: Gas price in Wei
+            timestamp_ns: Reading time in epoch nanoseconds (default: now)
+        """
+        if timestamp_ns is None:
+            timestamp_ns = self.clock.time_ns()
+        
+        self.gas_history.append_ns(timestamp_ns, gas_price)
+        self.forecaster.update(timestamp_ns, gas_price)
+        self.thresholds.notify(gas_price)
+        if self.candles is not None:
+            self.candles.update(timestamp_ns, gas_price)
+        
+        if self.timeseries is not None:
+            try:
+                self.timeseries.append(timestamp_ns, gas_price)
+            except OSError as e:
+                self.log_limiter.error("persist", "Failed to persist gas reading: %s", e)
+        
+        if self.shared_feed is not None:
+            self._publish_shared_feed(timestamp_ns, gas_price)
+    
+    def _publish_shared_feed(self, timestamp_ns: int, gas_price: int) -> None:
+        """
+        Write the latest reading and rolling statistics to the shared feed.
+        
+        Args:
+            timestamp_ns: Reading time in epoch nanoseconds
+            gas_price: Gas price in Wei
+        """
+        stats = self.gas_history.stats
+        snapshot = self.latest_snapshot
+        base_fee = snapshot.base_fee if snapshot is not None else None
+        
+        def gwei(value: Optional[float]) -> Optional[float]:
+            return None if value is None else value / 1e9
+        
+        self.shared_feed.publish(
+            timestamp_ns,
+            gas_price,
+            block_number=self.latest_block_number,
+            base_fee=base_fee if base_fee is not None else self.fee_history.next_base_fee,
+            max_priority_fee=snapshot.max_priority_fee if snapshot is not None else None,
+            sample_count=len(self.gas_history),
+            mean_gwei=gwei(stats.window_mean()),
+            median_gwei=gwei(stats.median()),
+            min_gwei=gwei(stats.min()),
+            max_gwei=gwei(stats.max()),
+            std_gwei=gwei(stats.window_std()),
+        )
     
     async def stop_monitoring(self) -> None:
         """
@@ -130,6 +873,7 @@ class GasMonitor:
         
         logger.info("Stopping gas price monitoring")
         self.is_monitoring = False
+        self.scheduler.stop()
         
         if self._monitor_task and not self._monitor_task.done():
             self._monitor_task.cancel()
@@ -147,31 +891,483 @@ class GasMonitor:
         2. Etherscan Gas Oracle API
         3. Default fallback value
         
+        In "hedged" and "concurrent" fetch modes the sources overlap, the first
+        valid answer is used and the remaining fetches are cancelled. In
+        "consensus" mode every source is queried at once and the weighted
+        median of the answers that agree is used.
+        
+        Concurrent callers share a single in-flight fetch, and a price younger
+        than ``price_cache_ttl`` (or fetched at the latest block, with
+        ``cache_per_block``) is returned without any I/O. The default
+        fallback is never cached, and never recorded by ``update_gas_price``.
+        
         Returns:
             int: Current gas price in Wei
         """
-        # Try Web3 provider first
-        try:
-            gas_price = await asyncio.to_thread(self.web3.eth.gas_price)
-            logger.debug(f"Gas price from Web3: {self.wei_to_gwei(gas_price):.2f} Gwei")
+        block = self.latest_block_number if self.cache_per_block else None
+        gas_price = await self.price_cache.get(self._fetch_current_gas_price, block)
+        if gas_price is not None:
+            self.log_limiter.reset("default_price")
             return gas_price
-        except Exception as e:
-            logger.warning(f"Failed to get gas price from Web3: {e}")
-        
-        # Try Etherscan API as fallback
-        try:
-            api_gas_price = await self._fetch_gas_from_api()
-            if api_gas_price:
-                logger.debug(f"Gas price from API: {self.wei_to_gwei(api_gas_price):.2f} Gwei")
-                return api_gas_price
-        except Exception as e:
-            logger.warning(f"Failed to get gas price from API: {e}")
         
         # Final fallback: return a conservative default (50 Gwei)
+        self.default_fallbacks += 1
         default_price = self.gwei_to_wei(50)
-        logger.warning(f"Using default gas price: {self.wei_to_gwei(default_price):.2f} Gwei")
+        self.log_limiter.warning("default_price", "Using default gas price: %.2f Gwei", default_price / 1e9)
         return default_price
     
+    async def _fetch_current_gas_price(self) -> Optional[int]:
+        """
+        Consult the gas sources according to the fetch mode.
+        
+        Returns:
+            Optional[int]: Gas price in Wei, or None if every source failed
+        """
+        if self.fetch_mode == "sequential":
+            for name, fetch in self._gas_sources():
+                gas_price = await self._timed_fetch(name, fetch)
+                if gas_price:
+                    self.source_stats[name].record_win()
+                    return gas_price
+            return None
+        
+        if self.fetch_mode == "consensus":
+            consensus = await self._fetch_consensus()
+            return None if consensus is None else consensus.gas_price
+        
+        result = await self._fetch_first_valid()
+        if result is None:
+            return None
+        name, gas_price = result
+        self.source_stats[name].record_win()
+        return gas_price
+    
+    def get_cache_stats(self) -> Dict[str, float]:
+        """
+        Get hit, miss and coalesced counters of the gas price cache.
+        
+        Returns:
+            Dict[str, float]: Cache counters and the fraction of calls served
+                without starting a fetch
+        """
+        return self.price_cache.as_dict()
+    
+    def get_pending_gas_price_percentile(self, percentile: float) -> Optional[int]:
+        """
+        Get a percentile of the effective gas prices bid by pending transactions.
+        
+        Args:
+            percentile: Percentile between 0 and 100
+        
+        Returns:
+            Optional[int]: Gas price in Wei, or None if mempool monitoring is
+                disabled or no pending transactions have been seen in the window
+        """
+        if self.mempool is None:
+            return None
+        return self.mempool.gas_price_percentile(percentile)
+    
+    def get_pending_priority_fee_percentile(self, percentile: float) -> Optional[int]:
+        """
+        Get a percentile of the priority fees bid by pending transactions.
+        
+        Args:
+            percentile: Percentile between 0 and 100
+        
+        Returns:
+            Optional[int]: Priority fee in Wei, or None if mempool monitoring
+                is disabled or no pending transactions have been seen in the
+                window
+        """
+        if self.mempool is None:
+            return None
+        return self.mempool.priority_fee_percentile(percentile)
+    
+    async def get_gas_snapshot(self) -> GasSnapshot:
+        """
+        Fetch gas price, priority fee, block number and base fee together.
+        
+        The four calls (``eth_gasPrice``, ``eth_maxPriorityFeePerGas``,
+        ``eth_blockNumber`` and ``eth_getBlockByNumber('latest')``) are sent as
+        one JSON-RPC batch. If the provider cannot batch, or the batch fails,
+        they are issued as concurrent individual calls instead.
+        
+        Returns:
+            GasSnapshot: Combined gas state of the chain
+        
+        Raises:
+            Exception: If the gas price or block number cannot be fetched
+        """
+        results = None
+        batched = False
+        
+        if self._batch_supported:
+            try:
+                results = await self._fetch_snapshot_batch()
+                batched = True
+            except (AttributeError, NotImplementedError) as e:
+                self._batch_supported = False
+                logger.info("JSON-RPC batching unavailable (%s); using concurrent calls", e)
+            except Exception as e:
+                self.log_limiter.warning("snapshot", "Batched gas snapshot failed: %s; using concurrent calls", e)
+        
+        if results is None:
+            results = await self._fetch_snapshot_concurrent()
+        
+        gas_price, max_priority_fee, block_number, latest_block = results
+        snapshot = GasSnapshot.from_results(
+            gas_price, max_priority_fee, block_number, latest_block,
+            timestamp_ns=self.clock.time_ns(),
+            batched=batched,
+        )
+        self.latest_block_number = snapshot.block_number
+        self.latest_snapshot = snapshot
+        return snapshot
+    
+    def _snapshot_requests(self) -> list:
+        """Get the snapshot calls in result order, for batching or direct use."""
+        eth = self.web3.eth
+        return [eth.gas_price, eth.max_priority_fee, eth.block_number, eth.get_block("latest")]
+    
+    async def _fetch_snapshot_batch(self) -> list:
+        """
+        Fetch the snapshot values in a single JSON-RPC batch.
+        
+        Returns:
+            list: gas price, priority fee, block number and latest block
+        """
+        if self.is_async:
+            async with self.web3.batch_requests() as batch:
+                for request in self._snapshot_requests():
+                    batch.add(request)
+                return await batch.async_execute()
+        
+        def execute() -> list:
+            with self.web3.batch_requests() as batch:
+                for request in self._snapshot_requests():
+                    batch.add(request)
+                return batch.execute()
+        
+        return await asyncio.to_thread(execute)
+    
+    async def _fetch_snapshot_concurrent(self) -> list:
+        """
+        Fetch the snapshot values with concurrent individual calls.
+        
+        The priority fee and latest block are optional and become None if
+        their calls fail.
+        
+        Returns:
+            list: gas price, priority fee, block number and latest block
+        """
+        eth = self.web3.eth
+        if self.is_async:
+            calls = [eth.gas_price, eth.max_priority_fee, eth.block_number, eth.get_block("latest")]
+        else:
+            calls = [
+                asyncio.to_thread(lambda: eth.gas_price),
+                asyncio.to_thread(lambda: eth.max_priority_fee),
+                asyncio.to_thread(lambda: eth.block_number),
+                asyncio.to_thread(eth.get_block, "latest"),
+            ]
+        
+        gas_price, max_priority_fee, block_number, latest_block = await asyncio.gather(
+            *calls, return_exceptions=True
+        )
+        
+        for required in (gas_price, block_number):
+            if isinstance(required, BaseException):
+                raise required
+        if isinstance(max_priority_fee, BaseException):
+            logger.debug("eth_maxPriorityFeePerGas unavailable: %s", max_priority_fee)
+            max_priority_fee = None
+        if isinstance(latest_block, BaseException):
+            logger.debug("Latest block unavailable: %s", latest_block)
+            latest_block = None
+        
+        return [gas_price, max_priority_fee, block_number, latest_block]
+    
+    def _gas_sources(self) -> List[Tuple[str, Callable[[], Awaitable[Optional[int]]]]]:
+        """
+        Get the gas sources in order of preference.
+        
+        Returns:
+            List[Tuple[str, Callable]]: (name, fetch coroutine function) pairs
+        """
+        providers = [
+            (name, lambda web3=web3: self._fetch_gas_from_provider(web3))
+            for name, web3 in self.consensus_providers.items()
+        ]
+        sources = [("web3", self._fetch_gas_from_web3), *providers]
+        if self.etherscan_fallback:
+            sources.append(("etherscan", self._fetch_gas_from_api))
+        return sources
+    
+    async def _timed_fetch(
+        self,
+        name: str,
+        fetch: Callable[[], Awaitable[Optional[int]]]
+    ) -> Optional[int]:
+        """
+        Run a single source fetch, recording its latency and outcome.
+        
+        Args:
+            name: Source name
+            fetch: Coroutine function returning a gas price in Wei
+        
+        Returns:
+            Optional[int]: Gas price in Wei, or None if the source failed or
+                its circuit breaker is open
+        """
+        stats = self.source_stats[name]
+        if not stats.allow():
+            logger.debug("Skipping %s: circuit breaker is %s", name, stats.breaker.state)
+            return None
+        
+        stats.record_attempt()
+        started = time.perf_counter()
+        try:
+            gas_price = await fetch()
+        except asyncio.CancelledError:
+            stats.record_cancellation()
+            raise
+        except Exception as e:
+            stats.record_failure(time.perf_counter() - started)
+            self.log_limiter.warning(("source", name), "Failed to get gas price from %s: %s", name, e)
+            return None
+        
+        if not gas_price:
+            stats.record_failure(time.perf_counter() - started)
+            return None
+        
+        stats.record_success(time.perf_counter() - started, self.clock.monotonic_ns())
+        self.log_limiter.reset(("source", name))
+        logger.debug("Gas price from %s: %.2f Gwei", name, gas_price / 1e9)
+        return gas_price
+    
+    def _get_hedge_delay(self, name: str) -> float:
+        """
+        Get how long to wait on a source before starting the next one.
+        
+        Args:
+            name: Name of the source being hedged
+        
+        Returns:
+            float: Delay in seconds
+        """
+        if self.fetch_mode == "concurrent":
+            return 0.0
+        if self.hedge_delay is not None:
+            return self.hedge_delay
+        
+        stats = self.source_stats[name]
+        if len(stats.latencies) < self.MIN_HEDGE_SAMPLES:
+            return self.DEFAULT_HEDGE_DELAY
+        return stats.latency_percentile(self.hedge_percentile)
+    
+    async def _fetch_first_valid(self) -> Optional[Tuple[str, int]]:
+        """
+        Fetch from overlapping sources and keep the first valid answer.
+        
+        Each source is started once the previous ones have all failed or the
+        hedge delay has elapsed without a valid answer. Fetches still running
+        when a winner is found are cancelled.
+        
+        Returns:
+            Optional[Tuple[str, int]]: (source name, gas price in Wei) of the
+                winning source, or None if every source failed
+        """
+        pending: Dict[asyncio.Task, str] = {}
+        sources = self._gas_sources()
+        
+        try:
+            for index, (name, fetch) in enumerate(sources):
+                pending[asyncio.create_task(self._timed_fetch(name, fetch))] = name
+                
+                if index == len(sources) - 1:
+                    break
+                delay = self._get_hedge_delay(name)
+                if delay <= 0:
+                    continue
+                
+                result = await self._wait_first_valid(pending, delay)
+                if result is not None:
+                    return result
+            
+            return await self._wait_first_valid(pending, None)
+        finally:
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+    
+    @staticmethod
+    async def _wait_first_valid(
+        pending: Dict[asyncio.Task, str],
+        timeout: Optional[float]
+    ) -> Optional[Tuple[str, int]]:
+        """
+        Wait for the first pending fetch to return a valid price.
+        
+        Completed tasks are removed from ``pending``.
+        
+        Args:
+            pending: Running fetch tasks mapped to their source names
+            timeout: Maximum seconds to wait, or None for no limit
+        
+        Returns:
+            Optional[Tuple[str, int]]: (source name, gas price in Wei), or None
+                if the timeout expired or every pending fetch failed
+        """
+        loop = asyncio.get_running_loop()
+        deadline = None if timeout is None else loop.time() + timeout
+        
+        while pending:
+            remaining = None if deadline is None else max(0.0, deadline - loop.time())
+            done, _ = await asyncio.wait(
+                pending, timeout=remaining, return_when=asyncio.FIRST_COMPLETED
+            )
+            if not done:
+                return None
+            
+            for task in done:
+                name = pending.pop(task)
+                gas_price = task.result()
+                if gas_price:
+                    return name, gas_price
+        
+        return None
+    
+    async def _fetch_consensus(self) -> Optional[ConsensusResult]:
+        """
+        Fetch from every source at once and combine the answers.
+        
+        Sources still running when ``consensus_timeout`` expires are
+        cancelled and reported as missing. If no source has answered by then
+        the round waits for the first answer, since there is nothing to
+        combine yet. Each source's answer is recorded as an inlier or
+        outlier in its stats, and inliers are credited with a win.
+        
+        Returns:
+            Optional[ConsensusResult]: Consensus of the round, or None if
+                every source failed
+        """
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.consensus_timeout
+        pending: Dict[asyncio.Task, str] = {
+            asyncio.create_task(self._timed_fetch(name, fetch)): name
+            for name, fetch in self._gas_sources()
+        }
+        names = list(pending.values())
+        answers: Dict[str, int] = {}
+        
+        try:
+            while pending:
+                remaining = deadline - loop.time()
+                if remaining <= 0 and answers:
+                    break
+                done, _ = await asyncio.wait(
+                    pending,
+                    timeout=remaining if remaining > 0 else None,
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+                for task in done:
+                    name = pending.pop(task)
+                    gas_price = task.result()
+                    if gas_price:
+                        answers[name] = gas_price
+        finally:
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+        
+        now_ns = self.clock.monotonic_ns()
+        staleness: Dict[str, Optional[float]] = {}
+        for name in names:
+            last_success_ns = self.source_stats[name].last_success_ns
+            if name in answers:
+                staleness[name] = 0.0
+            elif last_success_ns is not None:
+                staleness[name] = (now_ns - last_success_ns) / 1e9
+            else:
+                staleness[name] = None
+        
+        result = self.consensus.combine(
+            answers,
+            self.source_weights,
+            missing=[name for name in names if name not in answers],
+            staleness=staleness,
+        )
+        if result is None:
+            return None
+        
+        for name in result.inliers:
+            self.source_stats[name].record_consensus(True)
+            self.source_stats[name].record_win()
+            self.log_limiter.reset(("outlier", name))
+        for name in result.outliers:
+            self.source_stats[name].record_consensus(False)
+            self.log_limiter.warning(
+                ("outlier", name), "Rejected outlier gas price from %s: %.2f Gwei (median %.2f Gwei)",
+                name, answers[name] / 1e9, result.median / 1e9
+            )
+        if not result.quorum_met:
+            self.log_limiter.warning(
+                "consensus_quorum", "Gas price consensus below quorum: %d of %d sources answered",
+                len(answers), self.consensus.quorum
+            )
+        
+        self.last_consensus = result
+        return result
+    
+    def get_consensus(self) -> Optional[ConsensusResult]:
+        """
+        Get the outcome of the most recent consensus round.
+        
+        Returns:
+            Optional[ConsensusResult]: Answers, rejected outliers, missing
+                sources, weight contributions and staleness of the last
+                round, or None before the first one
+        """
+        return self.last_consensus
+    
+    def get_source_stats(self) -> Dict[str, Dict[str, Optional[float]]]:
+        """
+        Get latency, outcome and win-rate counters for each gas source.
+        
+        Returns:
+            Dict[str, Dict[str, Optional[float]]]: Counters keyed by source name
+        """
+        return {name: stats.as_dict() for name, stats in self.source_stats.items()}
+    
+    async def _fetch_gas_from_web3(self) -> int:
+        """
+        Fetch gas price from the Web3 provider.
+        
+        AsyncWeb3 calls are awaited natively; synchronous Web3 calls are
+        offloaded to a worker thread so they never block the event loop.
+        
+        Returns:
+            int: Gas price in Wei
+        """
+        return await self._fetch_gas_from_provider(self.web3)
+    
+    @staticmethod
+    async def _fetch_gas_from_provider(web3: Union[Web3, AsyncWeb3]) -> int:
+        """
+        Fetch gas price from a Web3 or AsyncWeb3 instance.
+        
+        Args:
+            web3: Web3 instance to query
+        
+        Returns:
+            int: Gas price in Wei
+        """
+        if isinstance(web3, AsyncWeb3):
+            return await web3.eth.gas_price
+        return await asyncio.to_thread(lambda: web3.eth.gas_price)
+    
     async def _fetch_gas_from_api(self) -> Optional[int]:
         """
         Fetch gas price from Etherscan Gas Oracle API.
@@ -184,40 +1380,47 @@ class GasMonitor:
             url += f"&apikey={self.etherscan_api_key}"
         
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url, timeout=aiohttp.ClientTimeout(total=10)) as response:
-                    if response.status != 200:
-                        logger.warning(f"Etherscan API returned status {response.status}")
-                        return None
-                    
-                    data = await response.json()
-                    
-                    # Check for API error
-                    if data.get("status") != "1":
-                        logger.warning(f"Etherscan API error: {data.get('message')}")
-                        return None
-                    
-                    # Extract recommended gas price (in Gwei)
-                    result = data.get("result", {})
-                    # Use "ProposeGasPrice" or "SafeGasPrice" as recommended price
-                    gas_gwei = float(result.get("ProposeGasPrice", result.get("SafeGasPrice", 0)))
-                    
-                    if gas_gwei > 0:
-                        return self.gwei_to_wei(gas_gwei)
-                    
+            session = self._get_http_session()
+            async with session.get(url, timeout=aiohttp.ClientTimeout(total=10)) as response:
+                if response.status != 200:
+                    self.log_limiter.warning("etherscan", "Etherscan API returned status %s", response.status)
+                    return None
+                
+                data = await response.json()
+                
+                # Check for API error
+                if data.get("status") != "1":
+                    self.log_limiter.warning("etherscan", "Etherscan API error: %s", data.get("message"))
                     return None
-                    
+                
+                # Extract recommended gas price (in Gwei)
+                result = data.get("result", {})
+                # Use "ProposeGasPrice" or "SafeGasPrice" as recommended price
+                gas_gwei = float(result.get("ProposeGasPrice", result.get("SafeGasPrice", 0)))
+                
+                if gas_gwei > 0:
+                    self.log_limiter.reset("etherscan")
+                    self.log_limiter.reset("etherscan_error")
+                    return self.gwei_to_wei(gas_gwei)
+                
+                return None
+        
         except asyncio.TimeoutError:
-            logger.warning("Timeout fetching gas price from Etherscan API")
+            self.log_limiter.warning("etherscan", "Timeout fetching gas price from Etherscan API")
             return None
         except Exception as e:
-            logger.error(f"Error fetching gas price from API: {e}", exc_info=True)
+            # Kept apart from the expected failures above, so their repeats
+            # cannot hide a traceback
+            self.log_limiter.error("etherscan_error", "Error fetching gas price from API: %s", e, exc_info=True)
             return None
     
     def get_average_gas_price(self, window: int = 10) -> Optional[int]:
         """
         Calculate average gas price over a recent window.
         
+        Uses the running sums attached to the history, so the cost does not
+        depend on the window size.
+        
         Args:
             window: Number of recent readings to average (default: 10)
         
@@ -228,23 +1431,94 @@ class GasMonitor:
             logger.debug("No gas history available for average calculation")
             return None
         
-        # Get the most recent 'window' readings
-        recent_prices = list(self.gas_history)[-window:]
-        
-        if not recent_prices:
+        stats = self.gas_history.stats
+        mean_price = stats.window_mean(window)
+        if mean_price is None:
             return None
         
-        # Calculate average (prices are in Wei)
-        # Use regular division for better precision, then convert to int
-        avg_price = int(sum(price for _, price in recent_prices) / len(recent_prices))
+        avg_price = int(mean_price)
         
-        logger.debug(
-            f"Average gas price over {len(recent_prices)} readings: "
-            f"{self.wei_to_gwei(avg_price):.2f} Gwei"
-        )
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "Average gas price over %d readings: %.2f Gwei",
+                min(window, stats.count), self.wei_to_gwei(avg_price)
+            )
         
         return avg_price
     
+    def get_median_gas_price(self) -> Optional[int]:
+        """
+        Get the median gas price over the full history.
+        
+        Returns:
+            Optional[int]: Median gas price in Wei, or None if no data available
+        """
+        median = self.gas_history.stats.median()
+        return None if median is None else int(median)
+    
+    def get_gas_price_percentile(self, percentile: float) -> Optional[int]:
+        """
+        Get a percentile of the gas price over the full history.
+        
+        Args:
+            percentile: Percentile in the range 0-100
+        
+        Returns:
+            Optional[int]: Gas price in Wei, or None if no data available
+        """
+        value = self.gas_history.stats.percentile(percentile)
+        return None if value is None else int(value)
+    
+    def get_ema_gas_price(self, half_life: float = 20) -> Optional[int]:
+        """
+        Get an exponential moving average of the gas price.
+        
+        Args:
+            half_life: Half-life in readings; must be one of the monitor's
+                ``ema_half_lives`` (default: 20)
+        
+        Returns:
+            Optional[int]: EMA gas price in Wei, or None if no data available
+        """
+        ema = self.gas_history.stats.ema(half_life)
+        return None if ema is None else int(ema)
+    
+    def get_gas_price_volatility(self, window: int = 10) -> Optional[float]:
+        """
+        Get the standard deviation of the gas price over a recent window.
+        
+        Args:
+            window: Number of recent readings (default: 10)
+        
+        Returns:
+            Optional[float]: Standard deviation in Wei, or None if no data available
+        """
+        return self.gas_history.stats.window_std(window)
+    
+    def get_min_gas_price(self, window: Optional[int] = None) -> Optional[int]:
+        """
+        Get the lowest gas price over a recent window.
+        
+        Args:
+            window: Number of recent readings, or None for the full history
+        
+        Returns:
+            Optional[int]: Minimum gas price in Wei, or None if no data available
+        """
+        return self.gas_history.stats.min(window)
+    
+    def get_max_gas_price(self, window: Optional[int] = None) -> Optional[int]:
+        """
+        Get the highest gas price over a recent window.
+        
+        Args:
+            window: Number of recent readings, or None for the full history
+        
+        Returns:
+            Optional[int]: Maximum gas price in Wei, or None if no data available
+        """
+        return self.gas_history.stats.max(window)
+    
     def is_gas_price_favorable(self, threshold_gwei: float = 50) -> bool:
         """
         Check if current gas price is below the specified threshold.
@@ -256,21 +1530,234 @@ class GasMonitor:
             bool: True if current gas price is at or below threshold, False otherwise
         """
         if not self.gas_history:
-            logger.warning("No gas history available for threshold check")
+            self.log_limiter.warning("no_history", "No gas history available for threshold check")
             return False
         
         # Get most recent gas price
-        _, current_price_wei = self.gas_history[-1]
+        current_price_wei = self.gas_history.last_price_wei()
         current_price_gwei = self.wei_to_gwei(current_price_wei)
         
         is_favorable = current_price_gwei <= threshold_gwei
         
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "Gas price check: %.2f Gwei %s %s Gwei threshold",
+                current_price_gwei, "<=" if is_favorable else ">", threshold_gwei
+            )
+        
+        return is_favorable
+    
+    async def wait_for_price_below(
+        self,
+        threshold_gwei: float,
+        timeout: Optional[float] = None,
+        crossing: bool = False
+    ) -> int:
+        """
+        Wait until a reading is at or below a threshold.
+        
+        Unlike polling ``is_gas_price_favorable``, the waiter is woken by the
+        reading that reaches the threshold, and no other waiter is touched.
+        
+        Args:
+            threshold_gwei: Threshold in Gwei
+            timeout: Optional maximum wait in seconds
+            crossing: If True, wait for the price to cross the threshold from
+                above; otherwise return immediately if the latest reading
+                already satisfies it (default: False)
+        
+        Returns:
+            int: The gas price that reached the threshold, in Wei
+        
+        Raises:
+            asyncio.TimeoutError: If the threshold is not reached within timeout
+        """
+        future = self.thresholds.wait_below(self.gwei_to_wei(threshold_gwei), crossing)
+        return await asyncio.wait_for(future, timeout)
+    
+    async def wait_for_price_above(
+        self,
+        threshold_gwei: float,
+        timeout: Optional[float] = None,
+        crossing: bool = False
+    ) -> int:
+        """
+        Wait until a reading is at or above a threshold.
+        
+        Args:
+            threshold_gwei: Threshold in Gwei
+            timeout: Optional maximum wait in seconds
+            crossing: If True, wait for the price to cross the threshold from
+                below; otherwise return immediately if the latest reading
+                already satisfies it (default: False)
+        
+        Returns:
+            int: The gas price that reached the threshold, in Wei
+        
+        Raises:
+            asyncio.TimeoutError: If the threshold is not reached within timeout
+        """
+        future = self.thresholds.wait_above(self.gwei_to_wei(threshold_gwei), crossing)
+        return await asyncio.wait_for(future, timeout)
+    
+    def forecast_gas_price(self, steps: int = 5) -> Optional[GasForecast]:
+        """
+        Predict the gas price distribution for the next readings.
+        
+        With per-block monitoring each step is one block.
+        
+        Args:
+            steps: Number of readings ahead (default: 5)
+        
+        Returns:
+            Optional[GasForecast]: Log-normal predictive distribution per step,
+                or None if there is not enough history
+        """
+        return self.forecaster.forecast(steps)
+    
+    def is_waiting_favorable(self, steps: int = 5, min_probability: float = 0.6) -> bool:
+        """
+        Check if the price is likely to drop below the current one soon.
+        
+        Args:
+            steps: Number of readings the caller is willing to wait (default: 5)
+            min_probability: Required probability that some step within the
+                horizon is cheaper than the current price (default: 0.6)
+        
+        Returns:
+            bool: True if any of the next ``steps`` readings is at or below the
+                current price with at least ``min_probability``
+        """
+        forecast = self.forecast_gas_price(steps)
+        if forecast is None or not self.gas_history:
+            return False
+        
+        current_price_gwei = self.wei_to_gwei(self.gas_history.last_price_wei())
+        probability = float(forecast.probability_below(current_price_gwei).max())
+        
         logger.debug(
-            f"Gas price check: {current_price_gwei:.2f} Gwei "
-            f"{'<=' if is_favorable else '>'} {threshold_gwei} Gwei threshold"
+            "Waiting up to %d readings: %.0f%% chance of a price at or below %.2f Gwei",
+            steps, probability * 100, current_price_gwei
         )
+        return probability >= min_probability
+    
+    def estimate_costs(
+        self,
+        gas_units: Union[Sequence[int], np.ndarray],
+        urgency: Union[str, float] = "standard",
+        steps: int = 5,
+        blocks: int = 3
+    ) -> Optional[CostEstimate]:
+        """
+        Price a batch of candidate transactions in one vectorized call.
         
-        return is_favorable
+        Every price is an expected effective price, what a transaction is
+        likely to pay per gas, never the ``maxFeePerGas`` cap, which is
+        raised for base-fee growth and would make sending now look dearer
+        than waiting. The current price is, in order of preference, the next
+        block's base fee plus the priority fee recommended for inclusion
+        within ``blocks`` blocks at the urgency quantile, the urgency
+        percentile of pending transaction prices, or the latest reading.
+        Forecast prices are the urgency quantile of the predictive
+        distribution of readings at each step.
+        
+        Whether waiting pays (``best_step`` and ``savings_wei``) is judged
+        against the latest reading, the series the forecast models.
+        
+        Args:
+            gas_units: Gas limit of each transaction
+            urgency: "low", "standard", "high", "urgent" or a quantile
+                between 0 and 1 (default: "standard")
+            steps: Number of forecast readings to price; 0 skips the
+                forecast (default: 5)
+            blocks: Inclusion horizon of the fee recommendation (default: 3)
+        
+        Returns:
+            Optional[CostEstimate]: Cost arrays in Wei and ETH now and per
+                forecast step, or None if no gas price is known yet
+        
+        Raises:
+            ValueError: If the urgency is invalid or a gas limit is negative
+        """
+        quantile = urgency_quantile(urgency)
+        
+        gas_price = None
+        if self.fee_history.count:
+            recommendation = self.fee_history.recommend(blocks, quantile)
+            if recommendation is not None:
+                gas_price = self.fee_history.next_base_fee + recommendation.max_priority_fee_per_gas
+        if gas_price is None and self.mempool is not None:
+            gas_price = self.mempool.gas_price_percentile(quantile * 100)
+        if gas_price is None and self.gas_history:
+            gas_price = self.gas_history.last_price_wei()
+        if gas_price is None:
+            logger.warning("No gas price available for cost estimation")
+            return None
+        
+        forecast_prices = None
+        reference_price = None
+        forecast = self.forecast_gas_price(steps) if steps > 0 else None
+        if forecast is not None:
+            forecast_prices = forecast.quantile_gwei(quantile) * 1e9
+            reference_price = self.gas_history.last_price_wei()
+        
+        return CostEstimate.from_prices(gas_units, quantile, gas_price, forecast_prices, reference_price)
+    
+    async def update_fee_history(self) -> int:
+        """
+        Ingest ``eth_feeHistory`` for blocks not seen yet.
+        
+        Only the blocks after the last ingested one are requested, so a call
+        per new block fetches a single block.
+        
+        Returns:
+            int: Number of new blocks ingested
+        """
+        eth = self.web3.eth
+        if self.is_async:
+            newest_block = await eth.block_number
+        else:
+            newest_block = await asyncio.to_thread(lambda: eth.block_number)
+        self.latest_block_number = newest_block
+        
+        block_count = self.fee_history.blocks_to_fetch(newest_block)
+        if block_count == 0:
+            return 0
+        
+        percentiles = list(self.fee_history.reward_percentiles)
+        if self.is_async:
+            result = await eth.fee_history(block_count, newest_block, percentiles)
+        else:
+            result = await asyncio.to_thread(eth.fee_history, block_count, newest_block, percentiles)
+        
+        ingested = self.fee_history.ingest(result)
+        if self.mempool is not None and self.fee_history.next_base_fee is not None:
+            self.mempool.base_fee = self.fee_history.next_base_fee
+        return ingested
+    
+    def recommend_eip1559_fees(
+        self,
+        blocks: int = 3,
+        confidence: float = 0.9
+    ) -> Optional[FeeRecommendation]:
+        """
+        Recommend EIP-1559 fees for inclusion within a number of blocks.
+        
+        The answer is a constant-time lookup into tables refreshed by
+        ``update_fee_history``.
+        
+        Args:
+            blocks: Inclusion horizon in blocks (default: 3)
+            confidence: Probability of inclusion within ``blocks`` (default: 0.9)
+        
+        Returns:
+            Optional[FeeRecommendation]: Suggested ``maxFeePerGas`` and
+                ``maxPriorityFeePerGas``, or None if no fee history is available
+        """
+        recommendation = self.fee_history.recommend(blocks, confidence)
+        if recommendation is None:
+            logger.warning("No fee history available for fee recommendation")
+        return recommendation
     
     def get_current_price_gwei(self) -> Optional[float]:
         """
@@ -282,17 +1769,49 @@ class GasMonitor:
         if not self.gas_history:
             return None
         
-        _, price_wei = self.gas_history[-1]
-        return self.wei_to_gwei(price_wei)
+        return self.wei_to_gwei(self.gas_history.last_price_wei())
+    
+    def get_candles(
+        self,
+        start: datetime,
+        end: Optional[datetime] = None,
+        points: Optional[int] = None
+    ) -> Optional[Candles]:
+        """
+        Get OHLC candles over a time range.
+        
+        The coarsest resolution that still covers the range and yields at
+        least ``points`` candles is used, so a month-long chart does not read
+        minute candles.
+        
+        Args:
+            start: Start of the range
+            end: End of the range (default: now)
+            points: Minimum number of candles wanted; None uses the finest
+                resolution that covers the range
+        
+        Returns:
+            Optional[Candles]: Candles in Gwei with sample counts as volume,
+                or None if candles are disabled
+        """
+        if self.candles is None:
+            return None
+        start_ns = datetime_to_ns(start)
+        end_ns = self.clock.time_ns() if end is None else datetime_to_ns(end)
+        return self.candles.query(start_ns, end_ns, points)
     
     def get_gas_history(self) -> List[Tuple[datetime, int]]:
         """
         Get the complete gas price history.
         
+        Compatibility view that copies the columnar history into tuples; use
+        ``gas_history.timestamps_ns()`` and ``gas_history.prices_wei()`` for
+        zero-copy NumPy access.
+        
         Returns:
             List[Tuple[datetime, int]]: List of (timestamp, price_wei) tuples
         """
-        return list(self.gas_history)
+        return self.gas_history.to_list()
     
     @staticmethod
     def wei_to_gwei(wei: int) -> float:
@@ -0,0 +1,326 @@
+"""
+Gas History Module
+
+This module provides the bounded gas price history used by GasMonitor: a
+columnar ring buffer of int64 epoch-nanosecond timestamps and uint64/float64
+price columns, with rolling statistics kept up to date as readings arrive.
+"""
+
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+import numpy as np
+
+from .rolling_stats import RollingGasStatistics
+
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_ONE_MICROSECOND = timedelta(microseconds=1)
+
+
+def datetime_to_ns(timestamp: datetime) -> int:
+    """
+    Convert a datetime to integer nanoseconds since the Unix epoch.
+
+    Naive datetimes are interpreted as local time, matching ``datetime.now()``.
+
+    Args:
+        timestamp: Datetime to convert
+
+    Returns:
+        int: Nanoseconds since the epoch
+    """
+    if timestamp.tzinfo is None:
+        timestamp = timestamp.astimezone()
+    return (timestamp - _EPOCH) // _ONE_MICROSECOND * 1000
+
+
+def ns_to_datetime(timestamp_ns: int) -> datetime:
+    """
+    Convert integer nanoseconds since the Unix epoch to a naive local datetime.
+
+    Args:
+        timestamp_ns: Nanoseconds since the epoch
+
+    Returns:
+        datetime: Naive local datetime with microsecond precision
+    """
+    microseconds = int(timestamp_ns) // 1000
+    seconds, remainder = divmod(microseconds, 1_000_000)
+    return datetime.fromtimestamp(seconds).replace(microsecond=remainder)
+
+
+class GasHistory:
+    """
+    Bounded columnar history of gas price readings.
+
+    Each reading is stored twice, at slot ``i`` and ``i + maxlen`` of arrays
+    sized ``2 * maxlen``, so the most recent ``n`` readings are always one
+    contiguous slice. Window accessors therefore return read-only NumPy views
+    without copying. The columns cost 48 bytes per reading including the
+    mirror copy, and ``stats`` another 48, all preallocated: about 97 bytes
+    per reading in total as measured by ``bench_gas_monitor.py``.
+
+    The history is append-only: readings enter through ``append``,
+    ``append_ns`` or ``extend`` and leave by eviction once ``maxlen`` is
+    reached, which keeps ``stats`` consistent with the stored readings.
+
+    Attributes:
+        maxlen: Maximum number of readings to keep
+        stats: Incremental statistics over the stored prices
+    """
+
+    def __init__(
+        self,
+        maxlen: int,
+        readings: Iterable[Tuple[datetime, int]] = (),
+        ema_half_lives: Iterable[float] = (5, 20, 100)
+    ):
+        """
+        Initialize the history.
+
+        Args:
+            maxlen: Maximum number of readings to keep
+            readings: Optional initial (timestamp, price_wei) readings
+            ema_half_lives: Half-lives, in readings, of the maintained EMAs
+
+        Raises:
+            ValueError: If maxlen is not positive
+        """
+        if maxlen <= 0:
+            raise ValueError("maxlen must be positive")
+
+        self.maxlen = maxlen
+        self._timestamps_ns = np.zeros(2 * maxlen, dtype=np.int64)
+        self._prices_wei = np.zeros(2 * maxlen, dtype=np.uint64)
+        self._prices_gwei = np.zeros(2 * maxlen, dtype=np.float64)
+        self._total = 0
+        self.stats = RollingGasStatistics(maxlen, ema_half_lives=ema_half_lives)
+        self.extend(readings)
+
+    def append_ns(self, timestamp_ns: int, price_wei: int) -> None:
+        """
+        Append a reading given as epoch nanoseconds and Wei.
+
+        Args:
+            timestamp_ns: Reading time in nanoseconds since the epoch
+            price_wei: Gas price in Wei
+        """
+        slot = self._total % self.maxlen
+        mirror = slot + self.maxlen
+        self._timestamps_ns[slot] = self._timestamps_ns[mirror] = timestamp_ns
+        self._prices_wei[slot] = self._prices_wei[mirror] = price_wei
+        self._prices_gwei[slot] = self._prices_gwei[mirror] = price_wei / 1e9
+        self._total += 1
+        self.stats.push(int(price_wei))
+
+    def extend_ns(self, timestamps_ns: np.ndarray, prices_wei: np.ndarray) -> None:
+        """
+        Append many readings given as epoch-nanosecond and Wei arrays.
+
+        Columns are written with vectorized copies; only the readings that
+        remain in the history are fed to the statistics.
+
+        Args:
+            timestamps_ns: Reading times in nanoseconds since the epoch
+            prices_wei: Gas prices in Wei, same length as ``timestamps_ns``
+        """
+        timestamps_ns = np.asarray(timestamps_ns, dtype=np.int64)[-self.maxlen:]
+        prices_wei = np.asarray(prices_wei, dtype=np.uint64)[-self.maxlen:]
+        count = len(prices_wei)
+        if not count:
+            return
+
+        slots = (self._total + np.arange(count)) % self.maxlen
+        for offset in (0, self.maxlen):
+            self._timestamps_ns[slots + offset] = timestamps_ns
+            self._prices_wei[slots + offset] = prices_wei
+            self._prices_gwei[slots + offset] = prices_wei / 1e9
+        self._total += count
+
+        for price_wei in prices_wei.tolist():
+            self.stats.push(price_wei)
+
+    def append(self, reading: Tuple[datetime, int]) -> None:
+        """
+        Append a (timestamp, price_wei) reading, evicting the oldest if full.
+
+        Args:
+            reading: Tuple of reading time and gas price in Wei
+        """
+        timestamp, price_wei = reading
+        self.append_ns(datetime_to_ns(timestamp), price_wei)
+
+    def extend(self, readings: Iterable[Tuple[datetime, int]]) -> None:
+        """
+        Append several (timestamp, price_wei) readings in order.
+
+        Args:
+            readings: Iterable of readings
+        """
+        for reading in readings:
+            self.append(reading)
+
+    def clear(self) -> None:
+        """Remove all readings and reset the statistics."""
+        self._total = 0
+        self.stats.reset()
+
+    def __len__(self) -> int:
+        return min(self._total, self.maxlen)
+
+    def _window_slice(self, window: Optional[int]) -> slice:
+        """Get the contiguous slice holding the last ``window`` readings."""
+        count = len(self)
+        if window is None or window <= 0 or window > count:
+            window = count
+        end = (self._total - 1) % self.maxlen + self.maxlen + 1 if self._total else 0
+        return slice(end - window, end)
+
+    def _view(self, column: np.ndarray, window: Optional[int]) -> np.ndarray:
+        view = column[self._window_slice(window)]
+        view.flags.writeable = False
+        return view
+
+    def timestamps_ns(self, window: Optional[int] = None) -> np.ndarray:
+        """
+        Get reading times of the last ``window`` readings, oldest first.
+
+        Args:
+            window: Number of recent readings, or None for all
+
+        Returns:
+            np.ndarray: Read-only int64 view of epoch nanoseconds
+        """
+        return self._view(self._timestamps_ns, window)
+
+    def prices_wei(self, window: Optional[int] = None) -> np.ndarray:
+        """
+        Get gas prices of the last ``window`` readings, oldest first.
+
+        Args:
+            window: Number of recent readings, or None for all
+
+        Returns:
+            np.ndarray: Read-only uint64 view of prices in Wei
+        """
+        return self._view(self._prices_wei, window)
+
+    def prices_gwei(self, window: Optional[int] = None) -> np.ndarray:
+        """
+        Get gas prices of the last ``window`` readings in Gwei, oldest first.
+
+        Args:
+            window: Number of recent readings, or None for all
+
+        Returns:
+            np.ndarray: Read-only float64 view of prices in Gwei
+        """
+        return self._view(self._prices_gwei, window)
+
+    def time_slice(self, start_ns: int, end_ns: int) -> slice:
+        """
+        Locate readings with ``start_ns <= timestamp < end_ns`` by binary search.
+
+        Assumes readings were appended in non-decreasing time order.
+
+        Args:
+            start_ns: Inclusive start in epoch nanoseconds
+            end_ns: Exclusive end in epoch nanoseconds
+
+        Returns:
+            slice: Slice into the arrays returned by the window accessors
+                called without a window
+        """
+        timestamps = self.timestamps_ns()
+        start = int(np.searchsorted(timestamps, start_ns, side="left"))
+        end = int(np.searchsorted(timestamps, end_ns, side="left"))
+        return slice(start, max(start, end))
+
+    def aggregate(
+        self,
+        window: Optional[int] = None,
+        start_ns: Optional[int] = None,
+        end_ns: Optional[int] = None
+    ) -> Optional[Dict[str, float]]:
+        """
+        Compute vectorized aggregates over a window or a time range.
+
+        Args:
+            window: Number of recent readings, or None for all
+            start_ns: Optional inclusive start time; restricts to a time range
+            end_ns: Optional exclusive end time; restricts to a time range
+
+        Returns:
+            Optional[Dict[str, float]]: count, mean, min, max and std in Gwei,
+                or None if no readings match
+        """
+        prices = self.prices_gwei(window)
+        if start_ns is not None or end_ns is not None:
+            timestamps = self.timestamps_ns(window)
+            start = 0 if start_ns is None else np.searchsorted(timestamps, start_ns, side="left")
+            end = len(timestamps) if end_ns is None else np.searchsorted(timestamps, end_ns, side="left")
+            prices = prices[start:max(start, end)]
+
+        if not len(prices):
+            return None
+        return {
+            "count": int(len(prices)),
+            "mean": float(prices.mean()),
+            "min": float(prices.min()),
+            "max": float(prices.max()),
+            "std": float(prices.std()),
+        }
+
+    def last_price_wei(self) -> Optional[int]:
+        """
+        Get the most recent gas price without building a timestamp.
+
+        Returns:
+            Optional[int]: Most recent gas price in Wei, or None if empty
+        """
+        if not self._total:
+            return None
+        return int(self._prices_wei[(self._total - 1) % self.maxlen])
+
+    def __getitem__(self, index: Union[int, slice]):
+        """
+        Get readings as (timestamp, price_wei) tuples, like the former deque.
+
+        Args:
+            index: Position (negative counts from the newest) or slice
+
+        Returns:
+            Tuple[datetime, int] for an int, or a list of tuples for a slice
+        """
+        if isinstance(index, slice):
+            return self.to_list()[index]
+
+        count = len(self)
+        if index < 0:
+            index += count
+        if not 0 <= index < count:
+            raise IndexError("gas history index out of range")
+
+        position = self._window_slice(None).start + index
+        return (
+            ns_to_datetime(self._timestamps_ns[position]),
+            int(self._prices_wei[position]),
+        )
+
+    def __iter__(self) -> Iterator[Tuple[datetime, int]]:
+        return iter(self.to_list())
+
+    def to_list(self) -> List[Tuple[datetime, int]]:
+        """
+        Get all readings as (timestamp, price_wei) tuples, oldest first.
+
+        Returns:
+            List[Tuple[datetime, int]]: Copied readings
+        """
+        return [
+            (ns_to_datetime(timestamp_ns), price_wei)
+            for timestamp_ns, price_wei in zip(
+                self.timestamps_ns().tolist(), self.prices_wei().tolist()
+            )
+        ]
@@ -0,0 +1,126 @@
+"""
+HTTP Connection Pool Module
+
+This module builds long-lived, pooled aiohttp sessions for the gas oracle
+fallback and tracks how often pooled connections are reused.
+"""
+
+import logging
+from types import SimpleNamespace
+from typing import Dict, Optional
+
+import aiohttp
+
+
+# Configure module logger
+logger = logging.getLogger(__name__)
+
+
+class HttpConnectionStats:
+    """
+    Counters describing connection reuse for a pooled HTTP session.
+
+    Attributes:
+        requests: Number of HTTP requests started
+        connections_created: Number of new TCP (and TLS) connections opened
+        connections_reused: Number of requests served over a pooled connection
+        dns_cache_hits: Number of host resolutions answered from the DNS cache
+    """
+
+    def __init__(self):
+        """Initialize all counters to zero."""
+        self.requests = 0
+        self.connections_created = 0
+        self.connections_reused = 0
+        self.dns_cache_hits = 0
+
+    @property
+    def reuse_ratio(self) -> float:
+        """Fraction of connections acquired from the pool rather than opened."""
+        acquired = self.connections_created + self.connections_reused
+        return self.connections_reused / acquired if acquired else 0.0
+
+    def as_dict(self) -> Dict[str, float]:
+        """
+        Get the counters as a plain dictionary.
+
+        Returns:
+            Dict[str, float]: Counter values plus the reuse ratio
+        """
+        return {
+            "requests": self.requests,
+            "connections_created": self.connections_created,
+            "connections_reused": self.connections_reused,
+            "dns_cache_hits": self.dns_cache_hits,
+            "reuse_ratio": self.reuse_ratio,
+        }
+
+    def trace_config(self) -> aiohttp.TraceConfig:
+        """
+        Build an aiohttp trace config that updates these counters.
+
+        Returns:
+            aiohttp.TraceConfig: Trace config to pass to a ClientSession
+        """
+        trace_config = aiohttp.TraceConfig()
+
+        async def on_request_start(session, context: SimpleNamespace, params) -> None:
+            self.requests += 1
+
+        async def on_connection_create_end(session, context: SimpleNamespace, params) -> None:
+            self.connections_created += 1
+
+        async def on_connection_reuseconn(session, context: SimpleNamespace, params) -> None:
+            self.connections_reused += 1
+
+        async def on_dns_cache_hit(session, context: SimpleNamespace, params) -> None:
+            self.dns_cache_hits += 1
+
+        trace_config.on_request_start.append(on_request_start)
+        trace_config.on_connection_create_end.append(on_connection_create_end)
+        trace_config.on_connection_reuseconn.append(on_connection_reuseconn)
+        trace_config.on_dns_cache_hit.append(on_dns_cache_hit)
+        return trace_config
+
+
+def create_http_session(
+    max_connections: int = 10,
+    max_connections_per_host: int = 4,
+    keepalive_timeout: float = 30,
+    dns_cache_ttl: int = 300,
+    timeout: float = 10,
+    stats: Optional[HttpConnectionStats] = None
+) -> aiohttp.ClientSession:
+    """
+    Create a pooled aiohttp session with keep-alive and bounded connections.
+
+    Must be called from within a running event loop.
+
+    Args:
+        max_connections: Total simultaneous connections (default: 10)
+        max_connections_per_host: Simultaneous connections per host (default: 4)
+        keepalive_timeout: Seconds an idle connection stays pooled (default: 30)
+        dns_cache_ttl: Seconds resolved addresses are cached (default: 300)
+        timeout: Default total request timeout in seconds (default: 10)
+        stats: Optional counters to update from session trace events
+
+    Returns:
+        aiohttp.ClientSession: Session owning its connector
+    """
+    connector = aiohttp.TCPConnector(
+        limit=max_connections,
+        limit_per_host=max_connections_per_host,
+        keepalive_timeout=keepalive_timeout,
+        ttl_dns_cache=dns_cache_ttl,
+    )
+    trace_configs = [stats.trace_config()] if stats is not None else None
+
+    logger.debug(
+        f"Creating pooled HTTP session (limit={max_connections}, "
+        f"limit_per_host={max_connections_per_host}, keepalive={keepalive_timeout}s)"
+    )
+    return aiohttp.ClientSession(
+        connector=connector,
+        timeout=aiohttp.ClientTimeout(total=timeout),
+        trace_configs=trace_configs,
+    )
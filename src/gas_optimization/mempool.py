@@ -0,0 +1,373 @@
+"""
+Mempool Fee Module
+
+This module consumes pending transactions from a local node and keeps
+streaming quantile sketches of the fees they bid, so GasMonitor can answer
+"what do pending transactions pay right now" during congestion spikes,
+when the node's suggested ``gas_price`` lags the competition.
+
+Pending transactions are read either from an ``eth_subscribe
+newPendingTransactions`` stream with full transaction objects, or by
+polling ``txpool_content``.
+"""
+
+import logging
+from typing import Any, Awaitable, Callable, Dict, Iterable, Mapping, Optional, Tuple, Union
+
+import aiohttp
+import numpy as np
+
+from .clock import SystemClock, VirtualClock
+from .http_pool import create_http_session
+from .quantile_sketch import WindowedQuantiles
+from .subscription import (
+    DEFAULT_MAX_RETRY_DELAY,
+    DEFAULT_RETRY_DELAY,
+    EthSubscription,
+    resubscribe_with_backoff,
+)
+
+
+# Configure module logger
+logger = logging.getLogger(__name__)
+
+
+def _to_int(value: Any) -> Optional[int]:
+    """Parse an RPC quantity given as a hex string or an integer."""
+    if value is None:
+        return None
+    if isinstance(value, str):
+        return int(value, 16)
+    return int(value)
+
+
+def transaction_fees(
+    tx: Mapping[str, Any],
+    base_fee: Optional[int] = None
+) -> Optional[Tuple[int, int]]:
+    """
+    Get the gas price and priority fee a pending transaction bids.
+
+    For EIP-1559 transactions the effective gas price is
+    ``min(maxFeePerGas, base_fee + maxPriorityFeePerGas)``; without a known
+    base fee, ``maxFeePerGas`` is used. Legacy transactions bid ``gasPrice``,
+    of which everything above the base fee is the priority fee.
+
+    Args:
+        tx: Transaction object as returned by the node
+        base_fee: Base fee of the next block in Wei, if known
+
+    Returns:
+        Optional[Tuple[int, int]]: (effective gas price, priority fee) in
+            Wei, or None if the transaction carries no fee fields
+    """
+    try:
+        max_fee = _to_int(tx.get("maxFeePerGas"))
+        tip = _to_int(tx.get("maxPriorityFeePerGas"))
+        if max_fee is not None and tip is not None:
+            if base_fee is None:
+                return max_fee, tip
+            gas_price = min(max_fee, base_fee + tip)
+            return gas_price, max(0, gas_price - base_fee)
+
+        gas_price = _to_int(tx.get("gasPrice"))
+    except (TypeError, ValueError):
+        return None
+    if gas_price is None:
+        return None
+    return gas_price, gas_price if base_fee is None else max(0, gas_price - base_fee)
+
+
+class MempoolMonitor:
+    """
+    Sliding-window fee quantiles of pending transactions.
+
+    Effective gas prices and priority fees are added to two
+    ``WindowedQuantiles`` of KLL sketches, so memory stays constant no matter
+    how many transactions arrive, and percentiles are answered from at most
+    a few thousand retained items.
+
+    With a WebSocket URL, transactions stream in from ``eth_subscribe
+    newPendingTransactions`` (full objects, as supported by Geth and
+    Erigon). With an HTTP URL, ``txpool_content`` is polled and each poll
+    replaces the window with the current pending set. A lost or rejected
+    subscription is retried with capped exponential backoff; if an HTTP URL
+    is configured, polling fills in until the subscription is back.
+
+    Attributes:
+        ws_url: Optional WebSocket endpoint for the pending stream
+        http_url: Optional HTTP endpoint for ``txpool_content`` polling
+        poll_interval: Seconds between ``txpool_content`` polls
+        base_fee: Base fee of the next block in Wei, used for effective prices
+        gas_prices: Window of effective gas prices in Wei
+        priority_fees: Window of priority fees in Wei
+        transactions: Number of transactions ingested
+        skipped: Number of notifications without fee fields (e.g. bare hashes)
+        is_running: Flag indicating if the consumer loop is active
+    """
+
+    # Backoff between attempts to restore a lost pending-transaction stream
+    SUBSCRIPTION_RETRY_DELAY = DEFAULT_RETRY_DELAY
+    SUBSCRIPTION_RETRY_MAX_DELAY = DEFAULT_MAX_RETRY_DELAY
+
+    def __init__(
+        self,
+        ws_url: Optional[str] = None,
+        http_url: Optional[str] = None,
+        window: float = 60.0,
+        buckets: int = 6,
+        k: int = 200,
+        poll_interval: float = 2.0,
+        clock: Optional[Union[SystemClock, VirtualClock]] = None,
+        http_session: Optional[aiohttp.ClientSession] = None
+    ):
+        """
+        Initialize the consumer.
+
+        Args:
+            ws_url: Optional WebSocket endpoint for ``newPendingTransactions``
+            http_url: Optional HTTP endpoint for ``txpool_content`` polling
+            window: Seconds of streamed transactions covered by the
+                quantiles (default: 60.0)
+            buckets: Number of time buckets the window is split into
+                (default: 6)
+            k: Sketch accuracy parameter; rank error is about 1.7 / k
+                (default: 200)
+            poll_interval: Seconds between ``txpool_content`` polls
+                (default: 2.0)
+            clock: Time source (default: wall-clock ``SystemClock``)
+            http_session: Optional shared aiohttp session for polling; the
+                monitor will not close a session it did not create
+
+        Raises:
+            ValueError: If neither URL is given
+        """
+        if ws_url is None and http_url is None:
+            raise ValueError("ws_url or http_url is required")
+
+        self.ws_url = ws_url
+        self.http_url = http_url
+        self.poll_interval = poll_interval
+        self.clock = clock or SystemClock()
+        self.base_fee: Optional[int] = None
+
+        self.gas_prices = WindowedQuantiles(window, buckets, k, clock=self.clock)
+        self.priority_fees = WindowedQuantiles(window, buckets, k, clock=self.clock)
+        self.transactions = 0
+        self.skipped = 0
+
+        self._http_session = http_session
+        self._owns_http_session = http_session is None
+        self._request_id = 0
+        self.is_running = False
+
+    def ingest_transaction(self, tx: Any) -> bool:
+        """
+        Add one pending transaction to the sketches.
+
+        Args:
+            tx: Transaction object; anything else (such as a bare hash) is
+                counted as skipped
+
+        Returns:
+            bool: True if the transaction's fees were recorded
+        """
+        fees = transaction_fees(tx, self.base_fee) if isinstance(tx, Mapping) else None
+        if fees is None:
+            self.skipped += 1
+            return False
+
+        self.gas_prices.update(fees[0])
+        self.priority_fees.update(fees[1])
+        self.transactions += 1
+        return True
+
+    def ingest_transactions(self, txs: Iterable[Any]) -> int:
+        """
+        Add a batch of pending transactions to the sketches.
+
+        Args:
+            txs: Transaction objects
+
+        Returns:
+            int: Number of transactions whose fees were recorded
+        """
+        base_fee = self.base_fee
+        gas_prices, priority_fees = [], []
+        for tx in txs:
+            fees = transaction_fees(tx, base_fee) if isinstance(tx, Mapping) else None
+            if fees is None:
+                self.skipped += 1
+                continue
+            gas_prices.append(fees[0])
+            priority_fees.append(fees[1])
+
+        if gas_prices:
+            self.gas_prices.update_many(np.array(gas_prices, dtype=np.float64))
+            self.priority_fees.update_many(np.array(priority_fees, dtype=np.float64))
+            self.transactions += len(gas_prices)
+        return len(gas_prices)
+
+    def gas_price_percentile(self, percentile: float) -> Optional[int]:
+        """
+        Get a percentile of the effective gas prices in the window.
+
+        Args:
+            percentile: Percentile between 0 and 100
+
+        Returns:
+            Optional[int]: Gas price in Wei, or None if the window is empty
+        """
+        value = self.gas_prices.percentile(percentile)
+        return None if value is None else int(value)
+
+    def priority_fee_percentile(self, percentile: float) -> Optional[int]:
+        """
+        Get a percentile of the priority fees in the window.
+
+        Args:
+            percentile: Percentile between 0 and 100
+
+        Returns:
+            Optional[int]: Priority fee in Wei, or None if the window is empty
+        """
+        value = self.priority_fees.percentile(percentile)
+        return None if value is None else int(value)
+
+    def gas_price_rank(self, gas_price: int) -> float:
+        """
+        Get the fraction of pending transactions bidding at most a gas price.
+
+        Args:
+            gas_price: Gas price in Wei
+
+        Returns:
+            float: Fraction between 0 and 1
+        """
+        return self.gas_prices.sketch().rank(gas_price)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get ingestion counters and headline percentiles.
+
+        Returns:
+            Dict[str, Any]: Transaction and skip counters, transactions in
+                the window, and p10/p50/p90 gas prices and priority fees in Wei
+        """
+        return {
+            "transactions": self.transactions,
+            "skipped": self.skipped,
+            "window_transactions": self.gas_prices.count,
+            "base_fee": self.base_fee,
+            **{f"gas_price_p{p}": self.gas_price_percentile(p) for p in (10, 50, 90)},
+            **{f"priority_fee_p{p}": self.priority_fee_percentile(p) for p in (10, 50, 90)},
+        }
+
+    async def run(self) -> None:
+        """
+        Consume pending transactions until stopped or cancelled.
+
+        The subscription is used when ``ws_url`` is set; ``txpool_content``
+        polling is used otherwise. While the subscription cannot be
+        established or is lost, it is retried with capped exponential
+        backoff, and ``txpool_content`` is polled meanwhile if ``http_url``
+        is set.
+        """
+        self.is_running = True
+        try:
+            if self.ws_url is not None:
+                await resubscribe_with_backoff(
+                    self._run_subscription,
+                    lambda: self.is_running,
+                    self.clock.sleep,
+                    fallback=self._run_polling if self.http_url is not None else None,
+                    fallback_description="polling txpool_content",
+                    retry_delay=self.SUBSCRIPTION_RETRY_DELAY,
+                    max_retry_delay=self.SUBSCRIPTION_RETRY_MAX_DELAY,
+                    log=logger,
+                )
+            else:
+                await self._run_polling()
+        finally:
+            self.is_running = False
+
+    def stop(self) -> None:
+        """Stop consuming after the current message or poll."""
+        self.is_running = False
+
+    async def _run_subscription(
+        self,
+        on_subscribed: Optional[Callable[[], Awaitable[None]]] = None
+    ) -> None:
+        """
+        Stream full pending transactions.
+
+        Args:
+            on_subscribed: Optional coroutine function awaited once the
+                subscription is established
+
+        Raises:
+            SubscriptionUnavailableError: If the subscription cannot be
+                established or the connection is lost
+        """
+        params = ["newPendingTransactions", True]
+        async with EthSubscription(self.ws_url, params) as subscription:
+            logger.info("Streaming pending transactions")
+            if on_subscribed is not None:
+                await on_subscribed()
+            async for tx in subscription:
+                if not self.is_running:
+                    return
+                self.ingest_transaction(tx)
+
+    async def _run_polling(self) -> None:
+        """Poll ``txpool_content`` every ``poll_interval`` seconds."""
+        while self.is_running:
+            try:
+                await self.poll_txpool()
+            except Exception as e:
+                logger.warning("Failed to poll txpool_content: %s", e)
+            await self.clock.sleep(self.poll_interval)
+
+    async def poll_txpool(self) -> int:
+        """
+        Replace the window with the node's current pending transactions.
+
+        Returns:
+            int: Number of pending transactions recorded
+
+        Raises:
+            RuntimeError: If no HTTP URL is configured or the node returns
+                an error
+        """
+        if self.http_url is None:
+            raise RuntimeError("txpool_content polling needs http_url")
+
+        self._request_id += 1
+        payload = {"jsonrpc": "2.0", "id": self._request_id, "method": "txpool_content", "params": []}
+        async with self._get_http_session().post(self.http_url, json=payload) as response:
+            response.raise_for_status()
+            message = await response.json(content_type=None)
+        if "error" in message:
+            raise RuntimeError(f"txpool_content failed: {message['error']}")
+
+        pending = (message.get("result") or {}).get("pending") or {}
+        self.gas_prices.clear()
+        self.priority_fees.clear()
+        return self.ingest_transactions(
+            tx for by_nonce in pending.values() for tx in by_nonce.values()
+        )
+
+    def _get_http_session(self) -> aiohttp.ClientSession:
+        """Get the HTTP session, creating a pooled one on first use."""
+        if self._http_session is None or (self._owns_http_session and self._http_session.closed):
+            self._http_session = create_http_session(max_connections=2)
+            self._owns_http_session = True
+        return self._http_session
+
+    async def aclose(self) -> None:
+        """Stop consuming and close the HTTP session if it is owned."""
+        self.stop()
+        if self._owns_http_session and self._http_session is not None:
+            session, self._http_session = self._http_session, None
+            await session.close()
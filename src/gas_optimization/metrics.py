@@ -0,0 +1,407 @@
+"""
+Metrics Module
+
+This module provides lightweight instruments for GasMonitor internals, such
+as fixed-bucket histograms of scheduling lag and fetch overruns, a registry
+that renders them in the OpenMetrics text format, and a small HTTP server
+exposing ``/metrics``.
+
+Recording stays on the hot path and costs a bisect and a few additions;
+everything else happens when the registry is scraped. Counters and gauges
+are read from the attributes GasMonitor already keeps, so registering them
+adds nothing to the hot path at all. The event loop is single-threaded, so
+no locks are taken.
+"""
+
+import bisect
+import logging
+import math
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+from aiohttp import web
+
+
+# Configure module logger
+logger = logging.getLogger(__name__)
+
+
+# Default bucket upper bounds in seconds, from 0.5 ms to 30 s
+DEFAULT_LATENCY_BUCKETS = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1,
+    0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0,
+)
+
+
+class Histogram:
+    """
+    Fixed-bucket histogram with O(log b) observations.
+
+    Buckets are defined by increasing upper bounds; values above the last
+    bound fall into an implicit ``+Inf`` bucket. Percentiles are estimated by
+    linear interpolation inside the bucket that contains them.
+
+    Attributes:
+        name: Histogram name
+        bounds: Bucket upper bounds
+        count: Number of observations
+        total: Sum of observed values
+        min: Smallest observed value, or None
+        max: Largest observed value, or None
+    """
+
+    def __init__(self, name: str, bounds: Sequence[float] = DEFAULT_LATENCY_BUCKETS):
+        """
+        Initialize the histogram.
+
+        Args:
+            name: Histogram name
+            bounds: Increasing bucket upper bounds (default: 0.5 ms to 30 s)
+
+        Raises:
+            ValueError: If bounds are empty or not strictly increasing
+        """
+        if not bounds or any(b >= a for a, b in zip(bounds[1:], bounds)):
+            raise ValueError("bounds must be a non-empty, strictly increasing sequence")
+
+        self.name = name
+        self.bounds = tuple(float(b) for b in bounds)
+        self.reset()
+
+    def reset(self) -> None:
+        """Discard all observations."""
+        self.counts: List[int] = [0] * (len(self.bounds) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.min: Optional[float] = None
+        self.max: Optional[float] = None
+
+    def observe(self, value: float) -> None:
+        """
+        Record an observation.
+
+        Args:
+            value: Observed value
+        """
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.total += value
+        if self.min is None or value < self.min:
+            self.min = value
+        if self.max is None or value > self.max:
+            self.max = value
+
+    @property
+    def mean(self) -> Optional[float]:
+        """Mean of the observations, or None."""
+        return self.total / self.count if self.count else None
+
+    def percentile(self, percentile: float) -> Optional[float]:
+        """
+        Estimate a percentile of the observations.
+
+        Args:
+            percentile: Percentile between 0 and 100
+
+        Returns:
+            Optional[float]: Estimated value, or None if there are no observations
+        """
+        if not self.count:
+            return None
+
+        rank = percentile / 100 * self.count
+        cumulative = 0
+        for index, bucket_count in enumerate(self.counts):
+            if bucket_count and cumulative + bucket_count >= rank:
+                lower = self.bounds[index - 1] if index > 0 else self.min
+                upper = self.bounds[index] if index < len(self.bounds) else self.max
+                lower, upper = max(lower, self.min), min(upper, self.max)
+                fraction = (rank - cumulative) / bucket_count
+                return lower + (upper - lower) * fraction
+            cumulative += bucket_count
+        return self.max
+
+    def cumulative_counts(self) -> List[int]:
+        """
+        Get cumulative counts per bucket, ending with the ``+Inf`` bucket.
+
+        Returns:
+            List[int]: Observations at or below each bound
+        """
+        cumulative, running = [], 0
+        for bucket_count in self.counts:
+            running += bucket_count
+            cumulative.append(running)
+        return cumulative
+
+    def as_dict(self) -> Dict[str, object]:
+        """
+        Get a summary of the histogram.
+
+        Returns:
+            Dict[str, object]: ``count``, ``sum``, ``mean``, ``min``, ``max``,
+                ``p50``, ``p90``, ``p99`` and cumulative ``buckets`` keyed by
+                upper bound
+        """
+        bounds = [str(b) for b in self.bounds] + ["+Inf"]
+        return {
+            "count": self.count,
+            "sum": self.total,
+            "mean": self.mean,
+            "min": self.min,
+            "max": self.max,
+            "p50": self.percentile(50),
+            "p90": self.percentile(90),
+            "p99": self.percentile(99),
+            "buckets": dict(zip(bounds, self.cumulative_counts())),
+        }
+
+
+# A sample value: a number, a histogram, or None when unknown (not exported)
+SampleValue = Union[int, float, Histogram, None]
+# What a collector returns: one unlabeled value, or (labels, value) pairs
+Collected = Union[SampleValue, Iterable[Tuple[Dict[str, str], SampleValue]]]
+
+OPENMETRICS_CONTENT_TYPE = "application/openmetrics-text; version=1.0.0; charset=utf-8"
+
+
+class MetricFamily:
+    """
+    A named metric whose samples are read from a collector at scrape time.
+
+    Attributes:
+        name: Family name; counters get a ``_total`` suffix on their samples
+        type: "counter", "gauge" or "histogram"
+        help: One-line description
+        collect: Callable returning one unlabeled value, or an iterable of
+            (labels, value) pairs
+    """
+
+    TYPES = ("counter", "gauge", "histogram")
+
+    def __init__(self, name: str, metric_type: str, help: str, collect: Callable[[], Collected]):
+        """
+        Initialize the family.
+
+        Args:
+            name: Family name
+            metric_type: "counter", "gauge" or "histogram"
+            help: One-line description
+            collect: Collector called on every scrape
+
+        Raises:
+            ValueError: If the type is not supported
+        """
+        if metric_type not in self.TYPES:
+            raise ValueError(f"Unsupported metric type {metric_type!r}; expected one of {self.TYPES}")
+
+        self.name = name
+        self.type = metric_type
+        self.help = help
+        self.collect = collect
+
+    def samples(self) -> Tuple[bool, List[Tuple[Dict[str, str], SampleValue]]]:
+        """
+        Collect the current samples, dropping unknown values.
+
+        Returns:
+            Tuple[bool, List[Tuple[Dict[str, str], SampleValue]]]: Whether the
+                collector returned labeled samples, and the (labels, value) pairs
+        """
+        collected = self.collect()
+        labeled = not (collected is None or isinstance(collected, (int, float, Histogram)))
+        if not labeled:
+            collected = [({}, collected)]
+        return labeled, [(labels, value) for labels, value in collected if value is not None]
+
+
+def _escape_label_value(value: str) -> str:
+    """Escape backslashes, quotes and newlines in a label value."""
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(labels: Dict[str, str]) -> str:
+    """Render a label set as ``{a="1",b="2"}``."""
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape_label_value(str(value))}"' for key, value in labels.items()) + "}"
+
+
+def _format_value(value: float) -> str:
+    """Render a sample value."""
+    if isinstance(value, bool):
+        return str(int(value))
+    if isinstance(value, int):
+        return str(value)
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if math.isnan(value):
+        return "NaN"
+    return repr(float(value))
+
+
+class MetricsRegistry:
+    """
+    Collection of metric families rendered together.
+
+    Attributes:
+        families: Registered families keyed by name, in registration order
+    """
+
+    def __init__(self):
+        """Initialize an empty registry."""
+        self.families: Dict[str, MetricFamily] = {}
+
+    def register(self, name: str, metric_type: str, help: str, collect: Callable[[], Collected]) -> MetricFamily:
+        """
+        Add a metric family.
+
+        Args:
+            name: Family name, unique within the registry
+            metric_type: "counter", "gauge" or "histogram"
+            help: One-line description
+            collect: Callable returning the current value(s) on each scrape
+
+        Returns:
+            MetricFamily: The registered family
+
+        Raises:
+            ValueError: If the name is taken or the type is not supported
+        """
+        if name in self.families:
+            raise ValueError(f"Metric {name!r} is already registered")
+        family = MetricFamily(name, metric_type, help, collect)
+        self.families[name] = family
+        return family
+
+    def counter(self, name: str, help: str, collect: Callable[[], Collected]) -> MetricFamily:
+        """Register a counter family; see ``register``."""
+        return self.register(name, "counter", help, collect)
+
+    def gauge(self, name: str, help: str, collect: Callable[[], Collected]) -> MetricFamily:
+        """Register a gauge family; see ``register``."""
+        return self.register(name, "gauge", help, collect)
+
+    def histogram(self, name: str, help: str, collect: Callable[[], Collected]) -> MetricFamily:
+        """Register a histogram family; see ``register``."""
+        return self.register(name, "histogram", help, collect)
+
+    def render(self) -> str:
+        """
+        Render every family in the OpenMetrics text format.
+
+        Returns:
+            str: Exposition ending with ``# EOF``
+        """
+        lines: List[str] = []
+        for family in self.families.values():
+            lines.append(f"# TYPE {family.name} {family.type}")
+            lines.append(f"# HELP {family.name} {family.help}")
+            for labels, value in family.samples()[1]:
+                if family.type == "histogram":
+                    lines.extend(self._histogram_lines(family.name, labels, value))
+                else:
+                    suffix = "_total" if family.type == "counter" else ""
+                    lines.append(f"{family.name}{suffix}{_format_labels(labels)} {_format_value(value)}")
+        lines.append("# EOF")
+        return "\n".join(lines) + "\n"
+
+    @staticmethod
+    def _histogram_lines(name: str, labels: Dict[str, str], histogram: Histogram) -> List[str]:
+        """Render the bucket, count and sum samples of one histogram."""
+        lines = []
+        bounds = [_format_value(bound) for bound in histogram.bounds] + ["+Inf"]
+        for bound, cumulative in zip(bounds, histogram.cumulative_counts()):
+            lines.append(f"{name}_bucket{_format_labels({**labels, 'le': bound})} {cumulative}")
+        lines.append(f"{name}_count{_format_labels(labels)} {histogram.count}")
+        lines.append(f"{name}_sum{_format_labels(labels)} {_format_value(histogram.total)}")
+        return lines
+
+    def snapshot(self) -> Dict[str, object]:
+        """
+        Get the current value of every family as plain Python data.
+
+        Returns:
+            Dict[str, object]: Per family, the value (histograms as their
+                ``as_dict`` summary) when it has no labels, or a list of
+                ``{"labels": ..., "value": ...}`` entries when it has
+        """
+        snapshot: Dict[str, object] = {}
+        for family in self.families.values():
+            labeled, samples = family.samples()
+            samples = [
+                (labels, value.as_dict() if isinstance(value, Histogram) else value)
+                for labels, value in samples
+            ]
+            if labeled:
+                snapshot[family.name] = [{"labels": labels, "value": value} for labels, value in samples]
+            else:
+                snapshot[family.name] = samples[0][1] if samples else None
+        return snapshot
+
+
+class MetricsServer:
+    """
+    Local HTTP server exposing a registry at ``/metrics``.
+
+    Attributes:
+        registry: Registry rendered on every request
+        host: Interface to bind (default: loopback only)
+        port: Port to bind; 0 picks a free port, readable after ``start``
+    """
+
+    def __init__(self, registry: MetricsRegistry, host: str = "127.0.0.1", port: int = 9464):
+        """
+        Initialize the server.
+
+        Args:
+            registry: Registry to expose
+            host: Interface to bind (default: "127.0.0.1")
+            port: Port to bind; 0 picks a free port (default: 9464)
+        """
+        self.registry = registry
+        self.host = host
+        self.port = port
+        self._runner: Optional[web.AppRunner] = None
+
+    @property
+    def url(self) -> str:
+        """URL of the metrics endpoint."""
+        return f"http://{self.host}:{self.port}/metrics"
+
+    async def start(self) -> None:
+        """
+        Start serving on the running event loop.
+
+        Raises:
+            RuntimeError: If the server is already running
+            OSError: If the address cannot be bound
+        """
+        if self._runner is not None:
+            raise RuntimeError("Metrics server is already running")
+
+        app = web.Application()
+        app.router.add_get("/metrics", self._handle_metrics)
+        runner = web.AppRunner(app, access_log=None)
+        await runner.setup()
+        try:
+            site = web.TCPSite(runner, self.host, self.port)
+            await site.start()
+        except BaseException:
+            await runner.cleanup()
+            raise
+        self._runner = runner
+        self.port = runner.addresses[0][1]
+        logger.info(f"Serving metrics at {self.url}")
+
+    async def stop(self) -> None:
+        """Stop serving; does nothing if the server is not running."""
+        if self._runner is not None:
+            runner, self._runner = self._runner, None
+            await runner.cleanup()
+
+    async def _handle_metrics(self, request: web.Request) -> web.Response:
+        """Render the registry for one scrape."""
+        return web.Response(
+            body=self.registry.render().encode(),
+            headers={"Content-Type": OPENMETRICS_CONTENT_TYPE},
+        )
@@ -0,0 +1,466 @@
+"""
+Gas Monitor Pool Module
+
+This module runs gas monitors for many chains and RPC endpoints on a single
+event loop. One timing wheel drives every monitor's refresh, requests are
+staggered across each update interval, and all monitors share one pooled
+HTTP session.
+"""
+
+import asyncio
+import logging
+from typing import Any, Dict, Hashable, List, Optional, Set
+
+import aiohttp
+from web3 import AsyncHTTPProvider, AsyncWeb3
+
+from .gas_monitor import GasMonitor
+from .http_pool import HttpConnectionStats, create_http_session
+
+
+# Configure module logger
+logger = logging.getLogger(__name__)
+
+
+class _PoolEntry:
+    """Scheduling state of one monitor in the pool."""
+
+    __slots__ = (
+        "key", "monitor", "interval_ticks", "deadline", "active", "in_flight",
+        "session_attached", "updates", "failures", "skipped", "last_update_ns", "task",
+    )
+
+    def __init__(self, key: Hashable, monitor: GasMonitor, interval_ticks: int):
+        self.key = key
+        self.monitor = monitor
+        self.interval_ticks = interval_ticks
+        self.deadline = 0
+        self.active = True
+        self.in_flight = False
+        self.session_attached = False
+        self.updates = 0
+        self.failures = 0
+        self.skipped = 0
+        self.last_update_ns: Optional[int] = None
+        self.task: Optional[asyncio.Task] = None
+
+
+class TimingWheel:
+    """
+    Hashed timing wheel with a fixed number of slots.
+
+    Deadlines are absolute tick numbers. Scheduling and advancing are O(1)
+    per entry; entries more than one rotation ahead stay in their slot until
+    their round comes up.
+
+    Attributes:
+        slots: Number of slots in the wheel
+        current_tick: Tick most recently advanced to
+    """
+
+    def __init__(self, slots: int = 1024):
+        """
+        Initialize the wheel.
+
+        Args:
+            slots: Number of slots (default: 1024)
+
+        Raises:
+            ValueError: If slots is not positive
+        """
+        if slots <= 0:
+            raise ValueError("slots must be positive")
+        self.slots = slots
+        self.current_tick = 0
+        self._buckets: List[List[Any]] = [[] for _ in range(slots)]
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def schedule(self, item: Any, deadline: int) -> int:
+        """
+        Schedule an item for an absolute tick.
+
+        Args:
+            item: Object with a writable ``deadline`` attribute
+            deadline: Tick at which the item becomes due; deadlines that
+                have passed are moved to the next tick
+
+        Returns:
+            int: The tick the item was scheduled for
+        """
+        deadline = max(deadline, self.current_tick + 1)
+        item.deadline = deadline
+        self._buckets[deadline % self.slots].append(item)
+        self._size += 1
+        return deadline
+
+    def advance(self) -> List[Any]:
+        """
+        Move to the next tick and remove the items due on it.
+
+        Returns:
+            List[Any]: Items whose deadline is the new current tick
+        """
+        self.current_tick += 1
+        bucket = self._buckets[self.current_tick % self.slots]
+        if not bucket:
+            return []
+
+        due = [item for item in bucket if item.deadline <= self.current_tick]
+        if due:
+            self._buckets[self.current_tick % self.slots] = [
+                item for item in bucket if item.deadline > self.current_tick
+            ]
+            self._size -= len(due)
+        return due
+
+
+class GasMonitorPool:
+    """
+    Runs many GasMonitor instances from one timing wheel on one event loop.
+
+    Monitors are keyed by chain id (any hashable key works, e.g. a
+    ``(chain_id, endpoint)`` tuple). Each monitor is refreshed every
+    ``update_interval`` seconds at a fixed rate. The first refresh of each
+    monitor is offset by a low-discrepancy fraction of its interval, so
+    endpoints added together do not fire together. A refresh is skipped,
+    not queued, while the monitor's previous one is still running. At most
+    ``max_concurrency`` refreshes run at once.
+
+    All monitors share one pooled aiohttp session for the gas oracle and,
+    for ``AsyncHTTPProvider`` endpoints, for JSON-RPC calls as well.
+
+    Attributes:
+        tick: Timing wheel resolution in seconds
+        max_concurrency: Maximum number of refreshes in flight
+        http_stats: Connection reuse counters for the owned HTTP session
+        is_running: Flag indicating if the scheduler is active
+    """
+
+    # Fractional part of the golden ratio, for evenly spread start offsets
+    STAGGER_STEP = 0.6180339887498949
+
+    def __init__(
+        self,
+        tick: float = 0.1,
+        wheel_slots: int = 1024,
+        max_concurrency: int = 32,
+        http_session: Optional[aiohttp.ClientSession] = None,
+        max_http_connections: int = 100,
+        max_connections_per_host: int = 4
+    ):
+        """
+        Initialize the pool.
+
+        Args:
+            tick: Timing wheel resolution in seconds (default: 0.1)
+            wheel_slots: Number of timing wheel slots (default: 1024)
+            max_concurrency: Maximum number of refreshes in flight (default: 32)
+            http_session: Optional shared aiohttp session; the pool will not
+                close a session it did not create
+            max_http_connections: Connection limit of the session the pool
+                creates for itself (default: 100)
+            max_connections_per_host: Per-host connection limit of that
+                session (default: 4)
+
+        Raises:
+            ValueError: If tick or max_concurrency is not positive
+        """
+        if tick <= 0 or max_concurrency <= 0:
+            raise ValueError("tick and max_concurrency must be positive")
+
+        self.tick = tick
+        self.max_concurrency = max_concurrency
+        self.max_http_connections = max_http_connections
+        self.max_connections_per_host = max_connections_per_host
+
+        self._wheel = TimingWheel(wheel_slots)
+        self._entries: Dict[Hashable, _PoolEntry] = {}
+        self._added = 0
+
+        self._http_session: Optional[aiohttp.ClientSession] = http_session
+        self._owns_http_session = http_session is None
+        self.http_stats = HttpConnectionStats()
+
+        self.is_running = False
+        self._driver_task: Optional[asyncio.Task] = None
+        self._update_tasks: Set[asyncio.Task] = set()
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    async def __aenter__(self) -> "GasMonitorPool":
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.aclose()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, chain_id: Hashable) -> bool:
+        return chain_id in self._entries
+
+    def __getitem__(self, chain_id: Hashable) -> GasMonitor:
+        return self._entries[chain_id].monitor
+
+    def chain_ids(self) -> List[Hashable]:
+        """
+        Get the keys of all monitors in the pool.
+
+        Returns:
+            List[Hashable]: Chain ids in insertion order
+        """
+        return list(self._entries)
+
+    def add_monitor(
+        self,
+        chain_id: Hashable,
+        web3: Any,
+        update_interval: float = 15,
+        **monitor_kwargs: Any
+    ) -> GasMonitor:
+        """
+        Create a monitor for a chain and schedule its refreshes.
+
+        Args:
+            chain_id: Key the monitor is queried by
+            web3: Web3, AsyncWeb3 or async provider for the chain
+            update_interval: Seconds between refreshes (default: 15)
+            **monitor_kwargs: Further GasMonitor arguments (e.g.
+                ``history_size``, ``etherscan_api_key``, ``fetch_mode``)
+
+        Returns:
+            GasMonitor: The new monitor
+
+        Raises:
+            ValueError: If a monitor is already registered for chain_id
+        """
+        if chain_id in self._entries:
+            raise ValueError(f"A monitor for chain {chain_id!r} is already in the pool")
+
+        monitor = GasMonitor(web3, update_interval=update_interval, **monitor_kwargs)
+        interval_ticks = max(1, round(update_interval / self.tick))
+        entry = _PoolEntry(chain_id, monitor, interval_ticks)
+
+        offset = int((self._added * self.STAGGER_STEP) % 1.0 * interval_ticks)
+        self._added += 1
+        self._wheel.schedule(entry, self._wheel.current_tick + 1 + offset)
+        self._entries[chain_id] = entry
+
+        logger.info(
+            "Added gas monitor for chain %r (interval=%gs, offset=%.2fs)",
+            chain_id, update_interval, offset * self.tick
+        )
+        return monitor
+
+    async def remove_monitor(self, chain_id: Hashable) -> None:
+        """
+        Stop refreshing a chain and close its monitor.
+
+        A refresh still running for the chain is cancelled and awaited, and
+        the monitor lets go of the shared session before it is closed.
+
+        Args:
+            chain_id: Key of the monitor to remove
+
+        Raises:
+            KeyError: If no monitor is registered for chain_id
+        """
+        entry = self._entries.pop(chain_id)
+        # The wheel drops inactive entries when their slot comes up
+        entry.active = False
+        if entry.task is not None:
+            entry.task.cancel()
+            await asyncio.gather(entry.task, return_exceptions=True)
+        await self._release_monitor(entry)
+
+    def _get_http_session(self) -> aiohttp.ClientSession:
+        """
+        Get the shared HTTP session, creating it on first use.
+
+        Returns:
+            aiohttp.ClientSession: Long-lived session shared by all monitors
+        """
+        if self._http_session is None or (self._owns_http_session and self._http_session.closed):
+            self._http_session = create_http_session(
+                max_connections=self.max_http_connections,
+                max_connections_per_host=self.max_connections_per_host,
+                stats=self.http_stats,
+            )
+            self._owns_http_session = True
+        return self._http_session
+
+    async def _attach_shared_session(self, entry: _PoolEntry) -> None:
+        """Point a monitor's oracle and JSON-RPC calls at the shared session."""
+        session = self._get_http_session()
+        monitor = entry.monitor
+        await monitor.set_http_session(session)
+
+        if isinstance(monitor.web3, AsyncWeb3) and isinstance(monitor.web3.provider, AsyncHTTPProvider):
+            await monitor.web3.provider.cache_async_session(session)
+        entry.session_attached = True
+
+    async def _release_monitor(self, entry: _PoolEntry) -> None:
+        """Detach a monitor from the shared session and close it."""
+        if entry.session_attached:
+            await entry.monitor.set_http_session(None)
+            entry.session_attached = False
+        await entry.monitor.aclose()
+
+    async def start(self) -> None:
+        """
+        Start the timing wheel driver on the running event loop.
+
+        Raises:
+            RuntimeError: If the pool is already running
+        """
+        if self.is_running:
+            raise RuntimeError("GasMonitorPool is already running")
+
+        self.is_running = True
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        self._driver_task = asyncio.create_task(self._run_wheel())
+        logger.info("Started gas monitor pool with %d monitors", len(self._entries))
+
+    async def stop(self) -> None:
+        """Stop the driver and cancel refreshes in flight."""
+        self.is_running = False
+
+        tasks = list(self._update_tasks)
+        if self._driver_task is not None:
+            tasks.append(self._driver_task)
+            self._driver_task = None
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._update_tasks.clear()
+
+        logger.info("Stopped gas monitor pool")
+
+    async def aclose(self) -> None:
+        """
+        Stop the pool, close every monitor and release the shared session.
+
+        Monitors drop their reference to the shared session, so one used
+        again after the pool is closed creates its own. A session passed in
+        by the caller is left open.
+        """
+        if self.is_running:
+            await self.stop()
+
+        for entry in self._entries.values():
+            await self._release_monitor(entry)
+
+        if self._owns_http_session and self._http_session is not None:
+            session, self._http_session = self._http_session, None
+            await session.close()
+            logger.debug("Closed shared HTTP session")
+
+    async def _run_wheel(self) -> None:
+        """Advance the timing wheel once per tick and dispatch due monitors."""
+        loop = asyncio.get_running_loop()
+        # Tick times are absolute, so a slow tick does not shift later ones
+        origin = loop.time() - self._wheel.current_tick * self.tick
+
+        while self.is_running:
+            delay = origin + (self._wheel.current_tick + 1) * self.tick - loop.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+
+            for entry in self._wheel.advance():
+                self._dispatch(entry)
+
+    def _dispatch(self, entry: _PoolEntry) -> None:
+        """Reschedule a due monitor and start its refresh unless one is running."""
+        if not entry.active:
+            return
+
+        self._wheel.schedule(entry, entry.deadline + entry.interval_ticks)
+
+        if entry.in_flight:
+            entry.skipped += 1
+            logger.debug("Skipped refresh of chain %r: previous refresh still running", entry.key)
+            return
+
+        entry.in_flight = True
+        task = entry.task = asyncio.create_task(self._refresh(entry))
+        self._update_tasks.add(task)
+        task.add_done_callback(self._update_tasks.discard)
+
+    async def _refresh(self, entry: _PoolEntry) -> None:
+        """Refresh one monitor within the concurrency bound."""
+        try:
+            async with self._semaphore:
+                if not entry.session_attached:
+                    await self._attach_shared_session(entry)
+                gas_price = await entry.monitor.update_gas_price()
+            if gas_price is None:
+                entry.failures += 1
+                return
+            entry.updates += 1
+            entry.last_update_ns = entry.monitor.clock.time_ns()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            entry.failures += 1
+            logger.error("Error refreshing gas price for chain %r: %s", entry.key, e)
+        finally:
+            entry.in_flight = False
+            entry.task = None
+
+    def get_gas_prices(self) -> Dict[Hashable, Optional[int]]:
+        """
+        Get the most recent gas price of every chain.
+
+        Returns:
+            Dict[Hashable, Optional[int]]: Gas price in Wei by chain id, or
+                None for chains without readings yet
+        """
+        return {
+            chain_id: entry.monitor.gas_history.last_price_wei() if entry.monitor.gas_history else None
+            for chain_id, entry in self._entries.items()
+        }
+
+    def get_current_price_gwei(self, chain_id: Hashable) -> Optional[float]:
+        """
+        Get the most recent gas price of a chain in Gwei.
+
+        Args:
+            chain_id: Key of the monitor
+
+        Returns:
+            Optional[float]: Most recent gas price in Gwei, or None if no data
+        """
+        return self[chain_id].get_current_price_gwei()
+
+    def is_gas_price_favorable(self, chain_id: Hashable, threshold_gwei: float = 50) -> bool:
+        """
+        Check if a chain's current gas price is below a threshold.
+
+        Args:
+            chain_id: Key of the monitor
+            threshold_gwei: Maximum acceptable gas price in Gwei (default: 50)
+
+        Returns:
+            bool: True if the chain's current gas price is at or below threshold
+        """
+        return self[chain_id].is_gas_price_favorable(threshold_gwei)
+
+    def get_stats(self) -> Dict[Hashable, Dict[str, Optional[int]]]:
+        """
+        Get refresh counters of every chain.
+
+        Returns:
+            Dict[Hashable, Dict[str, Optional[int]]]: ``updates``,
+                ``failures``, ``skipped`` and ``last_update_ns`` by chain id
+        """
+        return {
+            chain_id: {
+                "updates": entry.updates,
+                "failures": entry.failures,
+                "skipped": entry.skipped,
+                "last_update_ns": entry.last_update_ns,
+            }
+            for chain_id, entry in self._entries.items()
+        }
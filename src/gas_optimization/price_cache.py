@@ -0,0 +1,166 @@
+"""
+Price Cache Module
+
+This module lets many concurrent callers share one gas price fetch. Callers
+arriving while a fetch is in flight await that fetch instead of starting
+their own, and the result is served from cache while it is fresh, either
+for a fixed TTL or until a new block is seen.
+"""
+
+import asyncio
+from typing import Awaitable, Callable, Dict, Optional, Union
+
+from .clock import SystemClock, VirtualClock
+
+
+class SingleFlightCache:
+    """
+    Single-flight cache of the latest gas price.
+
+    A cached price is fresh while it is younger than ``ttl`` seconds, or,
+    when a block key is given, while the caller's block key matches the one
+    the price was fetched at. On a miss, the first caller starts the fetch
+    and every caller arriving before it completes awaits the same result.
+    The shared fetch is shielded, so one caller being cancelled does not
+    cancel it for the others.
+
+    Fetches that return None (every source failed) are passed through but
+    not cached.
+
+    Attributes:
+        ttl: Seconds a price stays fresh; 0 disables time-based reuse
+        clock: Time source for cache ages
+        hits: Calls answered from cache
+        misses: Calls that started a fetch
+        coalesced: Calls that joined a fetch already in flight
+        value: Most recent cached price in Wei, or None
+    """
+
+    def __init__(
+        self,
+        ttl: float = 0.0,
+        clock: Optional[Union[SystemClock, VirtualClock]] = None
+    ):
+        """
+        Initialize an empty cache.
+
+        Args:
+            ttl: Seconds a fetched price is reused (default: 0, no
+                time-based reuse)
+            clock: Time source (default: wall-clock ``SystemClock``)
+
+        Raises:
+            ValueError: If ttl is negative
+        """
+        if ttl < 0:
+            raise ValueError("ttl must not be negative")
+
+        self.ttl = ttl
+        self.clock = clock or SystemClock()
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.value: Optional[int] = None
+        self._stored_at_ns = 0
+        self._block: Optional[int] = None
+        self._inflight: Optional[asyncio.Future] = None
+
+    def is_fresh(self, block: Optional[int] = None) -> bool:
+        """
+        Check whether the cached price can be served.
+
+        Args:
+            block: Current block number when prices are valid per block, or None
+
+        Returns:
+            bool: True if a cached price exists and is within its TTL or was
+                fetched at ``block``
+        """
+        if self.value is None:
+            return False
+        if block is not None and block == self._block:
+            return True
+        return self.ttl > 0 and (self.clock.monotonic_ns() - self._stored_at_ns) < self.ttl * 1e9
+
+    def store(self, value: int, block: Optional[int] = None) -> None:
+        """
+        Cache a price.
+
+        Args:
+            value: Gas price in Wei
+            block: Block number the price was fetched at, or None
+        """
+        self.value = value
+        self._block = block
+        self._stored_at_ns = self.clock.monotonic_ns()
+
+    def invalidate(self) -> None:
+        """Drop the cached price so the next call fetches."""
+        self.value = None
+        self._block = None
+
+    async def get(
+        self,
+        fetch: Callable[[], Awaitable[Optional[int]]],
+        block: Optional[int] = None
+    ) -> Optional[int]:
+        """
+        Get the price from cache, an in-flight fetch or a new fetch.
+
+        Args:
+            fetch: Coroutine function returning a gas price in Wei, or None
+            block: Current block number when prices are valid per block, or None
+
+        Returns:
+            Optional[int]: Gas price in Wei, or None if the fetch found none
+        """
+        if self.is_fresh(block):
+            self.hits += 1
+            return self.value
+
+        if self._inflight is not None:
+            self.coalesced += 1
+            return await asyncio.shield(self._inflight)
+
+        self.misses += 1
+        self._inflight = asyncio.ensure_future(self._fill(fetch, block))
+        return await asyncio.shield(self._inflight)
+
+    async def _fill(
+        self,
+        fetch: Callable[[], Awaitable[Optional[int]]],
+        block: Optional[int]
+    ) -> Optional[int]:
+        """Run the shared fetch and cache a valid result."""
+        try:
+            value = await fetch()
+            if value is not None:
+                self.store(value, block)
+            return value
+        finally:
+            self._inflight = None
+
+    async def cancel(self) -> None:
+        """Cancel the fetch in flight, if any, and wait for it to finish."""
+        inflight = self._inflight
+        if inflight is not None:
+            inflight.cancel()
+            await asyncio.gather(inflight, return_exceptions=True)
+
+    def as_dict(self) -> Dict[str, float]:
+        """
+        Get the counters as a plain dictionary.
+
+        Returns:
+            Dict[str, float]: Hit, miss and coalesced counters, the fraction
+                of calls that did not start a fetch, and whether a fetch is
+                in flight
+        """
+        calls = self.hits + self.misses + self.coalesced
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "saved_ratio": (self.hits + self.coalesced) / calls if calls else 0.0,
+            "in_flight": self._inflight is not None,
+        }
@@ -0,0 +1,373 @@
+"""
+Quantile Sketch Module
+
+This module provides a KLL quantile sketch: a mergeable summary that
+answers rank and quantile queries over a stream in memory that does not
+grow with the stream length, plus a sliding-window wrapper built from one
+sketch per time bucket.
+"""
+
+import bisect
+import math
+import random
+from collections import deque
+from typing import Deque, Iterable, List, Optional, Tuple, Union
+
+import numpy as np
+
+from .clock import SystemClock, VirtualClock
+
+
+class KLLSketch:
+    """
+    KLL streaming quantile sketch (Karnin, Lang and Liberty, 2016).
+
+    Items are kept in a stack of compactors. An item at level ``h`` stands
+    for ``2 ** h`` stream items. When a level fills up it is sorted and every
+    other item, starting at a random offset, is promoted to the next level.
+    Capacities shrink geometrically (by 2/3) towards the lower levels, so
+    about ``3k`` items are retained regardless of the stream length, and
+    the rank error is roughly ``1.7 / k`` with high probability.
+
+    Sketches with the same ``k`` can be merged, for example to combine the
+    buckets of a sliding window.
+
+    Attributes:
+        k: Capacity of the top compactor; controls accuracy and memory
+        count: Number of items summarized
+        min: Smallest item seen, or None
+        max: Largest item seen, or None
+    """
+
+    def __init__(self, k: int = 200, seed: Optional[int] = None):
+        """
+        Initialize an empty sketch.
+
+        Args:
+            k: Capacity of the top compactor (default: 200, about 1% rank error)
+            seed: Optional seed for the compaction coin flips
+
+        Raises:
+            ValueError: If k is smaller than 8
+        """
+        if k < 8:
+            raise ValueError("k must be at least 8")
+
+        self.k = k
+        self.count = 0
+        self.min: Optional[float] = None
+        self.max: Optional[float] = None
+        self._random = random.Random(seed)
+        self._levels: List[List[float]] = [[]]
+        self._size = 0
+        self._capacities: List[int] = []
+        self._max_size = 0
+        self._update_capacities()
+        self._sorted: Optional[Tuple[List[float], List[int]]] = None
+
+    def __len__(self) -> int:
+        return self.count
+
+    @property
+    def retained(self) -> int:
+        """Number of items currently stored."""
+        return self._size
+
+    def _update_capacities(self) -> None:
+        """Recompute level capacities, shrinking by 2/3 per level below the top."""
+        top = len(self._levels) - 1
+        self._capacities = [
+            max(2, int(math.ceil(self.k * (2 / 3) ** (top - level))))
+            for level in range(len(self._levels))
+        ]
+        self._max_size = sum(self._capacities)
+
+    def update(self, value: float) -> None:
+        """
+        Add an item.
+
+        Args:
+            value: Item to add
+        """
+        self._levels[0].append(value)
+        self._size += 1
+        self.count += 1
+        if self.min is None or value < self.min:
+            self.min = value
+        if self.max is None or value > self.max:
+            self.max = value
+        self._sorted = None
+        if self._size >= self._max_size:
+            self._compress()
+
+    def update_many(self, values: Union[Iterable[float], np.ndarray]) -> None:
+        """
+        Add many items at once.
+
+        Args:
+            values: Items to add
+        """
+        values = np.asarray(values, dtype=np.float64).ravel()
+        if not len(values):
+            return
+
+        low, high = float(values.min()), float(values.max())
+        self.min = low if self.min is None else min(self.min, low)
+        self.max = high if self.max is None else max(self.max, high)
+        self.count += len(values)
+        self._sorted = None
+
+        # Feed level 0 one capacity-sized chunk at a time to bound the buffer
+        chunk = self._capacities[0]
+        items = values.tolist()
+        for start in range(0, len(items), chunk):
+            part = items[start:start + chunk]
+            self._levels[0].extend(part)
+            self._size += len(part)
+            if self._size >= self._max_size:
+                self._compress()
+
+    def merge(self, other: "KLLSketch") -> None:
+        """
+        Fold another sketch into this one.
+
+        Args:
+            other: Sketch to merge; it is left unchanged
+
+        Raises:
+            ValueError: If the sketches have different ``k``
+        """
+        if other.k != self.k:
+            raise ValueError("Only sketches with the same k can be merged")
+        if not other.count:
+            return
+
+        while len(self._levels) < len(other._levels):
+            self._levels.append([])
+        for level, items in enumerate(other._levels):
+            self._levels[level].extend(items)
+
+        self.count += other.count
+        self.min = other.min if self.min is None else min(self.min, other.min)
+        self.max = other.max if self.max is None else max(self.max, other.max)
+        self._sorted = None
+        self._size = sum(len(items) for items in self._levels)
+        self._update_capacities()
+        if self._size >= self._max_size:
+            self._compress()
+
+    def _compress(self) -> None:
+        """Compact full levels until the sketch is within capacity."""
+        levels = self._levels
+        while self._size >= self._max_size:
+            for level, items in enumerate(levels):
+                if len(items) < self._capacities[level]:
+                    continue
+
+                if level + 1 == len(levels):
+                    levels.append([])
+                    self._update_capacities()
+                items.sort()
+                # An odd item out stays behind so the total weight is preserved
+                leftover = [items.pop()] if len(items) % 2 else []
+                promoted = items[self._random.getrandbits(1)::2]
+                levels[level + 1].extend(promoted)
+                levels[level] = leftover
+                self._size -= len(promoted)
+                break
+
+    def _weighted_items(self) -> Tuple[List[float], List[int]]:
+        """Get retained items in order with their cumulative weights."""
+        if self._sorted is None:
+            pairs = sorted(
+                (value, 1 << level)
+                for level, items in enumerate(self._levels)
+                for value in items
+            )
+            values, cumulative, running = [], [], 0
+            for value, weight in pairs:
+                running += weight
+                values.append(value)
+                cumulative.append(running)
+            self._sorted = (values, cumulative)
+        return self._sorted
+
+    def quantile(self, q: float) -> Optional[float]:
+        """
+        Estimate the item at a quantile.
+
+        Args:
+            q: Quantile between 0 and 1
+
+        Returns:
+            Optional[float]: Estimated item, or None if the sketch is empty
+        """
+        if not self.count:
+            return None
+        if q <= 0:
+            return self.min
+        if q >= 1:
+            return self.max
+
+        values, cumulative = self._weighted_items()
+        index = bisect.bisect_left(cumulative, q * cumulative[-1])
+        return values[min(index, len(values) - 1)]
+
+    def percentile(self, percentile: float) -> Optional[float]:
+        """
+        Estimate the item at a percentile.
+
+        Args:
+            percentile: Percentile between 0 and 100
+
+        Returns:
+            Optional[float]: Estimated item, or None if the sketch is empty
+        """
+        return self.quantile(percentile / 100)
+
+    def rank(self, value: float) -> float:
+        """
+        Estimate the fraction of items at or below a value.
+
+        Args:
+            value: Value to rank
+
+        Returns:
+            float: Fraction between 0 and 1 (0 for an empty sketch)
+        """
+        if not self.count:
+            return 0.0
+        values, cumulative = self._weighted_items()
+        index = bisect.bisect_right(values, value)
+        return cumulative[index - 1] / cumulative[-1] if index else 0.0
+
+
+class WindowedQuantiles:
+    """
+    Quantiles over a sliding time window, built from per-bucket KLL sketches.
+
+    The window is split into ``buckets`` equal time buckets, each with its
+    own sketch. Buckets older than the window are dropped, and queries merge
+    the live buckets into one sketch, which is cached until the next update.
+    Memory is bounded by ``buckets`` sketches of size about ``3k``.
+
+    Attributes:
+        window: Window length in seconds
+        buckets: Number of buckets the window is split into
+        k: Accuracy parameter of the bucket sketches
+        clock: Time source for bucket boundaries
+    """
+
+    def __init__(
+        self,
+        window: float = 60.0,
+        buckets: int = 6,
+        k: int = 200,
+        clock: Optional[Union[SystemClock, VirtualClock]] = None
+    ):
+        """
+        Initialize an empty window.
+
+        Args:
+            window: Window length in seconds (default: 60.0)
+            buckets: Number of time buckets (default: 6)
+            k: Accuracy parameter of the sketches (default: 200)
+            clock: Time source (default: wall-clock ``SystemClock``)
+
+        Raises:
+            ValueError: If window or buckets is not positive
+        """
+        if window <= 0 or buckets <= 0:
+            raise ValueError("window and buckets must be positive")
+
+        self.window = window
+        self.buckets = buckets
+        self.k = k
+        self.clock = clock or SystemClock()
+        self._bucket_ns = max(1, int(window * 1e9 / buckets))
+        self._sketches: Deque[Tuple[int, KLLSketch]] = deque()
+        self._merged: Optional[KLLSketch] = None
+
+    def _current(self) -> KLLSketch:
+        """Get the sketch of the current bucket, expiring old ones."""
+        bucket = self.clock.monotonic_ns() // self._bucket_ns
+        self._expire(bucket)
+        if not self._sketches or self._sketches[-1][0] != bucket:
+            self._sketches.append((bucket, KLLSketch(self.k)))
+        self._merged = None
+        return self._sketches[-1][1]
+
+    def _expire(self, bucket: int) -> None:
+        """Drop buckets that have left the window."""
+        sketches = self._sketches
+        if sketches and sketches[0][0] <= bucket - self.buckets:
+            while sketches and sketches[0][0] <= bucket - self.buckets:
+                sketches.popleft()
+            self._merged = None
+
+    def update(self, value: float) -> None:
+        """
+        Add an item to the current bucket.
+
+        Args:
+            value: Item to add
+        """
+        self._current().update(value)
+
+    def update_many(self, values: Union[Iterable[float], np.ndarray]) -> None:
+        """
+        Add many items to the current bucket.
+
+        Args:
+            values: Items to add
+        """
+        self._current().update_many(values)
+
+    def clear(self) -> None:
+        """Drop all buckets."""
+        self._sketches.clear()
+        self._merged = None
+
+    def sketch(self) -> KLLSketch:
+        """
+        Get a sketch of every item in the window.
+
+        Returns:
+            KLLSketch: Merged sketch; do not modify it
+        """
+        self._expire(self.clock.monotonic_ns() // self._bucket_ns)
+        if self._merged is None:
+            merged = KLLSketch(self.k)
+            for _, sketch in self._sketches:
+                merged.merge(sketch)
+            self._merged = merged
+        return self._merged
+
+    @property
+    def count(self) -> int:
+        """Number of items in the window."""
+        return self.sketch().count
+
+    def quantile(self, q: float) -> Optional[float]:
+        """
+        Estimate the item at a quantile of the window.
+
+        Args:
+            q: Quantile between 0 and 1
+
+        Returns:
+            Optional[float]: Estimated item, or None if the window is empty
+        """
+        return self.sketch().quantile(q)
+
+    def percentile(self, percentile: float) -> Optional[float]:
+        """
+        Estimate the item at a percentile of the window.
+
+        Args:
+            percentile: Percentile between 0 and 100
+
+        Returns:
+            Optional[float]: Estimated item, or None if the window is empty
+        """
+        return self.sketch().percentile(percentile)
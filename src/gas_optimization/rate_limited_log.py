@@ -0,0 +1,103 @@
+"""
+Rate-Limited Log Module
+
+This module keeps repeated warnings from flooding the log. While a gas
+source is down every update fails the same way; the first failure is logged
+at once, repeats are counted, and the count is reported with the next
+message let through once the interval has passed.
+"""
+
+import logging
+from typing import Any, Dict, Hashable, Optional, Union
+
+from .clock import SystemClock, VirtualClock
+
+
+class RateLimitedLogger:
+    """
+    Logs at most one message per key and interval, counting the rest.
+
+    Messages use deferred %-style formatting, so suppressed messages are
+    never formatted.
+
+    Attributes:
+        logger: Logger messages are passed to
+        interval: Seconds between messages logged for the same key
+        clock: Time source for the intervals
+        suppressed: Messages suppressed so far, per key, since the last one
+            logged
+    """
+
+    def __init__(
+        self,
+        logger: logging.Logger,
+        interval: float = 60.0,
+        clock: Optional[Union[SystemClock, VirtualClock]] = None
+    ):
+        """
+        Initialize the rate limiter.
+
+        Args:
+            logger: Logger to pass messages to
+            interval: Seconds between messages for the same key (default: 60.0)
+            clock: Time source (default: wall-clock ``SystemClock``)
+
+        Raises:
+            ValueError: If interval is negative
+        """
+        if interval < 0:
+            raise ValueError("interval must not be negative")
+
+        self.logger = logger
+        self.interval = interval
+        self.clock = clock or SystemClock()
+        self.suppressed: Dict[Hashable, int] = {}
+        self._next_ns: Dict[Hashable, int] = {}
+
+    def log(self, level: int, key: Hashable, msg: str, *args: Any, **kwargs: Any) -> bool:
+        """
+        Log a message unless one with the same key was logged recently.
+
+        Args:
+            level: Logging level
+            key: Identity of the repeated condition, e.g. a source name
+            msg: %-style message format
+            *args: Message arguments, formatted only if the message is logged
+            **kwargs: Keyword arguments for ``Logger.log`` (e.g. ``exc_info``)
+
+        Returns:
+            bool: True if the message was passed to the logger
+        """
+        if not self.logger.isEnabledFor(level):
+            return False
+
+        now_ns = self.clock.monotonic_ns()
+        if now_ns < self._next_ns.get(key, now_ns):
+            self.suppressed[key] = self.suppressed.get(key, 0) + 1
+            return False
+
+        self._next_ns[key] = now_ns + int(self.interval * 1e9)
+        suppressed = self.suppressed.pop(key, 0)
+        if suppressed:
+            msg += " (%d similar messages suppressed)"
+            args += (suppressed,)
+        self.logger.log(level, msg, *args, **kwargs)
+        return True
+
+    def warning(self, key: Hashable, msg: str, *args: Any, **kwargs: Any) -> bool:
+        """Log a rate-limited warning; see ``log``."""
+        return self.log(logging.WARNING, key, msg, *args, **kwargs)
+
+    def error(self, key: Hashable, msg: str, *args: Any, **kwargs: Any) -> bool:
+        """Log a rate-limited error; see ``log``."""
+        return self.log(logging.ERROR, key, msg, *args, **kwargs)
+
+    def reset(self, key: Hashable) -> None:
+        """
+        Forget a key, so its next message is logged at once.
+
+        Call this when the condition clears, e.g. when a source recovers.
+        Suppressed messages not yet reported are dropped.
+        """
+        self._next_ns.pop(key, None)
+        self.suppressed.pop(key, None)
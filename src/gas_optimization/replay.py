@@ -0,0 +1,532 @@
+"""
+Gas Replay and Backtesting Module
+
+This module replays recorded gas price series through GasMonitor on a
+virtual clock and scores transaction timing strategies against the best
+price that was available in hindsight.
+"""
+
+import asyncio
+import csv
+import logging
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from web3.providers import AsyncBaseProvider
+
+from .clock import VirtualClock
+from .gas_monitor import GasMonitor
+from .timeseries_store import GasTimeSeriesFile
+
+
+# Configure module logger
+logger = logging.getLogger(__name__)
+
+NS_PER_SECOND = 1_000_000_000
+
+
+@dataclass(frozen=True)
+class GasSeries:
+    """
+    Recorded gas prices in time order.
+
+    Attributes:
+        timestamps_ns: Reading times in epoch nanoseconds (int64)
+        prices_wei: Gas prices in Wei (uint64)
+    """
+
+    timestamps_ns: np.ndarray
+    prices_wei: np.ndarray
+
+    def __post_init__(self):
+        timestamps = np.asarray(self.timestamps_ns, dtype=np.int64)
+        prices = np.asarray(self.prices_wei, dtype=np.uint64)
+        if timestamps.shape != prices.shape or timestamps.ndim != 1:
+            raise ValueError("timestamps_ns and prices_wei must be 1-D arrays of equal length")
+        order = np.argsort(timestamps, kind="stable")
+        object.__setattr__(self, "timestamps_ns", timestamps[order])
+        object.__setattr__(self, "prices_wei", prices[order])
+
+    def __len__(self) -> int:
+        return len(self.timestamps_ns)
+
+    @property
+    def prices_gwei(self) -> np.ndarray:
+        """Gas prices in Gwei (float64)."""
+        return self.prices_wei / 1e9
+
+    @property
+    def duration_seconds(self) -> float:
+        """Time covered by the series, in seconds."""
+        if len(self) < 2:
+            return 0.0
+        return float(self.timestamps_ns[-1] - self.timestamps_ns[0]) / NS_PER_SECOND
+
+    @classmethod
+    def from_csv(cls, path: str) -> "GasSeries":
+        """
+        Load a series from a CSV file with a header row.
+
+        The time column is ``timestamp_ns`` (epoch nanoseconds) or
+        ``timestamp`` (epoch seconds); the price column is ``price_wei`` or
+        ``price_gwei``.
+
+        Args:
+            path: Path of the CSV file
+
+        Returns:
+            GasSeries: The loaded series
+
+        Raises:
+            ValueError: If the required columns are missing
+        """
+        with open(path, newline="") as f:
+            rows = list(csv.DictReader(f))
+        columns = set(rows[0]) if rows else set()
+
+        if "timestamp_ns" in columns:
+            timestamps = [int(row["timestamp_ns"]) for row in rows]
+        elif "timestamp" in columns:
+            timestamps = [int(float(row["timestamp"]) * NS_PER_SECOND) for row in rows]
+        else:
+            raise ValueError(f"{path}: expected a timestamp_ns or timestamp column")
+
+        if "price_wei" in columns:
+            prices = [int(row["price_wei"]) for row in rows]
+        elif "price_gwei" in columns:
+            prices = [int(round(float(row["price_gwei"]) * 1e9)) for row in rows]
+        else:
+            raise ValueError(f"{path}: expected a price_wei or price_gwei column")
+
+        return cls(np.array(timestamps, dtype=np.int64), np.array(prices, dtype=np.uint64))
+
+    @classmethod
+    def from_parquet(cls, path: str) -> "GasSeries":
+        """
+        Load a series from a Parquet file with ``timestamp_ns`` and
+        ``price_wei`` columns.
+
+        Requires the optional ``pyarrow`` package.
+
+        Args:
+            path: Path of the Parquet file
+
+        Returns:
+            GasSeries: The loaded series
+
+        Raises:
+            ImportError: If pyarrow is not installed
+        """
+        try:
+            import pyarrow.parquet as pq
+        except ImportError as e:
+            raise ImportError("Loading Parquet gas series requires pyarrow (pip install pyarrow)") from e
+
+        table = pq.read_table(path, columns=["timestamp_ns", "price_wei"])
+        return cls(
+            table.column("timestamp_ns").to_numpy(),
+            table.column("price_wei").to_numpy(),
+        )
+
+    @classmethod
+    def from_timeseries_file(cls, path: str) -> "GasSeries":
+        """
+        Load a series from a ``GasTimeSeriesFile`` written by GasMonitor.
+
+        Args:
+            path: Path of the binary time-series file
+
+        Returns:
+            GasSeries: The loaded series
+        """
+        with GasTimeSeriesFile(path) as store:
+            records = store.records()
+            return cls(np.array(records["timestamp_ns"]), np.array(records["price_wei"]))
+
+
+@dataclass(frozen=True)
+class BacktestResult:
+    """
+    Outcome of a timing strategy over a replayed series.
+
+    Transactions arrive every ``arrival_interval`` seconds and must be sent
+    within ``max_wait`` seconds. Each one is sent at the first reading where
+    the strategy says so, or at its deadline.
+
+    Attributes:
+        strategy: Strategy name
+        transactions: Number of simulated transactions
+        mean_realized_gwei: Mean price paid
+        mean_optimal_gwei: Mean lowest price available within each window
+        mean_immediate_gwei: Mean price when sending on arrival
+        savings_pct: Saving of realized over immediate sending, in percent
+        regret_pct: Excess of realized over optimal, in percent
+        forced_ratio: Share of transactions sent at their deadline
+        mean_wait_seconds: Mean time from arrival to sending
+        samples: Number of readings replayed
+        replay_seconds: Wall-clock time of the replay
+    """
+
+    strategy: str
+    transactions: int
+    mean_realized_gwei: float
+    mean_optimal_gwei: float
+    mean_immediate_gwei: float
+    savings_pct: float
+    regret_pct: float
+    forced_ratio: float
+    mean_wait_seconds: float
+    samples: int
+    replay_seconds: float
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Get the result as a plain dict."""
+        return dict(self.__dict__)
+
+
+class ThresholdStrategy:
+    """Send when the latest price is at or below a fixed threshold."""
+
+    def __init__(self, threshold_gwei: float):
+        self.threshold_wei = GasMonitor.gwei_to_wei(threshold_gwei)
+        self.name = f"threshold<={threshold_gwei:g}gwei"
+
+    def __call__(self, monitor: GasMonitor) -> bool:
+        return monitor.gas_history.last_price_wei() <= self.threshold_wei
+
+
+class PercentileStrategy:
+    """Send when the latest price is at or below a percentile of the history."""
+
+    def __init__(self, percentile: float = 25):
+        self.percentile = percentile
+        self.name = f"percentile<=p{percentile:g}"
+
+    def __call__(self, monitor: GasMonitor) -> bool:
+        limit = monitor.get_gas_price_percentile(self.percentile)
+        return limit is not None and monitor.gas_history.last_price_wei() <= limit
+
+
+class ForecastStrategy:
+    """Send unless the forecaster expects a cheaper price within a few steps."""
+
+    def __init__(self, steps: int = 5, min_probability: float = 0.6):
+        self.steps = steps
+        self.min_probability = min_probability
+        self.name = f"forecast(steps={steps},p={min_probability:g})"
+
+    def __call__(self, monitor: GasMonitor) -> bool:
+        return not monitor.is_waiting_favorable(self.steps, self.min_probability)
+
+
+def transaction_windows(
+    series: GasSeries,
+    arrival_interval: float,
+    max_wait: float
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Get the reading index range of each simulated transaction.
+
+    Args:
+        series: Replayed series
+        arrival_interval: Seconds between transaction arrivals
+        max_wait: Seconds a transaction may wait before it must be sent
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: First and last eligible reading index
+            of each transaction, both non-decreasing
+    """
+    timestamps = series.timestamps_ns
+    if len(timestamps) == 0:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+
+    wait_ns = int(max_wait * NS_PER_SECOND)
+    arrivals = np.arange(
+        timestamps[0], timestamps[-1] - wait_ns + 1, int(arrival_interval * NS_PER_SECOND), dtype=np.int64
+    )
+    starts = np.searchsorted(timestamps, arrivals, side="left")
+    ends = np.searchsorted(timestamps, arrivals + wait_ns, side="right") - 1
+    return starts, np.maximum(ends, starts)
+
+
+def _range_min(values: np.ndarray, starts: np.ndarray, ends: np.ndarray) -> np.ndarray:
+    """Vectorized minimum of values[start:end + 1] via a sparse table."""
+    if len(starts) == 0:
+        return np.empty(0, dtype=values.dtype)
+
+    table = [values]
+    width = 1
+    while width * 2 <= len(values):
+        previous = table[-1]
+        table.append(np.minimum(previous[:-width], previous[width:]))
+        width *= 2
+
+    lengths = ends - starts + 1
+    levels = np.floor(np.log2(lengths)).astype(np.int64)
+    result = np.empty(len(starts), dtype=values.dtype)
+    for level in np.unique(levels):
+        mask = levels == level
+        row = table[level]
+        span = 1 << int(level)
+        result[mask] = np.minimum(row[starts[mask]], row[ends[mask] - span + 1])
+    return result
+
+
+def _summarize(
+    name: str,
+    series: GasSeries,
+    starts: np.ndarray,
+    ends: np.ndarray,
+    send_index: np.ndarray,
+    forced: np.ndarray,
+    replay_seconds: float
+) -> BacktestResult:
+    """Score realized send indexes against immediate and optimal sending."""
+    prices = series.prices_gwei
+    realized = prices[send_index]
+    immediate = prices[starts]
+    optimal = _range_min(prices, starts, ends)
+
+    count = len(starts)
+    mean_realized = float(realized.mean()) if count else 0.0
+    mean_immediate = float(immediate.mean()) if count else 0.0
+    mean_optimal = float(optimal.mean()) if count else 0.0
+    waits = (series.timestamps_ns[send_index] - series.timestamps_ns[starts]) / NS_PER_SECOND
+
+    return BacktestResult(
+        strategy=name,
+        transactions=count,
+        mean_realized_gwei=mean_realized,
+        mean_optimal_gwei=mean_optimal,
+        mean_immediate_gwei=mean_immediate,
+        savings_pct=100 * (1 - mean_realized / mean_immediate) if mean_immediate else 0.0,
+        regret_pct=100 * (mean_realized / mean_optimal - 1) if mean_optimal else 0.0,
+        forced_ratio=float(forced.mean()) if count else 0.0,
+        mean_wait_seconds=float(waits.mean()) if count else 0.0,
+        samples=len(series),
+        replay_seconds=replay_seconds,
+    )
+
+
+class ReplayProvider(AsyncBaseProvider):
+    """
+    JSON-RPC provider answering ``eth_gasPrice`` with a replayed reading.
+
+    A replay monitor uses it as its node, so recorded prices reach the
+    monitor through the same source, cache and fallback path as live ones.
+
+    Attributes:
+        gas_price_wei: Price of the reading being replayed, or None to
+            answer every request with an error
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.gas_price_wei: Optional[int] = None
+
+    async def make_request(self, method, params):
+        if method != "eth_gasPrice" or self.gas_price_wei is None:
+            return {
+                "jsonrpc": "2.0",
+                "id": 1,
+                "error": {"code": -32601, "message": f"{method} is not replayed"},
+            }
+        return {"jsonrpc": "2.0", "id": 1, "result": hex(self.gas_price_wei)}
+
+    async def is_connected(self, show_traceback=False):
+        return True
+
+
+class GasReplay:
+    """
+    Replays a recorded series through GasMonitor on a virtual clock.
+
+    Each reading is served by a ``ReplayProvider`` and taken in with
+    ``GasMonitor.update_gas_price`` at its recorded time, so the source
+    fetch, price cache, history, rolling statistics, forecaster and
+    threshold waiters all handle replayed data as they would live data.
+
+    Readings are fed one by one rather than by the monitor's fixed-rate
+    scheduler: backtests are scored per recorded reading, and scheduler
+    ticks would resample an irregular series onto the polling grid.
+    Replays are limited only by CPU, so they typically run many thousands
+    of times faster than real time.
+
+    Attributes:
+        series: Recorded series being replayed
+        monitor_kwargs: Extra GasMonitor arguments for each replay
+    """
+
+    def __init__(self, series: GasSeries, **monitor_kwargs: Any):
+        """
+        Initialize the replay.
+
+        Args:
+            series: Recorded series to replay
+            **monitor_kwargs: Further GasMonitor arguments (e.g. ``history_size``)
+        """
+        self.series = series
+        self.monitor_kwargs = monitor_kwargs
+
+    def create_monitor(self) -> GasMonitor:
+        """
+        Create a fresh monitor on a virtual clock at the start of the series.
+
+        The Etherscan fallback is disabled, so the ``ReplayProvider`` is the
+        only source and a replay never makes network calls; a reading the
+        provider cannot serve, such as a zero price, is skipped.
+
+        Returns:
+            GasMonitor: Monitor whose node is a ``ReplayProvider``
+        """
+        start_ns = int(self.series.timestamps_ns[0]) if len(self.series) else 0
+        kwargs = {"etherscan_fallback": False, **self.monitor_kwargs}
+        return GasMonitor(ReplayProvider(), clock=VirtualClock(start_ns), **kwargs)
+
+    def replay(self, monitor: GasMonitor, on_reading: Callable[[int], None] = None) -> None:
+        """
+        Feed every reading into a monitor in time order.
+
+        Runs its own event loop, so it must not be called from a coroutine.
+
+        Args:
+            monitor: Monitor created by ``create_monitor``
+            on_reading: Optional callback invoked with each reading's index
+                after it was recorded
+
+        Raises:
+            ValueError: If the monitor was not created by ``create_monitor``
+        """
+        provider = getattr(monitor.web3, "provider", None)
+        if not isinstance(provider, ReplayProvider):
+            raise ValueError("Replays need a monitor created by create_monitor()")
+        asyncio.run(self._replay(monitor, provider, on_reading))
+
+    async def _replay(
+        self,
+        monitor: GasMonitor,
+        provider: ReplayProvider,
+        on_reading: Optional[Callable[[int], None]]
+    ) -> None:
+        """Serve each reading from the provider and let the monitor fetch it."""
+        clock = monitor.clock
+        timestamps = self.series.timestamps_ns.tolist()
+        prices = self.series.prices_wei.tolist()
+        try:
+            for index, (timestamp_ns, price_wei) in enumerate(zip(timestamps, prices)):
+                clock.set_time_ns(timestamp_ns)
+                provider.gas_price_wei = price_wei
+                await monitor.update_gas_price()
+                if on_reading is not None:
+                    on_reading(index)
+        finally:
+            provider.gas_price_wei = None
+
+    def run(
+        self,
+        strategy: Callable[[GasMonitor], bool],
+        arrival_interval: float = 60,
+        max_wait: float = 600
+    ) -> BacktestResult:
+        """
+        Backtest a timing strategy.
+
+        The strategy is consulted after each reading while transactions are
+        waiting, and sees only the readings recorded so far.
+
+        Args:
+            strategy: Callable returning True to send all waiting transactions
+                at the latest price; its ``name`` attribute labels the result
+            arrival_interval: Seconds between transaction arrivals (default: 60)
+            max_wait: Seconds a transaction may wait (default: 600)
+
+        Returns:
+            BacktestResult: Realized versus optimal and immediate fees
+        """
+        starts, ends = transaction_windows(self.series, arrival_interval, max_wait)
+        send_index = ends.copy()
+        forced = np.ones(len(starts), dtype=bool)
+        pending = deque()
+        next_tx = 0
+        monitor = self.create_monitor()
+
+        def on_reading(index: int) -> None:
+            nonlocal next_tx
+            while next_tx < len(starts) and starts[next_tx] == index:
+                pending.append(next_tx)
+                next_tx += 1
+            if not pending:
+                return
+
+            if strategy(monitor):
+                for tx in pending:
+                    send_index[tx] = index
+                    forced[tx] = False
+                pending.clear()
+                return
+
+            while pending and ends[pending[0]] <= index:
+                pending.popleft()
+
+        started = time.perf_counter()
+        try:
+            self.replay(monitor, on_reading)
+            elapsed = time.perf_counter() - started
+        finally:
+            asyncio.run(monitor.aclose())
+
+        name = getattr(strategy, "name", getattr(strategy, "__name__", repr(strategy)))
+        result = _summarize(name, self.series, starts, ends, send_index, forced, elapsed)
+        logger.info(
+            f"Backtest {name}: {result.transactions} transactions, "
+            f"savings {result.savings_pct:.1f}%, regret {result.regret_pct:.1f}% "
+            f"({len(self.series)} readings in {elapsed:.2f}s)"
+        )
+        return result
+
+
+def sweep_thresholds(
+    series: GasSeries,
+    thresholds_gwei: Sequence[float],
+    arrival_interval: float = 60,
+    max_wait: float = 600
+) -> List[BacktestResult]:
+    """
+    Backtest fixed-threshold strategies over a series, vectorized.
+
+    A threshold decision depends only on the latest price, so each threshold
+    is scored in O(n) NumPy operations without replaying the monitor. The
+    results match ``GasReplay.run(ThresholdStrategy(t))``.
+
+    Args:
+        series: Recorded series
+        thresholds_gwei: Thresholds to evaluate
+        arrival_interval: Seconds between transaction arrivals (default: 60)
+        max_wait: Seconds a transaction may wait (default: 600)
+
+    Returns:
+        List[BacktestResult]: One result per threshold, in input order
+    """
+    starts, ends = transaction_windows(series, arrival_interval, max_wait)
+    count = len(series)
+    indexes = np.arange(count, dtype=np.int64)
+    results = []
+
+    for threshold in thresholds_gwei:
+        started = time.perf_counter()
+        threshold_wei = GasMonitor.gwei_to_wei(threshold)
+        eligible = np.where(series.prices_wei <= threshold_wei, indexes, count)
+        # First eligible reading at or after each index
+        next_eligible = np.minimum.accumulate(eligible[::-1])[::-1]
+
+        first = next_eligible[starts] if len(starts) else np.empty(0, dtype=np.int64)
+        forced = first > ends
+        send_index = np.where(forced, ends, first)
+        results.append(_summarize(
+            ThresholdStrategy(threshold).name, series, starts, ends, send_index, forced,
+            time.perf_counter() - started,
+        ))
+    return results
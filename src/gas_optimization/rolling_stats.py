@@ -0,0 +1,512 @@
+"""
+Rolling Gas Statistics Module
+
+This module maintains incremental statistics over the most recent gas price
+readings so that averages, volatility, exponential moving averages, extrema
+and percentiles can be queried without copying or re-scanning the history.
+"""
+
+import math
+from array import array
+from collections import OrderedDict, deque
+from typing import Dict, Iterable, Optional, Sequence, Tuple
+
+import numpy as np
+
+
+_MASK_64 = (1 << 64) - 1
+_MASK_128 = (1 << 128) - 1
+
+class _OrderIndex:
+    """
+    Order-statistic treap over the slots of a ring buffer.
+
+    Nodes are ring slots ordered by (value, slot). Every node keeps the size
+    of its subtree, so inserting, removing and selecting the k-th smallest
+    value take O(log n) expected time. Links, sizes and random priorities
+    live in typed arrays indexed by slot (16 bytes per slot); the extra
+    slot ``capacity`` is the empty-tree sentinel, with size 0.
+    """
+
+    def __init__(self, values: Sequence[int], capacity: int):
+        """
+        Initialize an empty index.
+
+        Args:
+            values: Value of each slot, shared with the ring buffer
+            capacity: Number of slots
+        """
+        self._values = values
+        self._nil = nil = capacity
+        self._left = array("i", [nil]) * (capacity + 1)
+        self._right = array("i", [nil]) * (capacity + 1)
+        self._size = array("i", [0]) * (capacity + 1)
+        self._priority = array("I")
+        self._priority.frombytes(
+            np.random.default_rng(capacity).integers(0, 2**32, capacity + 1, dtype=np.uint32).tobytes()
+        )
+        self._root = nil
+
+    def __len__(self) -> int:
+        return self._size[self._root]
+
+    def insert(self, node: int) -> None:
+        """
+        Add a slot, ordered by its current value.
+
+        Args:
+            node: Slot not currently in the index
+        """
+        nil, values, left, right, size, priority = (
+            self._nil, self._values, self._left, self._right, self._size, self._priority
+        )
+        value, node_priority = values[node], priority[node]
+
+        # Descend while the path outranks the new node, counting it in
+        parent, is_right, current = nil, False, self._root
+        while current != nil and priority[current] >= node_priority:
+            size[current] += 1
+            parent = current
+            current_value = values[current]
+            is_right = current_value < value or (current_value == value and current < node)
+            current = right[current] if is_right else left[current]
+
+        # Split the remaining subtree around the new node, which takes its place
+        before = after = nil
+        path = []
+        while current != nil:
+            path.append(current)
+            current_value = values[current]
+            if current_value < value or (current_value == value and current < node):
+                if before == nil:
+                    left[node] = current
+                else:
+                    right[before] = current
+                before, current = current, right[current]
+            else:
+                if after == nil:
+                    right[node] = current
+                else:
+                    left[after] = current
+                after, current = current, left[current]
+        if before == nil:
+            left[node] = nil
+        else:
+            right[before] = nil
+        if after == nil:
+            right[node] = nil
+        else:
+            left[after] = nil
+        for current in reversed(path):
+            size[current] = size[left[current]] + size[right[current]] + 1
+        size[node] = size[left[node]] + size[right[node]] + 1
+
+        if parent == nil:
+            self._root = node
+        elif is_right:
+            right[parent] = node
+        else:
+            left[parent] = node
+
+    def remove(self, node: int) -> None:
+        """
+        Remove a slot; its value must not have changed since it was inserted.
+
+        Args:
+            node: Slot currently in the index
+        """
+        nil, values, left, right, size, priority = (
+            self._nil, self._values, self._left, self._right, self._size, self._priority
+        )
+        value = values[node]
+
+        # Descend to the node, counting it out of every subtree on the way
+        parent, is_right, current = nil, False, self._root
+        while current != node:
+            size[current] -= 1
+            parent = current
+            current_value = values[current]
+            is_right = current_value < value or (current_value == value and current < node)
+            current = right[current] if is_right else left[current]
+
+        # Merge its children into its place; every node of ``first`` orders
+        # before every node of ``second``
+        first, second = left[node], right[node]
+        while first != nil and second != nil:
+            if priority[first] > priority[second]:
+                size[first] += size[second]
+                chosen, first = first, right[first]
+                child_is_right = True
+            else:
+                size[second] += size[first]
+                chosen, second = second, left[second]
+                child_is_right = False
+            if parent == nil:
+                self._root = chosen
+            elif is_right:
+                right[parent] = chosen
+            else:
+                left[parent] = chosen
+            parent, is_right = chosen, child_is_right
+
+        rest = first if first != nil else second
+        if parent == nil:
+            self._root = rest
+        elif is_right:
+            right[parent] = rest
+        else:
+            left[parent] = rest
+
+    def select(self, rank: int) -> int:
+        """
+        Get the value of a given rank.
+
+        Args:
+            rank: Zero-based rank, smaller than ``len(self)``
+
+        Returns:
+            int: The ``rank``-th smallest value
+        """
+        node = self._root
+        while True:
+            left = self._left[node]
+            left_size = self._size[left]
+            if rank < left_size:
+                node = left
+            elif rank == left_size:
+                return self._values[node]
+            else:
+                rank -= left_size + 1
+                node = self._right[node]
+
+
+class RollingGasStatistics:
+    """
+    Incremental statistics over the last ``capacity`` gas prices.
+
+    Complexity per operation:
+        push: O(1) amortized for sums, EMAs and extrema; O(log n) expected
+            for the order-statistic index
+        window_sum / window_mean / window_variance: O(1) for any window
+        ema: O(1)
+        min / max: O(1) for registered windows (registered lazily on first
+            use; at most ``MAX_EXTREMUM_WINDOWS`` each, least recently
+            queried dropped first)
+        percentile / median: O(log n) over the full history; O(1) when the
+            same ranks are queried again before the next push
+
+    Per-reading state lives in typed arrays (``array.array``) rather than
+    lists of Python ints: 48 bytes per reading for the values, prefix sums
+    and order index. They are used instead of NumPy arrays because every
+    access is a scalar access from Python, which they serve several times
+    faster. Prefix sums are kept modulo 2**64 and prefix sums of squares
+    modulo 2**128 (as high and low words), so they never grow into big
+    integers; window differences stay exact while a window's sum is below
+    2**64 Wei and its sum of squares below 2**128, e.g. a million readings
+    of up to 18,000 Gwei.
+
+    Attributes:
+        capacity: Maximum number of readings covered by the statistics
+        count: Number of readings currently covered
+        total_pushed: Number of readings pushed since creation or reset
+    """
+
+    # Most window sizes that keep a min or max deque updated on every push
+    MAX_EXTREMUM_WINDOWS = 8
+
+    def __init__(self, capacity: int, ema_half_lives: Iterable[float] = (5, 20, 100)):
+        """
+        Initialize the statistics.
+
+        Args:
+            capacity: Maximum number of readings to cover
+            ema_half_lives: Half-lives, in readings, of the maintained EMAs
+                (default: (5, 20, 100))
+
+        Raises:
+            ValueError: If capacity is not positive
+        """
+        if capacity <= 0:
+            raise ValueError("capacity must be positive")
+
+        self.capacity = capacity
+        self._ema_alphas: Dict[float, float] = {
+            half_life: 1 - 2 ** (-1 / half_life) for half_life in ema_half_lives
+        }
+        self.reset()
+
+    @property
+    def ema_half_lives(self) -> Tuple[float, ...]:
+        """Half-lives, in readings, of the maintained EMAs."""
+        return tuple(self._ema_alphas)
+
+    def reset(self) -> None:
+        """Discard all readings."""
+        self.total_pushed = 0
+
+        # Ring buffers of raw values and of prefix sums; prefix sum k covers the
+        # first k readings ever pushed and lives at slot k % (capacity + 1)
+        self._values = array("Q", [0]) * self.capacity
+        self._prefix_sum = array("Q", [0]) * (self.capacity + 1)
+        self._prefix_sum_sq_high = array("Q", [0]) * (self.capacity + 1)
+        self._prefix_sum_sq_low = array("Q", [0]) * (self.capacity + 1)
+
+        self._emas: Dict[float, Optional[float]] = {h: None for h in self._ema_alphas}
+
+        # Monotonic deques of (sequence number, value) per extrema window,
+        # least recently queried first
+        self._min_deques: "OrderedDict[int, deque]" = OrderedDict()
+        self._max_deques: "OrderedDict[int, deque]" = OrderedDict()
+
+        # Order-statistic index of the covered slots for percentiles, and the
+        # values selected from it since the last push
+        self._order = _OrderIndex(self._values, self.capacity)
+        self._selected: Dict[int, int] = {}
+
+    @property
+    def count(self) -> int:
+        """Number of readings currently covered."""
+        return min(self.total_pushed, self.capacity)
+
+    def push(self, value: int) -> None:
+        """
+        Add a reading, evicting the oldest once ``capacity`` is reached.
+
+        Args:
+            value: Gas price in Wei, below 2**64
+        """
+        seq = self.total_pushed
+        slot = seq % self.capacity
+
+        if seq >= self.capacity:
+            self._order.remove(slot)
+
+        self._values[slot] = value
+        self._order.insert(slot)
+        if self._selected:
+            self._selected.clear()
+
+        ring = self.capacity + 1
+        previous, current = seq % ring, (seq + 1) % ring
+        self._prefix_sum[current] = (self._prefix_sum[previous] + value) & _MASK_64
+        sum_sq = (self._prefix_sum_sq(previous) + value * value) & _MASK_128
+        self._prefix_sum_sq_high[current] = sum_sq >> 64
+        self._prefix_sum_sq_low[current] = sum_sq & _MASK_64
+
+        for half_life, alpha in self._ema_alphas.items():
+            previous = self._emas[half_life]
+            self._emas[half_life] = value if previous is None else previous + alpha * (value - previous)
+
+        for window, window_deque in self._min_deques.items():
+            while window_deque and window_deque[-1][1] >= value:
+                window_deque.pop()
+            window_deque.append((seq, value))
+            while window_deque[0][0] <= seq - window:
+                window_deque.popleft()
+
+        for window, window_deque in self._max_deques.items():
+            while window_deque and window_deque[-1][1] <= value:
+                window_deque.pop()
+            window_deque.append((seq, value))
+            while window_deque[0][0] <= seq - window:
+                window_deque.popleft()
+
+        self.total_pushed = seq + 1
+
+    def _clamp_window(self, window: Optional[int]) -> int:
+        """Clamp a requested window to the number of covered readings."""
+        if window is None or window <= 0:
+            return self.count
+        return min(window, self.count)
+
+    def _prefix_sum_sq(self, index: int) -> int:
+        """Join the high and low words of a prefix sum of squares."""
+        return (self._prefix_sum_sq_high[index] << 64) | self._prefix_sum_sq_low[index]
+
+    def _window_sums(self, window: int):
+        """Return (sum, sum of squares) over the last ``window`` readings."""
+        ring = self.capacity + 1
+        end = self.total_pushed % ring
+        start = (self.total_pushed - window) % ring
+        return (
+            (self._prefix_sum[end] - self._prefix_sum[start]) & _MASK_64,
+            (self._prefix_sum_sq(end) - self._prefix_sum_sq(start)) & _MASK_128,
+        )
+
+    def window_sum(self, window: Optional[int] = None) -> int:
+        """
+        Sum of the last ``window`` readings.
+
+        Args:
+            window: Number of recent readings, or None for all covered readings
+
+        Returns:
+            int: Sum in Wei (0 if there are no readings)
+        """
+        window = self._clamp_window(window)
+        return self._window_sums(window)[0] if window else 0
+
+    def window_mean(self, window: Optional[int] = None) -> Optional[float]:
+        """
+        Mean of the last ``window`` readings.
+
+        Args:
+            window: Number of recent readings, or None for all covered readings
+
+        Returns:
+            Optional[float]: Mean in Wei, or None if there are no readings
+        """
+        window = self._clamp_window(window)
+        if not window:
+            return None
+        return self._window_sums(window)[0] / window
+
+    def window_variance(self, window: Optional[int] = None) -> Optional[float]:
+        """
+        Population variance of the last ``window`` readings.
+
+        Args:
+            window: Number of recent readings, or None for all covered readings
+
+        Returns:
+            Optional[float]: Variance in Wei squared, or None if there are no readings
+        """
+        window = self._clamp_window(window)
+        if not window:
+            return None
+        total, total_sq = self._window_sums(window)
+        # Exact integer numerator avoids catastrophic cancellation
+        return (window * total_sq - total * total) / (window * window)
+
+    def window_std(self, window: Optional[int] = None) -> Optional[float]:
+        """
+        Population standard deviation of the last ``window`` readings.
+
+        Args:
+            window: Number of recent readings, or None for all covered readings
+
+        Returns:
+            Optional[float]: Standard deviation in Wei, or None if there are no readings
+        """
+        variance = self.window_variance(window)
+        return None if variance is None else math.sqrt(variance)
+
+    def ema(self, half_life: float) -> Optional[float]:
+        """
+        Exponential moving average with the given half-life.
+
+        Args:
+            half_life: Half-life in readings; must be one of ``ema_half_lives``
+
+        Returns:
+            Optional[float]: EMA in Wei, or None if there are no readings
+
+        Raises:
+            ValueError: If the half-life is not maintained
+        """
+        if half_life not in self._emas:
+            raise ValueError(
+                f"EMA half-life {half_life} is not maintained; "
+                f"available: {sorted(self._emas)}"
+            )
+        return self._emas[half_life]
+
+    def _extremum_deque(self, deques: "OrderedDict[int, deque]", window: int, is_min: bool) -> deque:
+        """Get the monotonic deque for a window, building it on first use."""
+        window_deque = deques.get(window)
+        if window_deque is not None:
+            deques.move_to_end(window)
+        else:
+            window_deque = deque()
+            first = self.total_pushed - self.count
+            for seq in range(first, self.total_pushed):
+                value = self._values[seq % self.capacity]
+                while window_deque and (
+                    window_deque[-1][1] >= value if is_min else window_deque[-1][1] <= value
+                ):
+                    window_deque.pop()
+                window_deque.append((seq, value))
+            while window_deque and window_deque[0][0] <= self.total_pushed - 1 - window:
+                window_deque.popleft()
+            deques[window] = window_deque
+            if len(deques) > self.MAX_EXTREMUM_WINDOWS:
+                deques.popitem(last=False)
+        return window_deque
+
+    def min(self, window: Optional[int] = None) -> Optional[int]:
+        """
+        Minimum of the last ``window`` readings.
+
+        The first query for a new window size builds its monotonic deque in
+        O(window); later queries and pushes keep it up to date in O(1).
+        Only the ``MAX_EXTREMUM_WINDOWS`` most recently queried window sizes
+        are kept, so one-off windows do not slow down every later push.
+
+        Args:
+            window: Number of recent readings, or None for the full capacity
+
+        Returns:
+            Optional[int]: Minimum in Wei, or None if there are no readings
+        """
+        if not self.count:
+            return None
+        window = self.capacity if window is None or window <= 0 else min(window, self.capacity)
+        return self._extremum_deque(self._min_deques, window, is_min=True)[0][1]
+
+    def max(self, window: Optional[int] = None) -> Optional[int]:
+        """
+        Maximum of the last ``window`` readings.
+
+        Args:
+            window: Number of recent readings, or None for the full capacity
+
+        Returns:
+            Optional[int]: Maximum in Wei, or None if there are no readings
+        """
+        if not self.count:
+            return None
+        window = self.capacity if window is None or window <= 0 else min(window, self.capacity)
+        return self._extremum_deque(self._max_deques, window, is_min=False)[0][1]
+
+    def percentile(self, percentile: float) -> Optional[float]:
+        """
+        Percentile of all covered readings with linear interpolation.
+
+        Args:
+            percentile: Percentile in the range 0-100
+
+        Returns:
+            Optional[float]: Percentile in Wei, or None if there are no readings
+
+        Raises:
+            ValueError: If percentile is outside 0-100
+        """
+        if not 0 <= percentile <= 100:
+            raise ValueError("percentile must be between 0 and 100")
+        count = len(self._order)
+        if not count:
+            return None
+
+        position = (count - 1) * percentile / 100
+        lower = math.floor(position)
+        upper = min(lower + 1, count - 1)
+        fraction = position - lower
+        lower_value = self._select(lower)
+        upper_value = lower_value if upper == lower else self._select(upper)
+        return lower_value + (upper_value - lower_value) * fraction
+
+    def _select(self, rank: int) -> int:
+        """Get the value of a rank, memoized until the next push."""
+        value = self._selected.get(rank)
+        if value is None:
+            value = self._selected[rank] = self._order.select(rank)
+        return value
+
+    def median(self) -> Optional[float]:
+        """
+        Median of all covered readings.
+
+        Returns:
+            Optional[float]: Median in Wei, or None if there are no readings
+        """
+        return self.percentile(50)
@@ -0,0 +1,342 @@
+"""
+Fixed-Rate Scheduler Module
+
+This module runs a coroutine at a fixed rate aimed at absolute deadlines,
+so the sampling cadence does not drift with callback latency. Missed ticks
+are skipped or coalesced, concurrent runs are bounded, and tick lag and
+overruns are recorded in histograms. The rate can be retuned while running,
+for example by an ``AdaptiveInterval`` policy.
+"""
+
+import asyncio
+import logging
+from typing import Awaitable, Callable, Dict, Optional, Set, Union
+
+from .clock import SystemClock, VirtualClock
+from .metrics import Histogram
+
+
+# Configure module logger
+logger = logging.getLogger(__name__)
+
+
+class FixedRateScheduler:
+    """
+    Runs a callback on a fixed grid of absolute deadlines.
+
+    Tick ``k`` is due at ``start + k * interval`` on the clock's monotonic
+    time, regardless of how long earlier callbacks took. Each callback runs
+    as its own task, so a slow callback does not delay the next tick.
+
+    Under overload:
+
+    * If the loop wakes a whole interval or more after a deadline, the
+      missed ticks are either coalesced into one immediate run
+      (``"coalesce"``) or dropped so the next run happens on the next grid
+      point (``"skip"``).
+    * If ``max_in_flight`` callbacks are still running when a tick is due,
+      that tick is dropped rather than queued.
+
+    ``set_interval`` changes the period from the last tick onward and wakes
+    the loop if the next tick is now due sooner.
+
+    Attributes:
+        interval: Seconds between ticks
+        max_in_flight: Maximum number of concurrently running callbacks
+        missed_tick_policy: "coalesce" or "skip"
+        ticks: Number of callbacks started
+        missed_ticks: Ticks not run individually because the loop was late
+        busy_ticks: Ticks dropped because ``max_in_flight`` runs were active
+        overruns: Callbacks that took longer than the interval
+        tick_lag: Histogram of seconds between deadline and start
+        duration: Histogram of callback durations in seconds
+        overrun: Histogram of seconds by which callbacks exceeded the interval
+        is_running: Flag indicating if the scheduler loop is active
+    """
+
+    MISSED_TICK_POLICIES = ("coalesce", "skip")
+
+    def __init__(
+        self,
+        interval: float,
+        callback: Callable[[], Awaitable[None]],
+        clock: Optional[Union[SystemClock, VirtualClock]] = None,
+        max_in_flight: int = 1,
+        missed_tick_policy: str = "coalesce"
+    ):
+        """
+        Initialize the scheduler.
+
+        Args:
+            interval: Seconds between ticks
+            callback: Coroutine function run on every tick
+            clock: Time source (default: wall-clock ``SystemClock``)
+            max_in_flight: Maximum number of concurrently running callbacks
+                (default: 1)
+            missed_tick_policy: "coalesce" runs once immediately for all
+                missed ticks; "skip" waits for the next grid point
+                (default: "coalesce")
+
+        Raises:
+            ValueError: If interval or max_in_flight is not positive or the
+                policy is not supported
+        """
+        if interval <= 0 or max_in_flight <= 0:
+            raise ValueError("interval and max_in_flight must be positive")
+        if missed_tick_policy not in self.MISSED_TICK_POLICIES:
+            raise ValueError(
+                f"Unsupported missed_tick_policy {missed_tick_policy!r}; "
+                f"expected one of {self.MISSED_TICK_POLICIES}"
+            )
+
+        self.interval = interval
+        self._interval_ns = int(interval * 1e9)
+        self.callback = callback
+        self.clock = clock or SystemClock()
+        self.max_in_flight = max_in_flight
+        self.missed_tick_policy = missed_tick_policy
+
+        self.ticks = 0
+        self.missed_ticks = 0
+        self.busy_ticks = 0
+        self.overruns = 0
+        self.tick_lag = Histogram("tick_lag_seconds")
+        self.duration = Histogram("callback_duration_seconds")
+        self.overrun = Histogram("overrun_seconds")
+
+        self.is_running = False
+        self._in_flight: Set[asyncio.Task] = set()
+        self._deadline = 0
+        self._wakeup: Optional[asyncio.Future] = None
+
+    async def run(self) -> None:
+        """
+        Run ticks until stopped or cancelled.
+
+        Callbacks still running when the loop ends are cancelled.
+        """
+        clock = self.clock
+        self._deadline = clock.monotonic_ns()
+        self.is_running = True
+
+        try:
+            while self.is_running:
+                now = clock.monotonic_ns()
+                if now < self._deadline:
+                    # Re-check afterwards: the deadline may have moved
+                    await self._sleep((self._deadline - now) / 1e9)
+                    continue
+
+                interval_ns = self._interval_ns
+                lag = now - self._deadline
+                missed = lag // interval_ns
+                if missed and self.missed_tick_policy == "skip":
+                    self.missed_ticks += missed + 1
+                    self._deadline += (missed + 1) * interval_ns
+                    logger.debug(f"Skipped {missed + 1} late ticks")
+                    continue
+
+                self.missed_ticks += missed
+                self.tick_lag.observe(lag / 1e9)
+                self._start_callback()
+                self._deadline += (missed + 1) * interval_ns
+        finally:
+            self.is_running = False
+            tasks = list(self._in_flight)
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            self._in_flight.clear()
+
+    async def _sleep(self, seconds: float) -> None:
+        """
+        Sleep on the clock until the duration elapses or the loop is woken.
+
+        Args:
+            seconds: Duration in seconds
+        """
+        self._wakeup = asyncio.get_running_loop().create_future()
+        sleeper = asyncio.ensure_future(self.clock.sleep(seconds))
+        try:
+            await asyncio.wait((sleeper, self._wakeup), return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            sleeper.cancel()
+            self._wakeup = None
+
+    def _wake(self) -> None:
+        """Interrupt the current sleep, if any."""
+        if self._wakeup is not None and not self._wakeup.done():
+            self._wakeup.set_result(None)
+
+    def set_interval(self, interval: float) -> None:
+        """
+        Change the period, measured from the last tick.
+
+        Args:
+            interval: Seconds between ticks
+
+        Raises:
+            ValueError: If interval is not positive
+        """
+        if interval <= 0:
+            raise ValueError("interval must be positive")
+
+        interval_ns = int(interval * 1e9)
+        if self.is_running:
+            self._deadline += interval_ns - self._interval_ns
+            if interval_ns < self._interval_ns:
+                self._wake()
+        self.interval = interval
+        self._interval_ns = interval_ns
+
+    def stop(self) -> None:
+        """Stop after the current tick."""
+        self.is_running = False
+        self._wake()
+
+    def _start_callback(self) -> None:
+        """Start a callback task unless too many are still running."""
+        if len(self._in_flight) >= self.max_in_flight:
+            self.busy_ticks += 1
+            logger.debug(f"Dropped tick: {len(self._in_flight)} callbacks still running")
+            return
+
+        self.ticks += 1
+        self._in_flight.add(asyncio.create_task(self._run_callback()))
+
+    async def _run_callback(self) -> None:
+        """Run the callback and record its duration."""
+        started = self.clock.monotonic_ns()
+        try:
+            await self.callback()
+        except Exception as e:
+            logger.error(f"Scheduled callback failed: {e}", exc_info=True)
+        finally:
+            # Release the slot before the task finishes, not a loop iteration later
+            self._in_flight.discard(asyncio.current_task())
+
+        elapsed = (self.clock.monotonic_ns() - started) / 1e9
+        self.duration.observe(elapsed)
+        if elapsed > self.interval:
+            self.overruns += 1
+            self.overrun.observe(elapsed - self.interval)
+
+    def get_stats(self) -> Dict[str, object]:
+        """
+        Get scheduler counters and histograms.
+
+        Returns:
+            Dict[str, object]: ``ticks``, ``missed_ticks``, ``busy_ticks``,
+                ``overruns``, ``in_flight`` and the ``tick_lag``, ``duration``
+                and ``overrun`` histogram summaries
+        """
+        return {
+            "ticks": self.ticks,
+            "missed_ticks": self.missed_ticks,
+            "busy_ticks": self.busy_ticks,
+            "overruns": self.overruns,
+            "in_flight": len(self._in_flight),
+            "tick_lag": self.tick_lag.as_dict(),
+            "duration": self.duration.as_dict(),
+            "overrun": self.overrun.as_dict(),
+        }
+
+
+class AdaptiveInterval:
+    """
+    Polling interval policy driven by market volatility and threshold proximity.
+
+    Two urgency scores in [0, 1] are combined by taking the larger:
+
+    * volatility: the coefficient of variation of recent readings relative
+      to ``volatility_target`` (1 at or above the target)
+    * proximity: how close the price is to the nearest watched threshold,
+      1 at the threshold and 0 at ``proximity`` (a relative distance) or
+      beyond
+
+    The interval is interpolated geometrically from ``max_interval`` at
+    urgency 0 to ``min_interval`` at urgency 1, so a flat market is sampled
+    rarely and a moving one, or one about to cross a threshold, often.
+
+    Attributes:
+        min_interval: Interval in seconds at full urgency
+        max_interval: Interval in seconds when the market is flat
+        volatility_target: Coefficient of variation treated as fully volatile
+        proximity: Relative distance to a threshold below which polling speeds up
+    """
+
+    def __init__(
+        self,
+        min_interval: float,
+        max_interval: float,
+        volatility_target: float = 0.05,
+        proximity: float = 0.1
+    ):
+        """
+        Initialize the policy.
+
+        Args:
+            min_interval: Interval in seconds at full urgency
+            max_interval: Interval in seconds when the market is flat
+            volatility_target: Coefficient of variation (std / mean) treated
+                as fully volatile (default: 0.05)
+            proximity: Relative distance to a threshold at which polling
+                starts to speed up (default: 0.1, i.e. within 10%)
+
+        Raises:
+            ValueError: If the intervals are not positive and ordered or the
+                scales are not positive
+        """
+        if not 0 < min_interval <= max_interval:
+            raise ValueError("intervals must satisfy 0 < min_interval <= max_interval")
+        if volatility_target <= 0 or proximity <= 0:
+            raise ValueError("volatility_target and proximity must be positive")
+
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.volatility_target = volatility_target
+        self.proximity = proximity
+
+    def urgency(
+        self,
+        relative_volatility: Optional[float],
+        relative_distance: Optional[float] = None
+    ) -> float:
+        """
+        Score how urgently the price should be sampled.
+
+        Args:
+            relative_volatility: Standard deviation divided by the mean of
+                recent readings, or None if unknown
+            relative_distance: Distance from the price to the nearest watched
+                threshold divided by the price, or None if nothing is watched
+
+        Returns:
+            float: Urgency between 0 and 1
+        """
+        urgency = 0.0
+        if relative_volatility is not None:
+            urgency = min(1.0, relative_volatility / self.volatility_target)
+        if relative_distance is not None:
+            urgency = max(urgency, 1.0 - min(1.0, relative_distance / self.proximity))
+        return urgency
+
+    def interval(
+        self,
+        relative_volatility: Optional[float],
+        relative_distance: Optional[float] = None
+    ) -> float:
+        """
+        Choose the polling interval.
+
+        Args:
+            relative_volatility: Standard deviation divided by the mean of
+                recent readings, or None if unknown
+            relative_distance: Distance from the price to the nearest watched
+                threshold divided by the price, or None if nothing is watched
+
+        Returns:
+            float: Interval in seconds between ``min_interval`` and ``max_interval``
+        """
+        urgency = self.urgency(relative_volatility, relative_distance)
+        return self.max_interval * (self.min_interval / self.max_interval) ** urgency
@@ -0,0 +1,361 @@
+"""
+Shared Gas Feed Module
+
+This module lets one GasMonitor publish its latest reading and rolling
+statistics to any number of worker processes on the same host through a
+``multiprocessing.shared_memory`` segment, so only the publisher talks to
+the RPC provider.
+
+Segment layout (little-endian, 192 bytes):
+    Header (64 bytes): magic ``b"GASFEED\\x00"``, uint32 format version,
+        uint32 record size, zero padding
+    Record (128 bytes): uint64 sequence, then the payload: int64
+        timestamp_ns, uint64 gas_price_wei, int64 block_number, int64
+        base_fee_wei, int64 max_priority_fee_wei (-1 when unknown), uint64
+        sample_count, float64 mean/median/min/max/std in Gwei (NaN when
+        unknown), uint64 updates, zero padding
+
+The record is guarded by a seqlock. The publisher makes the sequence odd,
+writes the payload, then makes it even again. A reader copies the payload
+between two reads of the sequence and retries if the sequence was odd or
+changed, so reads never block the publisher, take no locks and make no
+system calls. Only a reader that keeps colliding with the publisher (for
+example because the publisher was preempted mid-write) yields the CPU
+between retries.
+"""
+
+import math
+import os
+import struct
+import sys
+import threading
+import time
+from dataclasses import dataclass
+from multiprocessing import resource_tracker, shared_memory
+from typing import Optional, Tuple
+
+
+class SharedFeedFormatError(Exception):
+    """Raised when a shared memory segment is not a gas feed or has an unknown version."""
+
+
+@dataclass(frozen=True)
+class GasFeedSnapshot:
+    """
+    Latest gas state read from a shared feed.
+
+    Attributes:
+        sequence: Seqlock sequence of the record; grows by 2 per publish
+        timestamp_ns: Time of the reading in epoch nanoseconds
+        gas_price: Gas price in Wei
+        block_number: Latest block number seen by the publisher, or None
+        base_fee: Base fee in Wei, or None if unknown
+        max_priority_fee: Priority fee in Wei, or None if unknown
+        sample_count: Number of readings behind the statistics
+        mean_gwei: Mean gas price over the publisher's history, or None
+        median_gwei: Median gas price over the publisher's history, or None
+        min_gwei: Lowest gas price over the publisher's history, or None
+        max_gwei: Highest gas price over the publisher's history, or None
+        std_gwei: Standard deviation over the publisher's history, or None
+        updates: Number of publishes since the segment was created
+    """
+
+    sequence: int
+    timestamp_ns: int
+    gas_price: int
+    block_number: Optional[int]
+    base_fee: Optional[int]
+    max_priority_fee: Optional[int]
+    sample_count: int
+    mean_gwei: Optional[float]
+    median_gwei: Optional[float]
+    min_gwei: Optional[float]
+    max_gwei: Optional[float]
+    std_gwei: Optional[float]
+    updates: int
+
+    @property
+    def gas_price_gwei(self) -> float:
+        """Gas price in Gwei."""
+        return self.gas_price / 1e9
+
+
+def _optional_int(value: int) -> Optional[int]:
+    return None if value < 0 else value
+
+
+def _optional_float(value: float) -> Optional[float]:
+    return None if math.isnan(value) else value
+
+
+class _SharedGasFeed:
+    """Segment layout shared by the publisher and readers."""
+
+    MAGIC = b"GASFEED\x00"
+    VERSION = 1
+    HEADER_SIZE = 64
+    RECORD_SIZE = 128
+    SIZE = HEADER_SIZE + RECORD_SIZE
+    _HEADER_STRUCT = struct.Struct("<8sII")
+    _SEQUENCE_STRUCT = struct.Struct("<Q")
+    _PAYLOAD_STRUCT = struct.Struct("<qQqqqQdddddQ")
+    _PRICE_STRUCT = struct.Struct("<qQ")
+    SEQUENCE_OFFSET = HEADER_SIZE
+    PAYLOAD_OFFSET = HEADER_SIZE + _SEQUENCE_STRUCT.size
+
+    def __init__(self, shm: shared_memory.SharedMemory):
+        self._shm = shm
+        self._buf = shm.buf
+
+    @property
+    def name(self) -> str:
+        """Name other processes use to attach to the segment."""
+        return self._shm.name
+
+    @property
+    def sequence(self) -> int:
+        """Current seqlock sequence; odd while a publish is in progress."""
+        return self._SEQUENCE_STRUCT.unpack_from(self._buf, self.SEQUENCE_OFFSET)[0]
+
+    def close(self) -> None:
+        """Detach from the segment in this process."""
+        if self._buf is not None:
+            self._buf = None
+            self._shm.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+
+class SharedGasFeedPublisher(_SharedGasFeed):
+    """
+    Single writer of a shared gas feed.
+
+    Only one publisher may write to a segment. The segment is removed by
+    ``unlink`` (or on exit of a context manager block) once no more readers
+    need it.
+    """
+
+    def __init__(self, name: Optional[str] = None):
+        """
+        Create the shared memory segment.
+
+        Args:
+            name: Segment name readers attach to; a random name is chosen
+                if None
+
+        Raises:
+            FileExistsError: If a segment with this name already exists
+        """
+        super().__init__(shared_memory.SharedMemory(name=name, create=True, size=self.SIZE))
+        self._buf[:self.SIZE] = bytes(self.SIZE)
+        self._HEADER_STRUCT.pack_into(self._buf, 0, self.MAGIC, self.VERSION, self.RECORD_SIZE)
+        self._sequence = 0
+        self.updates = 0
+
+    def publish(
+        self,
+        timestamp_ns: int,
+        gas_price: int,
+        block_number: Optional[int] = None,
+        base_fee: Optional[int] = None,
+        max_priority_fee: Optional[int] = None,
+        sample_count: int = 0,
+        mean_gwei: Optional[float] = None,
+        median_gwei: Optional[float] = None,
+        min_gwei: Optional[float] = None,
+        max_gwei: Optional[float] = None,
+        std_gwei: Optional[float] = None
+    ) -> None:
+        """
+        Write a new record under the seqlock.
+
+        Args:
+            timestamp_ns: Time of the reading in epoch nanoseconds
+            gas_price: Gas price in Wei
+            block_number: Latest block number, or None
+            base_fee: Base fee in Wei, or None
+            max_priority_fee: Priority fee in Wei, or None
+            sample_count: Number of readings behind the statistics
+            mean_gwei: Mean gas price in Gwei, or None
+            median_gwei: Median gas price in Gwei, or None
+            min_gwei: Lowest gas price in Gwei, or None
+            max_gwei: Highest gas price in Gwei, or None
+            std_gwei: Standard deviation in Gwei, or None
+        """
+        nan = math.nan
+        self.updates += 1
+        payload = self._PAYLOAD_STRUCT.pack(
+            timestamp_ns,
+            gas_price,
+            -1 if block_number is None else block_number,
+            -1 if base_fee is None else base_fee,
+            -1 if max_priority_fee is None else max_priority_fee,
+            sample_count,
+            nan if mean_gwei is None else mean_gwei,
+            nan if median_gwei is None else median_gwei,
+            nan if min_gwei is None else min_gwei,
+            nan if max_gwei is None else max_gwei,
+            nan if std_gwei is None else std_gwei,
+            self.updates,
+        )
+
+        buf = self._buf
+        self._sequence += 1
+        self._SEQUENCE_STRUCT.pack_into(buf, self.SEQUENCE_OFFSET, self._sequence)
+        buf[self.PAYLOAD_OFFSET:self.PAYLOAD_OFFSET + len(payload)] = payload
+        self._sequence += 1
+        self._SEQUENCE_STRUCT.pack_into(buf, self.SEQUENCE_OFFSET, self._sequence)
+
+    def unlink(self) -> None:
+        """Remove the segment; readers already attached keep their mapping."""
+        self._shm.unlink()
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+        self.unlink()
+
+
+class SharedGasFeedReader(_SharedGasFeed):
+    """
+    Lock-free reader of a shared gas feed.
+
+    Readers never write to the segment, so any number of processes can read
+    concurrently with the publisher.
+    """
+
+    # Busy retries before a reader starts yielding the CPU between retries
+    SPIN_RETRIES = 100
+    # Retries before giving up on a record that keeps changing under the reader
+    MAX_RETRIES = 100_000
+
+    def __init__(self, name: str):
+        """
+        Attach to an existing segment.
+
+        Args:
+            name: Segment name chosen by the publisher
+
+        Raises:
+            FileNotFoundError: If no segment with this name exists
+            SharedFeedFormatError: If the segment is not a gas feed
+        """
+        super().__init__(_attach(name))
+        magic, version, record_size = self._HEADER_STRUCT.unpack_from(self._buf, 0)
+        if magic != self.MAGIC or version != self.VERSION or record_size != self.RECORD_SIZE:
+            self.close()
+            raise SharedFeedFormatError(f"{name} is not a version {self.VERSION} gas feed")
+
+    def read(self) -> Optional[GasFeedSnapshot]:
+        """
+        Read the latest record.
+
+        Returns:
+            Optional[GasFeedSnapshot]: Consistent copy of the latest record,
+                or None if nothing has been published yet
+
+        Raises:
+            TimeoutError: If no consistent copy could be taken within
+                ``MAX_RETRIES`` attempts
+        """
+        sequence, payload = self._read_consistent(self._PAYLOAD_STRUCT)
+        if sequence == 0:
+            return None
+
+        (timestamp_ns, gas_price, block_number, base_fee, max_priority_fee, sample_count,
+         mean_gwei, median_gwei, min_gwei, max_gwei, std_gwei, updates) = payload
+        return GasFeedSnapshot(
+            sequence=sequence,
+            timestamp_ns=timestamp_ns,
+            gas_price=gas_price,
+            block_number=_optional_int(block_number),
+            base_fee=_optional_int(base_fee),
+            max_priority_fee=_optional_int(max_priority_fee),
+            sample_count=sample_count,
+            mean_gwei=_optional_float(mean_gwei),
+            median_gwei=_optional_float(median_gwei),
+            min_gwei=_optional_float(min_gwei),
+            max_gwei=_optional_float(max_gwei),
+            std_gwei=_optional_float(std_gwei),
+            updates=updates,
+        )
+
+    def read_gas_price(self) -> Optional[int]:
+        """
+        Read only the latest gas price, the cheapest consistent read.
+
+        Returns:
+            Optional[int]: Gas price in Wei, or None if nothing has been
+                published yet
+
+        Raises:
+            TimeoutError: If no consistent copy could be taken within
+                ``MAX_RETRIES`` attempts
+        """
+        sequence, (_, gas_price) = self._read_consistent(self._PRICE_STRUCT)
+        return gas_price if sequence else None
+
+    def _read_consistent(self, payload_struct: struct.Struct) -> Tuple[int, tuple]:
+        """
+        Copy the start of the payload under the seqlock.
+
+        Args:
+            payload_struct: Layout of the payload prefix to unpack
+
+        Returns:
+            Tuple[int, tuple]: Even sequence and the unpacked values
+
+        Raises:
+            TimeoutError: If no consistent copy could be taken within
+                ``MAX_RETRIES`` attempts
+        """
+        buf = self._buf
+        sequence_struct = self._SEQUENCE_STRUCT
+        offset = self.SEQUENCE_OFFSET
+        for attempt in range(self.MAX_RETRIES):
+            before = sequence_struct.unpack_from(buf, offset)[0]
+            if not before & 1:
+                payload = payload_struct.unpack_from(buf, self.PAYLOAD_OFFSET)
+                if sequence_struct.unpack_from(buf, offset)[0] == before:
+                    return before, payload
+            if attempt >= self.SPIN_RETRIES:
+                _yield_cpu()
+        raise TimeoutError("Shared gas feed kept changing while being read")
+
+
+_yield_cpu = getattr(os, "sched_yield", lambda: time.sleep(0))
+_attach_lock = threading.Lock()
+
+
+def _attach(name: str) -> shared_memory.SharedMemory:
+    """
+    Attach to a segment without letting this process's resource tracker
+    unlink it on exit.
+
+    Args:
+        name: Segment name
+
+    Returns:
+        shared_memory.SharedMemory: The attached segment
+    """
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(name=name, track=False)
+
+    # Before 3.13 attaching registers the segment for cleanup at exit. Skip
+    # that registration rather than undoing it, since a child process shares
+    # the resource tracker of the publisher's process.
+    with _attach_lock:
+        register = resource_tracker.register
+
+        def register_unless_attaching(resource_name: str, rtype: str) -> None:
+            if rtype != "shared_memory" or resource_name.lstrip("/") != name.lstrip("/"):
+                register(resource_name, rtype)
+
+        resource_tracker.register = register_unless_attaching
+        try:
+            return shared_memory.SharedMemory(name=name)
+        finally:
+            resource_tracker.register = register
@@ -0,0 +1,86 @@
+"""
+Gas Snapshot Module
+
+This module defines the typed result of a combined gas query: legacy gas
+price, EIP-1559 priority fee, latest block number and latest base fee,
+fetched together in a single JSON-RPC round trip where the provider allows.
+"""
+
+from dataclasses import dataclass
+from typing import Any, Mapping, Optional
+
+
+@dataclass(frozen=True)
+class GasSnapshot:
+    """
+    Gas state of the chain at one point in time.
+
+    Attributes:
+        gas_price: ``eth_gasPrice`` result in Wei
+        max_priority_fee: ``eth_maxPriorityFeePerGas`` result in Wei, or None
+            if the node does not support it
+        block_number: ``eth_blockNumber`` result
+        base_fee: ``baseFeePerGas`` of the latest block in Wei, or None for
+            pre-London blocks
+        block_timestamp: Timestamp of the latest block in seconds, if known
+        timestamp_ns: Local time the snapshot was received, in epoch nanoseconds
+        batched: True if all values arrived in one JSON-RPC batch
+    """
+
+    gas_price: int
+    max_priority_fee: Optional[int]
+    block_number: int
+    base_fee: Optional[int]
+    block_timestamp: Optional[int]
+    timestamp_ns: int
+    batched: bool
+
+    @classmethod
+    def from_results(
+        cls,
+        gas_price: int,
+        max_priority_fee: Optional[int],
+        block_number: int,
+        latest_block: Optional[Mapping[str, Any]],
+        timestamp_ns: int,
+        batched: bool
+    ) -> "GasSnapshot":
+        """
+        Build a snapshot from the four RPC results.
+
+        Args:
+            gas_price: ``eth_gasPrice`` result
+            max_priority_fee: ``eth_maxPriorityFeePerGas`` result, or None
+            block_number: ``eth_blockNumber`` result
+            latest_block: ``eth_getBlockByNumber('latest')`` result, or None
+            timestamp_ns: Local receipt time in epoch nanoseconds
+            batched: Whether the results came from one batch
+
+        Returns:
+            GasSnapshot: The combined snapshot
+        """
+        latest_block = latest_block or {}
+        return cls(
+            gas_price=int(gas_price),
+            max_priority_fee=None if max_priority_fee is None else int(max_priority_fee),
+            block_number=int(block_number),
+            base_fee=latest_block.get("baseFeePerGas"),
+            block_timestamp=latest_block.get("timestamp"),
+            timestamp_ns=timestamp_ns,
+            batched=batched,
+        )
+
+    @property
+    def gas_price_gwei(self) -> float:
+        """Gas price in Gwei."""
+        return self.gas_price / 1e9
+
+    @property
+    def base_fee_gwei(self) -> Optional[float]:
+        """Base fee in Gwei, or None if unknown."""
+        return None if self.base_fee is None else self.base_fee / 1e9
+
+    @property
+    def max_priority_fee_gwei(self) -> Optional[float]:
+        """Priority fee in Gwei, or None if unknown."""
+        return None if self.max_priority_fee is None else self.max_priority_fee / 1e9
@@ -0,0 +1,309 @@
+"""
+Gas Source Statistics Module
+
+This module tracks per-source fetch latency, outcome and win-rate counters for
+the gas price sources consulted by GasMonitor, smoothed health estimates, and
+circuit breakers that stop known-bad sources from being called.
+"""
+
+import logging
+import math
+from collections import deque
+from typing import Dict, Optional, Union
+
+from .clock import SystemClock, VirtualClock
+from .metrics import Histogram
+
+
+# Configure module logger
+logger = logging.getLogger(__name__)
+
+
+class CircuitBreaker:
+    """
+    Closed/open/half-open circuit breaker for a gas price source.
+
+    * closed: calls are allowed; ``failure_threshold`` consecutive failures
+      open the breaker.
+    * open: calls are rejected until the reset timeout has elapsed.
+    * half-open: a single probe call is allowed. Success closes the breaker;
+      failure opens it again with the reset timeout doubled, up to
+      ``max_reset_timeout``.
+
+    Attributes:
+        name: Name of the protected source
+        failure_threshold: Consecutive failures that open the breaker
+        reset_timeout: Seconds an open breaker waits before probing
+        max_reset_timeout: Upper bound of the backed-off reset timeout
+        state: "closed", "open" or "half_open"
+        consecutive_failures: Failures since the last success
+        trips: Number of times the breaker opened
+        rejections: Number of calls rejected while open
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = 3,
+        reset_timeout: float = 30.0,
+        max_reset_timeout: float = 300.0,
+        clock: Optional[Union[SystemClock, VirtualClock]] = None
+    ):
+        """
+        Initialize a closed breaker.
+
+        Args:
+            name: Name of the protected source
+            failure_threshold: Consecutive failures that open the breaker
+                (default: 3)
+            reset_timeout: Seconds before an open breaker allows a probe
+                (default: 30.0)
+            max_reset_timeout: Upper bound of the doubled reset timeout
+                (default: 300.0)
+            clock: Time source (default: wall-clock ``SystemClock``)
+
+        Raises:
+            ValueError: If the threshold or timeouts are not positive
+        """
+        if failure_threshold <= 0 or reset_timeout <= 0 or max_reset_timeout < reset_timeout:
+            raise ValueError(
+                "failure_threshold and reset_timeout must be positive and "
+                "max_reset_timeout at least reset_timeout"
+            )
+
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.max_reset_timeout = max_reset_timeout
+        self.clock = clock or SystemClock()
+
+        self.state = self.CLOSED
+        self.consecutive_failures = 0
+        self.trips = 0
+        self.rejections = 0
+        self._timeout = reset_timeout
+        self._opened_at_ns = 0
+        self._probe_in_flight = False
+
+    def allow(self) -> bool:
+        """
+        Check whether a call may be made now.
+
+        An open breaker whose reset timeout has elapsed turns half-open and
+        admits the caller as its probe.
+
+        Returns:
+            bool: True if the call may proceed
+        """
+        if self.state == self.CLOSED:
+            return True
+
+        if self.state == self.OPEN:
+            elapsed = (self.clock.monotonic_ns() - self._opened_at_ns) / 1e9
+            if elapsed < self._timeout:
+                self.rejections += 1
+                return False
+            self.state = self.HALF_OPEN
+            logger.info(f"Circuit for {self.name} half-open; probing")
+
+        if self._probe_in_flight:
+            self.rejections += 1
+            return False
+        self._probe_in_flight = True
+        return True
+
+    def record_success(self) -> None:
+        """Record a successful call, closing the breaker."""
+        if self.state != self.CLOSED:
+            logger.info(f"Circuit for {self.name} closed")
+        self.state = self.CLOSED
+        self.consecutive_failures = 0
+        self._timeout = self.reset_timeout
+        self._probe_in_flight = False
+
+    def record_failure(self) -> None:
+        """Record a failed call, opening the breaker if needed."""
+        self.consecutive_failures += 1
+        if self.state == self.HALF_OPEN:
+            self._timeout = min(self._timeout * 2, self.max_reset_timeout)
+            self._open()
+        elif self.state == self.CLOSED and self.consecutive_failures >= self.failure_threshold:
+            self._open()
+
+    def record_cancellation(self) -> None:
+        """Record a call abandoned before it finished, freeing the probe slot."""
+        self._probe_in_flight = False
+
+    def _open(self) -> None:
+        """Open the breaker for the current reset timeout."""
+        self.state = self.OPEN
+        self.trips += 1
+        self._opened_at_ns = self.clock.monotonic_ns()
+        self._probe_in_flight = False
+        logger.warning(
+            f"Circuit for {self.name} opened after {self.consecutive_failures} "
+            f"consecutive failures; retrying in {self._timeout:.0f}s"
+        )
+
+
+class SourceStats:
+    """
+    Latency and outcome counters for a single gas price source.
+
+    Attributes:
+        name: Source name (e.g. "web3", "etherscan")
+        attempts: Number of fetches started
+        successes: Number of fetches returning a valid price
+        failures: Number of fetches raising or returning no price
+        cancellations: Number of fetches cancelled after another source won
+        wins: Number of readings this source supplied
+        inliers: Number of answers used by a consensus round
+        outliers: Number of answers rejected by a consensus round
+        last_success_ns: Monotonic time of the last valid answer in
+            nanoseconds, or None if none was seen
+        latencies: Recent successful fetch latencies in seconds
+        latency_histogram: Fixed-bucket histogram of every completed fetch's
+            latency in seconds, failures included
+        ewma_latency: Exponentially weighted latency in seconds, or None
+        error_rate: Exponentially weighted fraction of failed fetches
+        breaker: Optional circuit breaker updated with every outcome
+    """
+
+    def __init__(
+        self,
+        name: str,
+        latency_window: int = 200,
+        ewma_alpha: float = 0.2,
+        breaker: Optional[CircuitBreaker] = None
+    ):
+        """
+        Initialize the counters.
+
+        Args:
+            name: Source name
+            latency_window: Number of recent latencies kept for percentiles
+                (default: 200)
+            ewma_alpha: Weight of the newest fetch in the latency and error
+                rate averages (default: 0.2)
+            breaker: Optional circuit breaker to update with every outcome
+        """
+        self.name = name
+        self.attempts = 0
+        self.successes = 0
+        self.failures = 0
+        self.cancellations = 0
+        self.wins = 0
+        self.inliers = 0
+        self.outliers = 0
+        self.last_success_ns: Optional[int] = None
+        self.latencies: deque = deque(maxlen=latency_window)
+        self.latency_histogram = Histogram("fetch_duration_seconds")
+        self.ewma_alpha = ewma_alpha
+        self.ewma_latency: Optional[float] = None
+        self.error_rate = 0.0
+        self.breaker = breaker
+
+    def allow(self) -> bool:
+        """Check whether the source's breaker, if any, admits a fetch now."""
+        return self.breaker is None or self.breaker.allow()
+
+    def record_attempt(self) -> None:
+        """Record that a fetch was started."""
+        self.attempts += 1
+
+    def record_success(self, latency: float, timestamp_ns: Optional[int] = None) -> None:
+        """
+        Record a fetch that returned a valid price after ``latency`` seconds,
+        completing at monotonic time ``timestamp_ns`` if given.
+        """
+        self.successes += 1
+        if timestamp_ns is not None:
+            self.last_success_ns = timestamp_ns
+        self.latencies.append(latency)
+        self.latency_histogram.observe(latency)
+        alpha = self.ewma_alpha
+        if self.ewma_latency is None:
+            self.ewma_latency = latency
+        else:
+            self.ewma_latency += alpha * (latency - self.ewma_latency)
+        self.error_rate -= alpha * self.error_rate
+        if self.breaker is not None:
+            self.breaker.record_success()
+
+    def record_failure(self, latency: Optional[float] = None) -> None:
+        """Record a fetch that raised or returned no price after ``latency`` seconds."""
+        self.failures += 1
+        if latency is not None:
+            self.latency_histogram.observe(latency)
+        self.error_rate += self.ewma_alpha * (1.0 - self.error_rate)
+        if self.breaker is not None:
+            self.breaker.record_failure()
+
+    def record_cancellation(self) -> None:
+        """Record a fetch cancelled because another source answered first."""
+        self.cancellations += 1
+        if self.breaker is not None:
+            self.breaker.record_cancellation()
+
+    def record_win(self) -> None:
+        """Record that this source supplied the reading."""
+        self.wins += 1
+
+    def record_consensus(self, accepted: bool) -> None:
+        """Record whether a consensus round used or rejected this source's answer."""
+        if accepted:
+            self.inliers += 1
+        else:
+            self.outliers += 1
+
+    @property
+    def win_rate(self) -> float:
+        """Fraction of started fetches whose answer was used."""
+        return self.wins / self.attempts if self.attempts else 0.0
+
+    def latency_percentile(self, percentile: float) -> Optional[float]:
+        """
+        Get a nearest-rank percentile of recent successful latencies.
+
+        Args:
+            percentile: Percentile in the range 0-100
+
+        Returns:
+            Optional[float]: Latency in seconds, or None if no samples exist
+        """
+        if not self.latencies:
+            return None
+        ordered = sorted(self.latencies)
+        rank = max(1, math.ceil(percentile / 100 * len(ordered)))
+        return ordered[rank - 1]
+
+    def as_dict(self) -> Dict[str, Optional[float]]:
+        """
+        Get the counters as a plain dictionary.
+
+        Returns:
+            Dict[str, Optional[float]]: Counters, win rate, latency
+                percentiles, smoothed health and circuit breaker state
+        """
+        breaker = self.breaker
+        return {
+            "attempts": self.attempts,
+            "successes": self.successes,
+            "failures": self.failures,
+            "cancellations": self.cancellations,
+            "wins": self.wins,
+            "win_rate": self.win_rate,
+            "inliers": self.inliers,
+            "outliers": self.outliers,
+            "latency_p50": self.latency_percentile(50),
+            "latency_p95": self.latency_percentile(95),
+            "ewma_latency": self.ewma_latency,
+            "error_rate": self.error_rate,
+            "circuit_state": None if breaker is None else breaker.state,
+            "circuit_trips": 0 if breaker is None else breaker.trips,
+            "skipped": 0 if breaker is None else breaker.rejections,
+        }
@@ -0,0 +1,218 @@
+"""
+New Block Subscription Module
+
+This module provides a minimal JSON-RPC over WebSocket client for the
+``eth_subscribe`` family of subscriptions, used by GasMonitor to refresh gas
+state once per new block instead of polling on a fixed interval.
+"""
+
+import asyncio
+import json
+import logging
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional
+
+import websockets
+
+
+# Configure module logger
+logger = logging.getLogger(__name__)
+
+
+# Backoff between attempts to restore a lost subscription
+DEFAULT_RETRY_DELAY = 1.0
+DEFAULT_MAX_RETRY_DELAY = 300.0
+
+
+class SubscriptionUnavailableError(Exception):
+    """Raised when a WebSocket subscription cannot be established or is lost."""
+
+
+class EthSubscription:
+    """
+    A single ``eth_subscribe`` stream over a WebSocket connection.
+
+    Usage:
+        async with EthSubscription(ws_url, ["newHeads"]) as subscription:
+            async for header in subscription:
+                ...
+
+    Attributes:
+        ws_url: WebSocket endpoint of the Ethereum node
+        params: Parameters passed to ``eth_subscribe``
+        subscription_id: Identifier returned by the node once subscribed
+    """
+
+    def __init__(
+        self,
+        ws_url: str,
+        params: List[Any],
+        connect_timeout: float = 10
+    ):
+        """
+        Initialize the subscription.
+
+        Args:
+            ws_url: WebSocket endpoint (ws:// or wss://)
+            params: Parameters for ``eth_subscribe``, e.g. ``["newHeads"]``
+            connect_timeout: Seconds to wait for the connection and the
+                subscription confirmation (default: 10)
+        """
+        self.ws_url = ws_url
+        self.params = params
+        self.connect_timeout = connect_timeout
+        self.subscription_id: Optional[str] = None
+        self._ws = None
+        self._request_id = 0
+
+    async def __aenter__(self) -> "EthSubscription":
+        await self.subscribe()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.close()
+
+    async def subscribe(self) -> str:
+        """
+        Open the connection and register the subscription.
+
+        Returns:
+            str: Subscription identifier assigned by the node
+
+        Raises:
+            SubscriptionUnavailableError: If the endpoint is unreachable or
+                rejects ``eth_subscribe``
+        """
+        try:
+            self._ws = await asyncio.wait_for(
+                websockets.connect(self.ws_url), timeout=self.connect_timeout
+            )
+            self._request_id += 1
+            request_id = self._request_id
+            await self._ws.send(json.dumps({
+                "jsonrpc": "2.0",
+                "id": request_id,
+                "method": "eth_subscribe",
+                "params": self.params,
+            }))
+
+            # Notifications for other subscriptions may not arrive before the
+            # confirmation, but skip anything that is not our response anyway
+            while True:
+                raw = await asyncio.wait_for(self._ws.recv(), timeout=self.connect_timeout)
+                message = json.loads(raw)
+                if message.get("id") == request_id:
+                    break
+        except SubscriptionUnavailableError:
+            raise
+        except (OSError, asyncio.TimeoutError, websockets.WebSocketException, ValueError) as e:
+            await self.close()
+            raise SubscriptionUnavailableError(
+                f"Could not subscribe to {self.params[0]} at {self.ws_url}: {e}"
+            ) from e
+
+        if "error" in message or not message.get("result"):
+            await self.close()
+            raise SubscriptionUnavailableError(
+                f"Node rejected eth_subscribe {self.params[0]}: {message.get('error')}"
+            )
+
+        self.subscription_id = message["result"]
+        logger.info(f"Subscribed to {self.params[0]} (id={self.subscription_id})")
+        return self.subscription_id
+
+    async def __aiter__(self) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Iterate over subscription payloads as they arrive.
+
+        Yields:
+            Dict[str, Any]: The ``result`` field of each notification
+
+        Raises:
+            SubscriptionUnavailableError: If the connection drops
+        """
+        if self._ws is None:
+            raise SubscriptionUnavailableError("Subscription is not open")
+
+        try:
+            async for raw in self._ws:
+                message = json.loads(raw)
+                if message.get("method") != "eth_subscription":
+                    continue
+                params = message.get("params", {})
+                if params.get("subscription") != self.subscription_id:
+                    continue
+                yield params.get("result")
+        except websockets.WebSocketException as e:
+            raise SubscriptionUnavailableError(f"Subscription connection lost: {e}") from e
+
+        raise SubscriptionUnavailableError("Subscription stream closed by the node")
+
+    async def close(self) -> None:
+        """Close the underlying WebSocket connection."""
+        if self._ws is not None:
+            ws, self._ws = self._ws, None
+            try:
+                await ws.close()
+            except Exception as e:
+                logger.debug(f"Error closing subscription connection: {e}")
+
+
+async def resubscribe_with_backoff(
+    subscribe: Callable[[Callable[[], Awaitable[None]]], Awaitable[None]],
+    is_running: Callable[[], bool],
+    sleep: Callable[[float], Awaitable[None]],
+    fallback: Optional[Callable[[], Awaitable[None]]] = None,
+    fallback_description: str = "using the fallback",
+    retry_delay: float = DEFAULT_RETRY_DELAY,
+    max_retry_delay: float = DEFAULT_MAX_RETRY_DELAY,
+    log: logging.Logger = logger
+) -> None:
+    """
+    Keep a subscription running, with a fallback while it is down.
+
+    ``subscribe`` is called with a coroutine function it must await once
+    its subscription is established. Each time it raises
+    ``SubscriptionUnavailableError``, the fallback starts (unless it is
+    already running) and the subscription is retried after a delay that
+    doubles up to ``max_retry_delay``. Once a subscription is established,
+    the fallback is cancelled and the delay is reset.
+
+    Args:
+        subscribe: Coroutine function consuming the subscription
+        is_running: Returns False once the consumer was stopped
+        sleep: Sleep of the consumer's clock
+        fallback: Optional coroutine function run while the subscription is down
+        fallback_description: What the fallback does, for log messages
+        retry_delay: Seconds before the first retry (default: 1.0)
+        max_retry_delay: Upper bound of the retry delay (default: 300.0)
+        log: Logger for retry and recovery messages
+    """
+    fallback_task: Optional[asyncio.Task] = None
+    delay = retry_delay
+
+    async def on_subscribed() -> None:
+        nonlocal fallback_task, delay
+        delay = retry_delay
+        if fallback_task is not None:
+            fallback_task.cancel()
+            await asyncio.gather(fallback_task, return_exceptions=True)
+            fallback_task = None
+            log.info("Subscription restored; stopped %s", fallback_description)
+
+    try:
+        while is_running():
+            try:
+                await subscribe(on_subscribed)
+            except SubscriptionUnavailableError as e:
+                if fallback is None:
+                    log.warning("%s; retrying subscription in %gs", e, delay)
+                else:
+                    if fallback_task is None:
+                        fallback_task = asyncio.create_task(fallback())
+                    log.warning("%s; %s, retrying subscription in %gs", e, fallback_description, delay)
+                await sleep(delay)
+                delay = min(delay * 2, max_retry_delay)
+    finally:
+        if fallback_task is not None:
+            fallback_task.cancel()
+            await asyncio.gather(fallback_task, return_exceptions=True)
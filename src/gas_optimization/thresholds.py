@@ -0,0 +1,260 @@
+"""
+Gas Price Threshold Module
+
+This module lets many callers await gas price threshold events. Waiters are
+kept in heaps ordered by threshold, so each new reading wakes only the
+waiters it satisfies instead of scanning every subscriber.
+"""
+
+import asyncio
+import heapq
+import itertools
+import logging
+from typing import List, Optional, Tuple
+
+
+# Configure module logger
+logger = logging.getLogger(__name__)
+
+_Entry = Tuple[int, int, asyncio.Future]
+
+
+class ThresholdWaiters:
+    """
+    Heap-indexed waiters for "price at or below X" and "price at or above Y".
+
+    Waiters for a price at or below their threshold sit in a max-heap, so a
+    new reading pops exactly the waiters whose threshold it reaches. Waiters
+    for a price at or above their threshold sit in a min-heap. Waking ``k``
+    of ``n`` waiters costs O(k log n).
+
+    A crossing waiter must first see the price on the other side of its
+    threshold. Until then it waits in an arming heap and is moved into the
+    firing heap by the reading that arms it. One registered before any
+    reading is held until the first reading, which only sets the side of
+    the threshold the price starts on.
+
+    Waiters that are cancelled (for example by a timeout) are dropped lazily
+    when popped, and the heaps are compacted once most entries are stale.
+
+    Attributes:
+        last_price: Most recent reading in Wei, or None
+    """
+
+    # Minimum number of stale entries before the heaps are compacted
+    COMPACT_THRESHOLD = 64
+
+    def __init__(self):
+        """Initialize empty waiter heaps."""
+        # Keys: below heaps store -threshold (max-heap), above heaps threshold
+        self._below: List[_Entry] = []
+        self._above: List[_Entry] = []
+        # Crossing waiters not yet armed: below waits for price > threshold,
+        # above waits for price < threshold
+        self._arm_below: List[_Entry] = []
+        self._arm_above: List[_Entry] = []
+        # Crossing waiters registered before the first reading, as
+        # (is_below, threshold, sequence, future)
+        self._unreferenced: List[Tuple[bool, int, int, asyncio.Future]] = []
+        self._sequence = itertools.count()
+        self._live = 0
+        self._stale = 0
+        self.last_price: Optional[int] = None
+
+    def __len__(self) -> int:
+        return self._live
+
+    def wait_below(self, threshold_wei: int, crossing: bool = False) -> asyncio.Future:
+        """
+        Register a waiter for a price at or below a threshold.
+
+        Args:
+            threshold_wei: Threshold in Wei
+            crossing: If True, the price must first be seen above the
+                threshold, on a reading after the first one; otherwise the
+                latest reading can satisfy the waiter immediately
+
+        Returns:
+            asyncio.Future: Resolves with the price in Wei that reached the
+                threshold
+        """
+        future = self._new_future()
+        satisfied = self.last_price is not None and self.last_price <= threshold_wei
+
+        if crossing and self.last_price is None:
+            self._unreferenced.append((True, threshold_wei, next(self._sequence), future))
+        elif satisfied and not crossing:
+            future.set_result(self.last_price)
+        elif satisfied:
+            heapq.heappush(self._arm_below, (threshold_wei, next(self._sequence), future))
+        else:
+            heapq.heappush(self._below, (-threshold_wei, next(self._sequence), future))
+        return future
+
+    def wait_above(self, threshold_wei: int, crossing: bool = False) -> asyncio.Future:
+        """
+        Register a waiter for a price at or above a threshold.
+
+        Args:
+            threshold_wei: Threshold in Wei
+            crossing: If True, the price must first be seen below the
+                threshold, on a reading after the first one; otherwise the
+                latest reading can satisfy the waiter immediately
+
+        Returns:
+            asyncio.Future: Resolves with the price in Wei that reached the
+                threshold
+        """
+        future = self._new_future()
+        satisfied = self.last_price is not None and self.last_price >= threshold_wei
+
+        if crossing and self.last_price is None:
+            self._unreferenced.append((False, threshold_wei, next(self._sequence), future))
+        elif satisfied and not crossing:
+            future.set_result(self.last_price)
+        elif satisfied:
+            heapq.heappush(self._arm_above, (-threshold_wei, next(self._sequence), future))
+        else:
+            heapq.heappush(self._above, (threshold_wei, next(self._sequence), future))
+        return future
+
+    def _new_future(self) -> asyncio.Future:
+        """Create a tracked future on the running loop."""
+        future = asyncio.get_running_loop().create_future()
+        self._live += 1
+        future.add_done_callback(self._on_done)
+        return future
+
+    def _on_done(self, future: asyncio.Future) -> None:
+        """Update counters when a waiter resolves or is cancelled."""
+        self._live -= 1
+        if future.cancelled():
+            self._stale += 1
+
+    def notify(self, price_wei: int) -> int:
+        """
+        Process a new reading, waking and arming the affected waiters.
+
+        Args:
+            price_wei: New gas price in Wei
+
+        Returns:
+            int: Number of waiters woken
+        """
+        self.last_price = price_wei
+        woken = 0
+
+        below = self._below
+        while below and -below[0][0] >= price_wei:
+            future = heapq.heappop(below)[2]
+            if future.done():
+                self._stale -= 1
+                continue
+            future.set_result(price_wei)
+            woken += 1
+
+        above = self._above
+        while above and above[0][0] <= price_wei:
+            future = heapq.heappop(above)[2]
+            if future.done():
+                self._stale -= 1
+                continue
+            future.set_result(price_wei)
+            woken += 1
+
+        arm_below = self._arm_below
+        while arm_below and arm_below[0][0] < price_wei:
+            threshold, sequence, future = heapq.heappop(arm_below)
+            heapq.heappush(below, (-threshold, sequence, future))
+
+        arm_above = self._arm_above
+        while arm_above and -arm_above[0][0] > price_wei:
+            key, sequence, future = heapq.heappop(arm_above)
+            heapq.heappush(above, (-key, sequence, future))
+
+        if self._unreferenced:
+            self._place_unreferenced(price_wei)
+
+        if self._stale >= self.COMPACT_THRESHOLD and self._stale > self._live:
+            self._compact()
+
+        if woken:
+            logger.debug("Gas price %d Wei woke %d threshold waiters", price_wei, woken)
+        return woken
+
+    def _place_unreferenced(self, price_wei: int) -> None:
+        """Arm or hold the crossing waiters registered before the first reading."""
+        for is_below, threshold, sequence, future in self._unreferenced:
+            if future.done():
+                self._stale -= 1
+            elif is_below and price_wei > threshold:
+                heapq.heappush(self._below, (-threshold, sequence, future))
+            elif is_below:
+                heapq.heappush(self._arm_below, (threshold, sequence, future))
+            elif price_wei < threshold:
+                heapq.heappush(self._above, (threshold, sequence, future))
+            else:
+                heapq.heappush(self._arm_above, (-threshold, sequence, future))
+        self._unreferenced.clear()
+
+    def nearest_threshold(self, price_wei: int) -> Optional[int]:
+        """
+        Get the watched threshold closest to a price.
+
+        Only waiters that can fire on the next reading are considered, so
+        crossing waiters that are not yet armed are ignored. Cancelled
+        entries found on top of a heap are dropped.
+
+        Args:
+            price_wei: Reference price in Wei
+
+        Returns:
+            Optional[int]: Threshold in Wei, or None if nobody is waiting
+        """
+        candidates = []
+        for heap, sign in ((self._below, -1), (self._above, 1)):
+            while heap and heap[0][2].done():
+                heapq.heappop(heap)
+                self._stale -= 1
+            if heap:
+                candidates.append(sign * heap[0][0])
+        if not candidates:
+            return None
+        return min(candidates, key=lambda threshold: abs(threshold - price_wei))
+
+    def _compact(self) -> None:
+        """Drop cancelled and resolved entries from all heaps."""
+        for heap in (self._below, self._above, self._arm_below, self._arm_above):
+            heap[:] = [entry for entry in heap if not entry[2].done()]
+            heapq.heapify(heap)
+        self._unreferenced[:] = [entry for entry in self._unreferenced if not entry[3].done()]
+        self._stale = 0
+
+    def cancel_all(self) -> None:
+        """Cancel every pending waiter."""
+        heaps = (self._below, self._above, self._arm_below, self._arm_above)
+        futures = [entry[2] for heap in heaps for entry in heap]
+        futures.extend(entry[3] for entry in self._unreferenced)
+        for heap in heaps:
+            heap.clear()
+        self._unreferenced.clear()
+        self._stale = 0
+
+        finished = None
+        for future in futures:
+            if future.done():
+                finished = future
+                continue
+            # Detach the counters first: no heap holds these entries any more
+            future.remove_done_callback(self._on_done)
+            self._live -= 1
+            future.cancel()
+
+        if finished is not None:
+            # Done callbacks of waiters that finished just before may still be
+            # queued; reset the stale count again once they have run
+            finished.get_loop().call_soon(self._reset_stale)
+
+    def _reset_stale(self) -> None:
+        """Forget stale entries after every heap was cleared."""
+        self._stale = 0
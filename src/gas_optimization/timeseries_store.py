@@ -0,0 +1,247 @@
+"""
+Gas Time-Series Store Module
+
+This module persists gas price readings in an append-only, memory-mapped file
+so GasMonitor can warm-start its history after a restart.
+
+File layout (little-endian):
+    Header (64 bytes): magic ``b"GASTS\\x00\\x00\\x00"``, uint32 format version,
+        uint32 record size, zero padding
+    Records (24 bytes each): int64 timestamp_ns, uint64 price_wei,
+        uint32 CRC32 of the first 16 bytes, uint32 reserved
+
+Records are only ever appended. On open, a partially written trailing record
+and any trailing records whose checksum does not match (torn writes) are
+truncated away, so a crash can at most lose the readings being written.
+"""
+
+import bisect
+import logging
+import os
+import struct
+import zlib
+from typing import Optional, Tuple
+
+import numpy as np
+
+
+# Configure module logger
+logger = logging.getLogger(__name__)
+
+
+class TimeSeriesFormatError(Exception):
+    """Raised when a file is not a gas time-series file or has an unknown version."""
+
+
+class _TimestampColumn:
+    """Sequence view of mapped timestamps so ``bisect`` touches only O(log n) pages."""
+
+    def __init__(self, records: np.ndarray):
+        self._records = records
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def __getitem__(self, index: int) -> int:
+        return int(self._records[index]["timestamp_ns"])
+
+
+class GasTimeSeriesFile:
+    """
+    Append-only, memory-mapped file of (timestamp_ns, price_wei) records.
+
+    Timestamps are kept non-decreasing so range queries can binary search the
+    mapped file; a reading older than the last stored one is clamped to it.
+
+    Attributes:
+        path: Location of the file
+        count: Number of valid records
+        recovered_bytes: Bytes truncated from a damaged tail when opened
+    """
+
+    MAGIC = b"GASTS\x00\x00\x00"
+    VERSION = 1
+    HEADER_SIZE = 64
+    RECORD_DTYPE = np.dtype([
+        ("timestamp_ns", "<i8"),
+        ("price_wei", "<u8"),
+        ("checksum", "<u4"),
+        ("reserved", "<u4"),
+    ])
+    _HEADER_STRUCT = struct.Struct("<8sII")
+    _PAYLOAD_STRUCT = struct.Struct("<qQ")
+    _RECORD_STRUCT = struct.Struct("<qQII")
+
+    def __init__(self, path: str, fsync: bool = False):
+        """
+        Open or create a time-series file, recovering a damaged tail.
+
+        Args:
+            path: File location; created with a fresh header if missing
+            fsync: Whether every append is followed by ``os.fsync`` (default: False)
+
+        Raises:
+            TimeSeriesFormatError: If the file exists but is not a gas
+                time-series file of a supported version
+        """
+        self.path = path
+        self.fsync = fsync
+        self.recovered_bytes = 0
+        self._records: Optional[np.ndarray] = None
+        self._mapped_count = 0
+        self._last_timestamp_ns: Optional[int] = None
+
+        self._fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            self._open()
+        except Exception:
+            os.close(self._fd)
+            self._fd = None
+            raise
+
+    def _open(self) -> None:
+        size = os.fstat(self._fd).st_size
+        if size < self.HEADER_SIZE:
+            # New file, or a crash before the header was complete
+            header = self._HEADER_STRUCT.pack(
+                self.MAGIC, self.VERSION, self.RECORD_DTYPE.itemsize
+            ).ljust(self.HEADER_SIZE, b"\x00")
+            os.ftruncate(self._fd, 0)
+            os.pwrite(self._fd, header, 0)
+            self.recovered_bytes = size
+            size = self.HEADER_SIZE
+        else:
+            magic, version, record_size = self._HEADER_STRUCT.unpack(
+                os.pread(self._fd, self._HEADER_STRUCT.size, 0)
+            )
+            if magic != self.MAGIC:
+                raise TimeSeriesFormatError(f"{self.path} is not a gas time-series file")
+            if version != self.VERSION or record_size != self.RECORD_DTYPE.itemsize:
+                raise TimeSeriesFormatError(
+                    f"Unsupported gas time-series version {version} "
+                    f"(record size {record_size}) in {self.path}"
+                )
+
+        record_size = self.RECORD_DTYPE.itemsize
+        count = (size - self.HEADER_SIZE) // record_size
+
+        # Drop trailing records with a bad checksum (torn writes)
+        while count:
+            raw = os.pread(self._fd, record_size, self.HEADER_SIZE + (count - 1) * record_size)
+            timestamp_ns, price_wei, checksum, _ = self._RECORD_STRUCT.unpack(raw)
+            if checksum == zlib.crc32(raw[:self._PAYLOAD_STRUCT.size]):
+                self._last_timestamp_ns = timestamp_ns
+                break
+            count -= 1
+
+        valid_size = self.HEADER_SIZE + count * record_size
+        if valid_size != size:
+            os.ftruncate(self._fd, valid_size)
+            self.recovered_bytes += size - valid_size
+            logger.warning(
+                f"Recovered gas time-series {self.path}: truncated "
+                f"{size - valid_size} bytes of incomplete records"
+            )
+
+        self.count = count
+        logger.debug(f"Opened gas time-series {self.path} with {count} records")
+
+    def append(self, timestamp_ns: int, price_wei: int) -> None:
+        """
+        Append one reading.
+
+        Args:
+            timestamp_ns: Reading time in nanoseconds since the epoch
+            price_wei: Gas price in Wei
+        """
+        if self._last_timestamp_ns is not None and timestamp_ns < self._last_timestamp_ns:
+            timestamp_ns = self._last_timestamp_ns
+
+        payload = self._PAYLOAD_STRUCT.pack(timestamp_ns, price_wei)
+        record = payload + struct.pack("<II", zlib.crc32(payload), 0)
+        os.pwrite(self._fd, record, self.HEADER_SIZE + self.count * len(record))
+        if self.fsync:
+            os.fsync(self._fd)
+
+        self.count += 1
+        self._last_timestamp_ns = timestamp_ns
+
+    def flush(self) -> None:
+        """Force appended records to stable storage."""
+        os.fsync(self._fd)
+
+    def close(self) -> None:
+        """Release the mapping and close the file."""
+        self._records = None
+        self._mapped_count = 0
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+
+    def __enter__(self) -> "GasTimeSeriesFile":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return self.count
+
+    def records(self) -> np.ndarray:
+        """
+        Get all records as a read-only memory-mapped structured array.
+
+        The mapping is refreshed lazily when records were appended since the
+        last call; pages are only read from disk when accessed.
+
+        Returns:
+            np.ndarray: Records with ``RECORD_DTYPE`` fields
+        """
+        if self._mapped_count != self.count:
+            if self.count:
+                self._records = np.memmap(
+                    self.path, dtype=self.RECORD_DTYPE, mode="r",
+                    offset=self.HEADER_SIZE, shape=(self.count,)
+                )
+            else:
+                self._records = np.empty(0, dtype=self.RECORD_DTYPE)
+            self._mapped_count = self.count
+        elif self._records is None:
+            self._records = np.empty(0, dtype=self.RECORD_DTYPE)
+        return self._records
+
+    def tail(self, count: int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Get the last ``count`` readings.
+
+        Args:
+            count: Maximum number of readings
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: int64 timestamps and uint64 prices
+        """
+        records = self.records()[max(0, self.count - count):]
+        return (
+            np.ascontiguousarray(records["timestamp_ns"]),
+            np.ascontiguousarray(records["price_wei"]),
+        )
+
+    def query(self, start_ns: int, end_ns: int) -> np.ndarray:
+        """
+        Get readings with ``start_ns <= timestamp < end_ns``.
+
+        Both ends are located by binary search over the mapped file, so only
+        the pages holding the probed and returned records are read.
+
+        Args:
+            start_ns: Inclusive start in epoch nanoseconds
+            end_ns: Exclusive end in epoch nanoseconds
+
+        Returns:
+            np.ndarray: Memory-mapped structured slice of matching records
+        """
+        records = self.records()
+        column = _TimestampColumn(records)
+        start = bisect.bisect_left(column, start_ns)
+        end = bisect.bisect_left(column, end_ns, lo=start)
+        return records[start:end]
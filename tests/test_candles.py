@@ -0,0 +1,185 @@
+"""
+Tests for the multi-resolution gas candles
+"""
+
+import os
+import shutil
+import tempfile
+import unittest
+from datetime import datetime, timezone
+from unittest.mock import Mock
+
+import numpy as np
+
+import sys
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.gas_optimization.candles import CandleRollup, CandleSeries
+from src.gas_optimization.clock import VirtualClock
+from src.gas_optimization.gas_monitor import GasMonitor
+from src.gas_optimization.timeseries_store import GasTimeSeriesFile
+
+
+BASE_NS = 1_699_920_000 * 10**9  # midnight UTC
+SECOND = 10**9
+
+
+class TestCandleSeries(unittest.TestCase):
+    """Test suite for a single-resolution CandleSeries."""
+
+    def setUp(self):
+        self.series = CandleSeries(resolution=60, capacity=3)
+
+    def test_ohlc_and_open_candle(self):
+        """Test that readings fold into OHLC, mean and volume per bucket."""
+        for offset, price in ((0, 30.0), (10, 35.0), (20, 25.0), (59, 32.0), (60, 40.0)):
+            self.series.update(BASE_NS + offset * SECOND, price)
+
+        candles = self.series.candles()
+
+        self.assertEqual(len(candles), 2)
+        self.assertEqual(candles.start_ns.tolist(), [BASE_NS, BASE_NS + 60 * SECOND])
+        self.assertEqual(candles.open.tolist(), [30.0, 40.0])
+        self.assertEqual(candles.high.tolist(), [35.0, 40.0])
+        self.assertEqual(candles.low.tolist(), [25.0, 40.0])
+        self.assertEqual(candles.close.tolist(), [32.0, 40.0])
+        self.assertEqual(candles.mean.tolist(), [30.5, 40.0])
+        self.assertEqual(candles.volume.tolist(), [4, 1])
+
+    def test_eviction_and_coverage(self):
+        """Test that only ``capacity`` closed candles are kept."""
+        for minute in range(6):
+            self.series.update(BASE_NS + minute * 60 * SECOND, float(minute))
+
+        candles = self.series.candles()
+
+        self.assertEqual(candles.open.tolist(), [2.0, 3.0, 4.0, 5.0])
+        self.assertFalse(self.series.covers(BASE_NS))
+        self.assertTrue(self.series.covers(BASE_NS + 2 * 60 * SECOND))
+
+    def test_range_query(self):
+        """Test that a range returns the candles overlapping it."""
+        for minute in range(3):
+            self.series.update(BASE_NS + minute * 60 * SECOND, float(minute))
+
+        candles = self.series.candles(BASE_NS + 90 * SECOND, BASE_NS + 120 * SECOND)
+
+        self.assertEqual(candles.open.tolist(), [1.0])
+
+    def test_late_readings_are_dropped(self):
+        """Test that readings for a closed bucket are counted, not applied."""
+        self.series.update(BASE_NS + 60 * SECOND, 10.0)
+        self.series.update(BASE_NS, 99.0)
+
+        self.assertEqual(self.series.late, 1)
+        self.assertEqual(self.series.candles().high.tolist(), [10.0])
+
+    def test_extend_matches_updates(self):
+        """Test that vectorized extension builds the same candles."""
+        rng = np.random.default_rng(3)
+        timestamps = BASE_NS + np.cumsum(rng.integers(1, 30, size=500)) * SECOND
+        prices = rng.uniform(10, 100, size=500)
+
+        expected = CandleSeries(resolution=60, capacity=50)
+        for timestamp, price in zip(timestamps.tolist(), prices.tolist()):
+            expected.update(timestamp, price)
+
+        series = CandleSeries(resolution=60, capacity=50)
+        series.extend(timestamps[:137], prices[:137])
+        series.extend(timestamps[137:], prices[137:])
+
+        for field in ("start_ns", "open", "high", "low", "close", "mean", "volume"):
+            np.testing.assert_allclose(getattr(series.candles(), field), getattr(expected.candles(), field))
+
+    def test_invalid_settings(self):
+        """Test that a non-positive resolution or capacity is rejected."""
+        with self.assertRaises(ValueError):
+            CandleSeries(resolution=0, capacity=10)
+
+
+class TestCandleRollup(unittest.TestCase):
+    """Test suite for CandleRollup resolution selection."""
+
+    def setUp(self):
+        self.rollup = CandleRollup(((60, 60), (300, 100), (3600, 100)))
+        # Two days of readings every 30 seconds
+        for step in range(2 * 24 * 120):
+            self.rollup.update(BASE_NS + step * 30 * SECOND, 30 * 10**9)
+        self.end_ns = BASE_NS + 2 * 86400 * SECOND
+
+    def test_coarsest_resolution_with_enough_points(self):
+        """Test that the coarsest resolution giving the requested points wins."""
+        start_ns = self.end_ns - 3600 * SECOND
+
+        self.assertEqual(self.rollup.select_resolution(start_ns, self.end_ns, points=10), 300)
+        self.assertEqual(self.rollup.select_resolution(start_ns, self.end_ns, points=50), 60)
+        self.assertEqual(self.rollup.select_resolution(start_ns, self.end_ns, points=1), 3600)
+
+    def test_evicted_resolutions_are_skipped(self):
+        """Test that a resolution missing part of the range is not used."""
+        start_ns = self.end_ns - 6 * 3600 * SECOND
+
+        # One-minute candles only reach back an hour
+        self.assertEqual(self.rollup.select_resolution(start_ns, self.end_ns, points=1000), 300)
+        self.assertEqual(self.rollup.select_resolution(start_ns, self.end_ns), 300)
+
+        candles = self.rollup.query(start_ns, self.end_ns, points=1000)
+        self.assertEqual(candles.resolution, 300)
+        self.assertEqual(len(candles), 72)
+        self.assertEqual(int(candles.volume.sum()), 720)
+
+    def test_falls_back_to_coarsest(self):
+        """Test that a range older than every series uses the coarsest one."""
+        self.assertEqual(self.rollup.select_resolution(BASE_NS - 10**15, self.end_ns, points=5), 3600)
+
+
+class TestGasMonitorCandles(unittest.TestCase):
+    """Test suite for GasMonitor candle integration."""
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmpdir, "gas.ts")
+        self.clock = VirtualClock(start_ns=BASE_NS)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def test_readings_update_candles(self):
+        """Test that every recorded reading reaches the candles."""
+        monitor = GasMonitor(Mock(), history_size=5, clock=self.clock)
+        for minute in range(10):
+            monitor._record_gas_price((20 + minute) * 10**9, BASE_NS + minute * 60 * SECOND)
+        self.clock.advance(600)
+
+        start = datetime.fromtimestamp(BASE_NS / 1e9, tz=timezone.utc)
+        candles = monitor.get_candles(start, points=10)
+
+        self.assertEqual(candles.resolution, 60)
+        self.assertEqual(candles.close.tolist(), [float(20 + minute) for minute in range(10)])
+        self.assertEqual(len(monitor.gas_history), 5)
+
+    def test_candles_rebuilt_from_persisted_series(self):
+        """Test that a warm start rebuilds candles beyond the raw history."""
+        with GasTimeSeriesFile(self.path) as store:
+            for minute in range(30):
+                store.append(BASE_NS + minute * 60 * SECOND, 25 * 10**9)
+
+        monitor = GasMonitor(Mock(), history_size=5, persist_path=self.path, clock=self.clock)
+        try:
+            candles = monitor.candles.series[60].candles()
+            self.assertEqual(len(candles), 30)
+            self.assertEqual(int(monitor.candles.series[300].candles().volume.sum()), 30)
+        finally:
+            monitor.timeseries.close()
+
+    def test_disabled(self):
+        """Test that candles can be turned off."""
+        monitor = GasMonitor(Mock(), candle_resolutions=None)
+        monitor._record_gas_price(10**9)
+
+        self.assertIsNone(monitor.candles)
+        self.assertIsNone(monitor.get_candles(datetime.now()))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,245 @@
+"""
+Tests for multi-source gas price consensus
+"""
+
+import asyncio
+import logging
+import unittest
+from unittest.mock import Mock, patch
+
+import numpy as np
+
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.gas_optimization.clock import VirtualClock
+from src.gas_optimization.consensus import GasPriceConsensus, weighted_median
+from src.gas_optimization.gas_monitor import GasMonitor
+
+
+GWEI = 10**9
+
+
+def make_source(price, delay=0.0, error=None):
+    """Build an async fetch function returning ``price`` after ``delay`` seconds."""
+    async def fetch():
+        await asyncio.sleep(delay)
+        if error is not None:
+            raise error
+        return price
+
+    return fetch
+
+
+def make_provider(price):
+    """Build a synchronous Web3 stand-in reporting ``price``."""
+    provider = Mock()
+    provider.eth.gas_price = price
+    return provider
+
+
+class TestWeightedMedian(unittest.TestCase):
+    """Test suite for weighted_median."""
+
+    def test_equal_weights_match_median(self):
+        """Test that equal weights give the ordinary median."""
+        for values in ([3.0], [1.0, 5.0], [4.0, 1.0, 9.0], [7.0, 1.0, 3.0, 2.0]):
+            self.assertEqual(weighted_median(np.array(values), np.ones(len(values))), np.median(values))
+
+    def test_heavy_value_wins(self):
+        """Test that a value holding most of the weight is the median."""
+        self.assertEqual(weighted_median(np.array([1.0, 2.0, 10.0]), np.array([1.0, 1.0, 5.0])), 10.0)
+
+
+class TestGasPriceConsensus(unittest.TestCase):
+    """Test suite for GasPriceConsensus."""
+
+    def setUp(self):
+        self.consensus = GasPriceConsensus()
+
+    def test_outlier_rejected(self):
+        """Test that a far-off answer is rejected and does not move the price."""
+        result = self.consensus.combine({"a": 30 * GWEI, "b": 31 * GWEI, "c": 32 * GWEI, "d": 300 * GWEI})
+
+        self.assertEqual(result.outliers, ("d",))
+        self.assertEqual(result.inliers, ("a", "b", "c"))
+        self.assertEqual(result.gas_price, 31 * GWEI)
+        self.assertAlmostEqual(sum(result.contributions.values()), 1.0)
+        self.assertTrue(result.quorum_met)
+
+    def test_identical_answers_keep_small_deviations(self):
+        """Test that a zero MAD still tolerates answers within the minimum spread."""
+        result = self.consensus.combine(
+            {"a": 30 * GWEI, "b": 30 * GWEI, "c": 30 * GWEI, "d": int(30.3 * GWEI), "e": 36 * GWEI}
+        )
+
+        self.assertEqual(result.mad, 0.0)
+        self.assertEqual(result.outliers, ("e",))
+
+    def test_weights(self):
+        """Test that weights shift the median and the contributions."""
+        result = self.consensus.combine(
+            {"a": 30 * GWEI, "b": int(30.2 * GWEI), "c": int(30.4 * GWEI)}, weights={"c": 4.0}
+        )
+
+        self.assertEqual(result.gas_price, int(30.4 * GWEI))
+        self.assertAlmostEqual(result.contributions["c"], 4 / 6)
+
+    def test_two_answers_are_never_rejected(self):
+        """Test that with two answers neither can be singled out."""
+        result = self.consensus.combine({"a": 30 * GWEI, "b": 90 * GWEI})
+
+        self.assertEqual(result.outliers, ())
+        self.assertEqual(result.gas_price, 60 * GWEI)
+
+    def test_quorum_and_empty_round(self):
+        """Test that a single answer misses the quorum and no answers give None."""
+        result = GasPriceConsensus(quorum=2).combine({"a": 30 * GWEI}, missing=["b"])
+
+        self.assertFalse(result.quorum_met)
+        self.assertEqual(result.missing, ("b",))
+        self.assertIsNone(self.consensus.combine({}))
+
+    def test_invalid_settings(self):
+        """Test that non-positive settings are rejected."""
+        with self.assertRaises(ValueError):
+            GasPriceConsensus(mad_threshold=0)
+
+
+class TestGasMonitorConsensus(unittest.TestCase):
+    """Test suite for GasMonitor consensus fetching."""
+
+    def setUp(self):
+        self.providers = {"alchemy": make_provider(31 * GWEI), "infura": make_provider(32 * GWEI)}
+
+    def test_invalid_settings(self):
+        """Test that reserved provider names and unknown weights are rejected."""
+        with self.assertRaises(ValueError):
+            GasMonitor(Mock(), consensus_providers={"web3": make_provider(GWEI)})
+        with self.assertRaises(ValueError):
+            GasMonitor(Mock(), source_weights={"quicknode": 2.0})
+
+    def test_providers_are_sources(self):
+        """Test that extra providers sit between the primary and Etherscan."""
+        monitor = GasMonitor(Mock(), consensus_providers=self.providers)
+
+        self.assertEqual(
+            [name for name, _ in monitor._gas_sources()], ["web3", "alchemy", "infura", "etherscan"]
+        )
+        self.assertEqual(set(monitor.get_source_stats()), {"web3", "alchemy", "infura", "etherscan"})
+
+    async def test_consensus_rejects_outlier(self):
+        """Test that a misreporting source is outvoted and recorded as an outlier."""
+        web3 = make_provider(30 * GWEI)
+        monitor = GasMonitor(web3, fetch_mode="consensus", consensus_providers=self.providers)
+
+        with patch.object(monitor, '_fetch_gas_from_api', side_effect=make_source(500 * GWEI)):
+            gas_price = await monitor.get_current_gas_price()
+
+        consensus = monitor.get_consensus()
+        self.assertEqual(gas_price, 31 * GWEI)
+        self.assertEqual(consensus.outliers, ("etherscan",))
+        self.assertEqual(consensus.staleness["web3"], 0.0)
+
+        stats = monitor.get_source_stats()
+        self.assertEqual(stats["etherscan"]["outliers"], 1)
+        self.assertEqual(stats["etherscan"]["wins"], 0)
+        self.assertEqual(stats["alchemy"]["inliers"], 1)
+        self.assertEqual(stats["alchemy"]["wins"], 1)
+
+        snapshot = monitor.get_metrics_snapshot()["gas_source_consensus_answers"]
+        self.assertIn({"labels": {"source": "etherscan", "result": "outlier"}, "value": 1}, snapshot)
+
+    async def test_outlier_warning_rate_limited_per_source(self):
+        """Test that a repeated outlier is logged once, and again after it recovers."""
+        web3 = make_provider(30 * GWEI)
+        monitor = GasMonitor(
+            web3, fetch_mode="consensus", consensus_providers=self.providers, clock=VirtualClock(0)
+        )
+
+        with patch.object(monitor, '_fetch_gas_from_api') as etherscan:
+            with self.assertLogs("src.gas_optimization.gas_monitor", logging.WARNING) as logs:
+                etherscan.side_effect = make_source(500 * GWEI)
+                for _ in range(3):
+                    await monitor._fetch_consensus()
+                etherscan.side_effect = make_source(31 * GWEI)
+                await monitor._fetch_consensus()
+                etherscan.side_effect = make_source(500 * GWEI)
+                await monitor._fetch_consensus()
+
+        outlier_logs = [line for line in logs.output if "outlier" in line]
+        self.assertEqual(len(outlier_logs), 2)
+        self.assertIn("from etherscan: 500.00 Gwei", outlier_logs[0])
+        self.assertEqual(monitor.get_source_stats()["etherscan"]["outliers"], 4)
+
+    async def test_deadline_uses_answers_so_far(self):
+        """Test that slow sources are cut off at the latency budget."""
+        monitor = GasMonitor(
+            Mock(), fetch_mode="consensus", consensus_providers=self.providers, consensus_timeout=0.05
+        )
+        sources = [
+            ("web3", make_source(30 * GWEI)),
+            ("alchemy", make_source(31 * GWEI)),
+            ("infura", make_source(32 * GWEI, delay=10)),
+            ("etherscan", make_source(None, error=RuntimeError("down"))),
+        ]
+
+        with patch.object(monitor, '_gas_sources', return_value=sources):
+            started = asyncio.get_running_loop().time()
+            gas_price = await monitor.get_current_gas_price()
+            elapsed = asyncio.get_running_loop().time() - started
+
+        consensus = monitor.get_consensus()
+        self.assertLess(elapsed, 1.0)
+        self.assertEqual(gas_price, int(30.5 * GWEI))
+        self.assertEqual(set(consensus.missing), {"infura", "etherscan"})
+        self.assertIsNone(consensus.staleness["infura"])
+        self.assertTrue(consensus.quorum_met)
+        self.assertEqual(monitor.get_source_stats()["infura"]["cancellations"], 1)
+
+    async def test_waits_past_deadline_for_first_answer(self):
+        """Test that a round with no answers at the deadline waits for the first one."""
+        monitor = GasMonitor(Mock(), fetch_mode="consensus", consensus_timeout=0.01)
+        sources = [
+            ("web3", make_source(30 * GWEI, delay=0.05)),
+            ("etherscan", make_source(40 * GWEI, delay=10)),
+        ]
+
+        with patch.object(monitor, '_gas_sources', return_value=sources):
+            gas_price = await monitor.get_current_gas_price()
+
+        self.assertEqual(gas_price, 30 * GWEI)
+        self.assertFalse(monitor.get_consensus().quorum_met)
+
+    async def test_all_sources_fail(self):
+        """Test that the default price is used when nothing answers."""
+        monitor = GasMonitor(Mock(), fetch_mode="consensus")
+        sources = [("web3", make_source(None)), ("etherscan", make_source(None))]
+
+        with patch.object(monitor, '_gas_sources', return_value=sources):
+            gas_price = await monitor.get_current_gas_price()
+
+        self.assertEqual(gas_price, 50 * GWEI)
+        self.assertIsNone(monitor.get_consensus())
+
+
+def run_async_test(coro):
+    """Helper function to run async tests."""
+    return asyncio.run(coro)
+
+
+# Make async tests runnable with unittest
+for name, method in list(TestGasMonitorConsensus.__dict__.items()):
+    if name.startswith('test_') and asyncio.iscoroutinefunction(method):
+        # Wrap async test method
+        def make_sync_test(async_method):
+            def sync_test(self):
+                return run_async_test(async_method(self))
+            return sync_test
+
+        setattr(TestGasMonitorConsensus, name, make_sync_test(method))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,172 @@
+"""
+Tests for vectorized transaction cost estimation
+"""
+
+import unittest
+from unittest.mock import Mock
+
+import numpy as np
+
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.gas_optimization.cost_estimate import CostEstimate, urgency_quantile
+from src.gas_optimization.gas_monitor import GasMonitor
+
+
+GWEI = 10**9
+BASE_NS = 1_700_000_000 * 10**9
+
+
+class TestCostEstimate(unittest.TestCase):
+    """Test suite for CostEstimate."""
+
+    def setUp(self):
+        self.estimate = CostEstimate.from_prices(
+            [21_000, 100_000, 1_000_000],
+            urgency=0.5,
+            gas_price_wei=30 * GWEI,
+            forecast_gas_price_wei=np.array([32, 25, 28]) * GWEI,
+        )
+
+    def test_costs(self):
+        """Test that current and forecast costs broadcast over the batch."""
+        np.testing.assert_allclose(self.estimate.cost_wei, [630_000 * GWEI, 3_000_000 * GWEI, 30_000_000 * GWEI])
+        np.testing.assert_allclose(self.estimate.cost_native, [0.00063, 0.003, 0.03])
+        self.assertEqual(self.estimate.forecast_cost_wei.shape, (3, 3))
+        np.testing.assert_allclose(self.estimate.forecast_cost_native[1], [0.0032, 0.0025, 0.0028])
+
+    def test_best_step_and_savings(self):
+        """Test that waiting for the cheapest step is priced per transaction."""
+        self.assertEqual(self.estimate.best_step, 2)
+        np.testing.assert_allclose(self.estimate.savings_wei, [105_000 * GWEI, 500_000 * GWEI, 5_000_000 * GWEI])
+
+    def test_sending_now_is_cheapest(self):
+        """Test that no savings are reported when no step beats the current price."""
+        estimate = CostEstimate.from_prices([21_000], 0.5, 30 * GWEI, np.array([31, 35]) * GWEI)
+        self.assertEqual(estimate.best_step, 0)
+        np.testing.assert_array_equal(estimate.savings_wei, [0.0])
+
+    def test_reference_price_decides_waiting(self):
+        """Test that savings are measured from the reference price when set."""
+        estimate = CostEstimate.from_prices(
+            [100_000], 0.5, 40 * GWEI, np.array([32, 29]) * GWEI, reference_gas_price_wei=30 * GWEI
+        )
+        self.assertEqual(estimate.best_step, 2)
+        np.testing.assert_allclose(estimate.savings_wei, [100_000 * GWEI])
+
+    def test_without_forecast(self):
+        """Test that forecast fields are None without a forecast."""
+        estimate = CostEstimate.from_prices([21_000], 0.5, 30 * GWEI)
+        self.assertIsNone(estimate.forecast_cost_wei)
+        self.assertIsNone(estimate.forecast_cost_native)
+        self.assertIsNone(estimate.best_step)
+
+    def test_budget_and_net_value(self):
+        """Test that budgets and values are compared as whole arrays."""
+        np.testing.assert_array_equal(self.estimate.within_budget(0.005e18), [True, True, False])
+        np.testing.assert_allclose(
+            self.estimate.net_value_wei([0.001e18, 0.001e18, 0.05e18]),
+            [0.00037e18, -0.002e18, 0.02e18],
+        )
+
+    def test_large_costs_do_not_overflow(self):
+        """Test that costs beyond the int64 range stay exact enough."""
+        estimate = CostEstimate.from_prices([30_000_000], 0.5, 10_000 * GWEI)
+        self.assertEqual(estimate.cost_wei[0], 3e20)
+
+    def test_negative_gas_rejected(self):
+        """Test that negative gas limits are rejected."""
+        with self.assertRaises(ValueError):
+            CostEstimate.from_prices([-1], 0.5, GWEI)
+
+    def test_urgency_levels(self):
+        """Test that named and numeric urgencies resolve to quantiles."""
+        self.assertEqual(urgency_quantile("standard"), 0.5)
+        self.assertEqual(urgency_quantile(0.8), 0.8)
+        with self.assertRaises(ValueError):
+            urgency_quantile("asap")
+        with self.assertRaises(ValueError):
+            urgency_quantile(1.0)
+
+
+class TestGasMonitorEstimateCosts(unittest.TestCase):
+    """Test suite for GasMonitor.estimate_costs."""
+
+    def setUp(self):
+        self.monitor = GasMonitor(Mock())
+        self.gas_units = np.array([21_000, 150_000, 500_000])
+
+    def _record(self, prices_gwei):
+        for i, price in enumerate(prices_gwei):
+            self.monitor._record_gas_price(int(price * GWEI), BASE_NS + i * 12 * 10**9)
+
+    def test_no_price_known(self):
+        """Test that nothing is estimated before the first reading."""
+        self.assertIsNone(self.monitor.estimate_costs(self.gas_units))
+
+    def test_latest_reading_and_forecast(self):
+        """Test that the latest reading and forecast quantiles price the batch."""
+        self._record(30 + 3 * np.sin(np.arange(40) / 3))
+
+        low = self.monitor.estimate_costs(self.gas_units, "low")
+        urgent = self.monitor.estimate_costs(self.gas_units, "urgent")
+
+        self.assertEqual(low.gas_price_wei, self.monitor.gas_history.last_price_wei())
+        np.testing.assert_allclose(low.cost_wei, self.gas_units * float(low.gas_price_wei))
+        self.assertEqual(low.forecast_cost_wei.shape, (3, 5))
+        self.assertTrue(np.all(urgent.forecast_gas_price_wei > low.forecast_gas_price_wei))
+
+        no_forecast = self.monitor.estimate_costs(self.gas_units, steps=0)
+        self.assertIsNone(no_forecast.forecast_cost_wei)
+
+    def test_fee_history_recommendation_preferred(self):
+        """Test that the next base fee plus the recommended tip sets the current price."""
+        self._record([30, 31])
+        self.monitor.fee_history.ingest({
+            "oldestBlock": 100,
+            "baseFeePerGas": [20 * GWEI, 21 * GWEI, 22 * GWEI],
+            "gasUsedRatio": [0.6, 0.7],
+            "reward": [[GWEI] * 8, [2 * GWEI] * 8],
+        })
+
+        estimate = self.monitor.estimate_costs(self.gas_units, 0.9, blocks=2)
+        recommendation = self.monitor.recommend_eip1559_fees(blocks=2, confidence=0.9)
+
+        # Priced at the expected effective price, not the maxFeePerGas cap
+        self.assertEqual(
+            estimate.gas_price_wei,
+            self.monitor.fee_history.next_base_fee + recommendation.max_priority_fee_per_gas,
+        )
+        self.assertLess(estimate.gas_price_wei, recommendation.max_fee_per_gas)
+
+    def test_flat_history_has_no_savings(self):
+        """Test that a current price above the readings does not make waiting look cheaper."""
+        self._record([30] * 40)
+        self.monitor.fee_history.ingest({
+            "oldestBlock": 100,
+            "baseFeePerGas": [28 * GWEI, 29 * GWEI, 30 * GWEI],
+            "gasUsedRatio": [0.9, 0.9],
+            "reward": [[2 * GWEI] * 8, [2 * GWEI] * 8],
+        })
+
+        estimate = self.monitor.estimate_costs(self.gas_units, "standard")
+
+        self.assertGreater(estimate.gas_price_wei, 30 * GWEI)
+        self.assertEqual(estimate.reference_gas_price_wei, 30 * GWEI)
+        self.assertEqual(estimate.best_step, 0)
+        np.testing.assert_array_equal(estimate.savings_wei, np.zeros(3))
+
+    def test_mempool_percentile_used(self):
+        """Test that pending transaction prices are used without fee history."""
+        monitor = GasMonitor(Mock(), mempool_url="http://127.0.0.1:8545")
+        monitor.mempool.ingest_transactions([{"gasPrice": hex(gwei * GWEI)} for gwei in range(1, 101)])
+
+        estimate = monitor.estimate_costs([21_000], "high")
+
+        self.assertEqual(estimate.gas_price_wei, 75 * GWEI)
+
+
+if __name__ == '__main__':
+    unittest.main()
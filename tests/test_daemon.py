@@ -0,0 +1,287 @@
+"""
+Tests for the gas monitoring daemon and its query API
+"""
+
+import asyncio
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import Mock, patch
+
+import aiohttp
+from web3 import AsyncHTTPProvider
+
+import sys
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.gas_optimization.daemon import (
+    DaemonConfig,
+    GasDaemon,
+    GasQueryServer,
+    build_parser,
+    config_from_args,
+    gas_summary,
+    monitor_arguments,
+    run_event_loop,
+)
+from src.gas_optimization.gas_monitor import GasMonitor
+from src.gas_optimization.pool import GasMonitorPool
+
+
+GWEI = 10**9
+BASE_NS = 1_700_000_000 * 10**9
+
+
+def record(monitor, prices_gwei):
+    """Record readings 12 seconds apart."""
+    for i, price in enumerate(prices_gwei):
+        monitor._record_gas_price(int(price * GWEI), BASE_NS + i * 12 * 10**9)
+
+
+class TestGasSummary(unittest.TestCase):
+    """Test suite for gas_summary."""
+
+    def test_summary(self):
+        """Test that the summary reports the latest and rolling prices."""
+        monitor = GasMonitor(Mock(), ema_half_lives=(5, 20))
+        record(monitor, [30, 32, 34])
+
+        summary = gas_summary(monitor)
+
+        self.assertEqual(summary["gas_price_wei"], 34 * GWEI)
+        self.assertEqual(summary["timestamp_ns"], BASE_NS + 24 * 10**9)
+        self.assertEqual(summary["readings"], 3)
+        self.assertEqual(summary["rolling"]["median_wei"], 32 * GWEI)
+        self.assertEqual(summary["rolling"]["min_wei"], 30 * GWEI)
+        self.assertEqual(set(summary["rolling"]["ema_wei"]), {"5", "20"})
+        json.dumps(summary)
+
+    def test_empty_monitor(self):
+        """Test that a monitor without readings reports None prices."""
+        summary = gas_summary(GasMonitor(Mock()))
+
+        self.assertIsNone(summary["gas_price_wei"])
+        self.assertIsNone(summary["rolling"]["median_wei"])
+
+
+class TestGasQueryServer(unittest.TestCase):
+    """Test suite for GasQueryServer."""
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.pool = GasMonitorPool()
+        self.monitor = self.pool.add_monitor("mainnet", Mock(), update_interval=12)
+        self.pool.add_monitor(137, Mock(), update_interval=2)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def test_requires_a_listener(self):
+        """Test that a server without port and socket is rejected."""
+        with self.assertRaises(ValueError):
+            GasQueryServer(self.pool, port=None)
+
+    async def test_http_queries(self):
+        """Test the health, summary and error routes over TCP."""
+        record(self.monitor, [30, 31, 29])
+        server = GasQueryServer(self.pool, port=0)
+        await server.start()
+        try:
+            async with aiohttp.ClientSession() as session:
+                async with session.get(f"{server.url}/health") as response:
+                    self.assertEqual(await response.json(), {"status": "ok", "chains": ["mainnet", "137"]})
+
+                async with session.get(f"{server.url}/gas/mainnet") as response:
+                    self.assertEqual(response.status, 200)
+                    summary = await response.json()
+                self.assertEqual(summary["chain"], "mainnet")
+                self.assertEqual(summary["gas_price_wei"], 29 * GWEI)
+
+                async with session.get(f"{server.url}/gas") as response:
+                    everything = await response.json()
+                self.assertEqual(set(everything), {"mainnet", "137"})
+                self.assertIsNone(everything["137"]["gas_price_wei"])
+
+                async with session.get(f"{server.url}/gas/goerli") as response:
+                    self.assertEqual(response.status, 404)
+        finally:
+            await server.stop()
+
+    async def test_forecast_queries(self):
+        """Test forecast responses and step validation."""
+        server = GasQueryServer(self.pool, port=0)
+        await server.start()
+        try:
+            async with aiohttp.ClientSession() as session:
+                async with session.get(f"{server.url}/gas/mainnet/forecast") as response:
+                    self.assertEqual(response.status, 404)
+
+                record(self.monitor, [30 + (i % 5) for i in range(40)])
+                async with session.get(f"{server.url}/gas/mainnet/forecast?steps=3") as response:
+                    forecast = await response.json()
+                self.assertEqual(forecast["steps"], [1, 2, 3])
+                self.assertTrue(all(
+                    low <= median <= high
+                    for low, median, high in zip(forecast["p10_gwei"], forecast["median_gwei"], forecast["p90_gwei"])
+                ))
+
+                async with session.get(f"{server.url}/gas/mainnet/forecast?steps=0") as response:
+                    self.assertEqual(response.status, 400)
+                async with session.get(f"{server.url}/gas/mainnet/forecast?steps=x") as response:
+                    self.assertEqual(response.status, 400)
+        finally:
+            await server.stop()
+
+    async def test_unix_socket(self):
+        """Test that queries are served on a Unix-domain socket."""
+        path = os.path.join(self.tmpdir, "gas.sock")
+        record(self.monitor, [25])
+        server = GasQueryServer(self.pool, port=None, socket_path=path)
+        await server.start()
+        try:
+            async with aiohttp.ClientSession(connector=aiohttp.UnixConnector(path=path)) as session:
+                async with session.get("http://localhost/gas/mainnet") as response:
+                    summary = await response.json()
+            self.assertEqual(summary["gas_price_wei"], 25 * GWEI)
+        finally:
+            await server.stop()
+        self.assertFalse(os.path.exists(path))
+
+    def test_responses_cached_until_next_reading(self):
+        """Test that a summary is encoded once per reading."""
+        server = GasQueryServer(self.pool, port=0)
+        record(self.monitor, [30])
+
+        first = server._chain_body("mainnet")
+        with patch("src.gas_optimization.daemon.gas_summary") as summarize:
+            self.assertIs(server._chain_body("mainnet"), first)
+            summarize.assert_not_called()
+
+        self.monitor._record_gas_price(40 * GWEI)
+        self.assertEqual(json.loads(server._chain_body("mainnet"))["gas_price_wei"], 40 * GWEI)
+
+
+class TestDaemonConfig(unittest.TestCase):
+    """Test suite for daemon settings."""
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def _write(self, data):
+        path = os.path.join(self.tmpdir, "daemon.json")
+        with open(path, "w") as f:
+            json.dump(data, f)
+        return path
+
+    def test_from_file_with_overrides(self):
+        """Test that command line options override the settings file."""
+        path = self._write({
+            "port": 9000,
+            "monitors": {"mainnet": {"rpc_url": "http://127.0.0.1:8545", "update_interval": 12}},
+        })
+
+        config = config_from_args(build_parser().parse_args(["--config", path, "--socket", "/tmp/gas.sock", "--no-uvloop"]))
+
+        self.assertEqual(config.port, 9000)
+        self.assertEqual(config.socket_path, "/tmp/gas.sock")
+        self.assertFalse(config.use_uvloop)
+        self.assertEqual(config.monitors["mainnet"]["update_interval"], 12)
+
+    def test_invalid_files(self):
+        """Test that unknown keys and missing monitors are rejected."""
+        with self.assertRaises(ValueError):
+            DaemonConfig.from_file(self._write({"monitors": {"a": {"rpc_url": "x"}}, "prot": 1}))
+        with self.assertRaises(ValueError):
+            DaemonConfig.from_file(self._write({"monitors": {}}))
+
+    def test_single_monitor_from_arguments(self):
+        """Test that --rpc-url configures one monitor."""
+        args = build_parser().parse_args(["--rpc-url", "http://127.0.0.1:8545", "--fetch-mode", "hedged"])
+
+        config = config_from_args(args)
+
+        self.assertEqual(config.monitors["mainnet"]["fetch_mode"], "hedged")
+        self.assertEqual(config.port, 8547)
+
+    def test_listener_required(self):
+        """Test that turning off HTTP without a socket is rejected."""
+        args = build_parser().parse_args(["--rpc-url", "http://127.0.0.1:8545", "--no-http"])
+        with self.assertRaises(ValueError):
+            config_from_args(args)
+
+    def test_monitor_arguments(self):
+        """Test that URLs become async providers."""
+        arguments = monitor_arguments({
+            "rpc_url": "http://127.0.0.1:8545",
+            "consensus_providers": {"backup": "http://127.0.0.1:8546"},
+            "history_size": 50,
+        })
+
+        self.assertIsInstance(arguments["web3"], AsyncHTTPProvider)
+        self.assertIsInstance(arguments["consensus_providers"]["backup"], AsyncHTTPProvider)
+        self.assertEqual(arguments["history_size"], 50)
+        with self.assertRaises(ValueError):
+            monitor_arguments({"history_size": 50})
+
+
+class TestGasDaemon(unittest.TestCase):
+    """Test suite for GasDaemon."""
+
+    def test_run_until_stopped(self):
+        """Test that the daemon serves until asked to stop."""
+        config = DaemonConfig(
+            monitors={"mainnet": {"rpc_url": "http://127.0.0.1:1", "update_interval": 60}}, port=0
+        )
+        daemon = GasDaemon(config)
+
+        async def scenario():
+            task = asyncio.create_task(daemon.run())
+            while daemon.server._runner is None:
+                await asyncio.sleep(0.01)
+            async with aiohttp.ClientSession() as session:
+                async with session.get(f"{daemon.server.url}/health") as response:
+                    health = await response.json()
+            daemon.request_stop()
+            await task
+            return health
+
+        health = run_event_loop(scenario(), use_uvloop=False)
+
+        self.assertEqual(health["chains"], ["mainnet"])
+        self.assertFalse(daemon.pool.is_running)
+
+    def test_missing_uvloop(self):
+        """Test that requiring uvloop fails cleanly when it is not installed."""
+        async def noop():
+            return 1
+
+        with patch.dict(sys.modules, {"uvloop": None}):
+            with self.assertRaises(ImportError):
+                run_event_loop(noop(), use_uvloop=True)
+            self.assertEqual(run_event_loop(noop()), 1)
+
+
+def run_async_test(coro):
+    """Helper function to run async tests."""
+    return asyncio.run(coro)
+
+
+# Make async tests runnable with unittest
+for name, method in list(TestGasQueryServer.__dict__.items()):
+    if name.startswith('test_') and asyncio.iscoroutinefunction(method):
+        # Wrap async test method
+        def make_sync_test(async_method):
+            def sync_test(self):
+                return run_async_test(async_method(self))
+            return sync_test
+
+        setattr(TestGasQueryServer, name, make_sync_test(method))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,205 @@
+"""
+Tests for the EIP-1559 fee history engine
+
+The GasMonitor tests run against a local fake JSON-RPC HTTP node.
+"""
+
+import asyncio
+import unittest
+
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from aiohttp import web
+from web3 import AsyncWeb3, Web3
+
+from src.gas_optimization.fee_history import FeeHistoryEngine, FeeRecommendation
+from src.gas_optimization.gas_monitor import GasMonitor
+
+
+GWEI = 10**9
+
+
+def make_fee_history(oldest, base_fees, rewards, ratio=0.5):
+    """Build an eth_feeHistory result for consecutive blocks."""
+    return {
+        "oldestBlock": oldest,
+        "baseFeePerGas": list(base_fees),
+        "gasUsedRatio": [ratio] * len(rewards),
+        "reward": [list(row) for row in rewards],
+    }
+
+
+class FakeFeeHistoryNode:
+    """Local JSON-RPC node with a fixed fee history per block number."""
+
+    def __init__(self, head=100):
+        self.head = head
+        self.fee_history_calls = []
+
+    def base_fee(self, block):
+        return (10 + block % 3) * GWEI
+
+    async def __aenter__(self):
+        app = web.Application()
+        app.router.add_post("/", self._handle)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, "127.0.0.1", 0)
+        await site.start()
+        self.url = f"http://127.0.0.1:{self._runner.addresses[0][1]}"
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self._runner.cleanup()
+
+    def _fee_history(self, block_count, newest, percentiles):
+        block_count, newest = int(block_count, 16), int(newest, 16)
+        self.fee_history_calls.append((block_count, newest))
+        oldest = newest - block_count + 1
+        blocks = range(oldest, newest + 1)
+        return {
+            "oldestBlock": hex(oldest),
+            "baseFeePerGas": [hex(self.base_fee(b)) for b in range(oldest, newest + 2)],
+            "gasUsedRatio": [0.5 for _ in blocks],
+            "reward": [[hex(int(p * GWEI / 10)) for p in percentiles] for _ in blocks],
+        }
+
+    async def _handle(self, request):
+        call = await request.json()
+        if call["method"] == "eth_blockNumber":
+            result = hex(self.head)
+        elif call["method"] == "eth_feeHistory":
+            result = self._fee_history(*call["params"])
+        else:
+            result = hex(30 * GWEI)
+        return web.json_response({"jsonrpc": "2.0", "id": call["id"], "result": result})
+
+
+class TestFeeHistoryEngine(unittest.TestCase):
+    """Test suite for FeeHistoryEngine."""
+
+    def setUp(self):
+        """Create an engine with a small window."""
+        self.engine = FeeHistoryEngine(window=8, reward_percentiles=(10, 50, 90), max_blocks_ahead=4)
+
+    def test_empty_engine_has_no_recommendation(self):
+        """Test that recommendations need ingested history."""
+        self.assertIsNone(self.engine.recommend(1, 0.5))
+        self.assertEqual(self.engine.blocks_to_fetch(100), 8)
+        self.assertEqual(self.engine.blocks_to_fetch(3), 4)
+
+    def test_ingest_skips_known_blocks(self):
+        """Test that overlapping results only add unseen blocks."""
+        rewards = [[GWEI, 2 * GWEI, 3 * GWEI]] * 3
+        self.assertEqual(self.engine.ingest(make_fee_history(10, [GWEI] * 4, rewards)), 3)
+        self.assertEqual(self.engine.ingest(make_fee_history(11, [GWEI] * 4, rewards)), 1)
+
+        self.assertEqual(self.engine.last_block, 13)
+        self.assertEqual(self.engine.block_numbers[:self.engine.count].tolist(), [10, 11, 12, 13])
+        self.assertEqual(self.engine.blocks_to_fetch(15), 2)
+        self.assertEqual(self.engine.blocks_to_fetch(13), 0)
+
+    def test_window_keeps_most_recent_blocks(self):
+        """Test that old blocks fall out of the window."""
+        for block in range(20):
+            self.engine.ingest(make_fee_history(block, [(block + 1) * GWEI] * 2, [[1, 2, 3]]))
+
+        self.assertEqual(self.engine.count, 8)
+        self.assertEqual(self.engine.block_numbers.tolist(), list(range(12, 20)))
+        self.assertEqual(self.engine.base_fees[-1], 20 * GWEI)
+
+    def test_recommendation_uses_next_base_fee_and_tip_quantile(self):
+        """Test fee sizing for a flat base fee."""
+        rewards = [[GWEI, 2 * GWEI, 4 * GWEI]] * 5
+        self.engine.ingest(make_fee_history(1, [10 * GWEI] * 5 + [11 * GWEI], rewards))
+
+        recommendation = self.engine.recommend(blocks=1, confidence=0.5)
+
+        self.assertIsInstance(recommendation, FeeRecommendation)
+        self.assertEqual(recommendation.max_priority_fee_per_gas, 2 * GWEI)
+        self.assertEqual(recommendation.base_fee_estimate, 11 * GWEI)
+        self.assertEqual(recommendation.max_fee_per_gas, 13 * GWEI)
+
+    def test_longer_horizon_needs_lower_tip(self):
+        """Test that more blocks to wait lowers the per-block tip."""
+        rewards = [[GWEI, 2 * GWEI, 4 * GWEI]] * 5
+        self.engine.ingest(make_fee_history(1, [10 * GWEI] * 6, rewards))
+
+        one_block = self.engine.recommend(blocks=1, confidence=0.9)
+        four_blocks = self.engine.recommend(blocks=4, confidence=0.9)
+
+        self.assertEqual(one_block.max_priority_fee_per_gas, 4 * GWEI)
+        self.assertLess(four_blocks.max_priority_fee_per_gas, one_block.max_priority_fee_per_gas)
+
+    def test_base_fee_growth_is_bounded(self):
+        """Test that observed base fee growth is capped by the EIP-1559 limit."""
+        base_fees = [10 * GWEI * 2**i for i in range(7)]
+        self.engine.ingest(make_fee_history(1, base_fees, [[0, 0, 0]] * 6))
+
+        recommendation = self.engine.recommend(blocks=3, confidence=0.99)
+
+        self.assertEqual(recommendation.base_fee_estimate, int(base_fees[-1] * 1.125 ** 2))
+
+    def test_invalid_arguments(self):
+        """Test argument validation."""
+        with self.assertRaises(ValueError):
+            FeeHistoryEngine(reward_percentiles=(50, 10))
+        with self.assertRaises(ValueError):
+            self.engine.recommend(blocks=5)
+        with self.assertRaises(ValueError):
+            self.engine.recommend(confidence=1.0)
+
+
+class TestGasMonitorFeeHistory(unittest.TestCase):
+    """Test suite for GasMonitor fee history integration."""
+
+    async def test_incremental_updates_async_web3(self):
+        """Test that only new blocks are requested after the first update."""
+        async with FakeFeeHistoryNode(head=100) as node:
+            monitor = GasMonitor(AsyncWeb3(AsyncWeb3.AsyncHTTPProvider(node.url)), fee_history_window=16)
+            self.assertEqual(await monitor.update_fee_history(), 16)
+            self.assertEqual(await monitor.update_fee_history(), 0)
+            node.head = 102
+            self.assertEqual(await monitor.update_fee_history(), 2)
+            await monitor.web3.provider.disconnect()
+
+        self.assertEqual(node.fee_history_calls, [(16, 100), (2, 102)])
+        self.assertEqual(monitor.latest_block_number, 102)
+
+        recommendation = monitor.recommend_eip1559_fees(blocks=1, confidence=0.5)
+        self.assertEqual(recommendation.max_priority_fee_per_gas, 5 * GWEI)
+        self.assertGreaterEqual(recommendation.base_fee_estimate, node.base_fee(103))
+
+    async def test_tracked_on_gas_price_update_sync_web3(self):
+        """Test that update_gas_price refreshes the fee history when tracking."""
+        async with FakeFeeHistoryNode(head=50) as node:
+            monitor = GasMonitor(Web3(Web3.HTTPProvider(node.url)), track_fee_history=True)
+            self.assertIsNone(monitor.recommend_eip1559_fees())
+            await monitor.update_gas_price()
+            await monitor.aclose()
+
+        self.assertEqual(node.fee_history_calls, [(51, 50)])
+        self.assertIsNotNone(monitor.recommend_eip1559_fees())
+
+
+def run_async_test(coro):
+    """Helper function to run async tests."""
+    return asyncio.run(coro)
+
+
+# Make async tests runnable with unittest
+for name, method in list(TestGasMonitorFeeHistory.__dict__.items()):
+    if name.startswith('test_') and asyncio.iscoroutinefunction(method):
+        # Wrap async test method
+        def make_sync_test(async_method):
+            def sync_test(self):
+                return run_async_test(async_method(self))
+            return sync_test
+
+        setattr(TestGasMonitorFeeHistory, name, make_sync_test(method))
+
+
+if __name__ == '__main__':
+    unittest.main()
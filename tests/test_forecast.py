@@ -0,0 +1,143 @@
+"""
+Tests for the short-horizon gas price forecaster
+"""
+
+import math
+import time
+import unittest
+from unittest.mock import Mock
+
+import numpy as np
+
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.gas_optimization.forecast import HOUR_NS, GasForecast, GasPriceForecaster
+from src.gas_optimization.gas_monitor import GasMonitor
+
+
+GWEI = 10**9
+BLOCK_NS = 12 * 10**9
+
+
+def ar_series(count, mean_gwei=30.0, phi=0.8, sigma=0.05, seed=7):
+    """Generate gas prices whose log follows an AR(1) around a mean."""
+    rng = np.random.default_rng(seed)
+    log_mean = math.log(mean_gwei)
+    x = 0.0
+    prices = []
+    for _ in range(count):
+        x = phi * x + rng.normal(0, sigma)
+        prices.append(int(math.exp(log_mean + x) * GWEI))
+    return prices
+
+
+class TestGasPriceForecaster(unittest.TestCase):
+    """Test suite for GasPriceForecaster."""
+
+    def fit(self, prices, forecaster=None, step_ns=BLOCK_NS):
+        forecaster = forecaster or GasPriceForecaster()
+        timestamps = np.arange(len(prices), dtype=np.int64) * step_ns
+        forecaster.fit(timestamps, np.asarray(prices, dtype=np.uint64))
+        return forecaster
+
+    def test_needs_history(self):
+        """Test that no forecast is made before the spread is known."""
+        forecaster = GasPriceForecaster()
+        self.assertIsNone(forecaster.forecast())
+        forecaster.update(0, 30 * GWEI)
+        forecaster.update(BLOCK_NS, 30 * GWEI)
+        self.assertIsNone(forecaster.forecast())
+        with self.assertRaises(ValueError):
+            forecaster.forecast(0)
+
+    def test_stable_prices(self):
+        """Test that a stable series forecasts the same price."""
+        forecaster = self.fit(ar_series(300, sigma=0.01))
+        forecast = forecaster.forecast(5)
+
+        self.assertIsInstance(forecast, GasForecast)
+        self.assertEqual(forecast.steps.tolist(), [1, 2, 3, 4, 5])
+        np.testing.assert_allclose(forecast.median_gwei(), 30.0, rtol=0.05)
+        self.assertTrue(np.all(np.diff(forecast.log_std) > 0))
+        self.assertEqual(forecast.timestamps_ns[0], 300 * BLOCK_NS)
+
+    def test_trend_is_extrapolated(self):
+        """Test that a steady rise is continued."""
+        prices = [int(20 * GWEI * 1.01 ** i) for i in range(200)]
+        forecast = self.fit(prices).forecast(5)
+
+        self.assertTrue(np.all(np.diff(forecast.median_gwei()) > 0))
+        self.assertGreater(forecast.median_gwei()[0], prices[-1] / GWEI)
+
+    def test_spike_reverts(self):
+        """Test that the AR(1) term expects a spike to decay."""
+        prices = ar_series(500, phi=0.8)
+        forecaster = self.fit(prices + [45 * GWEI])
+        forecast = forecaster.forecast(10)
+
+        self.assertGreater(forecaster.phi, 0.3)
+        self.assertLess(forecast.median_gwei()[-1], forecast.median_gwei()[0])
+        self.assertLess(forecast.median_gwei()[-1], 45)
+
+    def test_time_of_day_seasonality(self):
+        """Test that hourly offsets are learned and applied to future hours."""
+        prices, timestamps = [], []
+        for hour in range(24 * 20):
+            price = 40 if hour % 24 == 12 else 20
+            for minute in range(6):
+                timestamps.append(hour * HOUR_NS + minute * 600 * 10**9)
+                prices.append(price * GWEI)
+
+        forecaster = GasPriceForecaster(seasonal_rate=0.1)
+        forecaster.fit(np.array(timestamps), np.array(prices))
+
+        self.assertGreater(forecaster.season[12], forecaster.season[3] + 0.3)
+
+    def test_distribution_queries(self):
+        """Test quantiles and threshold probabilities."""
+        forecast = self.fit(ar_series(300)).forecast(3)
+
+        low, high = forecast.quantile_gwei(0.1), forecast.quantile_gwei(0.9)
+        self.assertTrue(np.all(low < forecast.median_gwei()))
+        self.assertTrue(np.all(forecast.median_gwei() < high))
+        self.assertTrue(np.all(forecast.median_gwei() < forecast.mean_gwei()))
+        np.testing.assert_allclose(forecast.probability_below(forecast.median_gwei()[0])[0], 0.5)
+        np.testing.assert_allclose(forecast.probability_below(high[1])[1], 0.9, atol=1e-9)
+        self.assertEqual(forecast.probability_below(0).tolist(), [0, 0, 0])
+
+    def test_prediction_is_sub_millisecond(self):
+        """Test that a 10-step prediction takes well under a millisecond."""
+        forecaster = self.fit(ar_series(500))
+
+        start = time.perf_counter()
+        for _ in range(200):
+            forecaster.forecast(10)
+        elapsed = (time.perf_counter() - start) / 200
+
+        self.assertLess(elapsed, 1e-3)
+
+
+class TestGasMonitorForecast(unittest.TestCase):
+    """Test suite for GasMonitor forecasting helpers."""
+
+    def test_forecast_follows_recorded_readings(self):
+        """Test that recorded readings refit the forecaster."""
+        monitor = GasMonitor(Mock(), history_size=1000)
+        self.assertIsNone(monitor.forecast_gas_price())
+        self.assertFalse(monitor.is_waiting_favorable())
+
+        for i, price in enumerate(ar_series(400, phi=0.8)):
+            monitor._record_gas_price(price, timestamp_ns=i * BLOCK_NS)
+
+        self.assertEqual(monitor.forecaster.count, 400)
+        self.assertEqual(len(monitor.forecast_gas_price(steps=4).steps), 4)
+
+        # After a spike, waiting should be expected to pay off
+        monitor._record_gas_price(60 * GWEI, timestamp_ns=400 * BLOCK_NS)
+        self.assertTrue(monitor.is_waiting_favorable(steps=5, min_probability=0.6))
+
+
+if __name__ == '__main__':
+    unittest.main()
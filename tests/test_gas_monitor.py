@@ -12,7 +12,27 @@ import sys
 import os
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
+from web3 import AsyncWeb3
+from web3.providers import AsyncBaseProvider
+
 from src.gas_optimization.gas_monitor import GasMonitor
+from src.gas_optimization.history import GasHistory
+
+
+class FakeAsyncProvider(AsyncBaseProvider):
+    """Async provider answering JSON-RPC requests from a fixed table of results."""
+    
+    def __init__(self, results):
+        super().__init__()
+        self.results = results
+        self.calls = []
+    
+    async def make_request(self, method, params):
+        self.calls.append(method)
+        return {"jsonrpc": "2.0", "id": 1, "result": self.results[method]}
+    
+    async def is_connected(self, show_traceback=False):
+        return True
 
 
 class TestGasMonitor(unittest.TestCase):
@@ -46,7 +66,7 @@ class TestGasMonitor(unittest.TestCase):
         self.assertEqual(monitor.web3, self.mock_web3)
         self.assertEqual(monitor.update_interval, 15)
         self.assertEqual(monitor.history_size, 100)
-        self.assertIsInstance(monitor.gas_history, deque)
+        self.assertIsInstance(monitor.gas_history, GasHistory)
         self.assertEqual(len(monitor.gas_history), 0)
         self.assertFalse(monitor.is_monitoring)
     
@@ -81,6 +101,35 @@ class TestGasMonitor(unittest.TestCase):
         self.assertEqual(gas_price, expected_price)
         mock_to_thread.assert_called_once()
     
+    async def test_get_current_gas_price_from_sync_web3_in_thread(self):
+        """Test that the legacy sync path reads gas_price inside the worker thread."""
+        gas_price = await self.monitor.get_current_gas_price()
+        
+        self.assertFalse(self.monitor.is_async)
+        self.assertEqual(gas_price, 50000000000)
+    
+    @patch('asyncio.to_thread')
+    async def test_get_current_gas_price_from_async_web3(self, mock_to_thread):
+        """Test that AsyncWeb3 calls are awaited natively without a worker thread."""
+        provider = FakeAsyncProvider({"eth_gasPrice": hex(42000000000)})
+        monitor = GasMonitor(AsyncWeb3(provider))
+        
+        gas_price = await monitor.get_current_gas_price()
+        
+        self.assertTrue(monitor.is_async)
+        self.assertEqual(gas_price, 42000000000)
+        self.assertEqual(provider.calls, ["eth_gasPrice"])
+        mock_to_thread.assert_not_called()
+    
+    async def test_async_provider_is_wrapped_in_async_web3(self):
+        """Test that passing an async provider builds an AsyncWeb3 instance."""
+        provider = FakeAsyncProvider({"eth_gasPrice": hex(42000000000)})
+        monitor = GasMonitor(provider)
+        
+        self.assertIsInstance(monitor.web3, AsyncWeb3)
+        self.assertTrue(monitor.is_async)
+        self.assertEqual(await monitor.get_current_gas_price(), 42000000000)
+    
     @patch('asyncio.to_thread')
     async def test_get_current_gas_price_fallback_to_api(self, mock_to_thread):
         """Test fallback to API when Web3 fails."""
@@ -304,7 +353,7 @@ class TestGasMonitor(unittest.TestCase):
     
     async def test_start_monitoring_basic(self):
         """Test starting the monitoring loop."""
-        with patch.object(self.monitor, 'get_current_gas_price') as mock_get_price:
+        with patch.object(self.monitor, '_fetch_current_gas_price') as mock_get_price:
             mock_get_price.return_value = 45000000000  # 45 Gwei
             
             # Start monitoring in background
@@ -351,7 +400,7 @@ class TestGasMonitor(unittest.TestCase):
                 raise Exception("Temporary error")
             return 45000000000
         
-        with patch.object(self.monitor, 'get_current_gas_price', side_effect=mock_get_price_with_error):
+        with patch.object(self.monitor, '_fetch_current_gas_price', side_effect=mock_get_price_with_error):
             # Start monitoring
             monitor_task = asyncio.create_task(self.monitor.start_monitoring())
             
@@ -0,0 +1,216 @@
+"""
+Tests for GasMonitorPool
+
+The pool tests run many monitors against one local fake JSON-RPC node.
+"""
+
+import asyncio
+import unittest
+from types import SimpleNamespace
+
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from aiohttp import web
+from web3 import AsyncWeb3
+
+from src.gas_optimization.clock import VirtualClock
+from src.gas_optimization.gas_monitor import GasMonitor
+from src.gas_optimization.pool import GasMonitorPool, TimingWheel
+
+
+class FakeMultiChainNode:
+    """Local JSON-RPC node answering eth_gasPrice at /<chain_id>."""
+
+    def __init__(self, latency=0.0):
+        self.latency = latency
+        self.requests = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def __aenter__(self):
+        app = web.Application()
+        app.router.add_post("/{chain_id}", self._handle)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, "127.0.0.1", 0)
+        await site.start()
+        self.url = f"http://127.0.0.1:{self._runner.addresses[0][1]}"
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self._runner.cleanup()
+
+    def web3(self, chain_id):
+        return AsyncWeb3(AsyncWeb3.AsyncHTTPProvider(f"{self.url}/{chain_id}"))
+
+    async def _handle(self, request):
+        call = await request.json()
+        self.requests += 1
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.latency)
+        finally:
+            self.in_flight -= 1
+        gas_price = int(request.match_info["chain_id"]) * 10**9
+        return web.json_response({"jsonrpc": "2.0", "id": call["id"], "result": hex(gas_price)})
+
+
+class TestTimingWheel(unittest.TestCase):
+    """Test suite for TimingWheel."""
+
+    def test_items_fire_on_their_tick(self):
+        """Test that items are returned exactly on their deadline."""
+        wheel = TimingWheel(slots=4)
+        a, b = SimpleNamespace(), SimpleNamespace()
+        wheel.schedule(a, 2)
+        wheel.schedule(b, 9)
+
+        fired = {tick: wheel.advance() for tick in range(1, 11)}
+
+        self.assertEqual(fired[2], [a])
+        self.assertEqual(fired[9], [b])
+        self.assertEqual(sum(len(items) for items in fired.values()), 2)
+        self.assertEqual(len(wheel), 0)
+
+    def test_past_deadline_moves_to_next_tick(self):
+        """Test that an overdue item is not lost for a full rotation."""
+        wheel = TimingWheel(slots=4)
+        wheel.advance()
+        wheel.advance()
+        item = SimpleNamespace()
+
+        self.assertEqual(wheel.schedule(item, 1), 3)
+        self.assertEqual(wheel.advance(), [item])
+
+
+class TestGasMonitorPool(unittest.TestCase):
+    """Test suite for GasMonitorPool."""
+
+    async def test_refreshes_all_chains_on_one_session(self):
+        """Test that every chain refreshes through the shared session."""
+        async with FakeMultiChainNode() as node:
+            async with GasMonitorPool(tick=0.01) as pool:
+                for chain_id in range(1, 21):
+                    pool.add_monitor(chain_id, node.web3(chain_id), update_interval=0.05)
+                await pool.start()
+                await asyncio.sleep(0.3)
+                await pool.stop()
+
+                prices = pool.get_gas_prices()
+                stats = pool.get_stats()
+                http_stats = pool.http_stats.as_dict()
+
+        self.assertEqual(len(pool), 20)
+        self.assertEqual(prices[7], 7 * 10**9)
+        self.assertEqual(pool.get_current_price_gwei(3), 3.0)
+        self.assertTrue(pool.is_gas_price_favorable(3, threshold_gwei=5))
+        self.assertTrue(all(chain["updates"] >= 3 for chain in stats.values()))
+        self.assertEqual(http_stats["requests"], node.requests)
+        self.assertGreater(http_stats["connections_reused"], 0)
+        self.assertLessEqual(http_stats["connections_created"], pool.max_connections_per_host)
+
+    async def test_start_offsets_are_staggered(self):
+        """Test that monitors with the same interval start at different ticks."""
+        pool = GasMonitorPool(tick=0.1)
+        for chain_id in range(10):
+            pool.add_monitor(chain_id, AsyncWeb3(AsyncWeb3.AsyncHTTPProvider("http://127.0.0.1:1")), update_interval=10)
+
+        deadlines = [pool._entries[chain_id].deadline for chain_id in range(10)]
+        self.assertEqual(len(set(deadlines)), 10)
+        self.assertTrue(all(1 <= deadline <= 100 for deadline in deadlines))
+        self.assertIsInstance(pool[0], GasMonitor)
+        await pool.aclose()
+
+    async def test_concurrency_bound_and_skips(self):
+        """Test that slow endpoints are skipped, not queued, and bounded."""
+        async with FakeMultiChainNode(latency=0.1) as node:
+            async with GasMonitorPool(tick=0.01, max_concurrency=3) as pool:
+                for chain_id in range(1, 7):
+                    pool.add_monitor(chain_id, node.web3(chain_id), update_interval=0.02)
+                await pool.start()
+                await asyncio.sleep(0.4)
+                await pool.stop()
+                stats = pool.get_stats()
+
+        self.assertLessEqual(node.max_in_flight, 3)
+        self.assertTrue(all(chain["skipped"] > 0 for chain in stats.values()))
+
+    async def test_duplicate_and_removed_chains(self):
+        """Test key uniqueness and removal."""
+        async with FakeMultiChainNode() as node:
+            async with GasMonitorPool(tick=0.01) as pool:
+                pool.add_monitor(1, node.web3(1), update_interval=0.02)
+                with self.assertRaises(ValueError):
+                    pool.add_monitor(1, node.web3(1))
+                await pool.remove_monitor(1)
+                await pool.start()
+                await asyncio.sleep(0.1)
+                await pool.stop()
+
+        self.assertNotIn(1, pool)
+        self.assertEqual(node.requests, 0)
+
+    async def test_remove_monitor_cancels_running_refresh(self):
+        """Test that removing a chain cancels its refresh in flight."""
+        started = asyncio.Event()
+
+        async def slow_update():
+            started.set()
+            await asyncio.sleep(10)
+
+        async with GasMonitorPool(tick=0.01) as pool:
+            monitor = pool.add_monitor(1, AsyncWeb3(AsyncWeb3.AsyncHTTPProvider("http://127.0.0.1:1")), update_interval=0.02)
+            monitor.update_gas_price = slow_update
+            entry = pool._entries[1]
+            await pool.start()
+            await asyncio.wait_for(started.wait(), timeout=1)
+            task = entry.task
+
+            await pool.remove_monitor(1)
+
+        self.assertTrue(task.cancelled())
+        self.assertFalse(entry.in_flight)
+        self.assertIsNone(monitor._http_session)
+
+    async def test_aclose_detaches_shared_session(self):
+        """Test that monitors do not keep the shared session after the pool closes it."""
+        async with FakeMultiChainNode() as node:
+            pool = GasMonitorPool(tick=0.01)
+            monitor = pool.add_monitor(1, node.web3(1), update_interval=0.02, clock=VirtualClock(5 * 10**9))
+            await pool.start()
+            while not pool.get_stats()[1]["updates"]:
+                await asyncio.sleep(0.01)
+            shared = monitor._http_session
+            await pool.aclose()
+
+            self.assertTrue(shared.closed)
+            self.assertIsNone(monitor._http_session)
+            self.assertEqual(pool.get_stats()[1]["last_update_ns"], 5 * 10**9)
+
+            session = monitor._get_http_session()
+            self.assertFalse(session.closed)
+            await monitor.aclose()
+
+
+def run_async_test(coro):
+    """Helper function to run async tests."""
+    return asyncio.run(coro)
+
+
+# Make async tests runnable with unittest
+for name, method in list(TestGasMonitorPool.__dict__.items()):
+    if name.startswith('test_') and asyncio.iscoroutinefunction(method):
+        # Wrap async test method
+        def make_sync_test(async_method):
+            def sync_test(self):
+                return run_async_test(async_method(self))
+            return sync_test
+
+        setattr(TestGasMonitorPool, name, make_sync_test(method))
+
+
+if __name__ == '__main__':
+    unittest.main()
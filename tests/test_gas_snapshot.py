@@ -0,0 +1,185 @@
+"""
+Tests for batched gas snapshots
+
+These tests run GasMonitor against a local fake JSON-RPC HTTP node.
+"""
+
+import asyncio
+import unittest
+
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from aiohttp import web
+from web3 import AsyncWeb3, Web3
+
+from src.gas_optimization.gas_monitor import GasMonitor
+from src.gas_optimization.snapshot import GasSnapshot
+
+
+LATEST_BLOCK = {
+    "number": "0x10",
+    "baseFeePerGas": hex(7 * 10**9),
+    "timestamp": hex(1700000000),
+    "hash": "0x" + "11" * 32,
+    "parentHash": "0x" + "22" * 32,
+    "gasUsed": "0x1",
+    "gasLimit": "0x2",
+    "transactions": [],
+}
+
+
+class FakeRpcNode:
+    """Local JSON-RPC HTTP node recording every request payload."""
+
+    def __init__(self, support_batches=True, unsupported_methods=()):
+        self.support_batches = support_batches
+        self.unsupported_methods = set(unsupported_methods)
+        self.payloads = []
+        self.results = {
+            "eth_gasPrice": hex(30 * 10**9),
+            "eth_maxPriorityFeePerGas": hex(2 * 10**9),
+            "eth_blockNumber": "0x10",
+            "eth_getBlockByNumber": LATEST_BLOCK,
+        }
+
+    async def __aenter__(self):
+        app = web.Application()
+        app.router.add_post("/", self._handle)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, "127.0.0.1", 0)
+        await site.start()
+        self.url = f"http://127.0.0.1:{self._runner.addresses[0][1]}"
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self._runner.cleanup()
+
+    def _answer(self, call):
+        if call["method"] in self.unsupported_methods:
+            return {
+                "jsonrpc": "2.0", "id": call["id"],
+                "error": {"code": -32601, "message": "method not found"},
+            }
+        return {"jsonrpc": "2.0", "id": call["id"], "result": self.results[call["method"]]}
+
+    async def _handle(self, request):
+        payload = await request.json()
+        self.payloads.append(payload)
+        if isinstance(payload, list):
+            if not self.support_batches:
+                return web.json_response({
+                    "jsonrpc": "2.0", "id": None,
+                    "error": {"code": -32600, "message": "batch requests not supported"},
+                })
+            return web.json_response([self._answer(call) for call in payload])
+        return web.json_response(self._answer(payload))
+
+
+class TestGasSnapshot(unittest.TestCase):
+    """Test suite for GasMonitor.get_gas_snapshot."""
+
+    def assert_full_snapshot(self, snapshot):
+        self.assertIsInstance(snapshot, GasSnapshot)
+        self.assertEqual(snapshot.gas_price, 30 * 10**9)
+        self.assertEqual(snapshot.max_priority_fee, 2 * 10**9)
+        self.assertEqual(snapshot.block_number, 16)
+        self.assertEqual(snapshot.base_fee, 7 * 10**9)
+        self.assertEqual(snapshot.block_timestamp, 1700000000)
+        self.assertEqual(snapshot.base_fee_gwei, 7.0)
+
+    async def test_async_web3_single_round_trip(self):
+        """Test that AsyncWeb3 sends all four calls in one batch."""
+        async with FakeRpcNode() as node:
+            monitor = GasMonitor(AsyncWeb3(AsyncWeb3.AsyncHTTPProvider(node.url)))
+            snapshot = await monitor.get_gas_snapshot()
+            await monitor.web3.provider.disconnect()
+
+        self.assert_full_snapshot(snapshot)
+        self.assertTrue(snapshot.batched)
+        self.assertEqual(len(node.payloads), 1)
+        self.assertEqual(
+            [call["method"] for call in node.payloads[0]],
+            ["eth_gasPrice", "eth_maxPriorityFeePerGas", "eth_blockNumber", "eth_getBlockByNumber"],
+        )
+        self.assertEqual(monitor.latest_block_number, 16)
+
+    async def test_sync_web3_single_round_trip(self):
+        """Test that sync Web3 batches in a worker thread."""
+        async with FakeRpcNode() as node:
+            monitor = GasMonitor(Web3(Web3.HTTPProvider(node.url)))
+            snapshot = await monitor.get_gas_snapshot()
+
+        self.assert_full_snapshot(snapshot)
+        self.assertTrue(snapshot.batched)
+        self.assertEqual(len(node.payloads), 1)
+
+    async def test_falls_back_to_concurrent_calls(self):
+        """Test the concurrent fallback when the node rejects batches."""
+        async with FakeRpcNode(support_batches=False) as node:
+            monitor = GasMonitor(AsyncWeb3(AsyncWeb3.AsyncHTTPProvider(node.url)))
+            snapshot = await monitor.get_gas_snapshot()
+            await monitor.web3.provider.disconnect()
+
+        self.assert_full_snapshot(snapshot)
+        self.assertFalse(snapshot.batched)
+        single_calls = [payload for payload in node.payloads if isinstance(payload, dict)]
+        self.assertEqual(len(single_calls), 4)
+
+    async def test_missing_priority_fee_is_optional(self):
+        """Test that a node without eth_maxPriorityFeePerGas still yields a snapshot."""
+        async with FakeRpcNode(unsupported_methods={"eth_maxPriorityFeePerGas"}) as node:
+            monitor = GasMonitor(AsyncWeb3(AsyncWeb3.AsyncHTTPProvider(node.url)))
+            snapshot = await monitor.get_gas_snapshot()
+            await monitor.web3.provider.disconnect()
+
+        self.assertIsNone(snapshot.max_priority_fee)
+        self.assertEqual(snapshot.gas_price, 30 * 10**9)
+        self.assertEqual(snapshot.base_fee, 7 * 10**9)
+
+    async def test_unbatchable_provider_is_remembered(self):
+        """Test that a provider without batch support is not retried every call."""
+        async with FakeRpcNode() as node:
+            monitor = GasMonitor(Web3(Web3.HTTPProvider(node.url)))
+
+            async def no_batching():
+                raise NotImplementedError("batching not supported")
+
+            monitor._fetch_snapshot_batch = no_batching
+            first = await monitor.get_gas_snapshot()
+            second = await monitor.get_gas_snapshot()
+
+        self.assertFalse(monitor._batch_supported)
+        self.assertFalse(first.batched)
+        self.assertEqual(second.gas_price, 30 * 10**9)
+
+    def test_from_results_without_block(self):
+        """Test snapshot construction when the latest block is unavailable."""
+        snapshot = GasSnapshot.from_results(10**9, None, 5, None, timestamp_ns=1, batched=False)
+
+        self.assertIsNone(snapshot.base_fee)
+        self.assertIsNone(snapshot.max_priority_fee_gwei)
+        self.assertEqual(snapshot.gas_price_gwei, 1.0)
+
+
+def run_async_test(coro):
+    """Helper function to run async tests."""
+    return asyncio.run(coro)
+
+
+# Make async tests runnable with unittest
+for name, method in list(TestGasSnapshot.__dict__.items()):
+    if name.startswith('test_') and asyncio.iscoroutinefunction(method):
+        # Wrap async test method
+        def make_sync_test(async_method):
+            def sync_test(self):
+                return run_async_test(async_method(self))
+            return sync_test
+
+        setattr(TestGasSnapshot, name, make_sync_test(method))
+
+
+if __name__ == '__main__':
+    unittest.main()
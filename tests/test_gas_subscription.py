@@ -0,0 +1,263 @@
+"""
+Tests for new block subscriptions in the Gas Price Monitoring Module
+
+These tests run GasMonitor against a local fake JSON-RPC WebSocket node.
+"""
+
+import asyncio
+import json
+import unittest
+from unittest.mock import Mock, patch
+
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import websockets
+
+from src.gas_optimization.gas_monitor import GasMonitor
+from src.gas_optimization.subscription import EthSubscription, SubscriptionUnavailableError
+
+
+class FakeWebSocketNode:
+    """Local fake node answering eth_subscribe and pushing newHeads notifications."""
+
+    def __init__(self, support_subscriptions=True):
+        self.support_subscriptions = support_subscriptions
+        self.connections = []
+        self.subscribed = asyncio.Event()
+        self._server = None
+
+    async def __aenter__(self):
+        self._server = await websockets.serve(self._handler, "127.0.0.1", 0)
+        port = list(self._server.sockets)[0].getsockname()[1]
+        self.url = f"ws://127.0.0.1:{port}"
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        self._server.close()
+        await self._server.wait_closed()
+
+    async def _handler(self, ws, *args):
+        self.connections.append(ws)
+        async for raw in ws:
+            request = json.loads(raw)
+            if request["method"] != "eth_subscribe":
+                continue
+            if not self.support_subscriptions:
+                await ws.send(json.dumps({
+                    "jsonrpc": "2.0",
+                    "id": request["id"],
+                    "error": {"code": -32601, "message": "notifications not supported"},
+                }))
+                continue
+            await ws.send(json.dumps({"jsonrpc": "2.0", "id": request["id"], "result": "0xabc"}))
+            self.subscribed.set()
+
+    async def push_header(self, block_number, subscription="0xabc"):
+        message = json.dumps({
+            "jsonrpc": "2.0",
+            "method": "eth_subscription",
+            "params": {
+                "subscription": subscription,
+                "result": {"number": hex(block_number), "baseFeePerGas": hex(10**9)},
+            },
+        })
+        for ws in self.connections:
+            await ws.send(message)
+
+    async def drop_connections(self):
+        connections, self.connections = self.connections, []
+        self.subscribed.clear()
+        for ws in connections:
+            await ws.close()
+
+
+async def wait_until(predicate, timeout=2.0):
+    """Poll a predicate on the event loop until it holds or the timeout expires."""
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not predicate():
+        if asyncio.get_running_loop().time() > deadline:
+            raise AssertionError("Condition not met before timeout")
+        await asyncio.sleep(0.01)
+
+
+def retry_delays(logs):
+    """Get the delays announced by subscription retry warnings so far."""
+    return [line.rsplit(" ", 1)[-1] for line in logs.output if "retrying subscription" in line]
+
+
+class TestEthSubscription(unittest.TestCase):
+    """Test suite for the EthSubscription client."""
+
+    async def test_receives_notifications(self):
+        """Test that notifications for our subscription are yielded in order."""
+        async with FakeWebSocketNode() as node:
+            async with EthSubscription(node.url, ["newHeads"]) as subscription:
+                self.assertEqual(subscription.subscription_id, "0xabc")
+
+                await node.push_header(1, subscription="0xother")
+                await node.push_header(2)
+                await node.push_header(3)
+
+                received = []
+                async for header in subscription:
+                    received.append(int(header["number"], 16))
+                    if len(received) == 2:
+                        break
+
+                self.assertEqual(received, [2, 3])
+
+    async def test_rejected_subscription(self):
+        """Test that an eth_subscribe error raises SubscriptionUnavailableError."""
+        async with FakeWebSocketNode(support_subscriptions=False) as node:
+            with self.assertRaises(SubscriptionUnavailableError):
+                await EthSubscription(node.url, ["newHeads"]).subscribe()
+
+    async def test_unreachable_endpoint(self):
+        """Test that an unreachable endpoint raises SubscriptionUnavailableError."""
+        subscription = EthSubscription("ws://127.0.0.1:1", ["newHeads"], connect_timeout=1)
+        with self.assertRaises(SubscriptionUnavailableError):
+            await subscription.subscribe()
+
+
+class TestGasMonitorSubscription(unittest.TestCase):
+    """Test suite for GasMonitor subscription mode."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.mock_web3 = Mock()
+        self.mock_web3.eth = Mock()
+        self.mock_web3.eth.gas_price = 50000000000
+
+    async def _stop(self, monitor, task):
+        await monitor.stop_monitoring()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+
+    async def test_refreshes_once_per_block(self):
+        """Test that each new block header triggers exactly one gas refresh."""
+        async with FakeWebSocketNode() as node:
+            monitor = GasMonitor(self.mock_web3, update_interval=60, ws_url=node.url)
+
+            with patch.object(monitor, '_fetch_current_gas_price') as mock_get_price:
+                mock_get_price.return_value = 45000000000
+                task = asyncio.create_task(monitor.start_monitoring())
+                await asyncio.wait_for(node.subscribed.wait(), timeout=2)
+
+                # Nothing is fetched until a block arrives
+                self.assertEqual(mock_get_price.call_count, 0)
+
+                for block_number in (100, 101, 102):
+                    await node.push_header(block_number)
+                await wait_until(lambda: len(monitor.gas_history) == 3)
+
+                self.assertEqual(mock_get_price.call_count, 3)
+                self.assertEqual(monitor.latest_block_number, 102)
+                await self._stop(monitor, task)
+
+            self.assertFalse(monitor.is_monitoring)
+
+    async def test_falls_back_to_polling_when_unsupported(self):
+        """Test that a rejected subscription falls back to the polling loop."""
+        async with FakeWebSocketNode(support_subscriptions=False) as node:
+            monitor = GasMonitor(self.mock_web3, update_interval=0.05, ws_url=node.url)
+
+            with patch.object(monitor, '_fetch_current_gas_price') as mock_get_price:
+                mock_get_price.return_value = 45000000000
+                task = asyncio.create_task(monitor.start_monitoring())
+                await wait_until(lambda: len(monitor.gas_history) >= 2)
+                await self._stop(monitor, task)
+
+            self.assertIsNone(monitor.latest_block_number)
+
+    async def test_falls_back_to_polling_when_connection_lost(self):
+        """Test that a dropped subscription connection falls back to polling."""
+        async with FakeWebSocketNode() as node:
+            monitor = GasMonitor(self.mock_web3, update_interval=0.05, ws_url=node.url)
+
+            with patch.object(monitor, '_fetch_current_gas_price') as mock_get_price:
+                mock_get_price.return_value = 45000000000
+                task = asyncio.create_task(monitor.start_monitoring())
+                await asyncio.wait_for(node.subscribed.wait(), timeout=2)
+
+                await node.push_header(7)
+                await wait_until(lambda: len(monitor.gas_history) == 1)
+                await node.drop_connections()
+
+                await wait_until(lambda: len(monitor.gas_history) >= 3)
+                await self._stop(monitor, task)
+
+            self.assertEqual(monitor.latest_block_number, 7)
+
+    async def test_resubscribes_after_connection_lost(self):
+        """Test that polling stops once a lost subscription is restored."""
+        async with FakeWebSocketNode() as node:
+            monitor = GasMonitor(self.mock_web3, update_interval=0.05, ws_url=node.url)
+            monitor.SUBSCRIPTION_RETRY_DELAY = 0.2
+
+            with patch.object(monitor, '_fetch_current_gas_price') as mock_get_price:
+                mock_get_price.return_value = 45000000000
+                task = asyncio.create_task(monitor.start_monitoring())
+                await asyncio.wait_for(node.subscribed.wait(), timeout=2)
+                await node.drop_connections()
+
+                await wait_until(lambda: len(monitor.gas_history) >= 2)
+                await asyncio.wait_for(node.subscribed.wait(), timeout=2)
+                await asyncio.sleep(0.05)
+
+                # Polling has stopped; only block headers refresh the price
+                polled = len(monitor.gas_history)
+                await asyncio.sleep(0.2)
+                self.assertEqual(len(monitor.gas_history), polled)
+
+                await node.push_header(8)
+                await wait_until(lambda: len(monitor.gas_history) == polled + 1)
+                self.assertEqual(monitor.latest_block_number, 8)
+                self.assertFalse(monitor.scheduler.is_running)
+                await self._stop(monitor, task)
+
+    async def test_subscription_retry_backs_off(self):
+        """Test that subscription retries back off exponentially up to a cap."""
+        async with FakeWebSocketNode(support_subscriptions=False) as node:
+            monitor = GasMonitor(self.mock_web3, update_interval=60, ws_url=node.url)
+            monitor.SUBSCRIPTION_RETRY_DELAY = 0.01
+            monitor.SUBSCRIPTION_RETRY_MAX_DELAY = 0.04
+
+            with patch.object(monitor, '_fetch_current_gas_price') as mock_get_price:
+                mock_get_price.return_value = 45000000000
+                with self.assertLogs("src.gas_optimization.gas_monitor", "WARNING") as logs:
+                    task = asyncio.create_task(monitor.start_monitoring())
+                    await wait_until(lambda: len(retry_delays(logs)) >= 5)
+                    await self._stop(monitor, task)
+
+            self.assertEqual(retry_delays(logs)[:5], ["0.01s", "0.02s", "0.04s", "0.04s", "0.04s"])
+            # Polling started once and kept running across the retries
+            self.assertEqual(len(monitor.gas_history), 1)
+
+
+def run_async_test(coro):
+    """Helper function to run async tests."""
+    return asyncio.run(coro)
+
+
+# Make async tests runnable with unittest
+for test_case in (TestEthSubscription, TestGasMonitorSubscription):
+    for name, method in list(test_case.__dict__.items()):
+        if name.startswith('test_') and asyncio.iscoroutinefunction(method):
+            # Wrap async test method
+            def make_sync_test(async_method):
+                def sync_test(self):
+                    return run_async_test(async_method(self))
+                return sync_test
+
+            setattr(test_case, name, make_sync_test(method))
+
+# Do not leave a TestCase bound at module level for pytest to collect again
+del test_case
+
+
+if __name__ == '__main__':
+    unittest.main()
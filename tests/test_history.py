@@ -0,0 +1,120 @@
+"""
+Tests for the columnar gas history
+"""
+
+import unittest
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.gas_optimization.history import GasHistory, datetime_to_ns, ns_to_datetime
+
+
+class TestTimestampConversion(unittest.TestCase):
+    """Test suite for datetime/nanosecond conversion."""
+
+    def test_naive_round_trip(self):
+        """Test that naive local datetimes survive a round trip exactly."""
+        timestamp = datetime.now()
+        self.assertEqual(ns_to_datetime(datetime_to_ns(timestamp)), timestamp)
+
+    def test_aware_datetime(self):
+        """Test that aware datetimes convert relative to UTC."""
+        timestamp = datetime(2024, 1, 1, 0, 0, 1, 500, tzinfo=timezone.utc)
+        self.assertEqual(datetime_to_ns(timestamp), 1704067201000500000)
+
+
+class TestGasHistory(unittest.TestCase):
+    """Test suite for the columnar GasHistory."""
+
+    def setUp(self):
+        """Set up a history that has wrapped around several times."""
+        self.history = GasHistory(maxlen=8)
+        self.base_ns = 1_700_000_000 * 10**9
+        for i in range(21):
+            self.history.append_ns(self.base_ns + i * 10**9, (30 + i) * 10**9)
+
+    def test_length_and_latest(self):
+        """Test eviction and the latest reading after wrap-around."""
+        self.assertEqual(len(self.history), 8)
+        self.assertEqual(self.history.last_price_wei(), 50 * 10**9)
+        self.assertEqual(self.history[-1][1], 50 * 10**9)
+        self.assertEqual(self.history[0][1], 43 * 10**9)
+
+    def test_window_views_are_contiguous_and_zero_copy(self):
+        """Test that windows are read-only views in chronological order."""
+        prices = self.history.prices_wei(5)
+
+        np.testing.assert_array_equal(prices, np.arange(46, 51, dtype=np.uint64) * 10**9)
+        self.assertTrue(np.shares_memory(prices, self.history._prices_wei))
+        self.assertFalse(prices.flags.writeable)
+        np.testing.assert_array_equal(
+            self.history.prices_gwei(), np.arange(43, 51, dtype=np.float64)
+        )
+
+    def test_every_window_after_every_append(self):
+        """Test that all window sizes stay correct at every ring position."""
+        history = GasHistory(maxlen=5)
+        for i in range(17):
+            history.append_ns(i, i)
+            covered = list(range(max(0, i - 4), i + 1))
+            for window in range(1, len(covered) + 1):
+                self.assertEqual(history.prices_wei(window).tolist(), covered[-window:])
+
+    def test_time_slice(self):
+        """Test binary-searched time range selection."""
+        selected = self.history.time_slice(self.base_ns + 15 * 10**9, self.base_ns + 18 * 10**9)
+        self.assertEqual(
+            self.history.prices_gwei()[selected].tolist(), [45.0, 46.0, 47.0]
+        )
+
+    def test_aggregate(self):
+        """Test vectorized aggregation over windows and time ranges."""
+        result = self.history.aggregate(window=4)
+        self.assertEqual(result["count"], 4)
+        self.assertEqual(result["mean"], 48.5)
+        self.assertEqual(result["min"], 47.0)
+
+        ranged = self.history.aggregate(start_ns=self.base_ns + 19 * 10**9)
+        self.assertEqual(ranged["count"], 2)
+        self.assertEqual(ranged["max"], 50.0)
+
+        self.assertIsNone(self.history.aggregate(start_ns=self.base_ns + 100 * 10**9))
+
+    def test_tuple_compatibility(self):
+        """Test iteration, slicing and to_list returning (datetime, int) tuples."""
+        history = GasHistory(maxlen=3)
+        readings = [(datetime.now() + timedelta(seconds=i), (40 + i) * 10**9) for i in range(4)]
+        history.extend(readings)
+
+        self.assertEqual(history.to_list(), readings[1:])
+        self.assertEqual(list(history), readings[1:])
+        self.assertEqual(history[-2:], readings[2:])
+        with self.assertRaises(IndexError):
+            history[3]
+
+    def test_clear(self):
+        """Test that clearing empties the columns and the statistics."""
+        self.history.clear()
+
+        self.assertEqual(len(self.history), 0)
+        self.assertIsNone(self.history.last_price_wei())
+        self.assertEqual(len(self.history.prices_wei()), 0)
+        self.assertIsNone(self.history.stats.window_mean())
+
+    def test_stats_follow_columns(self):
+        """Test that the attached statistics match the stored column."""
+        self.assertEqual(self.history.stats.window_sum(), int(self.history.prices_wei().sum()))
+
+    def test_invalid_maxlen(self):
+        """Test that a non-positive maxlen is rejected."""
+        with self.assertRaises(ValueError):
+            GasHistory(maxlen=0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,177 @@
+"""
+Tests for the pooled HTTP session used by the gas oracle fallback
+"""
+
+import asyncio
+import unittest
+from unittest.mock import Mock
+
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import aiohttp
+from aiohttp import web
+
+from src.gas_optimization.gas_monitor import GasMonitor
+from src.gas_optimization.http_pool import HttpConnectionStats, create_http_session
+
+
+class FakeEtherscan:
+    """Local stand-in for the Etherscan gas oracle endpoint."""
+
+    def __init__(self):
+        self.request_count = 0
+
+    async def __aenter__(self):
+        app = web.Application()
+        app.router.add_get("/api", self._handle)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, "127.0.0.1", 0)
+        await site.start()
+        port = self._runner.addresses[0][1]
+        self.url = f"http://127.0.0.1:{port}/api?module=gastracker&action=gasoracle"
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self._runner.cleanup()
+
+    async def _handle(self, request):
+        self.request_count += 1
+        return web.json_response({
+            "status": "1",
+            "message": "OK",
+            "result": {"SafeGasPrice": "30", "ProposeGasPrice": "35", "FastGasPrice": "40"},
+        })
+
+
+class TestHttpConnectionStats(unittest.TestCase):
+    """Test suite for HttpConnectionStats."""
+
+    def test_reuse_ratio_without_connections(self):
+        """Test that the reuse ratio is zero before any connection."""
+        self.assertEqual(HttpConnectionStats().reuse_ratio, 0.0)
+
+    def test_as_dict(self):
+        """Test the dictionary view of the counters."""
+        stats = HttpConnectionStats()
+        stats.requests = 4
+        stats.connections_created = 1
+        stats.connections_reused = 3
+
+        result = stats.as_dict()
+
+        self.assertEqual(result["requests"], 4)
+        self.assertEqual(result["reuse_ratio"], 0.75)
+
+    async def test_create_http_session_limits(self):
+        """Test that the created session carries the configured limits."""
+        session = create_http_session(max_connections=7, max_connections_per_host=3)
+        try:
+            self.assertEqual(session.connector.limit, 7)
+            self.assertEqual(session.connector.limit_per_host, 3)
+        finally:
+            await session.close()
+
+
+class TestGasMonitorHttpPool(unittest.TestCase):
+    """Test suite for GasMonitor's pooled oracle session."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.mock_web3 = Mock()
+        self.mock_web3.eth = Mock()
+
+    async def test_connections_are_reused(self):
+        """Test that repeated oracle calls reuse a single pooled connection."""
+        async with FakeEtherscan() as etherscan:
+            async with GasMonitor(self.mock_web3) as monitor:
+                monitor.ETHERSCAN_GAS_ORACLE_URL = etherscan.url
+
+                for _ in range(5):
+                    self.assertEqual(await monitor._fetch_gas_from_api(), 35000000000)
+
+                stats = monitor.get_http_stats()
+                self.assertEqual(stats["requests"], 5)
+                self.assertEqual(stats["connections_created"], 1)
+                self.assertEqual(stats["connections_reused"], 4)
+
+            self.assertIsNone(monitor._http_session)
+
+    async def test_connection_limit_under_concurrency(self):
+        """Test that concurrent calls never open more connections than the limit."""
+        async with FakeEtherscan() as etherscan:
+            async with GasMonitor(self.mock_web3, max_http_connections=2) as monitor:
+                monitor.ETHERSCAN_GAS_ORACLE_URL = etherscan.url
+
+                results = await asyncio.gather(
+                    *(monitor._fetch_gas_from_api() for _ in range(20))
+                )
+
+                self.assertEqual(results, [35000000000] * 20)
+                self.assertEqual(etherscan.request_count, 20)
+                self.assertLessEqual(monitor.http_stats.connections_created, 2)
+
+    async def test_aclose_recreates_session_on_next_use(self):
+        """Test that a closed monitor transparently opens a new session."""
+        async with FakeEtherscan() as etherscan:
+            monitor = GasMonitor(self.mock_web3)
+            monitor.ETHERSCAN_GAS_ORACLE_URL = etherscan.url
+
+            await monitor._fetch_gas_from_api()
+            await monitor.aclose()
+            await monitor._fetch_gas_from_api()
+            await monitor.aclose()
+
+            self.assertEqual(monitor.http_stats.connections_created, 2)
+
+    async def test_shared_session_is_not_closed(self):
+        """Test that aclose leaves a caller-provided session open."""
+        async with aiohttp.ClientSession() as session:
+            monitor = GasMonitor(self.mock_web3, http_session=session)
+            await monitor.aclose()
+
+            self.assertFalse(session.closed)
+            self.assertIs(monitor._get_http_session(), session)
+
+    async def test_set_http_session(self):
+        """Test that replacing the session closes only one the monitor created."""
+        async with aiohttp.ClientSession() as shared, aiohttp.ClientSession() as other:
+            monitor = GasMonitor(self.mock_web3)
+            pooled = monitor._get_http_session()
+
+            await monitor.set_http_session(shared)
+            self.assertTrue(pooled.closed)
+            self.assertIs(monitor._get_http_session(), shared)
+
+            await monitor.set_http_session(other)
+            self.assertFalse(shared.closed)
+
+            await monitor.aclose()
+            self.assertFalse(other.closed)
+
+
+def run_async_test(coro):
+    """Helper function to run async tests."""
+    return asyncio.run(coro)
+
+
+# Make async tests runnable with unittest
+for test_case in (TestHttpConnectionStats, TestGasMonitorHttpPool):
+    for name, method in list(test_case.__dict__.items()):
+        if name.startswith('test_') and asyncio.iscoroutinefunction(method):
+            # Wrap async test method
+            def make_sync_test(async_method):
+                def sync_test(self):
+                    return run_async_test(async_method(self))
+                return sync_test
+
+            setattr(test_case, name, make_sync_test(method))
+
+# Do not leave a TestCase bound at module level for pytest to collect again
+del test_case
+
+
+if __name__ == '__main__':
+    unittest.main()
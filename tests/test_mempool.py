@@ -0,0 +1,342 @@
+"""
+Tests for the Mempool Fee Module
+
+The consumers run against a local fake WebSocket node streaming pending
+transactions and a local fake JSON-RPC node answering txpool_content.
+"""
+
+import asyncio
+import json
+import unittest
+from unittest.mock import Mock
+
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import websockets
+from aiohttp import web
+
+from src.gas_optimization.clock import VirtualClock
+from src.gas_optimization.gas_monitor import GasMonitor
+from src.gas_optimization.mempool import MempoolMonitor, transaction_fees
+
+
+GWEI = 10**9
+
+
+def dynamic_fee_tx(max_fee_gwei, tip_gwei):
+    return {"maxFeePerGas": hex(max_fee_gwei * GWEI), "maxPriorityFeePerGas": hex(tip_gwei * GWEI)}
+
+
+def legacy_tx(gas_price_gwei):
+    return {"gasPrice": hex(gas_price_gwei * GWEI)}
+
+
+class FakePendingNode:
+    """Local fake node pushing full pending transactions over eth_subscribe."""
+
+    def __init__(self, support_subscriptions=True):
+        self.support_subscriptions = support_subscriptions
+        self.connections = []
+        self.params = None
+        self._server = None
+
+    async def __aenter__(self):
+        self._server = await websockets.serve(self._handler, "127.0.0.1", 0)
+        port = list(self._server.sockets)[0].getsockname()[1]
+        self.url = f"ws://127.0.0.1:{port}"
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        self._server.close()
+        await self._server.wait_closed()
+
+    async def _handler(self, ws, *args):
+        async for raw in ws:
+            request = json.loads(raw)
+            if request["method"] != "eth_subscribe":
+                continue
+            self.params = request["params"]
+            if not self.support_subscriptions:
+                await ws.send(json.dumps({
+                    "jsonrpc": "2.0",
+                    "id": request["id"],
+                    "error": {"code": -32601, "message": "notifications not supported"},
+                }))
+                continue
+            await ws.send(json.dumps({"jsonrpc": "2.0", "id": request["id"], "result": "0xabc"}))
+            self.connections.append(ws)
+
+    async def push(self, result):
+        message = json.dumps({
+            "jsonrpc": "2.0",
+            "method": "eth_subscription",
+            "params": {"subscription": "0xabc", "result": result},
+        })
+        for ws in self.connections:
+            await ws.send(message)
+
+    async def drop_connections(self):
+        connections, self.connections = self.connections, []
+        for ws in connections:
+            await ws.close()
+
+
+class FakeTxPoolNode:
+    """Local JSON-RPC node answering txpool_content with a configurable pool."""
+
+    def __init__(self, pending):
+        self.pending = pending
+        self.requests = 0
+
+    async def __aenter__(self):
+        app = web.Application()
+        app.router.add_post("/", self._handle)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, "127.0.0.1", 0)
+        await site.start()
+        self.url = f"http://127.0.0.1:{self._runner.addresses[0][1]}/"
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self._runner.cleanup()
+
+    async def _handle(self, request):
+        call = await request.json()
+        self.requests += 1
+        if call["method"] != "txpool_content":
+            return web.json_response({
+                "jsonrpc": "2.0", "id": call["id"], "error": {"code": -32601, "message": "no"},
+            })
+        result = {"pending": self.pending, "queued": {}}
+        return web.json_response({"jsonrpc": "2.0", "id": call["id"], "result": result})
+
+
+async def wait_until(predicate, timeout=2.0):
+    """Poll a predicate on the event loop until it holds or the timeout expires."""
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not predicate():
+        if asyncio.get_running_loop().time() > deadline:
+            raise AssertionError("Condition not met before timeout")
+        await asyncio.sleep(0.01)
+
+
+class TestTransactionFees(unittest.TestCase):
+    """Test suite for transaction_fees."""
+
+    def test_dynamic_fee_with_base_fee(self):
+        """Test that the effective price is capped by maxFeePerGas."""
+        self.assertEqual(transaction_fees(dynamic_fee_tx(50, 2), 30 * GWEI), (32 * GWEI, 2 * GWEI))
+        self.assertEqual(transaction_fees(dynamic_fee_tx(31, 2), 30 * GWEI), (31 * GWEI, 1 * GWEI))
+
+    def test_dynamic_fee_without_base_fee(self):
+        """Test that maxFeePerGas is used when the base fee is unknown."""
+        self.assertEqual(transaction_fees(dynamic_fee_tx(50, 2)), (50 * GWEI, 2 * GWEI))
+
+    def test_legacy(self):
+        """Test that legacy transactions tip everything above the base fee."""
+        self.assertEqual(transaction_fees(legacy_tx(40), 30 * GWEI), (40 * GWEI, 10 * GWEI))
+        self.assertEqual(transaction_fees(legacy_tx(20), 30 * GWEI), (20 * GWEI, 0))
+        self.assertEqual(transaction_fees({"gasPrice": 5}), (5, 5))
+
+    def test_missing_or_malformed_fees(self):
+        """Test that transactions without usable fee fields are rejected."""
+        self.assertIsNone(transaction_fees({"hash": "0x1"}))
+        self.assertIsNone(transaction_fees({"gasPrice": "0xzz"}))
+
+
+class TestMempoolMonitor(unittest.TestCase):
+    """Test suite for MempoolMonitor."""
+
+    def setUp(self):
+        self.clock = VirtualClock()
+
+    def test_requires_an_endpoint(self):
+        """Test that a monitor needs a WebSocket or HTTP URL."""
+        with self.assertRaises(ValueError):
+            MempoolMonitor()
+
+    def test_ingest_and_percentiles(self):
+        """Test that percentiles reflect the ingested transactions."""
+        mempool = MempoolMonitor(http_url="http://node", clock=self.clock)
+        mempool.base_fee = 10 * GWEI
+        for gwei in range(11, 111):
+            mempool.ingest_transaction(legacy_tx(gwei))
+        mempool.ingest_transaction("0xhash")
+
+        self.assertEqual(mempool.gas_price_percentile(50), 60 * GWEI)
+        self.assertEqual(mempool.priority_fee_percentile(90), 90 * GWEI)
+        self.assertAlmostEqual(mempool.gas_price_rank(35 * GWEI), 0.25)
+
+        stats = mempool.get_stats()
+        self.assertEqual(stats["transactions"], 100)
+        self.assertEqual(stats["skipped"], 1)
+        self.assertEqual(stats["window_transactions"], 100)
+        self.assertEqual(stats["gas_price_p50"], 60 * GWEI)
+
+    def test_batch_ingest_matches_single(self):
+        """Test that batched ingestion records the same fees."""
+        mempool = MempoolMonitor(http_url="http://node", clock=self.clock)
+        recorded = mempool.ingest_transactions(
+            [dynamic_fee_tx(gwei, 1) for gwei in range(1, 101)] + [{"hash": "0x1"}]
+        )
+
+        self.assertEqual(recorded, 100)
+        self.assertEqual(mempool.skipped, 1)
+        self.assertEqual(mempool.gas_price_percentile(50), 50 * GWEI)
+        self.assertEqual(mempool.priority_fee_percentile(50), GWEI)
+
+    def test_window_expires(self):
+        """Test that old transactions leave the window."""
+        mempool = MempoolMonitor(http_url="http://node", window=10.0, clock=self.clock)
+        mempool.ingest_transaction(legacy_tx(100))
+        self.clock.advance(20)
+
+        self.assertIsNone(mempool.gas_price_percentile(50))
+        self.assertEqual(mempool.transactions, 1)
+
+    async def test_subscription_stream(self):
+        """Test that full pending transactions are streamed into the sketches."""
+        async with FakePendingNode() as node:
+            mempool = MempoolMonitor(ws_url=node.url)
+            task = asyncio.create_task(mempool.run())
+            await wait_until(lambda: node.connections)
+
+            self.assertEqual(node.params, ["newPendingTransactions", True])
+            for gwei in (10, 20, 30):
+                await node.push(legacy_tx(gwei))
+            await node.push("0xhashonly")
+            await wait_until(lambda: mempool.transactions + mempool.skipped == 4)
+
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+            await mempool.aclose()
+
+        self.assertEqual(mempool.gas_price_percentile(50), 20 * GWEI)
+        self.assertEqual(mempool.skipped, 1)
+        self.assertFalse(mempool.is_running)
+
+    async def test_txpool_polling_replaces_window(self):
+        """Test that each txpool_content poll replaces the previous pending set."""
+        pending = {
+            "0xaaa": {"0": legacy_tx(10), "1": legacy_tx(20)},
+            "0xbbb": {"5": dynamic_fee_tx(40, 3)},
+        }
+        async with FakeTxPoolNode(pending) as node:
+            mempool = MempoolMonitor(http_url=node.url)
+            try:
+                self.assertEqual(await mempool.poll_txpool(), 3)
+                self.assertEqual(mempool.gas_prices.count, 3)
+                self.assertEqual(mempool.gas_price_percentile(100), 40 * GWEI)
+
+                node.pending = {"0xccc": {"0": legacy_tx(5)}}
+                self.assertEqual(await mempool.poll_txpool(), 1)
+                self.assertEqual(mempool.gas_prices.count, 1)
+                self.assertEqual(mempool.gas_price_percentile(50), 5 * GWEI)
+                self.assertEqual(mempool.transactions, 4)
+            finally:
+                await mempool.aclose()
+
+    async def test_falls_back_to_polling(self):
+        """Test that an unavailable subscription falls back to txpool_content."""
+        async with FakePendingNode(support_subscriptions=False) as ws_node, \
+                FakeTxPoolNode({"0xaaa": {"0": legacy_tx(7)}}) as http_node:
+            mempool = MempoolMonitor(ws_url=ws_node.url, http_url=http_node.url, poll_interval=0.01)
+            mempool.SUBSCRIPTION_RETRY_DELAY = 0.05
+            task = asyncio.create_task(mempool.run())
+            await wait_until(lambda: http_node.requests >= 2)
+
+            mempool.stop()
+            await asyncio.wait_for(task, timeout=2)
+            await mempool.aclose()
+
+        self.assertEqual(mempool.gas_price_percentile(50), 7 * GWEI)
+
+    async def test_resubscribes_after_connection_lost(self):
+        """Test that a dropped stream is restored without an HTTP fallback."""
+        async with FakePendingNode() as node:
+            mempool = MempoolMonitor(ws_url=node.url)
+            mempool.SUBSCRIPTION_RETRY_DELAY = 0.05
+            task = asyncio.create_task(mempool.run())
+            await wait_until(lambda: node.connections)
+            await node.drop_connections()
+
+            await wait_until(lambda: node.connections)
+            await node.push(legacy_tx(12))
+            await wait_until(lambda: mempool.transactions == 1)
+            self.assertFalse(task.done())
+
+            mempool.stop()
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+            await mempool.aclose()
+
+        self.assertEqual(mempool.gas_price_percentile(50), 12 * GWEI)
+
+
+class TestGasMonitorMempool(unittest.TestCase):
+    """Test suite for GasMonitor mempool percentiles."""
+
+    def setUp(self):
+        self.mock_web3 = Mock()
+        self.mock_web3.eth.gas_price = 30 * GWEI
+
+    def test_disabled_by_default(self):
+        """Test that percentiles are None without a mempool endpoint."""
+        monitor = GasMonitor(self.mock_web3)
+        self.assertIsNone(monitor.mempool)
+        self.assertIsNone(monitor.get_pending_gas_price_percentile(50))
+        self.assertIsNone(monitor.get_pending_priority_fee_percentile(50))
+
+    def test_endpoint_scheme_selects_transport(self):
+        """Test that ws URLs subscribe and http URLs poll txpool_content."""
+        ws_monitor = GasMonitor(self.mock_web3, mempool_url="ws://127.0.0.1:8546")
+        http_monitor = GasMonitor(self.mock_web3, mempool_url="http://127.0.0.1:8545")
+
+        self.assertEqual(ws_monitor.mempool.ws_url, "ws://127.0.0.1:8546")
+        self.assertIsNone(ws_monitor.mempool.http_url)
+        self.assertEqual(http_monitor.mempool.http_url, "http://127.0.0.1:8545")
+        self.assertIsNone(http_monitor.mempool.ws_url)
+
+    async def test_mempool_runs_with_monitoring(self):
+        """Test that the mempool task runs while monitoring and stops with it."""
+        async with FakeTxPoolNode({"0xaaa": {"0": legacy_tx(45), "1": legacy_tx(55)}}) as node:
+            monitor = GasMonitor(self.mock_web3, update_interval=60, mempool_url=node.url)
+            task = asyncio.create_task(monitor.start_monitoring())
+            await wait_until(lambda: monitor.mempool.gas_prices.count == 2)
+
+            self.assertEqual(monitor.get_pending_gas_price_percentile(100), 55 * GWEI)
+            self.assertEqual(monitor.get_pending_priority_fee_percentile(0), 45 * GWEI)
+
+            await monitor.stop_monitoring()
+            await asyncio.gather(task, return_exceptions=True)
+            self.assertIsNone(monitor._mempool_task)
+            self.assertFalse(monitor.mempool.is_running)
+            await monitor.aclose()
+
+
+def run_async_test(coro):
+    """Helper function to run async tests."""
+    return asyncio.run(coro)
+
+
+# Make async tests runnable with unittest
+for test_case in (TestMempoolMonitor, TestGasMonitorMempool):
+    for name, method in list(test_case.__dict__.items()):
+        if name.startswith('test_') and asyncio.iscoroutinefunction(method):
+            # Wrap async test method
+            def make_sync_test(async_method):
+                def sync_test(self):
+                    return run_async_test(async_method(self))
+                return sync_test
+
+            setattr(test_case, name, make_sync_test(method))
+
+# Do not leave a TestCase bound at module level for pytest to collect again
+del test_case
+
+
+if __name__ == '__main__':
+    unittest.main()
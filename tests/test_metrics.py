@@ -0,0 +1,224 @@
+"""
+Tests for the metrics instruments
+"""
+
+import asyncio
+import unittest
+from unittest.mock import AsyncMock, Mock
+
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import aiohttp
+
+from src.gas_optimization.gas_monitor import GasMonitor
+from src.gas_optimization.metrics import (
+    OPENMETRICS_CONTENT_TYPE,
+    Histogram,
+    MetricsRegistry,
+    MetricsServer,
+)
+
+
+class TestHistogram(unittest.TestCase):
+    """Test suite for Histogram."""
+
+    def test_empty(self):
+        """Test summaries without observations."""
+        histogram = Histogram("empty")
+        self.assertIsNone(histogram.mean)
+        self.assertIsNone(histogram.percentile(50))
+        self.assertEqual(histogram.as_dict()["count"], 0)
+
+    def test_buckets_are_cumulative(self):
+        """Test that values are counted at or below each bound."""
+        histogram = Histogram("latency", bounds=(1, 2, 5))
+        for value in (0.5, 1, 1.5, 4, 10):
+            histogram.observe(value)
+
+        self.assertEqual(histogram.cumulative_counts(), [2, 3, 4, 5])
+        summary = histogram.as_dict()
+        self.assertEqual(summary["buckets"], {"1.0": 2, "2.0": 3, "5.0": 4, "+Inf": 5})
+        self.assertEqual(summary["sum"], 17)
+        self.assertEqual((summary["min"], summary["max"]), (0.5, 10))
+
+    def test_percentiles_interpolate_within_buckets(self):
+        """Test percentile estimates against uniform data."""
+        histogram = Histogram("uniform", bounds=[i / 10 for i in range(1, 11)])
+        for i in range(1000):
+            histogram.observe(i / 1000)
+
+        self.assertAlmostEqual(histogram.percentile(50), 0.5, delta=0.01)
+        self.assertAlmostEqual(histogram.percentile(90), 0.9, delta=0.01)
+        self.assertLessEqual(histogram.percentile(100), histogram.max)
+        self.assertGreaterEqual(histogram.percentile(0), histogram.min)
+
+    def test_reset(self):
+        """Test that reset discards observations."""
+        histogram = Histogram("reset")
+        histogram.observe(0.1)
+        histogram.reset()
+        self.assertEqual(histogram.count, 0)
+        self.assertEqual(sum(histogram.counts), 0)
+
+    def test_invalid_bounds(self):
+        """Test bound validation."""
+        with self.assertRaises(ValueError):
+            Histogram("none", bounds=())
+        with self.assertRaises(ValueError):
+            Histogram("unsorted", bounds=(1, 1, 2))
+
+
+
+class TestMetricsRegistry(unittest.TestCase):
+    """Test suite for OpenMetrics rendering and snapshots."""
+
+    def setUp(self):
+        self.registry = MetricsRegistry()
+        self.histogram = Histogram("latency", bounds=(0.1, 1))
+        self.histogram.observe(0.05)
+        self.histogram.observe(2)
+        self.requests = 3
+
+        self.registry.counter("requests", "Requests served.", lambda: self.requests)
+        self.registry.gauge("temperature", "Current temperature.", lambda: [
+            ({"room": "a"}, 21.5), ({"room": 'b"\\'}, None),
+        ])
+        self.registry.histogram("latency_seconds", "Request latency.", lambda: self.histogram)
+        self.registry.gauge("unknown", "Never known.", lambda: None)
+
+    def test_render(self):
+        """Test the OpenMetrics text exposition."""
+        text = self.registry.render()
+
+        self.assertIn("# TYPE requests counter\n# HELP requests Requests served.\nrequests_total 3\n", text)
+        self.assertIn('temperature{room="a"} 21.5\n', text)
+        self.assertNotIn('room="b', text)
+        self.assertIn('latency_seconds_bucket{le="0.1"} 1\n', text)
+        self.assertIn('latency_seconds_bucket{le="+Inf"} 2\n', text)
+        self.assertIn("latency_seconds_count 2\nlatency_seconds_sum 2.05\n", text)
+        self.assertIn("# TYPE unknown gauge\n# HELP unknown Never known.\n# EOF", text)
+        self.assertTrue(text.endswith("# EOF\n"))
+
+    def test_values_are_read_at_scrape_time(self):
+        """Test that collectors see the latest counter values."""
+        self.requests = 7
+        self.assertIn("requests_total 7\n", self.registry.render())
+
+    def test_label_escaping(self):
+        """Test that quotes, backslashes and newlines in label values are escaped."""
+        self.registry.counter("errors", "Errors.", lambda: [({"message": 'a"b\\c\nd'}, 1)])
+        self.assertIn('errors_total{message="a\\"b\\\\c\\nd"} 1\n', self.registry.render())
+
+    def test_snapshot(self):
+        """Test the programmatic snapshot."""
+        snapshot = self.registry.snapshot()
+
+        self.assertEqual(snapshot["requests"], 3)
+        self.assertEqual(snapshot["temperature"], [{"labels": {"room": "a"}, "value": 21.5}])
+        self.assertEqual(snapshot["latency_seconds"]["count"], 2)
+        self.assertIsNone(snapshot["unknown"])
+
+    def test_invalid_registrations(self):
+        """Test that duplicate names and unknown types are rejected."""
+        with self.assertRaises(ValueError):
+            self.registry.counter("requests", "Again.", lambda: 0)
+        with self.assertRaises(ValueError):
+            self.registry.register("summary", "summary", "Unsupported.", lambda: 0)
+
+
+class TestMetricsServer(unittest.TestCase):
+    """Test suite for the /metrics endpoint."""
+
+    async def test_serves_openmetrics(self):
+        """Test that a scrape returns the rendered registry."""
+        registry = MetricsRegistry()
+        registry.counter("scrapes", "Scrapes.", lambda: 1)
+        server = MetricsServer(registry, port=0)
+        await server.start()
+        try:
+            async with aiohttp.ClientSession() as session:
+                async with session.get(server.url) as response:
+                    body = await response.text()
+                    self.assertEqual(response.status, 200)
+                    self.assertEqual(response.headers["Content-Type"], OPENMETRICS_CONTENT_TYPE)
+            self.assertIn("scrapes_total 1\n", body)
+        finally:
+            await server.stop()
+
+
+class TestGasMonitorMetrics(unittest.TestCase):
+    """Test suite for GasMonitor instrumentation."""
+
+    def setUp(self):
+        self.mock_web3 = Mock()
+        self.mock_web3.eth.gas_price = 30 * 10**9
+
+    async def test_fetches_are_recorded(self):
+        """Test that fetch outcomes, skipped updates and history size are exported."""
+        monitor = GasMonitor(self.mock_web3, circuit_breaker_threshold=None)
+        await monitor.update_gas_price()
+        monitor._fetch_gas_from_web3 = AsyncMock(side_effect=ConnectionError("down"))
+        monitor._fetch_gas_from_api = AsyncMock(return_value=None)
+        await monitor.update_gas_price()
+
+        snapshot = monitor.get_metrics_snapshot()
+        outcomes = {
+            (entry["labels"]["source"], entry["labels"]["outcome"]): entry["value"]
+            for entry in snapshot["gas_source_fetches"]
+        }
+        durations = {entry["labels"]["source"]: entry["value"] for entry in snapshot["gas_source_fetch_duration_seconds"]}
+
+        self.assertEqual(outcomes[("web3", "success")], 1)
+        self.assertEqual(outcomes[("web3", "failure")], 1)
+        self.assertEqual(durations["web3"]["count"], 2)
+        self.assertEqual(snapshot["gas_default_fallbacks"], 0)
+        self.assertEqual(snapshot["gas_skipped_updates"], 1)
+        self.assertEqual(snapshot["gas_history_size"], 1)
+        self.assertEqual(snapshot["gas_price_wei"], 30 * 10**9)
+        self.assertEqual(snapshot["gas_scheduler_lag_seconds"]["count"], 0)
+        await monitor.aclose()
+
+    async def test_metrics_endpoint(self):
+        """Test that the monitor serves its metrics over HTTP until closed."""
+        monitor = GasMonitor(self.mock_web3)
+        await monitor.update_gas_price()
+        url = await monitor.start_metrics_server(port=0)
+        with self.assertRaises(RuntimeError):
+            await monitor.start_metrics_server(port=0)
+
+        async with aiohttp.ClientSession() as session:
+            async with session.get(url) as response:
+                body = await response.text()
+
+        self.assertIn('gas_source_wins_total{source="web3"} 1\n', body)
+        self.assertIn("gas_price_wei 30000000000\n", body)
+
+        await monitor.aclose()
+        self.assertIsNone(monitor.metrics_server)
+
+
+def run_async_test(coro):
+    """Helper function to run async tests."""
+    return asyncio.run(coro)
+
+
+# Make async tests runnable with unittest
+for test_case in (TestMetricsServer, TestGasMonitorMetrics):
+    for name, method in list(test_case.__dict__.items()):
+        if name.startswith('test_') and asyncio.iscoroutinefunction(method):
+            # Wrap async test method
+            def make_sync_test(async_method):
+                def sync_test(self):
+                    return run_async_test(async_method(self))
+                return sync_test
+
+            setattr(test_case, name, make_sync_test(method))
+
+# Do not leave a TestCase bound at module level for pytest to collect again
+del test_case
+
+
+if __name__ == '__main__':
+    unittest.main()
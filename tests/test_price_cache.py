@@ -0,0 +1,185 @@
+"""
+Tests for single-flight coalescing and caching of gas price fetches
+"""
+
+import asyncio
+import unittest
+from unittest.mock import Mock, patch
+
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.gas_optimization.clock import VirtualClock
+from src.gas_optimization.gas_monitor import GasMonitor
+from src.gas_optimization.price_cache import SingleFlightCache
+
+
+GWEI = 10**9
+
+
+def counting_fetch(price, delay=0.01):
+    """Build a fetch function that counts its calls."""
+    state = {"calls": 0}
+
+    async def fetch():
+        state["calls"] += 1
+        await asyncio.sleep(delay)
+        return price
+
+    return fetch, state
+
+
+class TestSingleFlightCache(unittest.TestCase):
+    """Test suite for SingleFlightCache."""
+
+    async def test_concurrent_callers_share_one_fetch(self):
+        """Test that callers arriving during a fetch join it."""
+        cache = SingleFlightCache()
+        fetch, state = counting_fetch(30 * GWEI)
+
+        results = await asyncio.gather(*(cache.get(fetch) for _ in range(100)))
+
+        self.assertEqual(results, [30 * GWEI] * 100)
+        self.assertEqual(state["calls"], 1)
+        self.assertEqual((cache.misses, cache.coalesced, cache.hits), (1, 99, 0))
+
+        # Without a TTL the next call fetches again
+        await cache.get(fetch)
+        self.assertEqual(state["calls"], 2)
+
+    async def test_ttl(self):
+        """Test that cached prices are reused only while fresh."""
+        clock = VirtualClock(0)
+        cache = SingleFlightCache(ttl=5, clock=clock)
+        fetch, state = counting_fetch(30 * GWEI, delay=0)
+
+        await cache.get(fetch)
+        clock.advance(4.9)
+        await cache.get(fetch)
+        self.assertEqual(state["calls"], 1)
+        self.assertEqual(cache.hits, 1)
+
+        clock.advance(0.1)
+        await cache.get(fetch)
+        self.assertEqual(state["calls"], 2)
+
+    async def test_per_block_validity(self):
+        """Test that a price stays valid until the block changes."""
+        cache = SingleFlightCache()
+        fetch, state = counting_fetch(30 * GWEI, delay=0)
+
+        for block in (100, 100, 100, 101, 101):
+            await cache.get(fetch, block=block)
+
+        self.assertEqual(state["calls"], 2)
+        self.assertEqual(cache.as_dict()["saved_ratio"], 0.6)
+
+    async def test_failures_are_not_cached(self):
+        """Test that a None result is returned but not stored."""
+        cache = SingleFlightCache(ttl=60)
+        fetch, state = counting_fetch(None, delay=0)
+
+        self.assertIsNone(await cache.get(fetch))
+        self.assertIsNone(await cache.get(fetch))
+        self.assertEqual(state["calls"], 2)
+
+    async def test_cancelled_caller_does_not_cancel_shared_fetch(self):
+        """Test that the fetch survives one of its callers being cancelled."""
+        cache = SingleFlightCache()
+        fetch, state = counting_fetch(30 * GWEI, delay=0.05)
+
+        first = asyncio.create_task(cache.get(fetch))
+        second = asyncio.create_task(cache.get(fetch))
+        await asyncio.sleep(0.01)
+        first.cancel()
+
+        self.assertEqual(await second, 30 * GWEI)
+        self.assertEqual(state["calls"], 1)
+
+    def test_negative_ttl(self):
+        """Test TTL validation."""
+        with self.assertRaises(ValueError):
+            SingleFlightCache(ttl=-1)
+
+
+class TestGasMonitorPriceCache(unittest.TestCase):
+    """Test suite for the price cache in GasMonitor."""
+
+    async def test_concurrent_callers_issue_one_rpc(self):
+        """Test that a burst of callers issues one fetch per source."""
+        monitor = GasMonitor(Mock(), price_cache_ttl=10)
+        web3_fetch, state = counting_fetch(25 * GWEI)
+
+        with patch.object(monitor, '_fetch_gas_from_web3', side_effect=web3_fetch):
+            prices = await asyncio.gather(*(monitor.get_current_gas_price() for _ in range(50)))
+            await monitor.get_current_gas_price()
+
+        self.assertEqual(set(prices), {25 * GWEI})
+        self.assertEqual(state["calls"], 1)
+        stats = monitor.get_cache_stats()
+        self.assertEqual((stats["misses"], stats["coalesced"], stats["hits"]), (1, 49, 1))
+
+    async def test_default_fallback_is_not_cached(self):
+        """Test that the default price never enters the cache."""
+        monitor = GasMonitor(Mock(), price_cache_ttl=10, circuit_breaker_threshold=None)
+        with patch.object(monitor, '_fetch_gas_from_web3', side_effect=ConnectionError), \
+                patch.object(monitor, '_fetch_gas_from_api', return_value=None):
+            self.assertEqual(await monitor.get_current_gas_price(), 50 * GWEI)
+
+        self.assertIsNone(monitor.price_cache.value)
+
+    async def test_updates_always_record_fresh_readings(self):
+        """Test that polling bypasses the cache but refreshes it."""
+        monitor = GasMonitor(Mock(), price_cache_ttl=3600)
+        prices = iter([20 * GWEI, 21 * GWEI])
+
+        async def web3_fetch():
+            return next(prices)
+
+        with patch.object(monitor, '_fetch_gas_from_web3', side_effect=web3_fetch):
+            await monitor.update_gas_price()
+            await monitor.update_gas_price()
+            self.assertEqual(await monitor.get_current_gas_price(), 21 * GWEI)
+
+        self.assertEqual(monitor.gas_history.prices_wei().tolist(), [20 * GWEI, 21 * GWEI])
+        self.assertEqual(monitor.get_cache_stats()["hits"], 1)
+
+    async def test_per_block_cache_follows_headers(self):
+        """Test that per-block caching reuses a price within a block."""
+        monitor = GasMonitor(Mock(), cache_per_block=True)
+        web3_fetch, state = counting_fetch(25 * GWEI, delay=0)
+        monitor.latest_block_number = 100
+
+        with patch.object(monitor, '_fetch_gas_from_web3', side_effect=web3_fetch):
+            await monitor.get_current_gas_price()
+            await monitor.get_current_gas_price()
+            monitor.latest_block_number = 101
+            await monitor.get_current_gas_price()
+
+        self.assertEqual(state["calls"], 2)
+
+
+def run_async_test(coro):
+    """Helper function to run async tests."""
+    return asyncio.run(coro)
+
+
+# Make async tests runnable with unittest
+for test_class in (TestSingleFlightCache, TestGasMonitorPriceCache):
+    for name, method in list(test_class.__dict__.items()):
+        if name.startswith('test_') and asyncio.iscoroutinefunction(method):
+            # Wrap async test method
+            def make_sync_test(async_method):
+                def sync_test(self):
+                    return run_async_test(async_method(self))
+                return sync_test
+
+            setattr(test_class, name, make_sync_test(method))
+
+# Do not leave a TestCase bound at module level for pytest to collect again
+del test_class
+
+
+if __name__ == '__main__':
+    unittest.main()
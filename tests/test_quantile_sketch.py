@@ -0,0 +1,145 @@
+"""
+Tests for the Quantile Sketch Module
+"""
+
+import unittest
+
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import numpy as np
+
+from src.gas_optimization.clock import VirtualClock
+from src.gas_optimization.quantile_sketch import KLLSketch, WindowedQuantiles
+
+
+def max_rank_error(sketch, values):
+    """Largest difference between estimated and true ranks at the deciles."""
+    ordered = np.sort(values)
+    errors = []
+    for q in np.linspace(0.05, 0.95, 19):
+        estimate = sketch.quantile(q)
+        true_rank = np.searchsorted(ordered, estimate, side="right") / len(ordered)
+        errors.append(abs(true_rank - q))
+    return max(errors)
+
+
+class TestKLLSketch(unittest.TestCase):
+    """Test suite for KLLSketch."""
+
+    def setUp(self):
+        self.values = np.random.default_rng(7).lognormal(mean=3.0, sigma=0.5, size=50_000)
+
+    def test_empty_sketch(self):
+        """Test that an empty sketch answers None and rank 0."""
+        sketch = KLLSketch()
+        self.assertIsNone(sketch.quantile(0.5))
+        self.assertEqual(sketch.rank(1.0), 0.0)
+        self.assertEqual(len(sketch), 0)
+
+    def test_small_stream_is_exact(self):
+        """Test that a stream below capacity is answered exactly."""
+        sketch = KLLSketch(k=200)
+        for value in range(1, 101):
+            sketch.update(value)
+
+        self.assertEqual(sketch.quantile(0.5), 50)
+        self.assertEqual(sketch.percentile(90), 90)
+        self.assertEqual(sketch.quantile(0), 1)
+        self.assertEqual(sketch.quantile(1), 100)
+        self.assertAlmostEqual(sketch.rank(25), 0.25)
+
+    def test_accuracy_and_bounded_memory(self):
+        """Test that rank error stays small while retained items stay bounded."""
+        sketch = KLLSketch(k=200, seed=1)
+        for value in self.values:
+            sketch.update(float(value))
+
+        self.assertEqual(sketch.count, len(self.values))
+        self.assertLess(sketch.retained, 3 * 200 + 50)
+        self.assertLess(max_rank_error(sketch, self.values), 0.02)
+        self.assertEqual(sketch.min, self.values.min())
+        self.assertEqual(sketch.max, self.values.max())
+
+    def test_update_many_matches_update(self):
+        """Test that batched updates summarize the same stream."""
+        sketch = KLLSketch(k=200, seed=1)
+        sketch.update_many(self.values)
+
+        self.assertEqual(sketch.count, len(self.values))
+        self.assertLess(max_rank_error(sketch, self.values), 0.02)
+
+    def test_merge(self):
+        """Test that merged sketches summarize the union of their streams."""
+        first, second = KLLSketch(k=200, seed=1), KLLSketch(k=200, seed=2)
+        first.update_many(self.values[:20_000])
+        second.update_many(self.values[20_000:])
+        first.merge(second)
+
+        self.assertEqual(first.count, len(self.values))
+        self.assertEqual(second.count, len(self.values) - 20_000)
+        self.assertLess(max_rank_error(first, self.values), 0.02)
+
+    def test_merge_requires_same_k(self):
+        """Test that sketches with different k cannot be merged."""
+        with self.assertRaises(ValueError):
+            KLLSketch(k=100).merge(KLLSketch(k=200))
+
+    def test_invalid_k(self):
+        """Test that a tiny k is rejected."""
+        with self.assertRaises(ValueError):
+            KLLSketch(k=4)
+
+
+class TestWindowedQuantiles(unittest.TestCase):
+    """Test suite for WindowedQuantiles."""
+
+    def setUp(self):
+        self.clock = VirtualClock()
+        self.window = WindowedQuantiles(window=60.0, buckets=6, k=200, clock=self.clock)
+
+    def test_buckets_expire(self):
+        """Test that items leave the window once their bucket is older than it."""
+        self.window.update_many([100.0] * 10)
+        self.clock.advance(30)
+        self.window.update_many([200.0] * 10)
+
+        self.assertEqual(self.window.count, 20)
+        self.assertEqual(self.window.percentile(90), 200.0)
+
+        self.clock.advance(35)
+
+        self.assertEqual(self.window.count, 10)
+        self.assertEqual(self.window.percentile(10), 200.0)
+
+        self.clock.advance(60)
+
+        self.assertEqual(self.window.count, 0)
+        self.assertIsNone(self.window.quantile(0.5))
+
+    def test_merged_sketch_is_cached(self):
+        """Test that queries reuse the merged sketch until the next update."""
+        self.window.update(1.0)
+        merged = self.window.sketch()
+        self.assertIs(self.window.sketch(), merged)
+
+        self.window.update(2.0)
+        self.assertIsNot(self.window.sketch(), merged)
+
+    def test_clear(self):
+        """Test that clear empties the window."""
+        self.window.update_many(range(100))
+        self.window.clear()
+        self.assertEqual(self.window.count, 0)
+
+    def test_invalid_settings(self):
+        """Test that a non-positive window or bucket count is rejected."""
+        with self.assertRaises(ValueError):
+            WindowedQuantiles(window=0)
+        with self.assertRaises(ValueError):
+            WindowedQuantiles(buckets=0)
+
+
+if __name__ == '__main__':
+    unittest.main()
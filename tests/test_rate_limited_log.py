@@ -0,0 +1,179 @@
+"""
+Tests for rate-limited logging and GasMonitor's deferred log formatting
+"""
+
+import asyncio
+import logging
+import unittest
+from unittest.mock import AsyncMock, Mock, patch
+
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.gas_optimization.clock import VirtualClock
+from src.gas_optimization.gas_monitor import GasMonitor
+from src.gas_optimization.rate_limited_log import RateLimitedLogger
+
+
+GWEI = 10**9
+MONITOR_LOGGER = "src.gas_optimization.gas_monitor"
+
+
+class TestRateLimitedLogger(unittest.TestCase):
+    """Test suite for RateLimitedLogger."""
+
+    def setUp(self):
+        self.clock = VirtualClock()
+        self.logger = logging.getLogger("test.rate_limited")
+        self.limiter = RateLimitedLogger(self.logger, interval=60.0, clock=self.clock)
+
+    def test_repeats_suppressed_and_counted(self):
+        """Test that repeats within the interval are counted and reported later."""
+        with self.assertLogs(self.logger, logging.WARNING) as logs:
+            self.assertTrue(self.limiter.warning("web3", "Failed: %s", "refused"))
+            for _ in range(4):
+                self.assertFalse(self.limiter.warning("web3", "Failed: %s", "refused"))
+            self.clock.advance(60)
+            self.limiter.warning("web3", "Failed: %s", "timeout")
+
+        self.assertEqual(logs.output, [
+            "WARNING:test.rate_limited:Failed: refused",
+            "WARNING:test.rate_limited:Failed: timeout (4 similar messages suppressed)",
+        ])
+
+    def test_keys_are_independent(self):
+        """Test that each key has its own interval."""
+        with self.assertLogs(self.logger, logging.WARNING) as logs:
+            self.limiter.warning("web3", "web3 down")
+            self.limiter.warning("etherscan", "etherscan down")
+
+        self.assertEqual(len(logs.output), 2)
+
+    def test_reset(self):
+        """Test that a reset key logs its next message at once."""
+        with self.assertLogs(self.logger, logging.WARNING) as logs:
+            self.limiter.warning("web3", "down")
+            self.limiter.warning("web3", "down")
+            self.limiter.reset("web3")
+            self.limiter.warning("web3", "down again")
+
+        self.assertEqual(logs.output[-1], "WARNING:test.rate_limited:down again")
+
+    def test_disabled_level_is_not_formatted(self):
+        """Test that messages below the logger's level are dropped without formatting."""
+        argument = Mock()
+        argument.__str__ = Mock(return_value="refused")
+        self.logger.setLevel(logging.CRITICAL)
+        try:
+            self.assertFalse(self.limiter.warning("web3", "Failed: %s", argument))
+        finally:
+            self.logger.setLevel(logging.NOTSET)
+
+        argument.__str__.assert_not_called()
+        self.assertEqual(self.limiter.suppressed, {})
+
+
+class TestGasMonitorLogging(unittest.TestCase):
+    """Test suite for GasMonitor's logging on hot paths."""
+
+    def setUp(self):
+        self.clock = VirtualClock()
+
+    def test_queries_skip_debug_work_when_disabled(self):
+        """Test that queries do not build debug messages when debug is off."""
+        monitor = GasMonitor(Mock())
+        monitor._record_gas_price(30 * GWEI)
+
+        with patch("src.gas_optimization.gas_monitor.logger") as module_logger:
+            module_logger.isEnabledFor.return_value = False
+            monitor.get_average_gas_price()
+            monitor.is_gas_price_favorable(40)
+
+        module_logger.debug.assert_not_called()
+
+    def test_debug_messages_when_enabled(self):
+        """Test that the deferred messages still render when debug is on."""
+        monitor = GasMonitor(Mock())
+        monitor._record_gas_price(30 * GWEI)
+
+        with self.assertLogs(MONITOR_LOGGER, logging.DEBUG) as logs:
+            monitor.is_gas_price_favorable(40)
+
+        self.assertIn("Gas price check: 30.00 Gwei <= 40 Gwei threshold", logs.output[-1])
+
+    async def test_repeated_source_failures_rate_limited(self):
+        """Test that a down source is reported once per interval, not per update."""
+        monitor = GasMonitor(Mock(), clock=self.clock, circuit_breaker_threshold=None, log_interval=30)
+
+        with patch.object(monitor, '_fetch_gas_from_web3', side_effect=ConnectionError("refused")), \
+                patch.object(monitor, '_fetch_gas_from_api', return_value=None):
+            with self.assertLogs(MONITOR_LOGGER, logging.WARNING) as logs:
+                for _ in range(10):
+                    await monitor.update_gas_price()
+                self.clock.advance(30)
+                await monitor.update_gas_price()
+
+        failures = [line for line in logs.output if "Failed to get gas price from web3" in line]
+        skipped = [line for line in logs.output if "skipping reading" in line]
+        self.assertEqual(len(failures), 2)
+        self.assertIn("(9 similar messages suppressed)", failures[1])
+        self.assertEqual(len(skipped), 2)
+        self.assertEqual(monitor.skipped_updates, 11)
+
+    async def test_recovery_resets_source_limit(self):
+        """Test that the first failure after a recovery is logged at once."""
+        monitor = GasMonitor(Mock(), clock=self.clock, circuit_breaker_threshold=None)
+        outcomes = [ConnectionError("refused"), 30 * GWEI, ConnectionError("refused again")]
+
+        with patch.object(monitor, '_fetch_gas_from_web3', side_effect=outcomes), \
+                patch.object(monitor, '_fetch_gas_from_api', return_value=None):
+            with self.assertLogs(MONITOR_LOGGER, logging.WARNING) as logs:
+                for _ in outcomes:
+                    await monitor.update_gas_price()
+
+        failures = [line for line in logs.output if "Failed to get gas price from web3" in line]
+        self.assertEqual(len(failures), 2)
+        self.assertIn("refused again", failures[1])
+
+    async def test_etherscan_errors_not_hidden_by_warnings(self):
+        """Test that an unexpected Etherscan error is logged despite recent warnings."""
+        monitor = GasMonitor(Mock(), clock=self.clock)
+        response = Mock(status=503)
+        session = Mock()
+        session.get.return_value.__aenter__ = AsyncMock(return_value=response)
+        session.get.return_value.__aexit__ = AsyncMock(return_value=False)
+
+        with patch.object(monitor, '_get_http_session', return_value=session):
+            with self.assertLogs(MONITOR_LOGGER, logging.WARNING) as logs:
+                await monitor._fetch_gas_from_api()
+                await monitor._fetch_gas_from_api()
+                session.get.side_effect = ValueError("bad payload")
+                await monitor._fetch_gas_from_api()
+
+        self.assertEqual(len([r for r in logs.records if "status 503" in r.getMessage()]), 1)
+        errors = [r for r in logs.records if r.levelno == logging.ERROR]
+        self.assertEqual(len(errors), 1)
+        self.assertIn("bad payload", errors[0].getMessage())
+        self.assertIsNotNone(errors[0].exc_info)
+
+
+def run_async_test(coro):
+    """Helper function to run async tests."""
+    return asyncio.run(coro)
+
+
+# Make async tests runnable with unittest
+for name, method in list(TestGasMonitorLogging.__dict__.items()):
+    if name.startswith('test_') and asyncio.iscoroutinefunction(method):
+        # Wrap async test method
+        def make_sync_test(async_method):
+            def sync_test(self):
+                return run_async_test(async_method(self))
+            return sync_test
+
+        setattr(TestGasMonitorLogging, name, make_sync_test(method))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,289 @@
+"""
+Tests for the virtual clock, gas series loaders and backtesting harness
+"""
+
+import asyncio
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import Mock, patch
+
+import numpy as np
+
+import sys
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.gas_optimization.clock import VirtualClock
+from src.gas_optimization.gas_monitor import GasMonitor
+from src.gas_optimization.replay import (
+    ForecastStrategy,
+    GasReplay,
+    GasSeries,
+    PercentileStrategy,
+    ThresholdStrategy,
+    sweep_thresholds,
+    transaction_windows,
+)
+from src.gas_optimization.timeseries_store import GasTimeSeriesFile
+
+
+GWEI = 10**9
+BLOCK_NS = 12 * 10**9
+
+
+def synthetic_series(count=5000, seed=3):
+    """Generate a block-spaced series with a daily cycle and noise."""
+    rng = np.random.default_rng(seed)
+    timestamps = 1_700_000_000 * 10**9 + np.arange(count, dtype=np.int64) * BLOCK_NS
+    hours = (timestamps // (3600 * 10**9)) % 24
+    gwei = 30 + 10 * np.sin(hours / 24 * 2 * np.pi) + rng.normal(0, 3, count)
+    return GasSeries(timestamps, (np.clip(gwei, 1, None) * GWEI).astype(np.uint64))
+
+
+class TestVirtualClock(unittest.TestCase):
+    """Test suite for the virtual clock in GasMonitor."""
+
+    def test_clock_moves_only_when_driven(self):
+        """Test setting and advancing virtual time."""
+        clock = VirtualClock(100)
+        clock.set_time_ns(50)
+        self.assertEqual(clock.time_ns(), 100)
+        clock.advance(1.5)
+        self.assertEqual(clock.time_ns(), 100 + 1_500_000_000)
+
+    async def test_overlapping_sleeps_share_the_timeline(self):
+        """Test that concurrent sleeps do not add up."""
+        clock = VirtualClock(0)
+        woken = []
+
+        async def sleeper(seconds):
+            await clock.sleep(seconds)
+            woken.append((seconds, clock.monotonic_ns()))
+
+        await asyncio.gather(sleeper(1), sleeper(1), sleeper(1), sleeper(0.5))
+
+        self.assertEqual(clock.monotonic_ns(), 10**9)
+        self.assertEqual(woken, [(0.5, 5 * 10**8), (1, 10**9), (1, 10**9), (1, 10**9)])
+
+    async def test_sleep_wakes_at_its_deadline(self):
+        """Test that advancing during a sleep does not push its deadline back."""
+        clock = VirtualClock(0)
+
+        async def busy_callback():
+            await asyncio.sleep(0)
+            clock.advance(0.03)
+
+        task = asyncio.create_task(busy_callback())
+        await clock.sleep(0.05)
+        await task
+
+        self.assertEqual(clock.monotonic_ns(), 50 * 10**6)
+
+        # A sleep overtaken by an advance wakes at the advanced time
+        task = asyncio.create_task(clock.sleep(0.01))
+        await asyncio.sleep(0)
+        clock.advance(1)
+        await task
+        self.assertEqual(clock.monotonic_ns(), 1_050 * 10**6)
+
+    def test_recorded_readings_use_the_clock(self):
+        """Test that readings are timestamped by the monitor's clock."""
+        monitor = GasMonitor(Mock(), clock=VirtualClock(42))
+        monitor._record_gas_price(GWEI)
+        self.assertEqual(monitor.gas_history.timestamps_ns().tolist(), [42])
+
+    async def test_polling_loop_runs_on_virtual_time(self):
+        """Test that the real polling loop sleeps on the virtual clock."""
+        web3 = Mock()
+        web3.eth.gas_price = 25 * GWEI
+        monitor = GasMonitor(web3, update_interval=15, clock=VirtualClock(0))
+
+        task = asyncio.create_task(monitor.start_monitoring())
+        while len(monitor.gas_history) < 5:
+            await asyncio.sleep(0.001)
+        await monitor.stop_monitoring()
+        await asyncio.gather(task, return_exceptions=True)
+
+        # Readings land on the fixed 15 s grid of virtual time
+        timestamps = monitor.gas_history.timestamps_ns()
+        self.assertTrue(all(t % (15 * 10**9) == 0 for t in timestamps.tolist()))
+        self.assertEqual(len(set(timestamps.tolist())), len(timestamps))
+
+
+class TestGasSeries(unittest.TestCase):
+    """Test suite for GasSeries loaders."""
+
+    def setUp(self):
+        """Create a scratch directory."""
+        self.tmpdir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        """Remove the scratch directory."""
+        shutil.rmtree(self.tmpdir)
+
+    def test_csv_columns(self):
+        """Test both supported CSV layouts."""
+        ns_path = os.path.join(self.tmpdir, "ns.csv")
+        with open(ns_path, "w") as f:
+            f.write("timestamp_ns,price_wei\n2000,20000000000\n1000,10000000000\n")
+        seconds_path = os.path.join(self.tmpdir, "s.csv")
+        with open(seconds_path, "w") as f:
+            f.write("timestamp,price_gwei\n1.5,12.5\n")
+
+        series = GasSeries.from_csv(ns_path)
+        self.assertEqual(series.timestamps_ns.tolist(), [1000, 2000])
+        self.assertEqual(series.prices_wei.tolist(), [10 * GWEI, 20 * GWEI])
+
+        series = GasSeries.from_csv(seconds_path)
+        self.assertEqual(series.timestamps_ns.tolist(), [1_500_000_000])
+        self.assertEqual(series.prices_gwei.tolist(), [12.5])
+
+    def test_csv_missing_columns(self):
+        """Test that an unknown CSV layout is rejected."""
+        path = os.path.join(self.tmpdir, "bad.csv")
+        with open(path, "w") as f:
+            f.write("time,gas\n1,2\n")
+        with self.assertRaises(ValueError):
+            GasSeries.from_csv(path)
+
+    def test_timeseries_file(self):
+        """Test loading a series persisted by GasMonitor."""
+        path = os.path.join(self.tmpdir, "gas.ts")
+        with GasTimeSeriesFile(path) as store:
+            for i in range(10):
+                store.append(i * BLOCK_NS, (20 + i) * GWEI)
+
+        series = GasSeries.from_timeseries_file(path)
+        self.assertEqual(len(series), 10)
+        self.assertEqual(series.duration_seconds, 108.0)
+
+    def test_parquet_requires_pyarrow(self):
+        """Test the optional Parquet loader."""
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError:
+            with self.assertRaises(ImportError):
+                GasSeries.from_parquet(os.path.join(self.tmpdir, "gas.parquet"))
+            return
+
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        path = os.path.join(self.tmpdir, "gas.parquet")
+        pq.write_table(pa.table({"timestamp_ns": [1, 2], "price_wei": [5, 6]}), path)
+        self.assertEqual(GasSeries.from_parquet(path).prices_wei.tolist(), [5, 6])
+
+
+class TestBacktest(unittest.TestCase):
+    """Test suite for GasReplay and threshold sweeps."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.series = synthetic_series()
+
+    def test_transaction_windows(self):
+        """Test that windows cover arrival to deadline."""
+        starts, ends = transaction_windows(self.series, arrival_interval=120, max_wait=60)
+
+        self.assertEqual(starts[:3].tolist(), [0, 10, 20])
+        self.assertEqual(ends[:3].tolist(), [5, 15, 25])
+
+    def test_replay_matches_vectorized_sweep(self):
+        """Test that the monitor replay and the vectorized sweep agree."""
+        replay = GasReplay(self.series, history_size=500)
+        replayed = replay.run(ThresholdStrategy(28), arrival_interval=300, max_wait=900)
+        swept = sweep_thresholds(self.series, [28], arrival_interval=300, max_wait=900)[0]
+
+        self.assertEqual(replayed.strategy, swept.strategy)
+        self.assertEqual(replayed.transactions, swept.transactions)
+        self.assertAlmostEqual(replayed.mean_realized_gwei, swept.mean_realized_gwei)
+        self.assertAlmostEqual(replayed.forced_ratio, swept.forced_ratio)
+        self.assertAlmostEqual(replayed.mean_wait_seconds, swept.mean_wait_seconds)
+
+    def test_results_are_bounded_by_optimal(self):
+        """Test realized versus optimal and immediate prices."""
+        results = sweep_thresholds(self.series, [1, 25, 30, 1000])
+        never, low, mid, always = results
+
+        for result in results:
+            self.assertGreaterEqual(result.mean_realized_gwei, result.mean_optimal_gwei)
+            self.assertGreaterEqual(result.regret_pct, 0)
+        self.assertEqual(never.forced_ratio, 1.0)
+        self.assertEqual(always.forced_ratio, 0.0)
+        self.assertAlmostEqual(always.savings_pct, 0.0)
+        self.assertEqual(always.mean_wait_seconds, 0.0)
+        self.assertGreater(mid.savings_pct, 0)
+
+    def test_monitor_strategies_run(self):
+        """Test strategies that depend on monitor statistics and forecasts."""
+        replay = GasReplay(self.series, history_size=300)
+        for strategy in (PercentileStrategy(25), ForecastStrategy(steps=5)):
+            result = replay.run(strategy, arrival_interval=600, max_wait=600)
+            self.assertEqual(result.strategy, strategy.name)
+            self.assertGreaterEqual(result.mean_realized_gwei, result.mean_optimal_gwei)
+
+    def test_replay_goes_through_monitor_sources(self):
+        """Test that replayed readings are fetched from the monitor's node source."""
+        series = GasSeries(self.series.timestamps_ns[:50], self.series.prices_wei[:50])
+        replay = GasReplay(series)
+        monitor = replay.create_monitor()
+        replay.replay(monitor)
+
+        self.assertEqual(monitor.source_stats["web3"].successes, 50)
+        self.assertEqual(monitor.price_cache.misses, 50)
+        self.assertEqual(monitor.gas_history.prices_wei().tolist(), series.prices_wei.tolist())
+        self.assertEqual(monitor.gas_history.timestamps_ns().tolist(), series.timestamps_ns.tolist())
+
+        with self.assertRaises(ValueError):
+            replay.replay(GasMonitor(Mock()))
+
+    def test_replay_never_falls_back_to_etherscan(self):
+        """Test that a reading the node cannot serve is skipped, not fetched online."""
+        prices = self.series.prices_wei[:5].copy()
+        prices[2] = 0
+        replay = GasReplay(GasSeries(self.series.timestamps_ns[:5], prices))
+        monitor = replay.create_monitor()
+
+        with patch.object(GasMonitor, '_fetch_gas_from_api') as fetch_from_api:
+            replay.replay(monitor)
+
+        fetch_from_api.assert_not_called()
+        self.assertNotIn("etherscan", monitor.source_stats)
+        self.assertEqual(monitor.skipped_updates, 1)
+        self.assertEqual(len(monitor.gas_history), 4)
+
+    def test_run_closes_its_monitor(self):
+        """Test that a backtest releases the monitor it created."""
+        replay = GasReplay(self.series)
+        with patch.object(GasMonitor, 'aclose') as aclose:
+            replay.run(ThresholdStrategy(30))
+
+        aclose.assert_called_once()
+
+    def test_replay_is_much_faster_than_real_time(self):
+        """Test that replaying runs thousands of times faster than real time."""
+        result = GasReplay(self.series).run(ThresholdStrategy(30))
+
+        self.assertEqual(result.samples, len(self.series))
+        self.assertGreater(self.series.duration_seconds / result.replay_seconds, 1000)
+
+
+def run_async_test(coro):
+    """Helper function to run async tests."""
+    return asyncio.run(coro)
+
+
+# Make async tests runnable with unittest
+for name, method in list(TestVirtualClock.__dict__.items()):
+    if name.startswith('test_') and asyncio.iscoroutinefunction(method):
+        # Wrap async test method
+        def make_sync_test(async_method):
+            def sync_test(self):
+                return run_async_test(async_method(self))
+            return sync_test
+
+        setattr(TestVirtualClock, name, make_sync_test(method))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,215 @@
+"""
+Tests for rolling gas statistics and the statistics-aware gas history
+"""
+
+import random
+import statistics
+import unittest
+from datetime import datetime
+from unittest.mock import Mock
+
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.gas_optimization.gas_monitor import GasMonitor
+from src.gas_optimization.history import GasHistory
+from src.gas_optimization.rolling_stats import RollingGasStatistics
+
+
+class TestRollingGasStatistics(unittest.TestCase):
+    """Test suite for RollingGasStatistics against brute-force references."""
+
+    def setUp(self):
+        """Set up a random price series larger than the capacity."""
+        rng = random.Random(42)
+        self.capacity = 50
+        self.prices = [rng.randint(10, 200) * 10**9 + rng.randint(0, 10**9) for _ in range(173)]
+        self.stats = RollingGasStatistics(self.capacity, ema_half_lives=(5, 20))
+
+    def test_window_sums_and_means(self):
+        """Test running sums and means for arbitrary windows after eviction."""
+        for index, price in enumerate(self.prices):
+            self.stats.push(price)
+            covered = self.prices[max(0, index + 1 - self.capacity):index + 1]
+            for window in (1, 7, 50):
+                expected = covered[-window:]
+                self.assertEqual(self.stats.window_sum(window), sum(expected))
+                self.assertEqual(self.stats.window_mean(window), sum(expected) / len(expected))
+
+    def test_window_variance(self):
+        """Test population variance against the statistics module."""
+        for price in self.prices:
+            self.stats.push(price)
+
+        expected = statistics.pvariance(self.prices[-20:])
+        self.assertAlmostEqual(self.stats.window_variance(20) / expected, 1.0, places=9)
+        self.assertAlmostEqual(
+            self.stats.window_std(20), statistics.pstdev(self.prices[-20:]), delta=1.0
+        )
+
+    def test_ema(self):
+        """Test EMA recursion for a maintained half-life."""
+        alpha = 1 - 2 ** (-1 / 5)
+        expected = None
+        for price in self.prices:
+            self.stats.push(price)
+            expected = price if expected is None else expected + alpha * (price - expected)
+
+        self.assertAlmostEqual(self.stats.ema(5), expected)
+
+    def test_ema_unknown_half_life(self):
+        """Test that querying an unmaintained half-life raises ValueError."""
+        self.stats.push(10**9)
+        with self.assertRaises(ValueError):
+            self.stats.ema(7)
+
+    def test_min_max_windows(self):
+        """Test monotonic-deque extrema, including windows registered mid-stream."""
+        for index, price in enumerate(self.prices):
+            self.stats.push(price)
+            covered = self.prices[max(0, index + 1 - self.capacity):index + 1]
+            self.assertEqual(self.stats.min(10), min(covered[-10:]))
+            self.assertEqual(self.stats.max(), max(covered))
+            if index >= 100:
+                # Registered lazily from the stored values at index 100
+                self.assertEqual(self.stats.max(25), max(covered[-25:]))
+
+    def test_percentiles(self):
+        """Test order statistics against the interpolated reference."""
+        for price in self.prices:
+            self.stats.push(price)
+
+        covered = sorted(self.prices[-self.capacity:])
+        self.assertEqual(self.stats.percentile(0), covered[0])
+        self.assertEqual(self.stats.percentile(100), covered[-1])
+        self.assertAlmostEqual(self.stats.median(), statistics.median(covered))
+
+        with self.assertRaises(ValueError):
+            self.stats.percentile(101)
+
+    def test_percentiles_after_every_push(self):
+        """Test every rank against a sorted copy while readings are evicted, with ties."""
+        rng = random.Random(7)
+        stats = RollingGasStatistics(20)
+        values = []
+        for _ in range(300):
+            value = rng.choice((10, 20, 20, 30)) * 10**9 if rng.random() < 0.3 else rng.randint(1, 10**12)
+            values.append(value)
+            stats.push(value)
+            covered = sorted(values[-20:])
+            for percentile in (0, 25, 50, 90, 100):
+                position = (len(covered) - 1) * percentile / 100
+                lower = int(position)
+                upper = min(lower + 1, len(covered) - 1)
+                expected = covered[lower] + (covered[upper] - covered[lower]) * (position - lower)
+                self.assertEqual(stats.percentile(percentile), expected)
+
+    def test_extremum_windows_are_capped(self):
+        """Test that only the most recently queried windows are kept up to date."""
+        for price in self.prices:
+            self.stats.push(price)
+        for window in range(1, 21):
+            self.stats.min(window)
+        self.stats.min(20)
+        self.stats.min(30)
+
+        cap = RollingGasStatistics.MAX_EXTREMUM_WINDOWS
+        self.assertEqual(len(self.stats._min_deques), cap)
+        self.assertEqual(list(self.stats._min_deques)[-2:], [20, 30])
+
+        self.stats.push(1)
+        self.assertEqual(self.stats.min(5), 1)
+        self.assertEqual(self.stats.min(3), min([1] + self.prices[-2:]))
+
+    def test_prefix_sums_wrap_exactly(self):
+        """Test that window sums stay exact once the fixed-width prefix sums wrap."""
+        stats = RollingGasStatistics(3)
+        values = [2**62 + i * 12_345 for i in range(20)]
+        for value in values:
+            stats.push(value)
+
+        self.assertEqual(stats.window_sum(), sum(values[-3:]))
+        self.assertEqual(stats.window_sum(2), sum(values[-2:]))
+        expected = statistics.pvariance(values[-3:])
+        self.assertAlmostEqual(stats.window_variance() / expected, 1.0, places=9)
+
+    def test_empty(self):
+        """Test that queries on empty statistics return None or zero."""
+        self.assertEqual(self.stats.window_sum(5), 0)
+        self.assertIsNone(self.stats.window_mean(5))
+        self.assertIsNone(self.stats.window_variance())
+        self.assertIsNone(self.stats.ema(5))
+        self.assertIsNone(self.stats.min())
+        self.assertIsNone(self.stats.median())
+
+    def test_invalid_capacity(self):
+        """Test that a non-positive capacity is rejected."""
+        with self.assertRaises(ValueError):
+            RollingGasStatistics(0)
+
+
+class TestGasHistory(unittest.TestCase):
+    """Test suite for GasHistory."""
+
+    def test_append_updates_stats(self):
+        """Test that appended readings feed the attached statistics."""
+        history = GasHistory(maxlen=3)
+        for price in (10, 20, 30, 40):
+            history.append((datetime.now(), price))
+
+        self.assertEqual(len(history), 3)
+        self.assertEqual(history.stats.window_sum(), 90)
+        self.assertEqual(history.stats.min(), 20)
+
+    def test_clear_resets_stats(self):
+        """Test that clearing the history resets its statistics."""
+        history = GasHistory(maxlen=3, readings=[(datetime.now(), 10)])
+        history.clear()
+
+        self.assertEqual(len(history), 0)
+        self.assertIsNone(history.stats.window_mean())
+
+
+class TestGasMonitorStatistics(unittest.TestCase):
+    """Test suite for GasMonitor statistics queries."""
+
+    def setUp(self):
+        """Set up a monitor with a known history."""
+        self.monitor = GasMonitor(Mock(), history_size=10, ema_half_lives=(2,))
+        for price_gwei in (40, 42, 44, 46, 48, 50, 52, 54, 56, 58, 60):
+            self.monitor.gas_history.append((datetime.now(), GasMonitor.gwei_to_wei(price_gwei)))
+
+    def test_median_and_percentile(self):
+        """Test median and percentile queries over the full history."""
+        self.assertEqual(self.monitor.get_median_gas_price(), 51000000000)
+        self.assertEqual(self.monitor.get_gas_price_percentile(100), 60000000000)
+
+    def test_min_max(self):
+        """Test extrema over the full history and a recent window."""
+        self.assertEqual(self.monitor.get_min_gas_price(), 42000000000)
+        self.assertEqual(self.monitor.get_max_gas_price(3), 60000000000)
+        self.assertEqual(self.monitor.get_min_gas_price(3), 56000000000)
+
+    def test_volatility(self):
+        """Test rolling standard deviation."""
+        expected = statistics.pstdev([56, 58, 60]) * 10**9
+        self.assertAlmostEqual(self.monitor.get_gas_price_volatility(3), expected, delta=1.0)
+
+    def test_ema(self):
+        """Test EMA query with a configured half-life."""
+        ema = self.monitor.get_ema_gas_price(half_life=2)
+        self.assertGreater(ema, 50000000000)
+        self.assertLess(ema, 60000000000)
+
+    def test_queries_without_data(self):
+        """Test that statistics queries return None without history."""
+        monitor = GasMonitor(Mock())
+        self.assertIsNone(monitor.get_median_gas_price())
+        self.assertIsNone(monitor.get_ema_gas_price())
+        self.assertIsNone(monitor.get_gas_price_volatility())
+        self.assertIsNone(monitor.get_max_gas_price())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,174 @@
+"""
+Tests for the fixed-rate monitoring scheduler
+"""
+
+import asyncio
+import time
+import unittest
+from unittest.mock import AsyncMock, Mock
+
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.gas_optimization.clock import VirtualClock
+from src.gas_optimization.gas_monitor import GasMonitor
+from src.gas_optimization.scheduler import FixedRateScheduler
+
+
+class TestFixedRateScheduler(unittest.TestCase):
+    """Test suite for FixedRateScheduler."""
+
+    async def run_for(self, scheduler, seconds):
+        task = asyncio.create_task(scheduler.run())
+        await asyncio.sleep(seconds)
+        scheduler.stop()
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+
+    async def test_period_does_not_include_callback_latency(self):
+        """Test that slow callbacks do not stretch the period."""
+        starts = []
+
+        async def fetch():
+            starts.append(time.monotonic())
+            await asyncio.sleep(0.03)
+
+        scheduler = FixedRateScheduler(0.05, fetch)
+        await self.run_for(scheduler, 0.52)
+
+        self.assertGreaterEqual(scheduler.ticks, 10)
+        period = (starts[-1] - starts[0]) / (len(starts) - 1)
+        self.assertAlmostEqual(period, 0.05, delta=0.005)
+        self.assertEqual(scheduler.busy_ticks, 0)
+        self.assertEqual(scheduler.tick_lag.count, scheduler.ticks)
+
+    async def test_busy_ticks_are_dropped_and_overruns_recorded(self):
+        """Test that a still-running fetch causes the next tick to be dropped."""
+        async def slow_fetch():
+            await asyncio.sleep(0.12)
+
+        scheduler = FixedRateScheduler(0.05, slow_fetch)
+        await self.run_for(scheduler, 0.5)
+
+        self.assertGreater(scheduler.busy_ticks, 0)
+        self.assertGreater(scheduler.overruns, 0)
+        self.assertAlmostEqual(scheduler.overrun.percentile(50), 0.07, delta=0.03)
+        stats = scheduler.get_stats()
+        self.assertEqual(stats["overrun"]["count"], scheduler.overruns)
+
+    async def test_max_in_flight_bounds_concurrency(self):
+        """Test that up to max_in_flight callbacks overlap."""
+        running, peak = 0, 0
+
+        async def slow_fetch():
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.12)
+            running -= 1
+
+        scheduler = FixedRateScheduler(0.02, slow_fetch, max_in_flight=3)
+        await self.run_for(scheduler, 0.4)
+
+        self.assertEqual(peak, 3)
+        self.assertGreater(scheduler.busy_ticks, 0)
+
+    async def stalled_run(self, policy):
+        """Run on a virtual clock with one callback stalling 3.5 intervals."""
+        clock = VirtualClock(0)
+        calls = []
+
+        async def fetch():
+            calls.append(clock.monotonic_ns())
+            if len(calls) == 2:
+                clock.advance(3.5)
+
+        scheduler = FixedRateScheduler(1, fetch, clock=clock, missed_tick_policy=policy)
+        task = asyncio.create_task(scheduler.run())
+        while len(calls) < 4:
+            await asyncio.sleep(0)
+        scheduler.stop()
+        await task
+        return scheduler, [t // 10**8 for t in calls[:4]]
+
+    async def test_coalesce_runs_once_for_missed_ticks(self):
+        """Test that missed ticks collapse into one immediate run."""
+        scheduler, calls = await self.stalled_run("coalesce")
+
+        self.assertEqual(calls, [0, 10, 55, 60])
+        self.assertEqual(scheduler.missed_ticks, 3)
+        self.assertEqual(scheduler.tick_lag.max, 3.5)
+
+    async def test_skip_waits_for_next_grid_point(self):
+        """Test that missed ticks are dropped and the grid is kept."""
+        scheduler, calls = await self.stalled_run("skip")
+
+        self.assertEqual(calls, [0, 10, 60, 70])
+        self.assertEqual(scheduler.missed_ticks, 4)
+
+    def test_invalid_arguments(self):
+        """Test argument validation."""
+        with self.assertRaises(ValueError):
+            FixedRateScheduler(0, AsyncMock())
+        with self.assertRaises(ValueError):
+            FixedRateScheduler(1, AsyncMock(), missed_tick_policy="queue")
+        with self.assertRaises(ValueError):
+            GasMonitor(Mock(), missed_tick_policy="queue")
+
+
+class TestGasMonitorScheduling(unittest.TestCase):
+    """Test suite for fixed-rate polling in GasMonitor."""
+
+    async def test_polling_is_fixed_rate(self):
+        """Test that monitoring keeps its cadence with a slow source."""
+        clock = VirtualClock(0)
+        monitor = GasMonitor(Mock(), update_interval=0.05, clock=clock)
+        fetched = []
+
+        async def slow_gas_price():
+            fetched.append(clock.monotonic_ns())
+            clock.advance(0.03)
+            return 20 * 10**9
+
+        monitor._fetch_current_gas_price = slow_gas_price
+        task = asyncio.create_task(monitor.start_monitoring())
+        while len(monitor.gas_history) < 10:
+            await asyncio.sleep(0)
+        await monitor.stop_monitoring()
+        await asyncio.gather(task, return_exceptions=True)
+
+        # A 30 ms fetch does not shift the 50 ms schedule
+        self.assertEqual(fetched, [tick * 50 * 10**6 for tick in range(10)])
+        stats = monitor.get_scheduler_stats()
+        self.assertEqual(stats["ticks"], 10)
+        self.assertEqual(stats["duration"]["count"], 10)
+        self.assertEqual(len(monitor.gas_history), 10)
+        self.assertEqual(monitor.scheduler.busy_ticks, 0)
+        self.assertEqual(monitor.scheduler.missed_ticks, 0)
+        self.assertFalse(monitor.scheduler.is_running)
+
+
+def run_async_test(coro):
+    """Helper function to run async tests."""
+    return asyncio.run(coro)
+
+
+# Make async tests runnable with unittest
+for test_class in (TestFixedRateScheduler, TestGasMonitorScheduling):
+    for name, method in list(test_class.__dict__.items()):
+        if name.startswith('test_') and asyncio.iscoroutinefunction(method):
+            # Wrap async test method
+            def make_sync_test(async_method):
+                def sync_test(self):
+                    return run_async_test(async_method(self))
+                return sync_test
+
+            setattr(test_class, name, make_sync_test(method))
+
+# Do not leave a TestCase bound at module level for pytest to collect again
+del test_class
+
+
+if __name__ == '__main__':
+    unittest.main()
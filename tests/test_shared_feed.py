@@ -0,0 +1,169 @@
+"""
+Tests for the shared-memory gas feed
+"""
+
+import asyncio
+import multiprocessing
+import struct
+import unittest
+import uuid
+from multiprocessing import shared_memory
+from unittest.mock import Mock
+
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.gas_optimization.clock import VirtualClock
+from src.gas_optimization.gas_monitor import GasMonitor
+from src.gas_optimization.shared_feed import (
+    SharedFeedFormatError,
+    SharedGasFeedPublisher,
+    SharedGasFeedReader,
+)
+
+
+GWEI = 10**9
+
+
+def unique_name():
+    return f"gasfeed_test_{uuid.uuid4().hex[:12]}"
+
+
+def check_consistency(name, reads, results):
+    """Read the feed in another process and check each record is untorn."""
+    torn = 0
+    seen = set()
+    with SharedGasFeedReader(name) as reader:
+        for _ in range(reads):
+            snapshot = reader.read()
+            if snapshot is None:
+                continue
+            seen.add(snapshot.updates)
+            if (snapshot.gas_price != snapshot.timestamp_ns * 3
+                    or snapshot.sample_count != snapshot.updates
+                    or snapshot.mean_gwei != float(snapshot.updates)):
+                torn += 1
+    results.put((torn, len(seen)))
+
+
+class TestSharedGasFeed(unittest.TestCase):
+    """Test suite for the shared feed publisher and reader."""
+
+    def setUp(self):
+        """Create a publisher on a fresh segment."""
+        self.publisher = SharedGasFeedPublisher(unique_name())
+
+    def tearDown(self):
+        """Remove the segment."""
+        self.publisher.close()
+        self.publisher.unlink()
+
+    def test_round_trip(self):
+        """Test that readers see exactly what was published."""
+        with SharedGasFeedReader(self.publisher.name) as reader:
+            self.assertIsNone(reader.read())
+            self.assertIsNone(reader.read_gas_price())
+
+            self.publisher.publish(
+                1_700_000_000 * 10**9, 30 * GWEI, block_number=19_000_000,
+                base_fee=28 * GWEI, sample_count=5, mean_gwei=29.5, std_gwei=0.5,
+            )
+            snapshot = reader.read()
+
+        self.assertEqual(snapshot.gas_price, 30 * GWEI)
+        self.assertEqual(snapshot.gas_price_gwei, 30.0)
+        self.assertEqual(snapshot.block_number, 19_000_000)
+        self.assertEqual(snapshot.base_fee, 28 * GWEI)
+        self.assertIsNone(snapshot.max_priority_fee)
+        self.assertEqual((snapshot.mean_gwei, snapshot.std_gwei), (29.5, 0.5))
+        self.assertIsNone(snapshot.median_gwei)
+        self.assertEqual((snapshot.sequence, snapshot.updates), (2, 1))
+
+    def test_reader_retries_while_write_in_progress(self):
+        """Test that a record with an odd sequence is never returned."""
+        self.publisher.publish(1, 30 * GWEI)
+        with SharedGasFeedReader(self.publisher.name) as reader:
+            reader.MAX_RETRIES = 10
+            struct.pack_into("<Q", self.publisher._buf, self.publisher.SEQUENCE_OFFSET, 3)
+            with self.assertRaises(TimeoutError):
+                reader.read()
+            with self.assertRaises(TimeoutError):
+                reader.read_gas_price()
+
+    def test_rejects_foreign_segment(self):
+        """Test that a segment without the feed header is rejected."""
+        other = shared_memory.SharedMemory(name=unique_name(), create=True, size=256)
+        try:
+            with self.assertRaises(SharedFeedFormatError):
+                SharedGasFeedReader(other.name)
+        finally:
+            other.close()
+            other.unlink()
+
+    def test_reads_are_consistent_across_processes(self):
+        """Test that a concurrent reader process never sees a torn record."""
+        context = multiprocessing.get_context("spawn")
+        results = context.Queue()
+        process = context.Process(
+            target=check_consistency, args=(self.publisher.name, 20000, results)
+        )
+        process.start()
+        updates = 0
+        while process.is_alive() and updates < 2_000_000:
+            updates += 1
+            self.publisher.publish(
+                updates, updates * 3, sample_count=updates, mean_gwei=float(updates)
+            )
+        torn, distinct = results.get(timeout=30)
+        process.join(timeout=30)
+
+        self.assertEqual(torn, 0)
+        self.assertGreater(distinct, 1)
+
+
+class TestGasMonitorSharedFeed(unittest.TestCase):
+    """Test suite for publishing from GasMonitor."""
+
+    async def test_monitor_publishes_readings_and_stats(self):
+        """Test that every recorded reading reaches readers."""
+        name = unique_name()
+        monitor = GasMonitor(Mock(), clock=VirtualClock(1000), shared_feed_name=name)
+        reader = SharedGasFeedReader(name)
+
+        for gwei in (20, 30, 40):
+            monitor._record_gas_price(gwei * GWEI)
+        snapshot = reader.read()
+
+        self.assertEqual(snapshot.gas_price, 40 * GWEI)
+        self.assertEqual(snapshot.timestamp_ns, 1000)
+        self.assertEqual(snapshot.sample_count, 3)
+        self.assertEqual((snapshot.min_gwei, snapshot.max_gwei), (20.0, 40.0))
+        self.assertAlmostEqual(snapshot.mean_gwei, 30.0)
+        self.assertEqual(reader.read_gas_price(), 40 * GWEI)
+        reader.close()
+
+        await monitor.aclose()
+        with self.assertRaises(FileNotFoundError):
+            SharedGasFeedReader(name)
+
+
+def run_async_test(coro):
+    """Helper function to run async tests."""
+    return asyncio.run(coro)
+
+
+# Make async tests runnable with unittest
+for name, method in list(TestGasMonitorSharedFeed.__dict__.items()):
+    if name.startswith('test_') and asyncio.iscoroutinefunction(method):
+        # Wrap async test method
+        def make_sync_test(async_method):
+            def sync_test(self):
+                return run_async_test(async_method(self))
+            return sync_test
+
+        setattr(TestGasMonitorSharedFeed, name, make_sync_test(method))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,254 @@
+"""
+Tests for source health tracking, circuit breakers and adaptive polling
+"""
+
+import asyncio
+import unittest
+from unittest.mock import Mock, patch
+
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.gas_optimization.clock import VirtualClock
+from src.gas_optimization.gas_monitor import GasMonitor
+from src.gas_optimization.scheduler import AdaptiveInterval
+from src.gas_optimization.source_stats import CircuitBreaker, SourceStats
+from src.gas_optimization.thresholds import ThresholdWaiters
+
+
+GWEI = 10**9
+
+
+class TestCircuitBreaker(unittest.TestCase):
+    """Test suite for CircuitBreaker state transitions."""
+
+    def setUp(self):
+        """Create a breaker on a virtual clock."""
+        self.clock = VirtualClock(0)
+        self.breaker = CircuitBreaker(
+            "web3", failure_threshold=3, reset_timeout=10, max_reset_timeout=25, clock=self.clock
+        )
+
+    def trip(self):
+        for _ in range(3):
+            self.assertTrue(self.breaker.allow())
+            self.breaker.record_failure()
+
+    def test_opens_after_consecutive_failures(self):
+        """Test that only consecutive failures open the breaker."""
+        self.breaker.record_failure()
+        self.breaker.record_success()
+        self.breaker.record_failure()
+        self.assertEqual(self.breaker.state, CircuitBreaker.CLOSED)
+
+        self.breaker.record_failure()
+        self.breaker.record_failure()
+        self.assertEqual(self.breaker.state, CircuitBreaker.OPEN)
+        self.assertFalse(self.breaker.allow())
+        self.assertEqual(self.breaker.rejections, 1)
+
+    def test_half_open_admits_one_probe(self):
+        """Test that one probe is allowed after the reset timeout."""
+        self.trip()
+        self.clock.advance(10)
+
+        self.assertTrue(self.breaker.allow())
+        self.assertEqual(self.breaker.state, CircuitBreaker.HALF_OPEN)
+        self.assertFalse(self.breaker.allow())
+
+        self.breaker.record_success()
+        self.assertEqual(self.breaker.state, CircuitBreaker.CLOSED)
+        self.assertTrue(self.breaker.allow())
+
+    def test_failed_probe_backs_off(self):
+        """Test that each failed probe doubles the timeout up to the cap."""
+        self.trip()
+        self.clock.advance(10)
+        for timeout in (20, 25, 25):
+            self.assertTrue(self.breaker.allow())
+            self.breaker.record_failure()
+            self.assertEqual(self.breaker.state, CircuitBreaker.OPEN)
+
+            self.clock.advance(timeout - 1)
+            self.assertFalse(self.breaker.allow())
+            self.clock.advance(1)
+        self.assertEqual(self.breaker.trips, 4)
+
+    def test_cancelled_probe_frees_slot(self):
+        """Test that a cancelled probe lets the next caller probe."""
+        self.trip()
+        self.clock.advance(10)
+        self.assertTrue(self.breaker.allow())
+        self.breaker.record_cancellation()
+        self.assertTrue(self.breaker.allow())
+
+    def test_invalid_arguments(self):
+        """Test argument validation."""
+        with self.assertRaises(ValueError):
+            CircuitBreaker("web3", failure_threshold=0)
+        with self.assertRaises(ValueError):
+            CircuitBreaker("web3", reset_timeout=60, max_reset_timeout=30)
+
+
+class TestSourceHealth(unittest.TestCase):
+    """Test suite for smoothed source health."""
+
+    def test_ewma_latency_and_error_rate(self):
+        """Test the exponentially weighted health estimates."""
+        stats = SourceStats("web3", ewma_alpha=0.5)
+        stats.record_success(0.1)
+        stats.record_success(0.3)
+        stats.record_failure()
+
+        self.assertAlmostEqual(stats.ewma_latency, 0.2)
+        self.assertAlmostEqual(stats.error_rate, 0.5)
+        summary = stats.as_dict()
+        self.assertIsNone(summary["circuit_state"])
+        self.assertEqual(summary["skipped"], 0)
+
+
+class TestGasMonitorCircuitBreakers(unittest.TestCase):
+    """Test suite for circuit breakers in GasMonitor."""
+
+    async def test_dead_source_is_skipped_until_probe(self):
+        """Test that a dead Web3 provider stops being called once tripped."""
+        clock = VirtualClock(0)
+        monitor = GasMonitor(Mock(), clock=clock, circuit_breaker_timeout=30)
+        web3_calls = 0
+
+        async def dead_web3():
+            nonlocal web3_calls
+            web3_calls += 1
+            raise ConnectionError("connection refused")
+
+        async def etherscan():
+            return 40 * GWEI
+
+        with patch.object(monitor, '_fetch_gas_from_web3', side_effect=dead_web3), \
+                patch.object(monitor, '_fetch_gas_from_api', side_effect=etherscan):
+            for _ in range(10):
+                self.assertEqual(await monitor.get_current_gas_price(), 40 * GWEI)
+            self.assertEqual(web3_calls, 3)
+
+            clock.advance(30)
+            await monitor.get_current_gas_price()
+            self.assertEqual(web3_calls, 4)
+
+        stats = monitor.get_source_stats()["web3"]
+        self.assertEqual(stats["circuit_state"], "open")
+        self.assertEqual(stats["circuit_trips"], 2)
+        self.assertEqual(stats["skipped"], 7)
+        self.assertEqual(stats["attempts"], 4)
+        self.assertGreater(stats["error_rate"], 0.5)
+
+    async def test_breakers_can_be_disabled(self):
+        """Test that every call reaches the source without breakers."""
+        monitor = GasMonitor(Mock(), circuit_breaker_threshold=None)
+        with patch.object(monitor, '_fetch_gas_from_web3', side_effect=ConnectionError), \
+                patch.object(monitor, '_fetch_gas_from_api', return_value=None) as api:
+            for _ in range(5):
+                await monitor.get_current_gas_price()
+
+        self.assertEqual(api.call_count, 5)
+        self.assertEqual(monitor.source_stats["web3"].failures, 5)
+
+
+class TestAdaptiveInterval(unittest.TestCase):
+    """Test suite for adaptive polling."""
+
+    def test_policy_interpolates_between_bounds(self):
+        """Test urgency from volatility and threshold proximity."""
+        policy = AdaptiveInterval(2, 32, volatility_target=0.1, proximity=0.1)
+
+        self.assertEqual(policy.interval(None), 32)
+        self.assertEqual(policy.interval(0.0), 32)
+        self.assertEqual(policy.interval(0.5), 2)
+        self.assertAlmostEqual(policy.interval(0.05), 8)
+        self.assertAlmostEqual(policy.interval(0.0, relative_distance=0.05), 8)
+        self.assertEqual(policy.interval(0.0, relative_distance=0.5), 32)
+
+        with self.assertRaises(ValueError):
+            AdaptiveInterval(10, 5)
+
+    async def test_nearest_threshold(self):
+        """Test the nearest live threshold on either side of the price."""
+        waiters = ThresholdWaiters()
+        self.assertIsNone(waiters.nearest_threshold(50))
+        waiters.notify(50)
+
+        waiters.wait_below(40)
+        near = waiters.wait_below(45)
+        waiters.wait_above(70)
+        self.assertEqual(waiters.nearest_threshold(50), 45)
+
+        near.cancel()
+        await asyncio.sleep(0)
+        self.assertEqual(waiters.nearest_threshold(50), 40)
+        self.assertEqual(waiters.nearest_threshold(65), 70)
+        waiters.cancel_all()
+
+    async def test_monitor_polls_faster_near_threshold(self):
+        """Test that a waiter close to the price shortens the interval."""
+        monitor = GasMonitor(
+            Mock(), update_interval=15, min_update_interval=3, max_update_interval=60
+        )
+        for _ in range(10):
+            monitor._record_gas_price(50 * GWEI)
+        self.assertEqual(monitor.get_adaptive_interval(), 60)
+
+        waiter = asyncio.create_task(monitor.wait_for_price_below(49))
+        await asyncio.sleep(0)
+        self.assertLess(monitor.get_adaptive_interval(), 15)
+
+        monitor._record_gas_price(48 * GWEI)
+        self.assertEqual(await waiter, 48 * GWEI)
+        self.assertGreater(monitor.get_adaptive_interval(), 15)
+
+    async def test_polling_applies_adaptive_interval(self):
+        """Test that each poll retunes the scheduler."""
+        clock = VirtualClock(0)
+        monitor = GasMonitor(
+            Mock(), update_interval=15, clock=clock, max_update_interval=120
+        )
+        fetched_at = []
+
+        async def gas_price():
+            fetched_at.append(clock.monotonic_ns())
+            return 25 * GWEI
+
+        monitor._fetch_current_gas_price = gas_price
+
+        task = asyncio.create_task(monitor.start_monitoring())
+        while len(monitor.gas_history) < 4:
+            await asyncio.sleep(0.001)
+        await monitor.stop_monitoring()
+        await asyncio.gather(task, return_exceptions=True)
+
+        self.assertEqual(monitor.scheduler.interval, 120)
+        self.assertEqual(fetched_at[:4], [0, 120 * 10**9, 240 * 10**9, 360 * 10**9])
+
+
+def run_async_test(coro):
+    """Helper function to run async tests."""
+    return asyncio.run(coro)
+
+
+# Make async tests runnable with unittest
+for test_class in (TestGasMonitorCircuitBreakers, TestAdaptiveInterval):
+    for name, method in list(test_class.__dict__.items()):
+        if name.startswith('test_') and asyncio.iscoroutinefunction(method):
+            # Wrap async test method
+            def make_sync_test(async_method):
+                def sync_test(self):
+                    return run_async_test(async_method(self))
+                return sync_test
+
+            setattr(test_class, name, make_sync_test(method))
+
+# Do not leave a TestCase bound at module level for pytest to collect again
+del test_class
+
+
+if __name__ == '__main__':
+    unittest.main()
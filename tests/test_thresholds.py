@@ -0,0 +1,196 @@
+"""
+Tests for gas price threshold waiters
+"""
+
+import asyncio
+import unittest
+from unittest.mock import AsyncMock, Mock
+
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.gas_optimization.gas_monitor import GasMonitor
+from src.gas_optimization.thresholds import ThresholdWaiters
+
+
+GWEI = 10**9
+
+
+class TestThresholdWaiters(unittest.TestCase):
+    """Test suite for ThresholdWaiters."""
+
+    async def test_only_reached_thresholds_wake(self):
+        """Test that a reading wakes exactly the satisfied waiters."""
+        waiters = ThresholdWaiters()
+        waiters.notify(50)
+        below = {threshold: waiters.wait_below(threshold) for threshold in (10, 20, 30, 40)}
+        above = {threshold: waiters.wait_above(threshold) for threshold in (60, 70)}
+
+        self.assertEqual(waiters.notify(25), 2)
+        self.assertTrue(below[30].done() and below[40].done())
+        self.assertFalse(below[20].done() or below[10].done())
+        self.assertEqual(below[30].result(), 25)
+
+        self.assertEqual(waiters.notify(65), 1)
+        self.assertEqual(above[60].result(), 65)
+        self.assertFalse(above[70].done())
+
+        await asyncio.sleep(0)
+        self.assertEqual(len(waiters), 3)
+
+    async def test_level_triggered_resolves_immediately(self):
+        """Test that a satisfied threshold resolves without a new reading."""
+        waiters = ThresholdWaiters()
+        waiters.notify(30)
+
+        self.assertEqual(waiters.wait_below(40).result(), 30)
+        self.assertEqual(waiters.wait_above(20).result(), 30)
+
+    async def test_crossing_requires_other_side_first(self):
+        """Test that crossing waiters need the price to cross the threshold."""
+        waiters = ThresholdWaiters()
+        waiters.notify(30)
+        below = waiters.wait_below(40, crossing=True)
+        above = waiters.wait_above(20, crossing=True)
+
+        waiters.notify(35)
+        self.assertFalse(below.done() or above.done())
+
+        waiters.notify(45)
+        self.assertFalse(below.done())
+        waiters.notify(15)
+        self.assertEqual(below.result(), 15)
+        self.assertFalse(above.done())
+        waiters.notify(25)
+        self.assertEqual(above.result(), 25)
+
+    async def test_cancelled_waiters_are_compacted(self):
+        """Test that timed-out waiters do not accumulate."""
+        waiters = ThresholdWaiters()
+        futures = [waiters.wait_below(i) for i in range(200)]
+        for future in futures[:150]:
+            future.cancel()
+        await asyncio.sleep(0)
+
+        waiters.notify(1000)
+        self.assertEqual(len(waiters), 50)
+        self.assertEqual(len(waiters._below), 50)
+        self.assertEqual(waiters.notify(0), 50)
+
+
+    async def test_crossing_before_first_reading(self):
+        """Test that the first reading only sets the reference for crossing waiters."""
+        waiters = ThresholdWaiters()
+        below = waiters.wait_below(40, crossing=True)
+        above = waiters.wait_above(20, crossing=True)
+
+        self.assertEqual(waiters.notify(30), 0)
+        self.assertFalse(below.done() or above.done())
+
+        waiters.notify(45)
+        waiters.notify(15)
+        self.assertEqual(below.result(), 15)
+        self.assertFalse(above.done())
+        waiters.notify(25)
+        self.assertEqual(above.result(), 25)
+
+    async def test_cancel_all_resets_counters(self):
+        """Test that cancelled waiters are not counted as stale after cancel_all."""
+        waiters = ThresholdWaiters()
+        futures = [waiters.wait_below(i) for i in range(10)]
+        futures.append(waiters.wait_above(100, crossing=True))
+        futures[0].cancel()
+        await asyncio.sleep(0)
+        futures[1].cancel()
+
+        waiters.cancel_all()
+        await asyncio.sleep(0)
+
+        self.assertTrue(all(future.cancelled() for future in futures))
+        self.assertEqual(len(waiters), 0)
+        self.assertEqual(waiters._stale, 0)
+
+
+class TestGasMonitorThresholds(unittest.TestCase):
+    """Test suite for GasMonitor threshold waits."""
+
+    async def test_many_waiters_wake_on_recorded_readings(self):
+        """Test that thousands of awaiting callers wake on the right reading."""
+        monitor = GasMonitor(Mock())
+        monitor._record_gas_price(60 * GWEI)
+
+        tasks = [
+            asyncio.create_task(monitor.wait_for_price_below(threshold))
+            for threshold in range(1, 2001)
+        ]
+        high = asyncio.create_task(monitor.wait_for_price_above(80))
+        await asyncio.sleep(0)
+
+        monitor._record_gas_price(1500 * GWEI // 100)
+        await asyncio.sleep(0)
+        self.assertEqual(sum(task.done() for task in tasks), 1986)
+        self.assertEqual(tasks[20].result(), 15 * GWEI)
+        self.assertFalse(high.done())
+
+        monitor._record_gas_price(90 * GWEI)
+        self.assertEqual(await high, 90 * GWEI)
+
+        await monitor.aclose()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self.assertTrue(tasks[0].cancelled())
+
+    async def test_default_price_does_not_wake_waiters(self):
+        """Test that the made-up default price is never recorded as a reading."""
+        monitor = GasMonitor(Mock(), circuit_breaker_threshold=None)
+        monitor._fetch_gas_from_web3 = AsyncMock(side_effect=ConnectionError("down"))
+        monitor._fetch_gas_from_api = AsyncMock(return_value=None)
+        waiter = asyncio.ensure_future(monitor.wait_for_price_below(60))
+        await asyncio.sleep(0)
+
+        self.assertIsNone(await monitor.update_gas_price())
+        self.assertEqual(await monitor.get_current_gas_price(), 50 * GWEI)
+        await asyncio.sleep(0)
+
+        self.assertFalse(waiter.done())
+        self.assertEqual(len(monitor.gas_history), 0)
+        self.assertEqual(monitor.skipped_updates, 1)
+        self.assertEqual(monitor.default_fallbacks, 1)
+
+        monitor._fetch_gas_from_web3 = AsyncMock(return_value=40 * GWEI)
+        self.assertEqual(await monitor.update_gas_price(), 40 * GWEI)
+        self.assertEqual(await waiter, 40 * GWEI)
+        await monitor.aclose()
+
+    async def test_timeout(self):
+        """Test that a wait can time out."""
+        monitor = GasMonitor(Mock())
+        with self.assertRaises(asyncio.TimeoutError):
+            await monitor.wait_for_price_below(10, timeout=0.01)
+        await asyncio.sleep(0)
+        self.assertEqual(len(monitor.thresholds), 0)
+
+
+def run_async_test(coro):
+    """Helper function to run async tests."""
+    return asyncio.run(coro)
+
+
+# Make async tests runnable with unittest
+for test_class in (TestThresholdWaiters, TestGasMonitorThresholds):
+    for name, method in list(test_class.__dict__.items()):
+        if name.startswith('test_') and asyncio.iscoroutinefunction(method):
+            # Wrap async test method
+            def make_sync_test(async_method):
+                def sync_test(self):
+                    return run_async_test(async_method(self))
+                return sync_test
+
+            setattr(test_class, name, make_sync_test(method))
+
+# Do not leave a TestCase bound at module level for pytest to collect again
+del test_class
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,142 @@
+"""
+Tests for the persistent memory-mapped gas time-series store
+"""
+
+import asyncio
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import Mock
+
+import numpy as np
+
+import sys
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.gas_optimization.gas_monitor import GasMonitor
+from src.gas_optimization.timeseries_store import GasTimeSeriesFile, TimeSeriesFormatError
+
+
+class TestGasTimeSeriesFile(unittest.TestCase):
+    """Test suite for GasTimeSeriesFile."""
+
+    def setUp(self):
+        """Create a scratch directory."""
+        self.tmpdir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmpdir, "gas.ts")
+
+    def tearDown(self):
+        """Remove the scratch directory."""
+        shutil.rmtree(self.tmpdir)
+
+    def _write(self, count, start=0):
+        with GasTimeSeriesFile(self.path) as store:
+            for i in range(start, start + count):
+                store.append(i * 1000, (20 + i) * 10**9)
+
+    def test_append_and_reopen(self):
+        """Test that records survive closing and reopening the file."""
+        self._write(10)
+
+        with GasTimeSeriesFile(self.path) as store:
+            self.assertEqual(len(store), 10)
+            self.assertEqual(store.recovered_bytes, 0)
+            timestamps, prices = store.tail(3)
+
+        self.assertEqual(timestamps.tolist(), [7000, 8000, 9000])
+        self.assertEqual(prices.tolist(), [27 * 10**9, 28 * 10**9, 29 * 10**9])
+
+    def test_records_follow_appends(self):
+        """Test that the mapping is refreshed after new appends."""
+        with GasTimeSeriesFile(self.path) as store:
+            self.assertEqual(len(store.records()), 0)
+            store.append(1, 10)
+            self.assertEqual(len(store.records()), 1)
+            store.append(2, 20)
+            self.assertEqual(store.records()["price_wei"].tolist(), [10, 20])
+
+    def test_range_query(self):
+        """Test binary-searched range queries over the mapped file."""
+        self._write(100)
+
+        with GasTimeSeriesFile(self.path) as store:
+            selected = store.query(25_000, 30_000)
+            self.assertIsInstance(selected, np.memmap)
+            self.assertEqual(selected["timestamp_ns"].tolist(), [25000, 26000, 27000, 28000, 29000])
+            self.assertEqual(len(store.query(500_000, 600_000)), 0)
+            self.assertEqual(len(store.query(-10, 1)), 1)
+
+    def test_partial_tail_record_is_truncated(self):
+        """Test recovery from a crash in the middle of writing a record."""
+        self._write(5)
+        with open(self.path, "ab") as f:
+            f.write(b"\x01\x02\x03")
+
+        with GasTimeSeriesFile(self.path) as store:
+            self.assertEqual(len(store), 5)
+            self.assertEqual(store.recovered_bytes, 3)
+            store.append(5000, 1)
+
+        with GasTimeSeriesFile(self.path) as store:
+            self.assertEqual(store.records()["timestamp_ns"].tolist()[-2:], [4000, 5000])
+
+    def test_torn_record_is_truncated(self):
+        """Test that a full-length record with a bad checksum is dropped."""
+        self._write(5)
+        size = os.path.getsize(self.path)
+        with open(self.path, "r+b") as f:
+            f.seek(size - 20)
+            f.write(b"\xff\xff\xff\xff")
+
+        with GasTimeSeriesFile(self.path) as store:
+            self.assertEqual(len(store), 4)
+            self.assertEqual(store.recovered_bytes, GasTimeSeriesFile.RECORD_DTYPE.itemsize)
+
+    def test_timestamps_are_kept_monotonic(self):
+        """Test that a reading older than the last one is clamped."""
+        with GasTimeSeriesFile(self.path) as store:
+            store.append(2000, 10)
+            store.append(1000, 20)
+            self.assertEqual(store.records()["timestamp_ns"].tolist(), [2000, 2000])
+
+    def test_foreign_file_is_rejected(self):
+        """Test that a file with the wrong magic is not overwritten."""
+        with open(self.path, "wb") as f:
+            f.write(b"not a time-series file".ljust(128, b"\x00"))
+
+        with self.assertRaises(TimeSeriesFormatError):
+            GasTimeSeriesFile(self.path)
+
+
+class TestGasMonitorPersistence(unittest.TestCase):
+    """Test suite for GasMonitor warm start from a time-series file."""
+
+    def setUp(self):
+        """Create a scratch directory."""
+        self.tmpdir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmpdir, "gas.ts")
+
+    def tearDown(self):
+        """Remove the scratch directory."""
+        shutil.rmtree(self.tmpdir)
+
+    def test_readings_persist_and_warm_start(self):
+        """Test that a new monitor resumes history and statistics from disk."""
+        monitor = GasMonitor(Mock(), history_size=5, persist_path=self.path)
+        for price_gwei in (30, 31, 32, 33, 34, 35, 36):
+            monitor._record_gas_price(GasMonitor.gwei_to_wei(price_gwei))
+        asyncio.run(monitor.aclose())
+
+        restarted = GasMonitor(Mock(), history_size=5, persist_path=self.path)
+        try:
+            self.assertEqual(len(restarted.gas_history), 5)
+            self.assertEqual(restarted.get_current_price_gwei(), 36.0)
+            self.assertEqual(restarted.get_average_gas_price(window=5), 34000000000)
+            self.assertEqual(len(restarted.timeseries), 7)
+        finally:
+            asyncio.run(restarted.aclose())
+
+
+if __name__ == '__main__':
+    unittest.main()